@@ -0,0 +1,2 @@
+# This file makes Python treat the 'benchmarks' directory as a package.
+# Run a benchmark from the python/ directory, e.g. `python -m hyperfy_agent_python.benchmarks.bench_behaviour_tree`
@@ -0,0 +1,91 @@
+"""
+Action construction microbenchmark
+
+Compares creation rate and retained memory of the slotted Action (integer ids,
+class-level loggers) against a replica of the previous construction path
+(uuid4 string id, per-instance logger lookup, instance __dict__).
+"""
+import argparse
+import gc
+import logging
+import time
+import tracemalloc
+import uuid
+
+from hyperfy_agent_python.src.core.action_system import Action, ActionStatus
+from hyperfy_agent_python.src.physics.movement_action import MovementAction
+
+
+class LegacyAction:
+    """Replica of the pre-slots Action.__init__ for comparison."""
+    def __init__(self, agent=None, priority=0):
+        self.id = str(uuid.uuid4())
+        self.agent = agent
+        self.priority = priority
+        self.status = ActionStatus.PENDING
+        self.creation_time = time.time()
+        self.deadline = None
+        self.queued_time = None
+        self.start_time = None
+        self.completion_time = None
+        self.error = None
+        self.progress = 0.0
+        self.logger = logging.getLogger(f"action.{self.__class__.__name__}")
+
+
+class LegacyMovementAction(LegacyAction):
+    def __init__(self, agent, target_position, speed=1.0, precision=0.1):
+        super().__init__(agent=agent, priority=10)
+        self.target_position = target_position
+        self.speed = speed
+        self.precision = precision
+        self.path = [target_position]
+        self.current_waypoint_index = 0
+        self._cached_initial_distance = None
+        self.logger = logging.getLogger("action.MovementAction")
+
+
+def creation_rate(factory, count):
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(count):
+            factory()
+        return count / (time.perf_counter() - start)
+    finally:
+        gc.enable()
+
+
+def bytes_per_instance(factory, count):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    keep = [factory() for _ in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del keep
+    return total / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Action allocation microbenchmark")
+    parser.add_argument("--count", type=int, default=200000)
+    args = parser.parse_args()
+
+    target = [1.0, 0.0, 1.0]
+    cases = [
+        ("legacy Action", LegacyAction),
+        ("Action", Action),
+        ("legacy MovementAction", lambda: LegacyMovementAction(None, target)),
+        ("MovementAction", lambda: MovementAction(None, target)),
+    ]
+    print(f"{'class':>22} {'created/s':>12} {'bytes/instance':>15}")
+    for name, factory in cases:
+        rate = creation_rate(factory, args.count)
+        size = bytes_per_instance(factory, min(args.count, 50000))
+        print(f"{name:>22} {rate:>12.0f} {size:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
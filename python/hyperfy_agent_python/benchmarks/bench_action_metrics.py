@@ -0,0 +1,42 @@
+"""
+Overhead of action lifecycle metrics on the ActionSystem hot path
+
+Runs the same stream of instant actions through an ActionSystem with metrics
+disabled and enabled and reports actions per second for each.
+"""
+import argparse
+import time
+
+from hyperfy_agent_python.src.core.action_system import ActionSystem, Action
+from hyperfy_agent_python.src.core.metrics import MetricsRegistry
+
+
+def run(actions, enabled):
+    system = ActionSystem(action_cooldown=0.0, max_queue_size=actions + 1, history_size=100)
+    system.add_hook("post_execute", lambda action: None)
+    if enabled:
+        system.enable_metrics(MetricsRegistry(), agent_name="bench")
+
+    batch = [Action() for _ in range(actions)]
+    start = time.perf_counter()
+    for action in batch:
+        system.queue_action(action)
+        system.update(0.016)
+    elapsed = time.perf_counter() - start
+    return actions / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Action metrics overhead benchmark")
+    parser.add_argument("--actions", type=int, default=50000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    disabled = max(run(args.actions, False) for _ in range(args.rounds))
+    enabled = max(run(args.actions, True) for _ in range(args.rounds))
+    print(f"metrics disabled: {disabled:>10.0f} actions/s")
+    print(f"metrics enabled:  {enabled:>10.0f} actions/s ({(disabled / enabled - 1) * 100:.1f}% slower)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+AgentCluster scaling: agent updates per second against the number of worker processes
+
+Every worker hosts the same number of wandering agents and ticks them as fast
+as it can (a very high tick rate with no catch-up), so its step count measures
+throughput. Throughput is reported as agent updates per second and as the
+number of agents that could be sustained at 60 Hz. With one worker per free
+core the total should grow close to linearly with the worker count.
+"""
+import argparse
+import logging
+import time
+
+from hyperfy_agent_python.src.core.agent_base import AgentBase
+from hyperfy_agent_python.src.core.agent_cluster import AgentCluster, default_worker_count
+from hyperfy_agent_python.src.core.custom_actions import WalkRandomlyAction
+
+CONFIG = {
+    "VOICE_RECOGNITION_ENABLED": False,
+    "PHYSICS_ENABLED": False,
+    "ACTION_COOLDOWN": 0.0,
+    "AGENT_TICK_RATE": 100000.0,
+    "AGENT_MAX_CATCH_UP": 1,
+    "CLUSTER_STATS_INTERVAL": 0.25,
+}
+
+
+class WanderingAgent(AgentBase):
+    def on_start(self):
+        self.queue_action(WalkRandomlyAction(self, interval=2, max_distance=5, duration=3600))
+
+
+def create_wandering_agent(config, name, **kwargs):
+    logging.disable(logging.INFO)
+    return WanderingAgent(name, config, **kwargs)
+
+
+def run(workers, agents_per_worker, duration):
+    names = [f"npc-{i}" for i in range(workers * agents_per_worker)]
+    cluster = AgentCluster(CONFIG, names, agent_factory=create_wandering_agent, workers=workers)
+    cluster.start()
+    try:
+        time.sleep(0.5)  # let every worker spawn its agents and warm up
+        before = [shard.stats.get("steps", 0) for shard in cluster.shards]
+        time.sleep(duration)
+        after = [shard.stats.get("steps", 0) for shard in cluster.shards]
+    finally:
+        cluster.stop()
+    steps = sum(b - a for a, b in zip(before, after))
+    return steps * agents_per_worker / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgentCluster scaling benchmark")
+    cores = default_worker_count()
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=[w for w in (1, 2, 4, 8, 16, 32) if w < cores] + [cores])
+    parser.add_argument("--agents-per-worker", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=3.0)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(f"{cores} cores available")
+    print(f"{'workers':>8} {'agents':>7} {'updates/s':>12} {'agents @60Hz':>13} {'speedup':>8}")
+    baseline = None
+    for workers in args.workers:
+        throughput = run(workers, args.agents_per_worker, args.duration)
+        baseline = baseline or throughput
+        print(f"{workers:>8} {workers * args.agents_per_worker:>7} {throughput:>12.0f} "
+              f"{throughput / 60:>13.0f} {throughput / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+AgentHost scaling: tick time against the number of hosted agents
+
+Each agent wanders with WalkRandomlyAction, so every agent has a running
+movement to update on every tick. The host is stepped directly (no sleeping),
+and the wall time of one shared tick is reported along with the share of a
+60 Hz frame budget it uses.
+"""
+import argparse
+import logging
+import random
+import statistics
+import time
+
+from hyperfy_agent_python.src.core.agent_base import AgentBase
+from hyperfy_agent_python.src.core.agent_host import AgentHost
+from hyperfy_agent_python.src.core.custom_actions import WalkRandomlyAction
+
+FRAME = 1 / 60
+CONFIG = {
+    "VOICE_RECOGNITION_ENABLED": False,
+    "PHYSICS_ENABLED": False,
+    "ACTION_COOLDOWN": 0.0,
+}
+
+
+def run(count, ticks, seed):
+    random.seed(seed)
+    host = AgentHost(CONFIG)
+    for i in range(count):
+        agent = AgentBase(f"npc-{i}", CONFIG, world_state=host.world_state)
+        host.add_agent(agent)
+        agent.queue_action(WalkRandomlyAction(agent, interval=2, max_distance=5, duration=3600))
+
+    for _ in range(10):  # warm up
+        host.tick(FRAME)
+
+    samples = []
+    for _ in range(ticks):
+        start = time.perf_counter()
+        host.tick(FRAME)
+        samples.append(time.perf_counter() - start)
+
+    for name in list(host.agents):
+        host.remove_agent(name)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AgentHost scaling benchmark")
+    parser.add_argument("--counts", type=int, nargs="+", default=[1, 10, 100, 250, 500, 1000])
+    parser.add_argument("--ticks", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(f"{'agents':>7} {'p50 tick ms':>12} {'p95 tick ms':>12} {'us/agent':>9} {'60Hz budget':>12}")
+    for count in args.counts:
+        samples = sorted(run(count, args.ticks, args.seed))
+        p50 = statistics.median(samples)
+        p95 = samples[int(0.95 * (len(samples) - 1))]
+        print(f"{count:>7} {p50 * 1000:>12.3f} {p95 * 1000:>12.3f} {p50 * 1e6 / count:>9.1f} "
+              f"{p50 / FRAME:>11.1%}")
+
+
+if __name__ == "__main__":
+    main()
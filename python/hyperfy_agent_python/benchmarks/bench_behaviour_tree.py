@@ -0,0 +1,92 @@
+"""
+Throughput benchmark for deep behaviour trees built from composite actions
+
+Builds trees of alternating sequence/selector/parallel nodes and ticks them to
+completion, reporting tree build rate and tree ticks per second.
+"""
+import argparse
+import time
+
+from hyperfy_agent_python.src.core.action_system import Action
+from hyperfy_agent_python.src.core.composite_actions import SequenceAction, SelectorAction, ParallelAction
+
+
+class TickLeaf(Action):
+    """Leaf that completes after a fixed number of updates."""
+    def __init__(self, ticks):
+        super().__init__()
+        self.ticks = ticks
+        self.updates = 0
+
+    def update(self, delta_time):
+        self.updates += 1
+        return self.updates >= self.ticks
+
+
+def build_tree(depth, fanout, leaf_ticks):
+    """
+    Build a tree of the given depth
+    Levels cycle through sequence, parallel and selector nodes
+    """
+    if depth == 0:
+        return TickLeaf(leaf_ticks)
+
+    children = [build_tree(depth - 1, fanout, leaf_ticks) for _ in range(fanout)]
+    kind = depth % 3
+    if kind == 0:
+        return SequenceAction(children=children)
+    if kind == 1:
+        return ParallelAction(children=children)
+    return SelectorAction(children=children)
+
+
+def count_nodes(action):
+    return 1 + sum(count_nodes(child) for child in getattr(action, "children", []))
+
+
+def run(depth, fanout, leaf_ticks, repeats):
+    total_ticks = 0
+    total_nodes = 0
+    build_seconds = 0.0
+    tick_seconds = 0.0
+
+    for _ in range(repeats):
+        build_start = time.perf_counter()
+        tree = build_tree(depth, fanout, leaf_ticks)
+        build_seconds += time.perf_counter() - build_start
+        total_nodes += count_nodes(tree)
+
+        tick_start = time.perf_counter()
+        tree.start()
+        while not tree.update(0.016):
+            total_ticks += 1
+        total_ticks += 1
+        tick_seconds += time.perf_counter() - tick_start
+
+    return {
+        "depth": depth,
+        "fanout": fanout,
+        "nodes_per_tree": total_nodes // repeats,
+        "tree_ticks": total_ticks,
+        "build_trees_per_s": repeats / build_seconds if build_seconds else 0.0,
+        "tree_ticks_per_s": total_ticks / tick_seconds if tick_seconds else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Behaviour tree throughput benchmark")
+    parser.add_argument("--depths", type=int, nargs="+", default=[2, 4, 6, 8])
+    parser.add_argument("--fanout", type=int, default=2)
+    parser.add_argument("--leaf-ticks", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'depth':>5} {'nodes':>7} {'ticks':>7} {'trees/s built':>14} {'tree ticks/s':>13}")
+    for depth in args.depths:
+        result = run(depth, args.fanout, args.leaf_ticks, args.repeats)
+        print(f"{result['depth']:>5} {result['nodes_per_tree']:>7} {result['tree_ticks']:>7} "
+              f"{result['build_trees_per_s']:>14.1f} {result['tree_ticks_per_s']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Bursty move_to benchmark for action coalescing
+
+Simulates event re-triggers that issue bursts of move commands towards
+jittered targets, with and without coalescing, and reports how many
+MovementActions actually ran (a retargeted action counts once), the distance walked, and the update cost.
+"""
+import argparse
+import random
+import time
+
+from hyperfy_agent_python.src.core.action_system import ActionSystem
+from hyperfy_agent_python.src.physics.movement_action import MovementAction
+
+
+class SimAgent:
+    def __init__(self):
+        self.name = "bench"
+        self.position = [0.0, 0.0, 0.0]
+        self.rotation = [0.0, 0.0, 0.0]
+        self.physics_engine = None
+
+
+def run(coalesce, bursts, burst_size, frames_between, seed):
+    rng = random.Random(seed)
+    agent = SimAgent()
+    system = ActionSystem(action_cooldown=0.0, max_queue_size=bursts * burst_size + 1, coalesce=coalesce)
+    walked = 0.0
+    frames = 0
+    delta = 1 / 60
+
+    start = time.perf_counter()
+    for _ in range(bursts):
+        anchor = [rng.uniform(-20, 20), 0.0, rng.uniform(-20, 20)]
+        for _ in range(burst_size):
+            target = [anchor[0] + rng.uniform(-1, 1), 0.0, anchor[2] + rng.uniform(-1, 1)]
+            system.queue_action(MovementAction(agent, target, speed=5.0))
+        for _ in range(frames_between):
+            before = list(agent.position)
+            system.update(delta)
+            walked += sum((a - b) ** 2 for a, b in zip(agent.position, before)) ** 0.5
+            frames += 1
+
+    # Drain whatever is still queued
+    while not system.is_idle() and frames < 10_000_000:
+        before = list(agent.position)
+        system.update(delta)
+        walked += sum((a - b) ** 2 for a, b in zip(agent.position, before)) ** 0.5
+        frames += 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        "executed": system.get_stats("MovementAction")["execution_time"]["count"],
+        "coalesced": system.coalesced_count,
+        "walked": walked,
+        "frames": frames,
+        "us_per_frame": elapsed / frames * 1e6 if frames else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bursty move command benchmark")
+    parser.add_argument("--bursts", type=int, default=50)
+    parser.add_argument("--burst-size", type=int, default=10)
+    parser.add_argument("--frames-between", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"{'mode':>12} {'moves run':>10} {'coalesced':>10} {'walked m':>10} {'frames':>8} {'us/frame':>9}")
+    for coalesce in (False, True):
+        result = run(coalesce, args.bursts, args.burst_size, args.frames_between, args.seed)
+        mode = "coalescing" if coalesce else "queued"
+        print(f"{mode:>12} {result['executed']:>10} {result['coalesced']:>10} {result['walked']:>10.1f} "
+              f"{result['frames']:>8} {result['us_per_frame']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
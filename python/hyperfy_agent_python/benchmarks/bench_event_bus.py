@@ -0,0 +1,119 @@
+"""
+Event dispatch microbenchmark
+
+Measures events per second through AgentBase.emit_event() on the event bus
+against a replica of the previous dict-of-lists dispatch, the bus on its own
+with pre-built typed events, the bus with wildcard subscriptions, and queued
+delivery on an event loop. Emitting a topic nobody listens to is measured
+separately since agents emit many events only a few agents handle.
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from hyperfy_agent_python.src.core.agent_base import AgentBase
+from hyperfy_agent_python.src.core.event_bus import EventBus, Event, OverflowPolicy
+from hyperfy_agent_python.src.core.tick_scheduler import TickScheduler
+
+CONFIG = {"VOICE_RECOGNITION_ENABLED": False, "PHYSICS_ENABLED": False}
+
+
+class LegacyEmitter:
+    """Replica of the pre-bus AgentBase event dispatch for comparison."""
+    def __init__(self, name):
+        self.name = name
+        self.event_handlers = {}
+        self.event_waiters = {}
+        self.scheduler = TickScheduler()
+        self.logger = logging.getLogger(f"agent.{name}")
+
+    def register_event_handler(self, event_name, handler):
+        if event_name not in self.event_handlers:
+            self.event_handlers[event_name] = []
+        self.event_handlers[event_name].append(handler)
+
+    def emit_event(self, event_name, data=None):
+        if not data:
+            data = {}
+        data["source"] = self.name
+        data["timestamp"] = time.time()
+        if event_name in self.event_handlers:
+            for handler in self.event_handlers[event_name]:
+                try:
+                    handler(data)
+                except Exception as e:
+                    self.logger.error(f"Error in event handler for {event_name}: {e}")
+        self.scheduler.wake()
+        waiters = self.event_waiters.pop(event_name, None)
+        if waiters:
+            for future in waiters:
+                future.set_result(data)
+        self.logger.debug(f"Emitted event: {event_name} with data: {data}")
+
+
+def rate(emit, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        emit()
+    return count / (time.perf_counter() - start)
+
+
+def noop(_):
+    pass
+
+
+def queued_rate(count, handlers, queue_size):
+    async def scenario():
+        bus = EventBus(queue_size, overflow=OverflowPolicy.BLOCK)
+        for _ in range(handlers):
+            bus.subscribe("collision", noop)
+        bus.start()
+        event = Event("collision", {"other": "wall"})
+        start = time.perf_counter()
+        for _ in range(count):
+            await bus.publish_async(event)
+        await bus.stop()
+        return count / (time.perf_counter() - start)
+    return asyncio.run(scenario())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Event bus microbenchmark")
+    parser.add_argument("--count", type=int, default=200000)
+    parser.add_argument("--handlers", type=int, default=3)
+    parser.add_argument("--queue-size", type=int, default=1024)
+    args = parser.parse_args()
+
+    legacy = LegacyEmitter("legacy")
+    agent = AgentBase("bench", CONFIG)
+    bus = EventBus()
+    wildcard_bus = EventBus()
+    for _ in range(args.handlers):
+        legacy.register_event_handler("collision", noop)
+        agent.register_event_handler("collision", noop)
+        bus.subscribe("collision", noop)
+        wildcard_bus.subscribe("collision.*", noop)
+    wildcard_bus.subscribe("#", noop)
+    wildcard_bus.subscribe("player.*", noop)
+
+    event = Event("collision", {"other": "wall"})
+    wall_event = Event("collision.wall", {"other": "wall"})
+    cases = [
+        ("legacy emit_event", lambda: legacy.emit_event("collision", {"other": "wall"})),
+        ("AgentBase.emit_event", lambda: agent.emit_event("collision", {"other": "wall"})),
+        ("EventBus.publish", lambda: bus.publish(event)),
+        ("EventBus.publish (wildcards)", lambda: wildcard_bus.publish(wall_event)),
+        ("legacy emit_event, no handlers", lambda: legacy.emit_event("unhandled", {"other": "wall"})),
+        ("AgentBase.emit_event, no handlers", lambda: agent.emit_event("unhandled", {"other": "wall"})),
+    ]
+
+    print(f"{args.handlers} handlers per topic, {args.count} events")
+    print(f"{'case':<36} {'events/s':>12}")
+    for name, emit in cases:
+        print(f"{name:<36} {rate(emit, args.count):>12.0f}")
+    print(f"{'EventBus queued (asyncio)':<36} {queued_rate(args.count, args.handlers, args.queue_size):>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Flow field benchmark
+
+500 agents scattered over the obstacle map of bench_pathfinding.py all head for
+one point, the way a tea party or the rabbit hole gathers everyone. Each run
+drives real MovementActions until every agent has arrived: once with a path
+search per agent, once in "flow" mode sharing one flow field. Reported: time to
+start all the moves (path searches, or computing the field) and time per tick
+to move everyone.
+"""
+import argparse
+import random
+import time
+
+from hyperfy_agent_python.benchmarks.bench_pathfinding import build
+from hyperfy_agent_python.src.physics.movement_action import MovementAction
+
+
+class Engine:
+    """
+    The navigation half of PhysicsEngine, without bodies
+    """
+    def __init__(self, navigator):
+        self.flow_field = navigator.flow_field
+        self.release_flow_field = navigator.release_flow_field
+        self.calculate_path = navigator.calculate_path
+
+
+class Walker:
+    def __init__(self, name, position, engine):
+        self.name = name
+        self.position = position
+        self.rotation = [0, 0, 0]
+        self.physics_engine = engine
+
+
+def run(navigator, starts, goal, mode, speed, delta_time, max_ticks):
+    engine = Engine(navigator)
+    actions = [MovementAction(Walker(f"agent-{i}", list(p), engine), goal, speed, precision=0.25, mode=mode)
+               for i, p in enumerate(starts)]
+    start = time.perf_counter()
+    for action in actions:
+        action.start()
+    start_time = time.perf_counter() - start
+
+    moving = actions
+    ticks = 0
+    start = time.perf_counter()
+    while moving and ticks < max_ticks:
+        moving = [action for action in moving if not action.update(delta_time)]
+        ticks += 1
+    tick_time = (time.perf_counter() - start) / ticks
+    return start_time, tick_time, ticks, len(actions) - len(moving)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flow field benchmark")
+    parser.add_argument("--size", type=float, default=100.0, help="World width and depth in metres")
+    parser.add_argument("--density", type=float, default=0.12, help="Fraction of the ground covered by obstacles")
+    parser.add_argument("--agents", type=int, default=500)
+    parser.add_argument("--speed", type=float, default=2.0)
+    parser.add_argument("--delta-time", type=float, default=0.1)
+    parser.add_argument("--max-ticks", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    navigator, obstacles = build(args.size, args.density, args.seed)
+    grid = navigator.grid
+    free = [(x, z) for x in range(grid.width) for z in range(grid.depth) if not grid.blocked[z, x]]
+    gx, gz = grid.centre_of(*rng.choice(free))
+    goal = [gx, 0.0, gz]
+    starts = []
+    for x, z in rng.sample(free, args.agents):
+        x, z = grid.centre_of(x, z)
+        starts.append([x, 0.0, z])
+    print(f"{args.size:.0f} m x {args.size:.0f} m, {obstacles} obstacles, {args.agents} agents heading for "
+          f"({gx:.1f}, {gz:.1f})")
+
+    for mode in ("path", "flow"):
+        navigator, _ = build(args.size, args.density, args.seed, NAV_FLOW_FIELD_RADIUS=args.size)
+        start_time, tick_time, ticks, arrived = run(navigator, starts, goal, mode, args.speed,
+                                                    args.delta_time, args.max_ticks)
+        print(f"{mode:4s}  start {start_time * 1e3:8.1f} ms  tick {tick_time * 1e3:6.2f} ms "
+              f"({tick_time / args.agents * 1e6:5.1f} us per agent)  {arrived}/{args.agents} arrived "
+              f"in {ticks} ticks")
+
+
+if __name__ == "__main__":
+    main()
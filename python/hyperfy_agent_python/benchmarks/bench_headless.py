@@ -0,0 +1,47 @@
+"""
+Headless simulation speed: simulated seconds per wall-clock second
+
+Runs wandering agents on a HeadlessRunner for a fixed amount of simulated time
+and reports how many times faster than real time the simulation ran. A fixed
+seed makes every run simulate exactly the same behaviour, so the numbers can be
+compared across commits as a regression benchmark.
+"""
+import argparse
+import logging
+
+from hyperfy_agent_python.src.core.agent_base import AgentBase
+from hyperfy_agent_python.src.core.custom_actions import WalkRandomlyAction
+from hyperfy_agent_python.src.core.headless import HeadlessRunner
+
+CONFIG = {"PHYSICS_ENABLED": False, "ACTION_COOLDOWN": 0.0}
+
+
+class WanderingAgent(AgentBase):
+    def on_start(self):
+        self.queue_action(WalkRandomlyAction(self, interval=2, max_distance=5, duration=10 ** 9))
+
+
+def run(agents, duration, seed):
+    with HeadlessRunner(CONFIG, seed=seed) as runner:
+        for i in range(agents):
+            runner.add_agent(WanderingAgent(f"npc-{i}", runner.config, **runner.agent_kwargs()))
+        return runner.run(duration)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless simulation benchmark")
+    parser.add_argument("--agents", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--duration", type=float, default=600.0, help="Simulated seconds per run")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(f"{'agents':>7} {'simulated s':>12} {'wall s':>8} {'speedup':>10} {'agent steps/s':>14}")
+    for agents in args.agents:
+        stats = run(agents, args.duration, args.seed)
+        print(f"{agents:>7} {stats['simulated_seconds']:>12.0f} {stats['wall_seconds']:>8.2f} "
+              f"{stats['speedup']:>9.0f}x {stats['steps'] * agents / stats['wall_seconds']:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Hierarchical pathfinding benchmark
+
+Builds a 1 km x 1 km world with the obstacle mix of bench_pathfinding.py and
+times baking the HPA* graph, saving it, loading it back as a restart would, and
+path queries between random free points: across the map, within 50 m, and for a
+few cross-map pairs the flat grid A* for comparison.
+"""
+import argparse
+import random
+import tempfile
+import time
+
+from hyperfy_agent_python.benchmarks.bench_pathfinding import build
+from hyperfy_agent_python.src.physics.hierarchical import HierarchicalPathfinder, geometry_key
+
+
+def random_free(grid, rng, near=None, radius=0):
+    while True:
+        if near is None:
+            cell = (rng.randrange(grid.width), rng.randrange(grid.depth))
+        else:
+            cell = (min(max(near[0] + rng.randint(-radius, radius), 0), grid.width - 1),
+                    min(max(near[1] + rng.randint(-radius, radius), 0), grid.depth - 1))
+        if not grid.blocked[cell[1], cell[0]]:
+            return cell
+
+
+def latency(search, grid, pairs):
+    times = []
+    for a, b in pairs:
+        start = time.perf_counter()
+        search.find_path(grid.index(*a), grid.index(*b))
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return sum(times) / len(times), times[int(len(times) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hierarchical pathfinding benchmark")
+    parser.add_argument("--size", type=float, default=1000.0, help="World width and depth in metres")
+    parser.add_argument("--density", type=float, default=0.12, help="Fraction of the ground covered by obstacles")
+    parser.add_argument("--cluster-size", type=int, default=32, help="Cells per side of a cluster")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--flat-queries", type=int, default=3, help="Cross-map queries for the flat grid A*")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    navigator, obstacles = build(args.size, args.density, args.seed)
+    grid = navigator.grid
+    print(f"{args.size:.0f} m x {args.size:.0f} m, {obstacles} obstacles, {grid.width} x {grid.depth} cells, "
+          f"rasterised in {time.perf_counter() - start:.2f} s")
+
+    start = time.perf_counter()
+    key = geometry_key(grid, args.cluster_size)
+    hash_time = time.perf_counter() - start
+    start = time.perf_counter()
+    baked = HierarchicalPathfinder.bake(grid, args.cluster_size)
+    bake_time = time.perf_counter() - start
+    print(f"bake: {bake_time:.2f} s, {baked.node_count} nodes, {baked.edge_count} edges "
+          f"(geometry hash {hash_time * 1e3:.0f} ms)")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        path = f"{cache_dir}/nav.npz"
+        start = time.perf_counter()
+        baked.save(path)
+        save_time = time.perf_counter() - start
+        start = time.perf_counter()
+        loaded = HierarchicalPathfinder.load(path, grid, key)
+        load_time = time.perf_counter() - start
+    print(f"save: {save_time:.2f} s, load: {load_time:.2f} s ({bake_time / load_time:.0f}x faster than baking)")
+
+    rng = random.Random(args.seed)
+    far = [(random_free(grid, rng), random_free(grid, rng)) for _ in range(args.queries)]
+    near_radius = int(50 / grid.cell_size)
+    near = []
+    for _ in range(args.queries):
+        a = random_free(grid, rng)
+        near.append((a, random_free(grid, rng, a, near_radius)))
+    for label, pairs in (("cross-map", far), ("within 50 m", near)):
+        mean, p95 = latency(loaded, grid, pairs)
+        print(f"HPA* {label:12s} mean {mean * 1e3:7.1f} ms  p95 {p95 * 1e3:7.1f} ms")
+    if args.flat_queries:
+        mean, p95 = latency(navigator.pathfinder, grid, far[:args.flat_queries])
+        print(f"flat A* {'cross-map':9s} mean {mean * 1e3:7.1f} ms  ({args.flat_queries} queries)")
+
+
+if __name__ == "__main__":
+    main()
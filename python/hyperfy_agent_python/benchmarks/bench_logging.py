@@ -0,0 +1,102 @@
+"""
+Logging pipeline benchmark
+
+Runs wandering agents that log on every step (plus the action system's debug
+logs) on a HeadlessRunner with logging off, with a synchronous FileHandler on
+the root logger, and with the queued pipeline in text and JSON formats, with and
+without a per-logger rate limit. Reports the time the tick thread spends per
+step and the records that reached the file, so the cost of the I/O moved to the
+writer thread shows up as the difference between sync and queued.
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from hyperfy_agent_python.src.core.agent_base import AgentBase
+from hyperfy_agent_python.src.core.custom_actions import WalkRandomlyAction
+from hyperfy_agent_python.src.core.headless import HeadlessRunner
+from hyperfy_agent_python.src.core.log_pipeline import (
+    TEXT_FORMAT, JsonFormatter, LogPipeline, RateLimitFilter
+)
+
+CONFIG = {"PHYSICS_ENABLED": False, "ACTION_COOLDOWN": 0.0}
+
+MODES = [
+    ("off", None, None, None),
+    ("sync text", "sync", "text", None),
+    ("queued text", "queued", "text", None),
+    ("queued json", "queued", "json", None),
+    ("queued text, 5 msg/s per logger", "queued", "text", 5.0),
+]
+
+
+class ChattyAgent(AgentBase):
+    def on_start(self):
+        self.queue_action(WalkRandomlyAction(self, interval=1, max_distance=5, duration=10 ** 9))
+        self.steps = 0
+
+    def update(self, delta_time):
+        self.steps += 1
+        self.logger.info("step %d at %s", self.steps, self.position)
+
+
+def run(agents, duration, mode, fmt, rate, path):
+    pipeline = None
+    if mode is not None:
+        handler = logging.FileHandler(path)
+        handler.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+        rate_filter = RateLimitFilter(rate=rate) if rate else None
+        pipeline = LogPipeline([handler], mode=mode, rate_filter=rate_filter).install(level=logging.DEBUG)
+    else:
+        logging.getLogger().setLevel(logging.WARNING)
+
+    with HeadlessRunner(CONFIG, seed=0) as runner:
+        for i in range(agents):
+            runner.add_agent(ChattyAgent(f"npc-{i}", runner.config, **runner.agent_kwargs()))
+        start_cpu = time.thread_time()
+        stats = runner.run(duration)
+        stats["tick_cpu"] = time.thread_time() - start_cpu
+
+    start = time.perf_counter()
+    if pipeline is not None:
+        stats["pipeline"] = pipeline.get_stats()
+        pipeline.close()
+    stats["drain_seconds"] = time.perf_counter() - start
+    with open(path) as f:
+        stats["lines"] = sum(1 for _ in f)
+    os.truncate(path, 0)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Logging pipeline benchmark")
+    parser.add_argument("--agents", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10.0, help="Simulated seconds")
+    args = parser.parse_args()
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.log")
+        open(path, "w").close()
+        print(f"{args.agents} agents, {args.duration:.0f} s simulated")
+        baseline = None
+        for label, mode, fmt, rate in MODES:
+            stats = run(args.agents, args.duration, mode, fmt, rate, path)
+            per_step = stats["wall_seconds"] / stats["steps"] * 1e3
+            baseline = baseline or per_step
+            extra = ""
+            if "pipeline" in stats:
+                pipeline = stats["pipeline"]
+                if "batches" in pipeline:
+                    extra += f", mean batch {pipeline['mean_batch']:.0f}, dropped {pipeline['dropped']}"
+                extra += f", drain after run {stats['drain_seconds']:.2f} s"
+            print(f"{label:34s} {per_step:7.3f} ms/step wall ({per_step / baseline:4.1f}x off), "
+                  f"tick thread CPU {stats['tick_cpu']:.2f} s, {stats['lines']} lines{extra}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Grid pathfinding benchmark
+
+Scatters trees, crates and hedge walls over a WORLD_SIZE map and times path
+queries between random free points: the full Navigator.calculate_path() (which
+returns straight away when the line is clear), the A* search alone, and a plain
+A* with dictionaries allocated per query and a Euclidean heuristic for
+comparison. A last run sends agents back and forth between a few landmarks,
+starting anywhere within a metre of them, with and without the path cache.
+"""
+import argparse
+import heapq
+import math
+import random
+import time
+
+from hyperfy_agent_python.src.physics.pathfinding import Navigator, SQRT2
+
+
+def build(size, density, seed, **config):
+    """
+    Navigator over a size x size world with obstacles covering about `density` of it
+    """
+    rng = random.Random(seed)
+    navigator = Navigator({"WORLD_SIZE": [size, 50, size], "NAV_CELL_SIZE": 0.5, "NAV_CLEARANCE": 0.5,
+                           "NAV_HIERARCHICAL": False, **config})
+    half = size / 2
+    covered = 0.0
+    i = 0
+    while covered < density * size * size:
+        x, z = rng.uniform(-half, half), rng.uniform(-half, half)
+        kind = rng.random()
+        if kind < 0.5:  # tree
+            w = d = rng.uniform(0.3, 0.8)
+        elif kind < 0.8:  # crate or table
+            w, d = rng.uniform(0.5, 2.0), rng.uniform(0.5, 2.0)
+        elif kind < 0.9:  # hedge along X
+            w, d = rng.uniform(4.0, 15.0), 0.5
+        else:  # hedge along Z
+            w, d = 0.5, rng.uniform(4.0, 15.0)
+        navigator.set_footprint(f"obstacle-{i}", (x - w, z - d, x + w, z + d))
+        covered += 4 * w * d
+        i += 1
+    navigator.calculate_path([0, 0, 0], [0, 0, 0])  # build the grid
+    return navigator, i
+
+
+def naive_astar(grid, start, goal):
+    """
+    A* with per-query dictionaries and sets, Euclidean heuristic and no tie-breaking
+    """
+    stride = grid.stride
+    passable = grid.passable
+    goal_z, goal_x = divmod(goal, stride)
+
+    def heuristic(i):
+        z, x = divmod(i, stride)
+        return math.hypot(x - goal_x, z - goal_z)
+
+    cost = {start: 0.0}
+    parent = {start: None}
+    closed = set()
+    heap = [(heuristic(start), start)]
+    while heap:
+        _, i = heapq.heappop(heap)
+        if i == goal:
+            break
+        if i in closed:
+            continue
+        closed.add(i)
+        for dx in (-1, 0, 1):
+            for dz in (-1, 0, 1):
+                j = i + dx + dz * stride
+                if j == i or not passable[j]:
+                    continue
+                if dx and dz and not (passable[i + dx] and passable[i + dz * stride]):
+                    continue
+                new_cost = cost[i] + (SQRT2 if dx and dz else 1.0)
+                if new_cost < cost.get(j, math.inf):
+                    cost[j] = new_cost
+                    parent[j] = i
+                    heapq.heappush(heap, (new_cost + heuristic(j), j))
+    path = []
+    i = goal if goal in parent else None
+    while i is not None:
+        path.append(i)
+        i = parent[i]
+    return path[::-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grid pathfinding benchmark")
+    parser.add_argument("--size", type=float, default=100.0, help="World width and depth in metres")
+    parser.add_argument("--density", type=float, default=0.12, help="Fraction of the ground covered by obstacles")
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--landmarks", type=int, default=5, help="Landmarks for the path cache run")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    navigator, obstacles = build(args.size, args.density, args.seed)
+    grid = navigator.grid
+    rng = random.Random(args.seed)
+    free = [(x, z) for x in range(grid.width) for z in range(grid.depth) if not grid.blocked[z, x]]
+    pairs = [(rng.choice(free), rng.choice(free)) for _ in range(args.queries)]
+    points = [([*grid.centre_of(*a)], [*grid.centre_of(*b)]) for a, b in pairs]
+    points = [([a[0], 0.0, a[1]], [b[0], 0.0, b[1]]) for a, b in points]
+    cells = [(grid.index(*a), grid.index(*b)) for a, b in pairs]
+
+    print(f"{args.size:.0f} m x {args.size:.0f} m, {obstacles} obstacles, "
+          f"{grid.width} x {grid.depth} cells, {grid.blocked.mean():.0%} blocked after clearance")
+
+    start = time.perf_counter()
+    waypoints = sum(len(navigator.calculate_path(a, b)) for a, b in points)
+    elapsed = time.perf_counter() - start
+    print(f"calculate_path    {args.queries / elapsed:8.0f} queries/s  {elapsed / args.queries * 1e3:6.2f} ms/query  "
+          f"{waypoints / args.queries:.1f} waypoints per path")
+
+    pathfinder = navigator.pathfinder
+    expansions = 0
+    start = time.perf_counter()
+    for a, b in cells:
+        pathfinder.find_path(a, b)
+        expansions += pathfinder.expansions
+    astar = time.perf_counter() - start
+    print(f"A* search         {args.queries / astar:8.0f} queries/s  {astar / args.queries * 1e3:6.2f} ms/query  "
+          f"{expansions / args.queries:.0f} cells expanded per query")
+
+    start = time.perf_counter()
+    for a, b in cells:
+        naive_astar(grid, a, b)
+    naive = time.perf_counter() - start
+    print(f"naive A*          {args.queries / naive:8.0f} queries/s  {naive / args.queries * 1e3:6.2f} ms/query  "
+          f"({naive / astar:.1f}x slower than the A* search)")
+
+    landmarks = [[*grid.centre_of(*rng.choice(free))] for _ in range(args.landmarks)]
+    trips = []
+    for _ in range(args.queries):
+        a, b = rng.sample(landmarks, 2)
+        start = [a[0] + rng.uniform(-1, 1), 0.0, a[1] + rng.uniform(-1, 1)]
+        trips.append((start, [b[0], 0.0, b[1]]))
+    for label, cache_size in (("uncached", 0), ("cached", 512)):
+        navigator, _ = build(args.size, args.density, args.seed, NAV_PATH_CACHE_SIZE=cache_size)
+        start = time.perf_counter()
+        for a, b in trips:
+            navigator.calculate_path(a, b)
+        elapsed = time.perf_counter() - start
+        line = f"landmarks {label:8s}{args.queries / elapsed:8.0f} queries/s  {elapsed / args.queries * 1e3:6.2f} ms/query"
+        if navigator.path_cache is not None:
+            line += f"  {navigator.path_cache.hit_rate:.0%} hit rate"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+NumPy physics backend benchmark
+
+Drops dynamic capsules, spheres and boxes among static crates and times full
+simulation steps, the sweep-and-prune broadphase against an all-pairs bounds
+test over the same bodies, and raycast throughput. The bodies are spread over an
+area sized to keep roughly the same density as the body count grows.
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from hyperfy_agent_python.src.physics.numpy_backend import NumpyBackend
+from hyperfy_agent_python.src.physics.physics_backend import Shape
+
+STEP = 1 / 60
+SHAPES = [
+    Shape.capsule(0.5, 0.5, offset=[0.0, 1.0, 0.0]),
+    Shape.sphere(0.4),
+    Shape.box([0.4, 0.4, 0.4])
+]
+
+
+def build(bodies, obstacles, seed):
+    rng = random.Random(seed)
+    side = (bodies / 0.05) ** 0.5  # about one body per 20 square metres
+    backend = NumpyBackend({})
+    for i in range(obstacles):
+        backend.add_body(f"crate-{i}", [rng.uniform(0, side), 1.0, rng.uniform(0, side)], [0, 0, 0],
+                         Shape.box([rng.uniform(0.5, 3.0), 1.0, rng.uniform(0.5, 3.0)]), 0.0, {"type": "crate"})
+    for i in range(bodies):
+        backend.add_body(f"body-{i}", [rng.uniform(0, side), rng.uniform(0, 5), rng.uniform(0, side)], [0, 0, 0],
+                         SHAPES[i % 3], 70.0, {"type": "body"})
+    return backend, side
+
+
+def all_pairs(backend, dynamic):
+    """
+    Broadphase without sorting: test the bounds of every pair
+    """
+    lo, hi = backend.bounds()
+    a, b = np.triu_indices(backend.count, k=1)
+    keep = np.all((lo[a] <= hi[b]) & (lo[b] <= hi[a]), axis=1) & (dynamic[a] | dynamic[b])
+    return a[keep], b[keep]
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumPy physics backend benchmark")
+    parser.add_argument("--bodies", type=int, default=1000)
+    parser.add_argument("--obstacles", type=int, default=100)
+    parser.add_argument("--steps", type=int, default=600)
+    parser.add_argument("--rays", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    backend, side = build(args.bodies, args.obstacles, args.seed)
+    # Let the drop settle before measuring
+    for _ in range(60):
+        backend.simulate(STEP)
+
+    start = time.perf_counter()
+    contacts = 0
+    for _ in range(args.steps):
+        backend.simulate(STEP)
+        contacts += len(backend._contacts[0]) if backend._contacts is not None else 0
+    step_time = (time.perf_counter() - start) / args.steps
+
+    dynamic = backend.inv_mass[:backend.count] > 0
+    sap_time, sap_pairs = timed(lambda: backend._broadphase(dynamic), 50)
+    brute_time, brute_pairs = timed(lambda: all_pairs(backend, dynamic), 5)
+
+    rng = random.Random(args.seed)
+    rays = [([rng.uniform(0, side), 1.0, rng.uniform(0, side)], [rng.uniform(-1, 1), rng.uniform(-0.2, 0.0),
+                                                                  rng.uniform(-1, 1)]) for _ in range(args.rays)]
+    start = time.perf_counter()
+    hits = 0
+    for origin, direction in rays:
+        length = sum(v * v for v in direction) ** 0.5
+        hits += backend.raycast(origin, [v / length for v in direction], 50.0) is not None
+    ray_time = (time.perf_counter() - start) / args.rays
+
+    print(f"{args.bodies} dynamic bodies, {args.obstacles} static crates over {side:.0f} m x {side:.0f} m")
+    print(f"step: {step_time * 1e3:.2f} ms ({1 / step_time:.0f} steps/s, "
+          f"{step_time / STEP:.1%} of a {STEP * 1e3:.1f} ms frame), {contacts / args.steps:.0f} contacts per step")
+    print(f"broadphase: sweep and prune {sap_time * 1e3:.2f} ms, all pairs {brute_time * 1e3:.2f} ms "
+          f"({brute_time / sap_time:.0f}x), {len(sap_pairs[0])} candidate pairs (all pairs: {len(brute_pairs[0])})")
+    print(f"raycast: {ray_time * 1e6:.0f} us per ray, {hits}/{args.rays} hits")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Pose read-back benchmark
+
+Times PhysicsEngine.advance() on the NumPy backend for many agents when the
+host steps physics several substeps at a time, comparing the legacy read-back
+(every agent's pose and velocity fetched one at a time after every substep)
+with the per-agent read-back after the last substep only and with the batched
+read-back into swapped PoseBuffers. The simulation itself is the same in all
+three, so the differences are read-back cost.
+"""
+import argparse
+import time
+
+from hyperfy_agent_python.src.physics.physics_engine import PhysicsEngine
+
+STEP = 1 / 60
+
+
+class Body:
+    def __init__(self, name, position):
+        self.name = name
+        self.position = position
+        self.rotation = [0.0, 0.0, 0.0]
+        self.velocity = [0.0, 0.0, 0.0]
+
+
+class LegacyPhysicsEngine(PhysicsEngine):
+    """
+    advance() as it was: agent states read back after every substep, one agent at a time
+    """
+    def advance(self, elapsed):
+        self.accumulator += elapsed
+        steps = int(self.accumulator / self.timestep)
+        for _ in range(steps):
+            self.backend.simulate(self.timestep)
+            self._process_collisions()
+            self._update_agent_states()
+        self.accumulator -= steps * self.timestep
+        return steps
+
+
+def run(engine_class, batch, agents, substeps, frames):
+    engine = engine_class({"PHYSICS_BACKEND": "numpy", "PHYSICS_BATCH_STATES": batch})
+    side = int(agents ** 0.5) + 1
+    for i in range(agents):
+        engine.register_agent(Body(f"agent-{i}", [(i % side) * 3.0, 0.0, (i // side) * 3.0]))
+    engine.start(threaded=False)
+    engine.advance(substeps * STEP)  # build buffers and settle
+
+    simulate = engine.backend.simulate
+    sim_time = 0.0
+
+    def timed_simulate(dt):
+        nonlocal sim_time
+        start = time.perf_counter()
+        simulate(dt)
+        sim_time += time.perf_counter() - start
+
+    engine.backend.simulate = timed_simulate
+    start = time.perf_counter()
+    for _ in range(frames):
+        engine.advance(substeps * STEP + 1e-9)
+    total = time.perf_counter() - start
+    engine.stop()
+    return total / frames, (total - sim_time) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pose read-back benchmark")
+    parser.add_argument("--agents", type=int, default=1000)
+    parser.add_argument("--substeps", type=int, default=4, help="Physics steps per advance() call")
+    parser.add_argument("--frames", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{args.agents} agents, {args.substeps} substeps per advance()")
+    legacy = None
+    for label, engine_class, batch in [
+        ("every substep, per agent (legacy)", LegacyPhysicsEngine, False),
+        ("last substep, per agent", PhysicsEngine, False),
+        ("last substep, batched", PhysicsEngine, True),
+    ]:
+        frame, readback = run(engine_class, batch, args.agents, args.substeps, args.frames)
+        legacy = legacy or readback
+        print(f"{label:34s} {frame * 1e3:7.2f} ms per advance, read-back {readback * 1e3:6.2f} ms "
+              f"({legacy / readback:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
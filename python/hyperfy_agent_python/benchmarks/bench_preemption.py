@@ -0,0 +1,69 @@
+"""
+Enqueue-to-start latency of urgent actions, with and without preemption
+
+A long MovementAction keeps the action slot busy while StopMovingActions are
+queued at random frames. Latency is reported in frames (at 60 Hz) and as the
+wall time of the update call that starts the urgent action.
+"""
+import argparse
+import random
+import time
+import statistics
+
+from hyperfy_agent_python.src.core.action_system import ActionSystem
+from hyperfy_agent_python.src.core.custom_actions import StopMovingAction
+from hyperfy_agent_python.src.physics.movement_action import MovementAction
+
+FRAME = 1 / 60
+
+
+class SimAgent:
+    def __init__(self, action_system):
+        self.name = "bench"
+        self.position = [0.0, 0.0, 0.0]
+        self.rotation = [0.0, 0.0, 0.0]
+        self.physics_engine = None
+        self.action_system = action_system
+
+
+def run(preemption, trials, seed):
+    rng = random.Random(seed)
+    latencies = []
+    start_call_us = []
+    for _ in range(trials):
+        system = ActionSystem(action_cooldown=0.0, preemption=preemption)
+        agent = SimAgent(system)
+        system.queue_action(MovementAction(agent, [rng.uniform(5, 15), 0.0, 0.0], speed=1.0))
+        for _ in range(rng.randint(1, 30)):
+            system.update(FRAME)
+
+        stop = StopMovingAction(agent)
+        system.queue_action(stop)
+        frames = 0
+        while stop.is_pending() and frames < 100_000:
+            call_start = time.perf_counter()
+            system.update(FRAME)
+            call_elapsed = time.perf_counter() - call_start
+            frames += 1
+        start_call_us.append(call_elapsed * 1e6)
+        latencies.append(frames)
+    return latencies, start_call_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Urgent action preemption latency benchmark")
+    parser.add_argument("--trials", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'mode':>13} {'p50 frames':>11} {'max frames':>11} {'p50 ms @60Hz':>13} {'start call us':>14}")
+    for preemption in (False, True):
+        latencies, call_us = run(preemption, args.trials, args.seed)
+        mode = "preemption" if preemption else "wait for slot"
+        p50 = statistics.median(latencies)
+        print(f"{mode:>13} {p50:>11.0f} {max(latencies):>11} {p50 * FRAME * 1000:>13.1f} "
+              f"{statistics.median(call_us):>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
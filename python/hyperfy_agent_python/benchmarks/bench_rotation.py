@@ -0,0 +1,118 @@
+"""
+Rotation conversion microbenchmark
+
+Times Euler -> quaternion -> Euler conversions per rotation for the legacy
+helpers (three axis-angle quaternions multiplied together, and an extraction
+built on NumPy scalar functions), the shared rotation module's scalar path with
+fresh and with repeated inputs, and its batched path over whole arrays. Yaw is
+also timed as MovementAction computes it, inline.
+"""
+import argparse
+import math
+import random
+import time
+
+import numpy as np
+
+from hyperfy_agent_python.src.physics import rotation
+from hyperfy_agent_python.src.physics.movement_action import DEGREES
+
+
+def legacy_axis_angle(axis, angle):
+    half = angle / 2
+    return np.array([axis[0] * np.sin(half), axis[1] * np.sin(half), axis[2] * np.sin(half), np.cos(half)])
+
+
+def legacy_multiply(a, b):
+    ax, ay, az, aw = a
+    bx, by, bz, bw = b
+    return np.array([aw * bx + ax * bw + ay * bz - az * by,
+                     aw * by - ax * bz + ay * bw + az * bx,
+                     aw * bz + ax * by - ay * bx + az * bw,
+                     aw * bw - ax * bx - ay * by - az * bz])
+
+
+def legacy_euler_to_quat(euler_angles):
+    """
+    PyPhysXBackend._euler_to_quat as it was, with NumPy arrays in place of pyphysx.Quat
+    """
+    radians = [angle * np.pi / 180.0 for angle in euler_angles]
+    qx = legacy_axis_angle([1, 0, 0], radians[0])
+    qy = legacy_axis_angle([0, 1, 0], radians[1])
+    qz = legacy_axis_angle([0, 0, 1], radians[2])
+    return legacy_multiply(legacy_multiply(qx, qy), qz)
+
+
+def legacy_quat_to_euler(quat):
+    """
+    PyPhysXBackend._quat_to_euler as it was
+    """
+    x, y, z, w = quat
+    roll = np.arctan2(2 * (w * x + y * z), 1 - 2 * (x * x + y * y))
+    sinp = 2 * (w * y - z * x)
+    pitch = np.copysign(np.pi / 2, sinp) if abs(sinp) >= 1 else np.arcsin(sinp)
+    yaw = np.arctan2(2 * (w * z + x * y), 1 - 2 * (y * y + z * z))
+    return [roll * 180.0 / np.pi, pitch * 180.0 / np.pi, yaw * 180.0 / np.pi]
+
+
+def timed(fn, items, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            fn(item)
+    return (time.perf_counter() - start) / (len(items) * repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rotation conversion microbenchmark")
+    parser.add_argument("--count", type=int, default=20000, help="Distinct rotations")
+    parser.add_argument("--repeat", type=int, default=5, help="Passes over the same rotations")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    eulers = [[rng.uniform(-180, 180), rng.uniform(-89, 89), rng.uniform(-180, 180)] for _ in range(args.count)]
+    quats = [rotation.euler_to_quat(euler) for euler in eulers]
+    # Agents mostly keep their rotation between frames: a few hundred distinct values
+    repeated = [[0.0, float(rng.randrange(360)), 0.0] for _ in range(args.count)]
+
+    def fresh(fn):
+        rotation._euler_to_quat.cache_clear()
+        rotation._quat_to_euler.cache_clear()
+        return fn
+
+    results = [
+        ("euler -> quat, legacy", timed(legacy_euler_to_quat, eulers)),
+        ("euler -> quat, scalar", timed(fresh(rotation.euler_to_quat), eulers)),
+        ("euler -> quat, scalar repeated", timed(rotation.euler_to_quat, repeated, args.repeat)),
+        ("quat -> euler, legacy", timed(legacy_quat_to_euler, quats)),
+        ("quat -> euler, scalar", timed(fresh(rotation.quat_to_euler), quats)),
+        ("yaw, math.degrees(math.atan2())", timed(lambda d: math.degrees(math.atan2(d[0], d[2])), eulers)),
+        ("yaw, scalar", timed(lambda d: rotation.yaw_from_direction(d[0], d[2]), eulers)),
+        ("yaw, inline (MovementAction)", timed(lambda d: math.atan2(d[0], d[2]) * DEGREES, eulers)),
+    ]
+
+    euler_array = np.array(eulers)
+    quat_array = np.empty((args.count, 4))
+    euler_out = np.empty((args.count, 3))
+    yaw_out = np.empty(args.count)
+    for label, fn in [
+        ("euler -> quat, batched", lambda: rotation.euler_to_quat_batch(euler_array, out=quat_array)),
+        ("quat -> euler, batched", lambda: rotation.quat_to_euler_batch(quat_array, out=euler_out)),
+        ("yaw, batched", lambda: rotation.yaw_from_directions(euler_array, out=yaw_out)),
+    ]:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            fn()
+        results.append((label, (time.perf_counter() - start) / (args.count * args.repeat)))
+
+    print(f"{args.count} rotations")
+    baseline = {}
+    for label, seconds in results:
+        kind = label.split(",")[0]
+        baseline.setdefault(kind, seconds)
+        print(f"{label:34s} {seconds * 1e9:8.0f} ns per rotation ({baseline[kind] / seconds:6.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Tick level-of-detail benchmark
+
+Simulates wandering NPCs spread over a large area with a few players, on a
+HeadlessRunner, with LOD off and on. Reports wall time for the same simulated
+duration, the share of agent steps skipped and the agents per tier, i.e. how
+many more NPCs fit in the same CPU budget.
+"""
+import argparse
+import logging
+import random
+
+from hyperfy_agent_python.src.core.agent_base import AgentBase
+from hyperfy_agent_python.src.core.custom_actions import WalkRandomlyAction
+from hyperfy_agent_python.src.core.headless import HeadlessRunner
+from hyperfy_agent_python.src.core.tick_lod import DEFAULT_TIERS
+from hyperfy_agent_python.src.core.world_state import Player
+
+CONFIG = {"PHYSICS_ENABLED": False, "ACTION_COOLDOWN": 0.0, "LOD_TIERS": DEFAULT_TIERS}
+
+
+class WanderingAgent(AgentBase):
+    def on_start(self):
+        self.queue_action(WalkRandomlyAction(self, interval=2, max_distance=5, duration=10 ** 9))
+
+
+def run(agents, players, area, duration, lod, seed):
+    config = dict(CONFIG, LOD_ENABLED=lod)
+    with HeadlessRunner(config, seed=seed) as runner:
+        for i in range(players):
+            runner.host.world_state.add_player(
+                Player(f"player-{i}", position=[random.uniform(0, area), 0.0, random.uniform(0, area)]))
+        for i in range(agents):
+            agent = WanderingAgent(f"npc-{i}", runner.config, **runner.agent_kwargs())
+            agent.position = [random.uniform(0, area), 0.0, random.uniform(0, area)]
+            runner.add_agent(agent)
+        stats = runner.run(duration)
+        stats["host"] = runner.host.get_stats()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tick LOD benchmark")
+    parser.add_argument("--agents", type=int, default=500)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--area", type=float, default=400.0, help="Side of the square the agents are spread over")
+    parser.add_argument("--duration", type=float, default=30.0, help="Simulated seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    off = run(args.agents, args.players, args.area, args.duration, False, args.seed)
+    on = run(args.agents, args.players, args.area, args.duration, True, args.seed)
+    lod = on["host"]["lod"]
+    print(f"{args.agents} agents, {args.players} players over {args.area:.0f} m, {args.duration:.0f} s simulated")
+    print(f"LOD off: {off['wall_seconds']:.2f} s wall ({off['speedup']:.1f}x real time)")
+    print(f"LOD on:  {on['wall_seconds']:.2f} s wall ({on['speedup']:.1f}x real time)")
+    print(f"steps skipped: {lod['skip_ratio']:.1%}, agents by tier: {lod['agents_by_tier']}, "
+          f"estimated CPU saved (metric): {lod['cpu_saved_seconds']:.2f} s, "
+          f"measured: {off['wall_seconds'] - on['wall_seconds']:.2f} s")
+    print(f"capacity at equal CPU: {off['wall_seconds'] / on['wall_seconds']:.1f}x agents")
+
+
+if __name__ == "__main__":
+    main()
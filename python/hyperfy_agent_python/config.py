@@ -10,20 +10,83 @@ AGENT_KNOWLEDGE_BASE = "alice_in_wonderland"
 PHYSICS_ENABLED = True
 PHYSICS_TIMESTEP = 1/60  # 60 fps simulation
 GRAVITY = [0, -9.81, 0]  # Standard gravity
+PHYSICS_BACKEND = "auto"  # auto (PyPhysX if installed, else NumPy), pyphysx or numpy
+PHYSICS_AGENT_RADIUS = 0.5  # Agent capsule radius, standing on the agent position
+PHYSICS_AGENT_HALF_HEIGHT = 0.5  # Half the length of the capsule's straight part
+PHYSICS_AGENT_MASS = 70.0
+PHYSICS_SOLVER_ITERATIONS = 2  # NumPy backend contact passes per step
+PHYSICS_BATCH_STATES = True  # Read all agent poses back in one batch after the last substep of each advance
 
 # World settings
 WORLD_SIZE = [100, 50, 100]  # x, y, z dimensions
 WORLD_GROUND_ENABLED = True
 WORLD_SKYBOX = "wonderland"
 
+# Navigation settings (grid over WORLD_SIZE, centred on the origin)
+NAV_CELL_SIZE = 0.5  # Pathfinding grid resolution in metres
+NAV_CLEARANCE = 0.5  # Distance paths keep from obstacles, usually the agent radius
+NAV_STEP_HEIGHT = 0.3  # Obstacles no taller than this are walked over
+NAV_OBSTACLE_TYPES = ["obstacle", "wall", "table", "tree"]  # WorldState object types that block paths, as does an "obstacle" property
+NAV_MAX_EXPANSIONS = 50000  # Cells A* may expand before settling for the closest one reached
+NAV_HIERARCHICAL = "auto"  # Search clusters of cells (HPA*): True, False or "auto" for grids over NAV_HIERARCHICAL_MIN_CELLS
+NAV_HIERARCHICAL_MIN_CELLS = 250000
+NAV_CLUSTER_SIZE = 32  # Cells per side of an HPA* cluster
+NAV_CACHE_DIR = "nav_cache"  # Baked HPA* graphs, one file per static geometry hash (None: bake on every start)
+NAV_CACHE_MAX_FILES = 8  # Baked graphs kept in NAV_CACHE_DIR, least recently used deleted first
+NAV_BACKGROUND_BAKE = True  # Bake HPA* graphs on a background thread; queries use flat A* until it finishes
+NAV_PATH_CACHE_SIZE = 512  # Recently searched paths kept for reuse (0 to disable)
+NAV_PATH_CACHE_QUANTUM = 2  # Cells per side of the start and goal buckets that share a cached path
+NAV_FLOW_FIELD_RADIUS = 64.0  # Metres around a shared goal covered by its flow field
+NAV_FLOW_FIELD_IDLE = 4  # Flow fields kept after their last agent lets go
+
 # Voice recognition settings
 VOICE_RECOGNITION_ENABLED = True
 VOICE_RECOGNITION_LANGUAGE = "en-US"
 VOICE_CONFIDENCE_THRESHOLD = 0.7
 
 # Action system settings
-ACTION_COOLDOWN = 1.0  # Seconds between actions
+ACTION_COOLDOWN = 1.0  # Default seconds between starts of actions of the same type
+ACTION_RATE_BURST = 3  # Starts of one action type allowed back to back before the cooldown applies
+ACTION_RATE_LIMITS = {  # Per action class overrides: (starts per second, burst)
+    "MovementAction": (10.0, 5),
+    "StopMovingAction": (20.0, 5)
+}
 ACTION_MAX_QUEUE = 5   # Maximum queued actions
+ACTION_HISTORY_SIZE = 100  # Finished actions kept in the history ring buffer
+ACTION_PRIORITY_AGING = 0.5  # Priority points a queued action gains per second of waiting
+ACTION_COALESCING = True  # Newer actions with the same coalesce key (e.g. locomotion) supersede older ones
+ACTION_PREEMPTION = True  # Higher priority actions suspend or cancel the running one
+ACTION_EVENT_TTL = 10.0  # Seconds an action queued in reaction to an event stays relevant
+
+# Metrics settings (Prometheus text format)
+METRICS_ENABLED = False
+METRICS_PORT = 9464        # Serve /metrics on this port when enabled (None to disable the endpoint)
+METRICS_HOST = "127.0.0.1"
+METRICS_FILE = None        # Optional path the metrics are dumped to when the agent stops
+
+# Runtime settings
+AGENT_TICK_RATE = 60.0       # Fixed update steps per second
+AGENT_MAX_CATCH_UP = 5       # Most steps run in one frame after falling behind; older steps are dropped
+AGENT_IDLE_INTERVAL = 0.5    # Seconds an idle agent sleeps between ticks unless woken by an action or event
+HOST_BATCH_SIZE = 64         # Agents ticked per batch by an AgentHost (asyncio mode yields between batches)
+CLUSTER_WORKERS = None       # Worker processes for --workers mode (None: one per available core)
+CLUSTER_FLUSH_INTERVAL = 1 / 60  # Seconds between batched world update / event sends to workers
+CLUSTER_MAX_RESTARTS = 5     # Crashes a worker may have within CLUSTER_RESTART_WINDOW before it is given up
+CLUSTER_RESTART_WINDOW = 60.0
+CLUSTER_STATS_INTERVAL = 1.0 # Seconds between tick stats reports from each worker
+CLUSTER_START_METHOD = None  # multiprocessing start method (None: platform default)
+ASYNC_RUNTIME = False        # Run agents as asyncio tasks on one event loop instead of a thread per subsystem
+ASYNC_EXECUTOR_WORKERS = 4   # Threads in the shared pool that runs short blocking calls (physics steps, run_blocking) in asyncio mode
+EVENT_DELIVERY = "sync"      # "sync" runs event handlers on the emitting thread; "queued" delivers from a task (asyncio mode only)
+EVENT_QUEUE_SIZE = 1024      # Events waiting for queued delivery before EVENT_OVERFLOW applies
+EVENT_OVERFLOW = "drop_oldest"  # drop_oldest, drop_newest, block or error
+LOD_ENABLED = False          # Tick agents far from every player less often; needs players in WorldState (e.g. from a cluster parent)
+LOD_TIERS = [[15.0, 1], [40.0, 4], [100.0, 15], [None, 60]]  # [max distance to nearest player, run 1 step in N]
+PROFILER_ENABLED = False     # Time each phase of the update loop and report frames over budget
+PROFILER_BUDGET = None       # Seconds per fixed step before a frame is reported (None: 1 / AGENT_TICK_RATE)
+PROFILER_WINDOW = 300        # Frames kept for get_profile_stats()
+PROFILER_REPORT_INTERVAL = 1.0  # Minimum seconds between logged overrun reports
+PROFILER_REPORT_FILE = None  # Append overrun reports to this file as JSON lines
 
 # Networking settings
 NETWORK_PORT = 8080
@@ -33,6 +96,14 @@ NETWORK_PROTOCOL = "websocket"
 # Logging settings
 LOG_LEVEL = "INFO"  # DEBUG, INFO, WARNING, ERROR, CRITICAL
 LOG_FILE = "hyperfy_agent.log"
+LOG_MODE = "queued"  # sync: write on the logging thread; queued: hand records to a background writer thread
+LOG_FORMAT = "text"  # text or json (one JSON object per line)
+LOG_QUEUE_SIZE = 10000  # Queued records before new ones are dropped
+LOG_BATCH_SIZE = 256  # Most records written per batch
+LOG_FLUSH_INTERVAL = 0.2  # Seconds the writer waits for a batch to build up
+LOG_RATE_LIMIT = None  # Messages per second each logger may log below WARNING (None: no limit)
+LOG_RATE_LIMITS = {}  # Per-logger overrides, e.g. {"action": 20}; a name also covers its children
+LOG_SAMPLE = {}  # Fraction of records below WARNING kept per logger, e.g. {"physics": 0.1}
 
 # Langchain settings
 LANGCHAIN_ENABLED = True
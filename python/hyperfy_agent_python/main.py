@@ -1,6 +1,10 @@
 import os
 import sys
+import time
+import atexit
+import asyncio
 import logging
+import functools
 import argparse
 import json5
 from pathlib import Path
@@ -15,16 +19,13 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 # Import agent types
 from src.agents.alice_agent import AliceAgent
+from src.core.agent_host import AgentHost
+from src.core.agent_cluster import AgentCluster
+from src.core.headless import HeadlessRunner
+from src.core.log_pipeline import TEXT_FORMAT, setup_logging
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler('hyperfy_agent.log')
-    ]
-)
+# Console logging until the configured pipeline is installed in main()
+logging.basicConfig(level=logging.INFO, format=TEXT_FORMAT)
 
 logger = logging.getLogger("hyperfy")
 
@@ -70,16 +71,108 @@ def load_config(config_path=None):
         logger.error(f"Unsupported config file format: {config_path}")
         return {}
 
-def create_agent(agent_type, config):
+def create_agent(agent_type, config, name=None, **kwargs):
     """
     Create an agent instance based on type
     """
     if agent_type.lower() == "alice":
-        return AliceAgent(config)
+        return AliceAgent(config, name=name or "Alice", **kwargs)
     else:
         logger.error(f"Unknown agent type: {agent_type}")
         return None
 
+def run_async(agent, agent_type):
+    """
+    Run an agent on an asyncio event loop until interrupted
+    """
+    logger.info(f"{agent_type.title()} agent is running on asyncio. Press Ctrl+C to exit.")
+    try:
+        asyncio.run(agent.run_async())
+    except KeyboardInterrupt:
+        logger.info("Shutting down...")
+    except Exception as e:
+        logger.error(f"Error running agent: {e}")
+        return 1
+        
+    return 0
+
+def run_host(agent_type, count, config, use_async):
+    """
+    Run `count` agents of one type in this process on a shared AgentHost until interrupted
+    """
+    host = AgentHost(config)
+    # The host owns the only microphone and speech engine
+    agent_config = {**config, "VOICE_RECOGNITION_ENABLED": False}
+    for i in range(count):
+        agent = create_agent(agent_type, agent_config, name=f"{agent_type.title()}-{i + 1}",
+                             world_state=host.world_state, physics_engine=host.physics_engine)
+        if not agent:
+            logger.error(f"Failed to create agent of type {agent_type}")
+            return 1
+        host.add_agent(agent)
+        
+    logger.info(f"Hosting {count} {agent_type} agents. Press Ctrl+C to exit.")
+    try:
+        if use_async:
+            asyncio.run(host.run_async())
+        else:
+            host.start()
+            while True:
+                time.sleep(1)
+    except KeyboardInterrupt:
+        logger.info("Shutting down...")
+    except Exception as e:
+        logger.error(f"Error running agent host: {e}")
+        return 1
+    finally:
+        host.stop()
+        
+    return 0
+
+def run_headless(agent_type, count, config, duration, seed):
+    """
+    Simulate `duration` seconds of `count` agents on a virtual clock as fast as possible
+    """
+    with HeadlessRunner(config, seed=seed) as runner:
+        for i in range(count):
+            agent = create_agent(agent_type, runner.config, name=f"{agent_type.title()}-{i + 1}",
+                                 **runner.agent_kwargs())
+            if not agent:
+                logger.error(f"Failed to create agent of type {agent_type}")
+                return 1
+            runner.add_agent(agent)
+        stats = runner.run(duration)
+        
+    for timestamp, name, text in runner.transcript:
+        logger.info(f"[{timestamp - runner.start_time:10.2f}s] {name} says: {text}")
+    logger.info(f"Simulated {stats['simulated_seconds']:.0f} s of {count} agents in {stats['wall_seconds']:.2f} s "
+                f"({stats['speedup']:.0f}x real time)")
+    return 0
+
+def run_cluster(agent_type, count, config, workers):
+    """
+    Run `count` agents of one type partitioned across worker processes until interrupted
+    """
+    names = [f"{agent_type.title()}-{i + 1}" for i in range(count)]
+    cluster = AgentCluster(
+        config, names, agent_factory=functools.partial(create_agent, agent_type), workers=workers or None,
+        on_speech=lambda name, text, voice_id: logger.info(f"{name} says: {text}")
+    )
+    logger.info(f"Running {count} {agent_type} agents on {cluster.worker_count} worker processes. Press Ctrl+C to exit.")
+    try:
+        cluster.start()
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        logger.info("Shutting down...")
+    except Exception as e:
+        logger.error(f"Error running agent cluster: {e}")
+        return 1
+    finally:
+        cluster.stop()
+        
+    return 0
+
 def main():
     """
     Main entry point for Hyperfy Agent Starter Kit
@@ -88,6 +181,15 @@ def main():
     parser = argparse.ArgumentParser(description="Hyperfy Agent Python Starter Kit")
     parser.add_argument("--agent", "-a", type=str, default="alice", help="Agent type (e.g., alice)")
     parser.add_argument("--config", "-c", type=str, help="Path to config file")
+    parser.add_argument("--async", dest="async_runtime", action="store_true",
+                        help="Run the agent on an asyncio event loop instead of threads")
+    parser.add_argument("--count", "-n", type=int, default=1,
+                        help="Number of agents to run in this process on a shared agent host")
+    parser.add_argument("--workers", "-w", type=int,
+                        help="Partition the agents across this many worker processes (0: one per core)")
+    parser.add_argument("--headless", type=float, metavar="SECONDS",
+                        help="Simulate this many seconds on a virtual clock as fast as possible, then exit")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for --headless runs")
     parser.add_argument("--log-level", "-l", type=str, default="INFO", 
                         choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
                         help="Logging level")
@@ -105,12 +207,27 @@ def main():
             config_key = key.replace("HYPERFY_", "")
             config[config_key] = value
     
+    # Console and LOG_FILE output, written on a background thread with LOG_MODE = "queued"
+    log_pipeline = setup_logging(config, args.log_level)
+    atexit.register(log_pipeline.close)
+    
+    use_async = args.async_runtime or config.get("ASYNC_RUNTIME", False)
+    if args.headless is not None:
+        return run_headless(args.agent, args.count, config, args.headless, args.seed)
+    if args.workers is not None:
+        return run_cluster(args.agent, args.count, config, args.workers)
+    if args.count > 1:
+        return run_host(args.agent, args.count, config, use_async)
+    
     # Create agent
     agent = create_agent(args.agent, config)
     if not agent:
         logger.error(f"Failed to create agent of type {args.agent}")
         return 1
     
+    if use_async:
+        return run_async(agent, args.agent)
+    
     # Start agent
     try:
         agent.start()
@@ -119,7 +236,6 @@ def main():
         logger.info(f"{args.agent.title()} agent is running. Press Ctrl+C to exit.")
         while True:
             # The agent runs in its own thread, so we just need to keep the main thread alive
-            import time
             time.sleep(1)
     except KeyboardInterrupt:
         logger.info("Shutting down...")
@@ -1,4 +1,3 @@
-import time
 import logging
 from typing import Dict, List, Any
 import random
@@ -6,6 +5,7 @@ import json
 import os
 
 # Import the base agent class
+from ..core import clock
 from ..core.agent_base import AgentBase
 from ..physics.movement_action import MovementAction
 from ..core.custom_actions import WalkRandomlyAction, StopMovingAction, UseItemAction, UnuseItemAction
@@ -25,9 +25,9 @@ class AliceAgent(AgentBase):
     Uses the Hyperfy agent starter kit with voice capabilities, world state management,
     action system, and physics integration
     """
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], name: str = "Alice", **kwargs):
         # Initialize base agent
-        super().__init__("Alice", config)
+        super().__init__(name, config, **kwargs)
         
         # Alice-specific properties
         self.personality = config.get("AGENT_PERSONALITY", "friendly, curious, whimsical")
@@ -41,12 +41,11 @@ class AliceAgent(AgentBase):
         ]
         
         # State variables
-        self.last_idle_time = time.time()
-        self.idle_interval = random.uniform(30, 60)  # Random interval between idle phrases
-        self.last_proactive_check_time = time.time()
-        self.proactive_check_interval = random.uniform(15, 20)
+        self.idle_timer = None
+        self.proactive_timer = None
         self.greeted_players_today: Dict[str, float] = {} # player_id: timestamp
         self.greeting_cooldown = 300 # 5 minutes in seconds
+        self.event_action_ttl = config.get("ACTION_EVENT_TTL", 10.0) # Event reactions go stale if not started in time
         
         # Initialize language model if available
         self.llm_chain = None
@@ -67,28 +66,33 @@ class AliceAgent(AgentBase):
         # Register additional event handlers
         self.register_event_handler("RabbitHoleEntered", self._on_rabbit_hole_entered)
         self.register_event_handler("tea_party", self._on_tea_party)
+        
+        # Idle phrases every 30-60 seconds, proactive greetings every 15-25 seconds
+        self.idle_timer = self.timers.call_every(45, self._on_idle_timer, jitter=15)
+        self.proactive_timer = self.timers.call_every(20, self._on_proactive_timer, jitter=5,
+                                                      first_delay=random.uniform(15, 20))
     
-    def update(self, delta_time: float):
+    def on_stop(self):
         """
-        Update method called every frame
+        Called when the agent stops
         """
-        current_time = time.time()
-        
-        # Check if it's time for an idle phrase
-        if current_time - self.last_idle_time > self.idle_interval:
-            # Say a random idle phrase occasionally
-            if random.random() < 0.3:  # 30% chance to say something
-                self._say_idle_phrase()
-            
-            # Reset timer with new random interval
-            self.last_idle_time = current_time
-            self.idle_interval = random.uniform(30, 60)
-
-        # Proactive greeting check
-        if current_time - self.last_proactive_check_time > self.proactive_check_interval:
-            self._proactive_greeting_check(current_time)
-            self.last_proactive_check_time = current_time
-            self.proactive_check_interval = random.uniform(15, 25) # Reset interval
+        for timer in (self.idle_timer, self.proactive_timer):
+            if timer is not None:
+                timer.cancel()
+        self.idle_timer = self.proactive_timer = None
+    
+    def _on_idle_timer(self):
+        """
+        Say a random idle phrase occasionally
+        """
+        if random.random() < 0.3:  # 30% chance to say something
+            self._say_idle_phrase()
+    
+    def _on_proactive_timer(self):
+        """
+        Periodic proactive greeting check
+        """
+        self._proactive_greeting_check(clock.now())
     
     def on_voice_input(self, text: str, confidence: float):
         """
@@ -147,7 +151,7 @@ class AliceAgent(AgentBase):
         """
         player_id = data.get("player_id", "unknown")
         distance = data.get("distance", 0.0)
-        current_time = time.time()
+        current_time = clock.now()
 
         # Greet the player if they're close enough AND haven't been greeted recently
         # This specific event might be for closer proximity than proactive check.
@@ -191,7 +195,7 @@ class AliceAgent(AgentBase):
             try:
                 dist = sum((a - b) ** 2 for a, b in zip(self.position, player_position))**0.5
             except (TypeError, IndexError) as e:
-                self.logger.debug(f"Could not calculate distance to player {player_id}: {e}")
+                self.logger.debug("Could not calculate distance to player %s: %s", player_id, e)
                 continue
 
 
@@ -233,10 +237,10 @@ class AliceAgent(AgentBase):
         player_id = data.get("playerId", "someone")
         self.say("Down the rabbit hole you go! How curious!")
         
-        # Move toward the rabbit hole
+        # Move toward the rabbit hole, along the flow field every agent there shares
         if self.physics_engine and "rabbit_hole_position" in data:
             position = data.get("rabbit_hole_position")
-            self.move_to(position)
+            self.move_to(position, ttl=self.event_action_ttl, mode="flow")
     
     def _on_tea_party(self, data: Dict[str, Any]):
         """
@@ -244,9 +248,9 @@ class AliceAgent(AgentBase):
         """
         self.say("A very merry unbirthday to you! Would you care for some tea?")
         
-        # If the tea party has a position, move there
+        # If the tea party has a position, move there along the shared flow field
         if "position" in data:
-            self.move_to(data["position"])
+            self.move_to(data["position"], ttl=self.event_action_ttl, mode="flow")
     
     def _rule_based_response(self, text: str):
         """
@@ -0,0 +1,201 @@
+import math
+from typing import Dict, Any, Optional
+
+class StreamingHistogram:
+    """
+    Streaming histogram with bounded relative error quantiles
+    Values are counted in logarithmic buckets (DDSketch style), so memory grows with
+    the dynamic range of the data rather than with the number of samples.
+    Any quantile is estimated within `relative_accuracy` of a true sample value.
+    """
+    def __init__(self, relative_accuracy: float = 0.01, min_value: float = 1e-6):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError(f"relative_accuracy must be between 0 and 1, got {relative_accuracy}")
+        self.relative_accuracy = relative_accuracy
+        self.min_value = min_value
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        """
+        Record a sample
+        """
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+        if value <= self.min_value:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate the q-quantile (0 <= q <= 1)
+        Returns None if no samples have been recorded
+        """
+        if self.count == 0:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return max(self.min, 0.0)
+
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                estimate = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(estimate, self.min), self.max)
+        return self.max
+
+    def mean(self) -> Optional[float]:
+        """
+        Mean of all recorded samples
+        """
+        return self.total / self.count if self.count else None
+
+    def merge(self, other: 'StreamingHistogram'):
+        """
+        Fold another histogram with the same accuracy into this one
+        """
+        if other.gamma != self.gamma:
+            raise ValueError("Cannot merge histograms with different accuracy")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summary dictionary with count, mean and p50/p95/p99
+        """
+        return {
+            "count": self.count,
+            "mean": self.mean(),
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99)
+        }
+
+
+class ActionRecord:
+    """
+    Lightweight record of a finished action kept in the action history
+    Holds only plain values, so the action, its agent and its logger can be released
+    """
+    __slots__ = ("id", "action_type", "status", "priority", "queued_time",
+                 "start_time", "completion_time", "error")
+
+    def __init__(self, action):
+        self.id = action.id
+        self.action_type = action.__class__.__name__
+        self.status = action.status.name
+        self.priority = action.priority
+        self.queued_time = action.queued_time
+        self.start_time = action.start_time
+        self.completion_time = action.completion_time
+        self.error = action.error
+
+    @property
+    def queue_wait(self) -> Optional[float]:
+        """
+        Seconds between queueing and starting (or leaving the queue unstarted)
+        """
+        if self.queued_time is None:
+            return None
+        end_time = self.start_time if self.start_time is not None else self.completion_time
+        if end_time is None:
+            return None
+        return max(0.0, end_time - self.queued_time)
+
+    @property
+    def execution_time(self) -> Optional[float]:
+        """
+        Seconds between starting and finishing, None if the action never started
+        """
+        if self.start_time is None or self.completion_time is None:
+            return None
+        return max(0.0, self.completion_time - self.start_time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert record to dictionary for serialization
+        """
+        return {
+            "id": self.id,
+            "type": self.action_type,
+            "status": self.status,
+            "priority": self.priority,
+            "queued_time": self.queued_time,
+            "start_time": self.start_time,
+            "completion_time": self.completion_time,
+            "queue_wait": self.queue_wait,
+            "execution_time": self.execution_time,
+            "error": self.error
+        }
+
+
+class ActionTypeStats:
+    """
+    Running aggregates for all finished actions of one type
+    """
+    def __init__(self, action_type: str, relative_accuracy: float = 0.01):
+        self.action_type = action_type
+        self.status_counts: Dict[str, int] = {}
+        self.total = 0
+        self.queue_wait = StreamingHistogram(relative_accuracy)
+        self.execution_time = StreamingHistogram(relative_accuracy)
+
+    def add(self, record: ActionRecord):
+        """
+        Fold a finished action record into the aggregates
+        """
+        self.total += 1
+        self.status_counts[record.status] = self.status_counts.get(record.status, 0) + 1
+
+        queue_wait = record.queue_wait
+        if queue_wait is not None:
+            self.queue_wait.add(queue_wait)
+        execution_time = record.execution_time
+        if execution_time is not None:
+            self.execution_time.add(execution_time)
+
+    @property
+    def failure_rate(self) -> float:
+        """
+        Fraction of finished actions that failed
+        """
+        return self.status_counts.get("FAILED", 0) / self.total if self.total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert aggregates to dictionary for serialization
+        """
+        return {
+            "type": self.action_type,
+            "count": self.total,
+            "status_counts": dict(self.status_counts),
+            "failure_rate": self.failure_rate,
+            "queue_wait": self.queue_wait.summary(),
+            "execution_time": self.execution_time.summary()
+        }
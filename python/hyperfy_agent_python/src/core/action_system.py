@@ -1,9 +1,18 @@
+import os
 import time
 import uuid
+import heapq
 import logging
-from typing import Dict, List, Any, Optional, Callable
+import itertools
+from collections import deque
+from typing import Dict, List, Any, Optional, Callable, Tuple, Deque
 from enum import Enum, auto
 
+from . import clock
+from .rate_limiter import TokenBucket
+from .action_stats import ActionRecord, ActionTypeStats
+from .metrics import ActionMetrics, MetricsRegistry, default_registry
+
 class ActionStatus(Enum):
     """
     Possible states of an action in the system
@@ -13,31 +22,91 @@ class ActionStatus(Enum):
     COMPLETED = auto() # Action has completed successfully
     FAILED = auto()    # Action has failed
     CANCELLED = auto() # Action was cancelled before completion
+    EXPIRED = auto()   # Action passed its deadline while still queued
+    SUSPENDED = auto() # Action was preempted and waits in the queue to resume
+    COALESCED = auto() # Action was absorbed by an earlier one with the same coalesce key
+
+class PreemptionPolicy(Enum):
+    """
+    How a running action responds when a strictly higher priority action is queued
+    """
+    NEVER = auto()     # Keep running; the urgent action waits for the slot
+    SUSPEND = auto()   # Pause and go back to the queue, resuming once the slot is free again
+    CANCEL = auto()    # Cancel and make way for the urgent action
+
+# Process-wide source of cheap integer action ids
+_action_ids = itertools.count(1)
+_wire_prefix = (None, "")
+
+def _get_wire_prefix() -> str:
+    """
+    Random per-process prefix that makes wire ids unique across processes
+    Regenerated after a fork so child processes never reuse the parent's prefix
+    """
+    global _wire_prefix
+    pid = os.getpid()
+    if _wire_prefix[0] != pid:
+        _wire_prefix = (pid, uuid.uuid4().hex[:12])
+    return _wire_prefix[1]
 
 class Action:
     """
     Base class for all agent actions
     Actions represent discrete tasks that can be performed by agents
+    Subclasses may set `rate_limit` to (starts_per_second, burst) to limit how often
+    actions of that class are started by the ActionSystem
+    An optional `deadline` (absolute time) or `ttl` (seconds from creation) makes the
+    action expire if it is still queued when that time passes
+    Actions sharing a `coalesce_key` supersede each other in the ActionSystem; see absorb()
+    `preemption_policy` declares what happens to the running action when a strictly
+    higher priority action is queued
+    
+    Actions are slotted and cheap to create: ids are integers from a process-wide
+    counter (use `wire_id` for a globally unique string) and every class shares one
+    logger, `action.<ClassName>`, created once when the class is defined.
     """
-    def __init__(self, agent=None, priority: int = 0):
-        self.id = str(uuid.uuid4())
+    __slots__ = ("id", "agent", "priority", "status", "creation_time", "deadline", "queued_time",
+                 "start_time", "completion_time", "error", "progress")
+    
+    logger = logging.getLogger("action.Action")
+    rate_limit: Optional[Tuple[float, float]] = None
+    coalesce_key: Optional[str] = None
+    preemption_policy: PreemptionPolicy = PreemptionPolicy.SUSPEND
+    
+    def __init__(self, agent=None, priority: int = 0, ttl: Optional[float] = None, deadline: Optional[float] = None):
+        self.id = next(_action_ids)
         self.agent = agent
         self.priority = priority
         self.status = ActionStatus.PENDING
-        self.creation_time = time.time()
+        self.creation_time = clock.now()
+        self.deadline = deadline
+        if ttl is not None:
+            self.set_ttl(ttl)
+        self.queued_time = None
         self.start_time = None
         self.completion_time = None
         self.error = None
         self.progress = 0.0  # 0.0 to 1.0
-        self.logger = logging.getLogger(f"action.{self.__class__.__name__}")
+        
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # One shared logger per action class instead of a lookup per instance
+        cls.logger = logging.getLogger(f"action.{cls.__name__}")
+        
+    @property
+    def wire_id(self) -> str:
+        """
+        String id that is unique across processes, for serialization
+        """
+        return f"{_get_wire_prefix()}-{self.id}"
         
     def start(self):
         """
         Called when the action starts execution
         """
         self.status = ActionStatus.RUNNING
-        self.start_time = time.time()
-        self.logger.debug(f"Starting action {self.id}")
+        self.start_time = clock.now()
+        self.logger.debug("Starting action %s", self.id)
         
     def update(self, delta_time: float) -> bool:
         """
@@ -51,16 +120,17 @@ class Action:
         Called when the action completes successfully
         """
         self.status = ActionStatus.COMPLETED
-        self.completion_time = time.time()
+        self.completion_time = clock.now()
         self.progress = 1.0
-        self.logger.debug(f"Action {self.id} completed in {self.completion_time - self.start_time:.2f}s")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Action %s completed in %.2fs", self.id, self.completion_time - (self.start_time or self.completion_time))
         
     def fail(self, error: str):
         """
         Called when the action fails
         """
         self.status = ActionStatus.FAILED
-        self.completion_time = time.time()
+        self.completion_time = clock.now()
         self.error = error
         self.logger.error(f"Action {self.id} failed: {error}")
         
@@ -69,8 +139,58 @@ class Action:
         Called when the action is cancelled
         """
         self.status = ActionStatus.CANCELLED
-        self.completion_time = time.time()
-        self.logger.debug(f"Action {self.id} cancelled")
+        self.completion_time = clock.now()
+        self.logger.debug("Action %s cancelled", self.id)
+        
+    def suspend(self):
+        """
+        Called when the running action is preempted and will be resumed later
+        """
+        self.status = ActionStatus.SUSPENDED
+        self.logger.debug("Action %s suspended", self.id)
+        
+    def resume(self):
+        """
+        Called when a suspended action gets the action slot back
+        """
+        self.status = ActionStatus.RUNNING
+        self.logger.debug("Action %s resumed", self.id)
+        
+    def expire(self):
+        """
+        Called when the action reaches its deadline before it could start
+        """
+        self.status = ActionStatus.EXPIRED
+        self.completion_time = clock.now()
+        self.logger.debug("Action %s expired", self.id)
+        
+    def coalesce(self):
+        """
+        Called when an earlier action with the same coalesce key absorbs this one
+        """
+        self.status = ActionStatus.COALESCED
+        self.completion_time = clock.now()
+        self.logger.debug("Action %s coalesced", self.id)
+        
+    def absorb(self, newer: 'Action') -> bool:
+        """
+        Take over the parameters of a newer action with the same coalesce key in place
+        Returns True if this action now stands in for `newer`, False if `newer`
+        has to replace it instead. The base implementation never absorbs.
+        """
+        return False
+        
+    def set_ttl(self, ttl: float):
+        """
+        Set the deadline to `ttl` seconds after the action was created
+        """
+        self.deadline = self.creation_time + ttl
+        
+    def is_past_deadline(self, current_time: float) -> bool:
+        """
+        Check if the action has a deadline that has passed
+        """
+        return self.deadline is not None and current_time >= self.deadline
         
     def is_completed(self) -> bool:
         """
@@ -90,6 +210,18 @@ class Action:
         """
         return self.status == ActionStatus.CANCELLED
         
+    def is_expired(self) -> bool:
+        """
+        Check if the action expired before it could start
+        """
+        return self.status == ActionStatus.EXPIRED
+        
+    def is_coalesced(self) -> bool:
+        """
+        Check if the action was absorbed by another one instead of running itself
+        """
+        return self.status == ActionStatus.COALESCED
+        
     def is_running(self) -> bool:
         """
         Check if the action is currently running
@@ -102,11 +234,47 @@ class Action:
         """
         return self.status == ActionStatus.PENDING
         
+    def is_suspended(self) -> bool:
+        """
+        Check if the action was preempted and is waiting to resume
+        """
+        return self.status == ActionStatus.SUSPENDED
+        
     def is_active(self) -> bool:
         """
-        Check if the action is active (either running or pending)
+        Check if the action is active (running, pending or suspended)
+        """
+        return self.status in (ActionStatus.RUNNING, ActionStatus.PENDING, ActionStatus.SUSPENDED)
+        
+    def is_finished(self) -> bool:
+        """
+        Check if the action has reached a terminal state (completed, failed, cancelled, expired or coalesced)
         """
-        return self.is_running() or self.is_pending()
+        return self.status in (ActionStatus.COMPLETED, ActionStatus.FAILED, ActionStatus.CANCELLED,
+                               ActionStatus.EXPIRED, ActionStatus.COALESCED)
+        
+    def tick_child(self, child: 'Action', delta_time: float) -> bool:
+        """
+        Drive a child action owned by this action for one frame
+        Starts the child if it is still pending, updates it and settles its final status.
+        The child is never placed on the agent's action queue.
+        Returns True once the child has finished (completed, failed or cancelled)
+        """
+        if child.agent is None:
+            child.agent = self.agent
+            
+        if child.is_pending():
+            child.start()
+            
+        if child.is_running():
+            try:
+                if child.update(delta_time) and child.is_running():
+                    child.complete()
+            except Exception as e:
+                self.logger.error(f"Error updating child action {child.id}: {e}")
+                child.fail(str(e))
+                
+        return child.is_finished()
         
     def get_execution_time(self) -> float:
         """
@@ -115,7 +283,7 @@ class Action:
         if self.start_time is None:
             return 0.0
             
-        end_time = self.completion_time or time.time()
+        end_time = self.completion_time or clock.now()
         return end_time - self.start_time
         
     def to_dict(self) -> Dict[str, Any]:
@@ -123,11 +291,13 @@ class Action:
         Convert action to dictionary for serialization
         """
         return {
-            "id": self.id,
+            "id": self.wire_id,
             "type": self.__class__.__name__,
             "priority": self.priority,
             "status": self.status.name,
             "creation_time": self.creation_time,
+            "deadline": self.deadline,
+            "queued_time": self.queued_time,
             "start_time": self.start_time,
             "completion_time": self.completion_time,
             "error": self.error,
@@ -138,38 +308,146 @@ class ActionSystem:
     """
     Manages the execution of actions for an agent
     Supports prioritization, queuing, and parallel execution
+    
+    The running action is ticked every frame. Starting new actions is rate limited
+    per action class with token buckets: `rate_limits` maps a class name to
+    (starts_per_second, burst), falling back to the class's `rate_limit` attribute
+    and then to a default bucket of one start per `action_cooldown` seconds.
+    An `action_cooldown` of 0 leaves classes without an explicit limit unthrottled.
+    
+    Finished actions are kept as lightweight ActionRecords in a ring buffer of
+    `history_size` entries, and per-type aggregates are updated as they finish.
+    
+    Queued actions past their deadline are expired, both when they reach the front
+    of the queue and proactively through a min-heap of deadlines checked every update.
+    With `priority_aging` > 0 a queued action gains that many priority points per
+    second of waiting, so low priority actions cannot be starved forever.
+    
+    With `coalesce` enabled an action with a `coalesce_key` supersedes every other
+    action with the same key: the running one absorbs it in place if it can,
+    otherwise a pending one absorbs it, and any remaining stale pending actions
+    with that key are cancelled. The absorber takes the higher of the two
+    priorities, and the absorbed action finishes as COALESCED.
+    
+    With `preemption` enabled, queueing an action of strictly higher priority than
+    the running one makes the running action yield according to its
+    `preemption_policy` (suspend or cancel) at the start of the next update, and
+    the urgent action starts and gets its first tick in that same update instead
+    of waiting for the slot.
+    
+    Prometheus-style lifecycle metrics are collected only after enable_metrics();
+    while disabled each instrumentation point costs a single `is not None` check.
     """
-    def __init__(self, action_cooldown: float = 0.1, max_queue_size: int = 10):
+    def __init__(self, action_cooldown: float = 0.1, max_queue_size: int = 10,
+                 rate_limits: Optional[Dict[str, Tuple[float, float]]] = None, rate_burst: float = 1.0,
+                 history_size: int = 100, priority_aging: float = 0.0, coalesce: bool = True,
+                 preemption: bool = True):
         self.action_queue: List[Action] = []
         self.current_action: Optional[Action] = None
-        self.completed_actions: List[Action] = []
+        self.action_history: Deque[ActionRecord] = deque(maxlen=history_size)
+        self.action_stats: Dict[str, ActionTypeStats] = {}
         self.action_cooldown = action_cooldown
         self.max_queue_size = max_queue_size
+        self.rate_limits: Dict[str, Tuple[float, float]] = dict(rate_limits or {})
+        self.rate_burst = rate_burst
+        self.rate_buckets: Dict[type, Optional[TokenBucket]] = {}
+        self.priority_aging = priority_aging
+        self.expiry_heap: List[Tuple[float, int, Action]] = []
+        self._expiry_sequence = itertools.count()
+        self.expired_count = 0
+        self.coalesce = coalesce
+        self.coalesced_count = 0
+        self.preemption = preemption
+        self.preempted_count = 0
         self.last_action_time = 0
+        self.metrics: Optional[ActionMetrics] = None
+        # Optional TickProfiler; spans are recorded only while the owner's loop profiles frames
+        self.profiler = None
         self.logger = logging.getLogger("action_system")
         self.action_hooks: Dict[str, List[Callable]] = {
+            "on_queue": [],
             "pre_execute": [],
             "post_execute": [],
             "on_complete": [],
             "on_fail": [],
-            "on_cancel": []
+            "on_cancel": [],
+            "on_expire": [],
+            "on_coalesce": [],
+            "on_preempt": [],
+            "on_resume": []
         }
         
     def queue_action(self, action: Action) -> bool:
         """
         Add an action to the queue
-        Returns True if successful, False if queue is full
+        Returns True if successful (including when an existing action absorbed it),
+        False if queue is full. An absorbed action is never started itself; it
+        finishes as COALESCED straight away.
         """
+        if self.coalesce and action.coalesce_key is not None and self._coalesce(action):
+            return True
+            
         if len(self.action_queue) >= self.max_queue_size:
             self.logger.warning(f"Action queue is full, rejecting action {action.id}")
+            if self.metrics is not None:
+                self.metrics.rejected.inc(self.metrics.agent_name, action.__class__.__name__)
             return False
             
+        action.queued_time = clock.now()
+        if action.deadline is not None:
+            heapq.heappush(self.expiry_heap, (action.deadline, next(self._expiry_sequence), action))
         self.action_queue.append(action)
         self.action_queue.sort(key=lambda a: a.priority, reverse=True)  # Higher priority first
-        self.logger.debug(f"Queued action {action.id}, queue size: {len(self.action_queue)}")
+        self.logger.debug("Queued action %s, queue size: %d", action.id, len(self.action_queue))
+        if self.metrics is not None:
+            self.metrics.queued.inc(self.metrics.agent_name, action.__class__.__name__)
+        self._call_hooks("on_queue", action)
         return True
         
-    def cancel_action(self, action_id: str) -> bool:
+    def _coalesce(self, action: Action) -> bool:
+        """
+        Let an existing action with the same coalesce key absorb `action`
+        Stale pending actions with the key are cancelled either way. An absorbed
+        `action` is settled as COALESCED, fires on_coalesce hooks and is recorded.
+        Returns True if `action` was absorbed and must not be queued
+        """
+        key = action.coalesce_key
+        absorber = None
+        running = self.current_action
+        if running is not None and running.coalesce_key == key and running.is_running() and running.absorb(action):
+            absorber = running
+            running.priority = max(running.priority, action.priority)
+        else:
+            for pending in self.action_queue:
+                if pending.coalesce_key == key and pending.absorb(action):
+                    absorber = pending
+                    pending.priority = max(pending.priority, action.priority)
+                    if pending.deadline is not None:
+                        heapq.heappush(self.expiry_heap, (pending.deadline, next(self._expiry_sequence), pending))
+                    break
+                    
+        stale = [pending for pending in self.action_queue if pending.coalesce_key == key and pending is not absorber]
+        if stale:
+            self.action_queue = [pending for pending in self.action_queue if pending not in stale]
+            for pending in stale:
+                pending.cancel()
+                self._call_hooks("on_cancel", pending)
+                self._record_action(pending)
+                
+        if absorber is None:
+            self.coalesced_count += len(stale)
+            return False
+            
+        self.coalesced_count += len(stale) + 1
+        if absorber is not running:
+            self.action_queue.sort(key=lambda a: a.priority, reverse=True)
+        self.logger.debug("Action %s absorbed %s (key %s)", absorber.id, action.__class__.__name__, key)
+        action.coalesce()
+        self._call_hooks("on_coalesce", action)
+        self._record_action(action)
+        return True
+        
+    def cancel_action(self, action_id: int) -> bool:
         """
         Cancel a pending or running action
         """
@@ -177,6 +455,7 @@ class ActionSystem:
         if self.current_action and self.current_action.id == action_id:
             self.current_action.cancel()
             self._call_hooks("on_cancel", self.current_action)
+            self._record_action(self.current_action)
             self.current_action = None
             return True
             
@@ -185,6 +464,7 @@ class ActionSystem:
             if action.id == action_id:
                 action.cancel()
                 self._call_hooks("on_cancel", action)
+                self._record_action(action)
                 self.action_queue.pop(i)
                 return True
                 
@@ -197,49 +477,314 @@ class ActionSystem:
         for action in self.action_queue:
             action.cancel()
             self._call_hooks("on_cancel", action)
+            self._record_action(action)
             
         self.action_queue.clear()
+        self.expiry_heap.clear()
         self.logger.debug("Action queue cleared")
         
     def update(self, delta_time: float):
         """
         Update the action system
-        Executes the current action or starts a new one if available
+        Ticks the running action every frame and, once the slot is free,
+        starts the highest priority queued action whose rate limit allows it
         """
-        current_time = time.time()
+        current_time = clock.now()
         
-        # Check cooldown
-        if current_time - self.last_action_time < self.action_cooldown:
-            return
+        # Drop queued actions whose deadline has passed
+        if self.expiry_heap and self.expiry_heap[0][0] <= current_time:
+            self._expire_due_actions(current_time)
+            
+        # Let a strictly higher priority queued action take the slot
+        if self.preemption and self.current_action and self.action_queue:
+            self._preempt_current_action(current_time)
             
         # Update current action if any
         if self.current_action:
-            try:
-                if self.current_action.update(delta_time):
-                    # Action completed
-                    self.current_action.complete()
-                    self._call_hooks("on_complete", self.current_action)
-                    self._call_hooks("post_execute", self.current_action)
-                    self.completed_actions.append(self.current_action)
-                    self.current_action = None
+            self._tick_current_action(delta_time, current_time)
+            
+        # Start a new action if available; it gets its first update in the same frame
+        if self.current_action is None and self.action_queue:
+            action = self._pop_startable_action(current_time)
+            if action:
+                self.current_action = action
+                if action.is_suspended():
+                    action.resume()
+                    self._call_hooks("on_resume", action)
+                else:
+                    self._call_hooks("pre_execute", action)
+                    action.start()
                     self.last_action_time = current_time
-            except Exception as e:
-                self.logger.error(f"Error updating action {self.current_action.id}: {e}")
-                self.current_action.fail(str(e))
-                self._call_hooks("on_fail", self.current_action)
-                self._call_hooks("post_execute", self.current_action)
-                self.completed_actions.append(self.current_action)
-                self.current_action = None
-                self.last_action_time = current_time
+                self._tick_current_action(delta_time, current_time)
+                
+    def _preempt_current_action(self, current_time: float):
+        """
+        Suspend or cancel the running action if a strictly higher priority action
+        is waiting and allowed to start now
+        """
+        running = self.current_action
+        urgent = self.action_queue[0] # The queue is sorted by base priority
+        if urgent.priority <= running.priority or running.preemption_policy == PreemptionPolicy.NEVER:
+            return
+        if not urgent.is_suspended():
+            bucket = self._get_rate_bucket(type(urgent))
+            if bucket is not None and bucket.time_until_available(current_time) > 0:
+                return
+                
+        self.preempted_count += 1
+        self.logger.debug("Action %s (priority %s) preempts %s (priority %s)", urgent.id, urgent.priority, running.id, running.priority)
+        self._call_hooks("on_preempt", running)
+        self.current_action = None
+        
+        if running.preemption_policy == PreemptionPolicy.CANCEL:
+            running.cancel()
+            self._call_hooks("on_cancel", running)
+            self._record_action(running)
+            return
+            
+        running.suspend()
+        # Suspended actions go back in the queue regardless of max_queue_size
+        self.action_queue.append(running)
+        self.action_queue.sort(key=lambda a: a.priority, reverse=True)
+                
+    def _tick_current_action(self, delta_time: float, current_time: float):
+        """
+        Update the running action and retire it once it has finished
+        """
+        action = self.current_action
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.enter("action", action)
+        try:
+            # The action may have settled itself already, e.g. inside start()
+            if not action.is_running() or action.update(delta_time):
+                if action.is_running():
+                    action.complete()
+                self._finish_current_action(current_time)
+        except Exception as e:
+            self.logger.error(f"Error updating action {action.id}: {e}")
+            action.fail(str(e))
+            self._finish_current_action(current_time)
+        finally:
+            if profiler is not None:
+                profiler.exit()
+            
+    def _pop_startable_action(self, current_time: float) -> Optional[Action]:
+        """
+        Remove and return the highest priority queued action allowed to start now
+        Actions whose class is out of start tokens stay queued without blocking other classes,
+        and actions found past their deadline on the way are expired
+        """
+        blocked = set()
+        expired = []
+        selected = None
+        for i in self._queue_order(current_time):
+            action = self.action_queue[i]
+            if action.is_pending() and action.is_past_deadline(current_time):
+                expired.append(action)
+                continue
+            if action.is_suspended():
+                # Resuming does not count as a new start
+                selected = action
+                break
+            action_type = type(action)
+            if action_type in blocked:
+                continue
+            bucket = self._get_rate_bucket(action_type)
+            if bucket is None or bucket.try_acquire(current_time):
+                selected = action
+                break
+            blocked.add(action_type)
+            if self.metrics is not None:
+                self.metrics.rate_limited.inc(self.metrics.agent_name, action_type.__name__)
+                self.metrics.blocked_since.setdefault(action.id, current_time)
+                
+        if expired or selected:
+            self.action_queue = [action for action in self.action_queue
+                                 if action is not selected and action not in expired]
+            for action in expired:
+                self._expire_action(action)
+                
+        if selected is not None and self.metrics is not None and not selected.is_suspended():
+            self._observe_start(selected, current_time)
+        return selected
+        
+    def _queue_order(self, current_time: float):
+        """
+        Queue indices in start order
+        The queue is kept sorted by base priority; with priority aging enabled the
+        order is recomputed from each action's aged priority (ties keep queue order)
+        """
+        if self.priority_aging <= 0:
+            return range(len(self.action_queue))
+        return sorted(range(len(self.action_queue)),
+                      key=lambda i: -self.get_effective_priority(self.action_queue[i], current_time))
+        
+    def get_effective_priority(self, action: Action, current_time: Optional[float] = None) -> float:
+        """
+        Priority of a queued action including the aging bonus for the time it has waited
+        """
+        if self.priority_aging <= 0 or action.queued_time is None:
+            return action.priority
+        if current_time is None:
+            current_time = clock.now()
+        return action.priority + self.priority_aging * max(0.0, current_time - action.queued_time)
+        
+    def _expire_due_actions(self, current_time: float):
+        """
+        Expire every queued action whose deadline has passed
+        Heap entries for actions that already left the queue are discarded lazily
+        """
+        expired_ids = set()
+        while self.expiry_heap and self.expiry_heap[0][0] <= current_time:
+            _, _, action = heapq.heappop(self.expiry_heap)
+            # Skip entries for actions that already left the queue or had their deadline moved
+            if action.is_pending() and action.is_past_deadline(current_time):
+                expired_ids.add(action.id)
+                
+        if not expired_ids:
             return
             
-        # Start a new action if available
-        if self.action_queue:
-            self.current_action = self.action_queue.pop(0)
-            self._call_hooks("pre_execute", self.current_action)
-            self.current_action.start()
-            self.last_action_time = current_time
+        remaining = []
+        for action in self.action_queue:
+            if action.id in expired_ids and action.is_pending():
+                self._expire_action(action)
+            else:
+                remaining.append(action)
+        self.action_queue = remaining
+        
+    def _expire_action(self, action: Action):
+        """
+        Mark a queued action as expired, fire on_expire hooks and record it
+        """
+        action.expire()
+        self.expired_count += 1
+        self.logger.debug("Action %s (%s) expired in queue", action.id, action.__class__.__name__)
+        self._call_hooks("on_expire", action)
+        self._record_action(action)
+        
+    def _get_rate_bucket(self, action_type: type) -> Optional[TokenBucket]:
+        """
+        Get (creating on first use) the token bucket limiting starts of an action class
+        Returns None if the class is not rate limited
+        """
+        if action_type in self.rate_buckets:
+            return self.rate_buckets[action_type]
+            
+        limit = self.rate_limits.get(action_type.__name__) or action_type.rate_limit
+        if limit:
+            bucket = TokenBucket(*limit)
+        elif self.action_cooldown > 0:
+            bucket = TokenBucket(1.0 / self.action_cooldown, self.rate_burst)
+        else:
+            bucket = None
             
+        self.rate_buckets[action_type] = bucket
+        return bucket
+        
+    def set_rate_limit(self, action_type_name: str, rate: float, burst: float = 1.0):
+        """
+        Configure the start rate limit for an action class by name
+        """
+        self.rate_limits[action_type_name] = (rate, burst)
+        for action_type in list(self.rate_buckets):
+            if action_type.__name__ == action_type_name:
+                del self.rate_buckets[action_type]
+                
+    def _finish_current_action(self, current_time: float):
+        """
+        Fire the lifecycle hooks matching the final status of the current action and retire it
+        """
+        action = self.current_action
+        if action.is_failed():
+            self._call_hooks("on_fail", action)
+        elif action.is_cancelled():
+            self._call_hooks("on_cancel", action)
+        else:
+            self._call_hooks("on_complete", action)
+        self._call_hooks("post_execute", action)
+        self._record_action(action)
+        self.current_action = None
+        self.last_action_time = current_time
+        
+    def _record_action(self, action: Action):
+        """
+        Append a finished action to the history ring buffer and fold it into the per-type aggregates
+        Only a lightweight record is retained, never the action itself
+        """
+        record = ActionRecord(action)
+        self.action_history.append(record)
+        
+        stats = self.action_stats.get(record.action_type)
+        if stats is None:
+            stats = self.action_stats[record.action_type] = ActionTypeStats(record.action_type)
+        stats.add(record)
+        
+        if self.metrics is not None:
+            metrics = self.metrics
+            metrics.blocked_since.pop(record.id, None)
+            metrics.finished.inc(metrics.agent_name, record.action_type, record.status)
+            execution_time = record.execution_time
+            if execution_time is not None:
+                metrics.execution.observe(execution_time, metrics.agent_name, record.action_type)
+                
+    def enable_metrics(self, registry: Optional[MetricsRegistry] = None, agent_name: str = ""):
+        """
+        Start collecting lifecycle metrics into a registry (the process-wide default if omitted)
+        """
+        self.metrics = ActionMetrics(registry or default_registry, agent_name)
+        
+    def disable_metrics(self):
+        """
+        Stop collecting lifecycle metrics
+        """
+        self.metrics = None
+        
+    def _observe_start(self, action: Action, current_time: float):
+        """
+        Record queue wait and rate limit wait for an action that is about to start
+        """
+        metrics = self.metrics
+        action_type = action.__class__.__name__
+        metrics.started.inc(metrics.agent_name, action_type)
+        if action.queued_time is not None:
+            metrics.queue_wait.observe(current_time - action.queued_time, metrics.agent_name, action_type)
+        blocked_since = metrics.blocked_since.pop(action.id, None)
+        if blocked_since is not None:
+            metrics.rate_limit_wait.observe(current_time - blocked_since, metrics.agent_name, action_type)
+        
+    def get_history(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get the most recent finished actions, newest last
+        """
+        records = list(self.action_history)
+        if limit is not None:
+            records = records[-limit:] if limit > 0 else []
+        return [record.to_dict() for record in records]
+        
+    def get_stats(self, action_type: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get aggregated statistics (counts, failure rate, queue wait and execution
+        time percentiles) for one action type, or for every type seen so far
+        """
+        if action_type is not None:
+            stats = self.action_stats.get(action_type)
+            return stats.to_dict() if stats else {}
+        return {name: stats.to_dict() for name, stats in self.action_stats.items()}
+        
+    def reset_stats(self):
+        """
+        Clear the history and all aggregated statistics
+        """
+        self.action_history.clear()
+        self.action_stats.clear()
+        
+    def get_current_action(self) -> Optional[Action]:
+        """
+        Get the action that is currently executing, if any
+        """
+        return self.current_action
+        
     def get_queue_count(self) -> int:
         """
         Get the number of actions in the queue
@@ -278,11 +823,23 @@ class ActionSystem:
         """
         Call all hooks of a specific type
         """
-        if hook_type not in self.action_hooks:
+        callbacks = self.action_hooks.get(hook_type)
+        if not callbacks:
             return
             
-        for callback in self.action_hooks[hook_type]:
+        if self.metrics is not None:
+            hook_start = time.perf_counter()
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.enter("hooks", (hook_type, action))
+            
+        for callback in callbacks:
             try:
                 callback(action)
             except Exception as e:
                 self.logger.error(f"Error in {hook_type} hook: {e}")
+                
+        if profiler is not None:
+            profiler.exit()
+        if self.metrics is not None:
+            self.metrics.hook.observe(time.perf_counter() - hook_start, self.metrics.agent_name, hook_type)
@@ -1,4 +1,5 @@
 import time
+import asyncio
 import threading
 import logging
 from typing import Dict, List, Any, Callable, Optional
@@ -7,6 +8,13 @@ from ..voice.voice_manager import VoiceManager
 from ..physics.physics_engine import PhysicsEngine
 from .world_state import WorldState
 from .action_system import ActionSystem, Action
+from . import metrics, clock
+from .async_runtime import get_blocking_executor, resolve_future, run_blocking
+from .tick_scheduler import TickScheduler
+from .tick_profiler import TickProfiler
+from .tick_lod import TickLod, DEFAULT_TIERS
+from .timer_wheel import TimerWheel
+from .event_bus import EventBus, Event, Subscription, OverflowPolicy, VoiceInputEvent, event_from_dict
 
 class AgentBase:
     """
@@ -16,24 +24,64 @@ class AgentBase:
     - World state management
     - Action system
     - Physics integration
+    
+    Agents run either on a dedicated update thread (start/stop) or as tasks on an
+    asyncio event loop (run_async, or start_async/stop_async). In asyncio mode many
+    agents can share one loop: subsystems run as tasks, and blocking calls such as
+    physics steps are bridged through a shared executor. An AgentHost
+    runs many agents on one shared scheduler instead (start_hosted).
     """
     
-    def __init__(self, name: str, config: Dict[str, Any]):
+    def __init__(self, name: str, config: Dict[str, Any], world_state: Optional[WorldState] = None,
+                 physics_engine: Optional[PhysicsEngine] = None):
         self.name = name
         self.config = config
         self.logger = logging.getLogger(f"agent.{name}")
         
-        # Initialize core systems
-        self.world_state = WorldState()
-        self.action_system = ActionSystem(config.get("ACTION_COOLDOWN", 1.0))
+        # Initialize core systems (world state and physics may be shared, e.g. by an AgentHost)
+        self.world_state = world_state or WorldState()
+        self.action_system = ActionSystem(
+            config.get("ACTION_COOLDOWN", 1.0),
+            rate_limits=config.get("ACTION_RATE_LIMITS"),
+            rate_burst=config.get("ACTION_RATE_BURST", 1.0),
+            history_size=config.get("ACTION_HISTORY_SIZE", 100),
+            priority_aging=config.get("ACTION_PRIORITY_AGING", 0.0),
+            coalesce=config.get("ACTION_COALESCING", True),
+            preemption=config.get("ACTION_PREEMPTION", True)
+        )
+        self.scheduler = TickScheduler(
+            config.get("AGENT_TICK_RATE", 60.0),
+            max_catch_up=config.get("AGENT_MAX_CATCH_UP", 5),
+            idle_interval=config.get("AGENT_IDLE_INTERVAL", 0.5)
+        )
+        # Queued actions end an idle sleep and any LOD countdown immediately
+        self.action_system.add_hook("on_queue", self._on_action_queued)
+        # One-shot and repeating timers, fired at the start of each step
+        self.timers = TimerWheel(self.scheduler.step)
         self.voice_manager = VoiceManager(config) if config.get("VOICE_RECOGNITION_ENABLED", True) else None
-        self.physics_engine = PhysicsEngine(config) if config.get("PHYSICS_ENABLED", True) else None
+        if physics_engine is None and config.get("PHYSICS_ENABLED", True):
+            physics_engine = PhysicsEngine(config)
+        self.physics_engine = physics_engine
         
         # State variables
         self.is_running = False
         self.last_update_time = 0
         self.update_thread = None
-        self.event_handlers = {}
+        self.host = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.update_task: Optional[asyncio.Task] = None
+        self.executor = None
+        self.event_bus = EventBus(
+            config.get("EVENT_QUEUE_SIZE", 1024),
+            overflow=OverflowPolicy[config.get("EVENT_OVERFLOW", "drop_oldest").upper()],
+            name=f"{name}.events"
+        )
+        self.event_waiters: Dict[str, List[asyncio.Future]] = {}
+        self.metrics_server = None
+        self.profiler: Optional[TickProfiler] = None
+        self.lod: Optional[TickLod] = None
+        # Optional replacement for local text-to-speech, called as (text, voice_id)
+        self.speech_handler: Optional[Callable[[str, Optional[str]], bool]] = None
         
         # Agent properties
         self.position = [0, 0, 0]
@@ -41,6 +89,13 @@ class AgentBase:
         self.scale = [1, 1, 1]
         self.velocity = [0, 0, 0]
         
+        if config.get("METRICS_ENABLED", False):
+            self.action_system.enable_metrics(metrics.default_registry, agent_name=name)
+        if config.get("PROFILER_ENABLED", False):
+            self.enable_profiler(config.get("PROFILER_BUDGET"))
+        if config.get("LOD_ENABLED", False):
+            self.enable_lod(config.get("LOD_TIERS", DEFAULT_TIERS))
+        
         self.logger.info(f"Agent {name} initialized with config: {config}")
     
     def start(self):
@@ -53,7 +108,7 @@ class AgentBase:
             
         self.logger.info(f"Starting agent {self.name}")
         self.is_running = True
-        self.last_update_time = time.time()
+        self.last_update_time = clock.now()
         
         # Start subsystems
         if self.voice_manager:
@@ -62,6 +117,8 @@ class AgentBase:
         if self.physics_engine:
             self.physics_engine.start()
             self._register_with_physics_engine()
+            
+        self._start_metrics_server()
         
         # Start update thread
         self.update_thread = threading.Thread(target=self._update_loop)
@@ -82,28 +139,223 @@ class AgentBase:
             
         self.logger.info(f"Stopping agent {self.name}")
         self.is_running = False
+        self.scheduler.wake()
         
         # Stop subsystems
         if self.voice_manager:
             self.voice_manager.stop()
             
         if self.physics_engine:
-            self.physics_engine.stop()
+            if self.host is None:
+                self.physics_engine.stop()
+            else:
+                # The scene belongs to the host; only leave it
+                self.physics_engine.unregister_agent(self.name)
+        self.host = None
         
         # Wait for update thread to finish
         if self.update_thread and self.update_thread.is_alive():
             self.update_thread.join(timeout=2.0)
+            
+        self.dump_metrics()
+        
+        self.on_stop()
+    
+    def start_hosted(self, host) -> bool:
+        """
+        Start the agent under an AgentHost
+        The host ticks the agent from its shared scheduler, so no update thread is
+        started, and the agent uses the host's world state, physics scene and voice
+        """
+        if self.is_running:
+            self.logger.warning("Agent is already running")
+            return False
+            
+        self.logger.info(f"Starting agent {self.name} on host")
+        self.host = host
+        self.world_state = host.world_state
+        self.scheduler = host.scheduler
+        self.is_running = True
+        self.last_update_time = clock.now()
+        
+        self.physics_engine = host.physics_engine
+        if self.physics_engine:
+            self._register_with_physics_engine()
+            
+        self._register_default_event_handlers()
+        
+        self.on_start()
+        return True
+    
+    async def start_async(self):
+        """
+        Start the agent as tasks on the running event loop
+        Subsystems that block are driven through the shared executor instead of
+        running threads of their own
+        """
+        if self.is_running:
+            self.logger.warning("Agent is already running")
+            return
+            
+        self.logger.info(f"Starting agent {self.name} (asyncio)")
+        self.loop = asyncio.get_running_loop()
+        self.executor = get_blocking_executor(self.config.get("ASYNC_EXECUTOR_WORKERS"))
+        self.is_running = True
+        self.last_update_time = clock.now()
+        
+        # Start subsystems
+        if self.voice_manager:
+            self.voice_manager.start_async(self._on_voice_input)
+            
+        if self.physics_engine:
+            self.physics_engine.start(threaded=False)
+            self._register_with_physics_engine()
+            
+        self._start_metrics_server()
+        
+        # Deliver events from a bounded queue instead of on the emitting thread
+        if self.config.get("EVENT_DELIVERY", "sync") == "queued":
+            self.event_bus.start()
+            
+        # Start update task
+        self.update_task = self.loop.create_task(self._async_update_loop(), name=f"agent-{self.name}")
+        
+        # Register default events
+        self._register_default_event_handlers()
+        
+        self.on_start()
+        
+    async def stop_async(self):
+        """
+        Stop an agent started with start_async() and wait for its tasks to finish
+        """
+        if not self.is_running:
+            return
+            
+        self.logger.info(f"Stopping agent {self.name}")
+        self.is_running = False
+        self.scheduler.wake()
+        
+        # Stop subsystems
+        if self.voice_manager:
+            await self.voice_manager.stop_async()
+            
+        if self.physics_engine:
+            self.physics_engine.stop()
+            
+        # Wait for the update task to finish its current frame
+        if self.update_task and self.update_task is not asyncio.current_task():
+            await asyncio.gather(self.update_task, return_exceptions=True)
+            
+        await self.event_bus.stop()
+            
+        for waiters in self.event_waiters.values():
+            for future in waiters:
+                future.cancel()
+        self.event_waiters.clear()
+            
+        self.dump_metrics()
         
         self.on_stop()
+        
+    async def run_async(self):
+        """
+        Run the agent on the current event loop until it is stopped or cancelled
+        """
+        await self.start_async()
+        try:
+            await self.update_task
+        finally:
+            await self.stop_async()
+    
+    def _start_metrics_server(self):
+        """
+        Serve action metrics over HTTP if metrics and METRICS_PORT are configured
+        """
+        if self.action_system.metrics is not None and self.config.get("METRICS_PORT"):
+            try:
+                self.metrics_server = metrics.start_http_server(
+                    self.config["METRICS_PORT"], self.config.get("METRICS_HOST", "127.0.0.1"))
+            except OSError as e:
+                self.logger.error(f"Failed to start metrics server: {e}")
+    
+    async def _async_update_loop(self):
+        """
+        Main update loop running as a task on the event loop
+        """
+        scheduler = self.scheduler
+        scheduler.reset(clock.monotonic())
+        while self.is_running:
+            frame_start = clock.monotonic()
+            steps = scheduler.begin_frame(frame_start)
+            if steps:
+                profiler = self.profiler
+                if profiler is not None:
+                    profiler.begin_frame()
+                # Step physics off the event loop
+                if self.physics_engine and self.physics_engine.is_running:
+                    if profiler is not None:
+                        profiler.enter("physics")
+                    await self.loop.run_in_executor(self.executor, self.physics_engine.advance, steps * scheduler.step)
+                    if profiler is not None:
+                        profiler.exit()
+                self._run_steps(steps)
+                scheduler.end_frame(frame_start, clock.monotonic())
+                if profiler is not None:
+                    profiler.end_frame(steps)
+                
+            # Externally stepped physics needs ticks even without actions
+            physics_active = self.physics_engine is not None and self.physics_engine.is_running
+            await scheduler.wait_async(self.is_idle() and not physics_active)
     
     def _update_loop(self):
         """
         Main update loop running on its own thread
         """
+        scheduler = self.scheduler
+        scheduler.reset(clock.monotonic())
         while self.is_running:
-            current_time = time.time()
-            delta_time = current_time - self.last_update_time
-            self.last_update_time = current_time
+            frame_start = clock.monotonic()
+            steps = scheduler.begin_frame(frame_start)
+            if steps:
+                profiler = self.profiler
+                if profiler is not None:
+                    profiler.begin_frame()
+                self._run_steps(steps)
+                scheduler.end_frame(frame_start, clock.monotonic())
+                if profiler is not None:
+                    profiler.end_frame(steps)
+                
+            scheduler.wait(self.is_idle())
+            
+    def _run_steps(self, steps: int):
+        """
+        Run `steps` fixed-size updates of the agent and its action system
+        """
+        delta_time = self.scheduler.step
+        for _ in range(steps):
+            self.tick(delta_time)
+        self.last_update_time = clock.now()
+        
+    def tick(self, delta_time: float):
+        """
+        Run one fixed step of the agent and its action system
+        With LOD enabled, an agent far from every player skips steps and catches up
+        their time on the steps it runs
+        """
+        lod = self.lod
+        if lod is not None:
+            delta_time = lod.before_step(self.world_state, self.position, delta_time)
+            if not delta_time:
+                return
+            tick_start = time.perf_counter()
+            
+        profiler = self.profiler
+        if profiler is not None:
+            self._run_profiled_step(profiler, delta_time)
+        else:
+            # Fire due timers
+            self.timers.advance(clock.monotonic())
             
             # Update all subsystems
             self.update(delta_time)
@@ -111,8 +363,104 @@ class AgentBase:
             # Process pending actions
             self.action_system.update(delta_time)
             
-            # Sleep to maintain reasonable CPU usage
-            time.sleep(0.016)  # ~60 FPS
+        if lod is not None:
+            lod.tick_time += time.perf_counter() - tick_start
+        
+    def _run_profiled_step(self, profiler: TickProfiler, delta_time: float):
+        profiler.enter("timers")
+        try:
+            self.timers.advance(clock.monotonic())
+        finally:
+            profiler.exit()
+        profiler.enter("update")
+        try:
+            self.update(delta_time)
+        finally:
+            profiler.exit()
+        profiler.enter("action_system")
+        try:
+            self.action_system.update(delta_time)
+        finally:
+            profiler.exit()
+    
+    def is_idle(self) -> bool:
+        """
+        Check if the agent has nothing to tick, so its loop may sleep until woken
+        Subclasses whose update() needs ticks at the full rate should override this
+        """
+        return self.action_system.is_idle()
+    
+    def get_tick_stats(self) -> Dict[str, Any]:
+        """
+        Get update loop statistics: steps, overruns, dropped steps and tick jitter
+        """
+        return self.scheduler.get_stats()
+    
+    def enable_profiler(self, budget: Optional[float] = None) -> TickProfiler:
+        """
+        Time each phase of every update loop frame and report frames over budget
+        `budget` is in seconds per fixed step and defaults to one step (1 / AGENT_TICK_RATE)
+        """
+        self.profiler = TickProfiler(
+            budget or self.scheduler.step,
+            window=self.config.get("PROFILER_WINDOW", 300),
+            report_interval=self.config.get("PROFILER_REPORT_INTERVAL", 1.0),
+            report_file=self.config.get("PROFILER_REPORT_FILE"),
+            name=self.name
+        )
+        self.action_system.profiler = self.profiler
+        self.event_bus.profiler = self.profiler
+        return self.profiler
+    
+    def disable_profiler(self):
+        """
+        Stop profiling the update loop
+        """
+        self.profiler = None
+        self.action_system.profiler = None
+        self.event_bus.profiler = None
+    
+    def enable_lod(self, tiers=DEFAULT_TIERS) -> TickLod:
+        """
+        Throttle the agent's tick rate by its distance to the nearest player
+        `tiers` are [max_distance, interval] pairs: within max_distance the agent runs one step in `interval`
+        """
+        registry = metrics.default_registry if self.config.get("METRICS_ENABLED", False) else None
+        self.lod = TickLod(tiers, agent_name=self.name, registry=registry)
+        return self.lod
+    
+    def disable_lod(self):
+        """
+        Tick the agent on every step regardless of player distance
+        """
+        self.lod = None
+    
+    def get_lod_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Current LOD tier and steps skipped, or None when LOD is disabled
+        """
+        return self.lod.get_stats() if self.lod is not None else None
+    
+    def get_profile_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Frame time and per-phase breakdown over the profiler's window, or None when not profiling
+        """
+        return self.profiler.get_stats() if self.profiler is not None else None
+    
+    def dump_metrics(self, path: str = None) -> bool:
+        """
+        Write action metrics in Prometheus text format to a file (METRICS_FILE by default)
+        """
+        path = path or self.config.get("METRICS_FILE")
+        if not path or self.action_system.metrics is None:
+            return False
+            
+        try:
+            metrics.default_registry.dump(path)
+            return True
+        except OSError as e:
+            self.logger.error(f"Failed to dump metrics to {path}: {e}")
+            return False
     
     def update(self, delta_time: float):
         """
@@ -135,34 +483,79 @@ class AgentBase:
         """
         pass
     
-    def register_event_handler(self, event_name: str, handler: Callable):
+    def register_event_handler(self, event_name: str, handler: Callable) -> Subscription:
         """
         Register a function to handle a specific event
+        `event_name` may be a wildcard pattern such as "player.*" or "#". The handler
+        receives the event's payload dict
         """
-        if event_name not in self.event_handlers:
-            self.event_handlers[event_name] = []
-        
-        self.event_handlers[event_name].append(handler)
-        self.logger.debug(f"Registered handler for event: {event_name}")
+        subscription = self.event_bus.subscribe(event_name, lambda event: handler(event.payload()))
+        self.logger.debug("Registered handler for event: %s", event_name)
+        return subscription
+    
+    def unregister_event_handler(self, subscription: Subscription) -> bool:
+        """
+        Remove a handler registered with register_event_handler()
+        """
+        return self.event_bus.unsubscribe(subscription)
     
     def emit_event(self, event_name: str, data: Dict[str, Any] = None):
         """
         Emit an event to all registered handlers
+        Handlers receive a copy of `data` with "source" and "timestamp" added
         """
-        if not data:
-            data = {}
-            
-        data["source"] = self.name
-        data["timestamp"] = time.time()
+        waiters = self.event_waiters.pop(event_name, None)
+        if not waiters and not self.event_bus.has_subscribers(event_name):
+            return
+        self._dispatch_event(event_from_dict(event_name, data, self.name), waiters)
+    
+    def publish(self, event: Event):
+        """
+        Emit a typed event, stamping its source and timestamp if unset
+        """
+        waiters = self.event_waiters.pop(event.topic, None)
+        if not waiters and not self.event_bus.has_subscribers(event.topic):
+            return
+        if event.source is None:
+            event.source = self.name
+        if event.timestamp is None:
+            event.timestamp = clock.now()
+        self._dispatch_event(event, waiters)
+    
+    def _dispatch_event(self, event: Event, waiters: Optional[List[asyncio.Future]]):
+        self.event_bus.publish(event)
+        
+        # Let the update loop react without waiting out an idle sleep
+        self.scheduler.wake()
         
-        if event_name in self.event_handlers:
-            for handler in self.event_handlers[event_name]:
-                try:
-                    handler(data)
-                except Exception as e:
-                    self.logger.error(f"Error in event handler for {event_name}: {e}")
+        # Wake coroutines waiting for this event
+        if waiters:
+            payload = event.payload()
+            for future in waiters:
+                resolve_future(future, payload)
         
-        self.logger.debug(f"Emitted event: {event_name} with data: {data}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Emitted event: %s with data: %s", event.topic, event.payload())
+    
+    async def wait_for_event(self, event_name: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Wait for the next emission of an event, e.g. a connector reply, and return its data
+        Raises asyncio.TimeoutError if `timeout` seconds pass first
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.event_waiters.setdefault(event_name, []).append(future)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            waiters = self.event_waiters.get(event_name)
+            if waiters and future in waiters:
+                waiters.remove(future)
+    
+    async def run_blocking(self, func: Callable, *args) -> Any:
+        """
+        Run a blocking call (e.g. an LLM request) on the shared executor and await its result
+        """
+        return await run_blocking(func, *args, executor=self.executor)
     
     def queue_action(self, action: Action):
         """
@@ -174,7 +567,11 @@ class AgentBase:
         """
         Make the agent speak using text-to-speech
         """
-        if not self.voice_manager:
+        if self.speech_handler is not None:
+            return self.speech_handler(text, voice_id)
+            
+        voice_manager = self.host.voice_manager if self.host is not None else self.voice_manager
+        if not voice_manager:
             self.logger.warning(f"Voice not enabled, can't say: {text}")
             return False
             
@@ -182,16 +579,28 @@ class AgentBase:
         if not voice_id:
             voice_id = self.config.get("AGENT_VOICE_ID", "default")
             
-        return self.voice_manager.speak(text, voice_id)
+        return voice_manager.speak(text, voice_id)
     
-    def move_to(self, position: List[float], speed: float = 1.0):
+    def move_to(self, position: List[float], speed: float = 1.0, ttl: Optional[float] = None, mode: str = "path"):
         """
         Move the agent to a specific position
+        If `ttl` is given the move is dropped when it is still queued after that many seconds.
+        Use mode "flow" for positions many agents head to at once (see MovementAction).
         """
         from ..physics.movement_action import MovementAction
-        action = MovementAction(self, position, speed)
+        action = MovementAction(self, position, speed, mode=mode)
+        if ttl is not None:
+            action.set_ttl(ttl)
         return self.queue_action(action)
     
+    def _on_action_queued(self, action: Action):
+        """
+        Make sure a newly queued action starts on the next step
+        """
+        self.scheduler.wake()
+        if self.lod is not None:
+            self.lod.wake()
+    
     def _on_voice_input(self, text: str, confidence: float):
         """
         Handle voice input from the voice recognition system
@@ -199,7 +608,7 @@ class AgentBase:
         self.logger.info(f"Voice input: '{text}' (confidence: {confidence:.2f})")
         
         # Emit voice input event
-        self.emit_event("voice_input", {"text": text, "confidence": confidence})
+        self.publish(VoiceInputEvent(text, confidence))
         
         # Call the overridable method
         self.on_voice_input(text, confidence)
@@ -216,6 +625,7 @@ class AgentBase:
         Register the agent with the physics engine
         """
         if self.physics_engine:
+            self.physics_engine.attach_world_state(self.world_state)
             self.physics_engine.register_agent(self)
     
     def _register_default_event_handlers(self):
@@ -229,7 +639,7 @@ class AgentBase:
         """
         Default collision handler
         """
-        self.logger.debug(f"Collision detected: {data}")
+        self.logger.debug("Collision detected: %s", data)
         self.on_collision(data)
     
     def on_collision(self, data: Dict[str, Any]):
@@ -243,7 +653,7 @@ class AgentBase:
         """
         Default handler for when a player is nearby
         """
-        self.logger.debug(f"Player nearby: {data}")
+        self.logger.debug("Player nearby: %s", data)
         self.on_player_nearby(data)
     
     def on_player_nearby(self, data: Dict[str, Any]):
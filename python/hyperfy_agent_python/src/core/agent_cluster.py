@@ -0,0 +1,409 @@
+import os
+import time
+import logging
+import threading
+import multiprocessing
+from collections import deque
+from multiprocessing import connection
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+from .world_state import WorldState, WorldObject, Player
+
+logger = logging.getLogger("agent_cluster")
+
+def default_worker_count() -> int:
+    """
+    Number of CPU cores this process may run on
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def create_base_agent(config: Dict[str, Any], name: str, **kwargs):
+    """
+    Default agent factory for cluster workers
+    """
+    from .agent_base import AgentBase
+    return AgentBase(name, config, **kwargs)
+
+def apply_world_change(world_state: WorldState, change: Tuple[str, str, Optional[Dict[str, Any]]]):
+    """
+    Apply one (kind, object_id, data) change forwarded by AgentCluster to a worker's world state
+    """
+    kind, object_id, data = change
+    if kind == "remove":
+        if not world_state.remove_player(object_id):
+            world_state.remove_object(object_id)
+        return
+    if world_state.update_object(object_id, data["position"], data["rotation"], data["scale"], data["properties"]):
+        return
+    if data["object_type"] == "player":
+        world_state.add_player(Player.from_dict(data))
+    else:
+        world_state.add_object(WorldObject.from_dict(data))
+
+def _worker_main(worker_id: int, conn, config: Dict[str, Any], agent_factory: Callable,
+                 names: List[str], world_snapshot: Optional[Dict[str, Any]]):
+    """
+    Entry point of a worker process
+    Runs an AgentHost for its shard of agents. Messages from the parent arrive in
+    batches and are applied between frames; actions, speech and periodic stats
+    produced by the agents are sent back as one batch per frame.
+    """
+    from .agent_host import AgentHost
+
+    # Speech goes to the parent through speech_handler; workers never open the microphone
+    config = {**config, "VOICE_RECOGNITION_ENABLED": False}
+    host = AgentHost(config)
+    if world_snapshot:
+        host.world_state.from_dict(world_snapshot)
+    outbox: List[Tuple[str, Optional[str], Any]] = []
+
+    def spawn(name: str):
+        agent = agent_factory(config, name, world_state=host.world_state, physics_engine=host.physics_engine)
+        agent.speech_handler = lambda text, voice_id: outbox.append(("say", name, (text, voice_id))) or True
+        agent.action_system.add_hook("pre_execute", lambda action: outbox.append(("action", name, action.to_dict())))
+        host.add_agent(agent)
+
+    for name in names:
+        spawn(name)
+
+    if host.physics_engine:
+        host.physics_engine.start(threaded=False)
+    scheduler = host.scheduler
+    scheduler.reset(time.monotonic())
+    stats_interval = config.get("CLUSTER_STATS_INTERVAL", 1.0)
+    next_stats = time.monotonic()
+    running = True
+    try:
+        while running:
+            # The pipe doubles as the wake-up source while idle
+            if conn.poll(scheduler.wait_timeout(host.is_idle(), time.monotonic())):
+                while running and conn.poll():
+                    for message in conn.recv():
+                        running = _handle_worker_message(host, spawn, message)
+                        if not running:
+                            break
+
+            frame_start = time.monotonic()
+            steps = scheduler.begin_frame(frame_start)
+            if steps:
+                if host.physics_engine and host.physics_engine.is_running:
+                    host.physics_engine.advance(steps * scheduler.step)
+                for _ in range(steps):
+                    host.tick()
+                scheduler.end_frame(frame_start, time.monotonic())
+
+            if frame_start >= next_stats:
+                outbox.append(("stats", None, host.get_stats()))
+                next_stats = frame_start + stats_interval
+            if outbox:
+                conn.send(outbox)
+                outbox.clear()
+    except (EOFError, BrokenPipeError, KeyboardInterrupt):
+        pass  # Parent went away
+    finally:
+        for name in list(host.agents):
+            host.remove_agent(name)
+        if host.physics_engine:
+            host.physics_engine.stop()
+
+def _handle_worker_message(host, spawn: Callable, message: Tuple) -> bool:
+    """
+    Apply one parent message inside a worker
+    Returns False when the worker should stop
+    """
+    kind = message[0]
+    if kind == "world":
+        for change in message[1]:
+            apply_world_change(host.world_state, change)
+    elif kind == "event":
+        _, agent_name, event_name, data = message
+        agents = [host.get_agent(agent_name)] if agent_name else list(host.agent_list)
+        for agent in agents:
+            if agent is not None:
+                agent.emit_event(event_name, data)
+    elif kind == "add":
+        spawn(message[1])
+    elif kind == "remove":
+        host.remove_agent(message[1])
+    elif kind == "stop":
+        return False
+    return True
+
+
+class WorkerShard:
+    """
+    Parent-side handle for one worker process and the agents assigned to it
+    """
+    __slots__ = ("worker_id", "names", "process", "conn", "pending", "restart_times", "restarts",
+                 "failed", "stats")
+
+    def __init__(self, worker_id: int):
+        self.worker_id = worker_id
+        self.names: List[str] = []
+        self.process = None
+        self.conn = None
+        self.pending: List[Tuple] = []
+        self.restart_times: deque = deque()
+        self.restarts = 0
+        self.failed = False
+        self.stats: Dict[str, Any] = {}
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+
+class AgentCluster:
+    """
+    Launcher that partitions agents across worker processes, one per core by default
+    Each worker runs an AgentHost for its shard, so agent logic is no longer bound to
+    the parent's GIL. The parent owns the authoritative WorldState: changes to it are
+    coalesced per object and fanned out to every worker in one pipe message per
+    flush interval, along with queued events and agent additions or removals.
+    Actions started and lines spoken by agents come back in per-frame batches and
+    are passed to `on_action(agent_name, action_dict)` and
+    `on_speech(agent_name, text, voice_id)` on the supervisor thread.
+
+    The supervisor restarts a crashed worker with the same agents (their in-memory
+    state is lost) and the current world snapshot, up to `CLUSTER_MAX_RESTARTS`
+    times per `CLUSTER_RESTART_WINDOW` seconds before giving up on that shard.
+
+    `agent_factory(config, name, world_state=..., physics_engine=...)` builds each
+    agent inside its worker and must be picklable with the chosen start method.
+    """
+    def __init__(self, config: Dict[str, Any], agent_names: List[str], agent_factory: Callable = create_base_agent,
+                 workers: Optional[int] = None, world_state: Optional[WorldState] = None,
+                 on_action: Optional[Callable] = None, on_speech: Optional[Callable] = None):
+        self.config = config
+        self.agent_factory = agent_factory
+        self.worker_count = max(1, workers or config.get("CLUSTER_WORKERS") or default_worker_count())
+        self.flush_interval = config.get("CLUSTER_FLUSH_INTERVAL", 1 / 60)
+        self.max_restarts = config.get("CLUSTER_MAX_RESTARTS", 5)
+        self.restart_window = config.get("CLUSTER_RESTART_WINDOW", 60.0)
+        self.context = multiprocessing.get_context(config.get("CLUSTER_START_METHOD"))
+        self.world_state = world_state or WorldState()
+        self.on_action = on_action
+        self.on_speech = on_speech
+        self.shards = [WorkerShard(i) for i in range(self.worker_count)]
+        self.placement: Dict[str, WorkerShard] = {}
+        self.world_changes: Dict[str, Tuple] = {}
+        self.lock = threading.Lock()
+        self.is_running = False
+        self.supervisor_thread = None
+
+        for i, name in enumerate(agent_names):
+            shard = self.shards[i % self.worker_count]
+            shard.names.append(name)
+            self.placement[name] = shard
+
+    def start(self):
+        """
+        Start the worker processes and the supervisor thread
+        """
+        if self.is_running:
+            logger.warning("Agent cluster is already running")
+            return
+        self.is_running = True
+        self.world_state.add_change_listener(self._on_world_change)
+        for shard in self.shards:
+            self._spawn(shard)
+        self.supervisor_thread = threading.Thread(target=self._supervise, name="agent-cluster-supervisor")
+        self.supervisor_thread.daemon = True
+        self.supervisor_thread.start()
+        logger.info(f"Agent cluster started: {len(self.placement)} agents on {self.worker_count} workers")
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Stop every worker, terminating any that do not exit within `timeout` seconds
+        """
+        if not self.is_running:
+            return
+        self.is_running = False
+        if self.supervisor_thread:
+            self.supervisor_thread.join(timeout=timeout)
+        self.world_state.remove_change_listener(self._on_world_change)
+
+        for shard in self.shards:
+            if shard.is_alive():
+                try:
+                    shard.conn.send([("stop",)])
+                except (OSError, ValueError):
+                    pass
+        deadline = time.monotonic() + timeout
+        for shard in self.shards:
+            if shard.process is None:
+                continue
+            shard.process.join(max(0.0, deadline - time.monotonic()))
+            if shard.process.is_alive():
+                shard.process.terminate()
+                shard.process.join(1.0)
+            shard.conn.close()
+        logger.info("Agent cluster stopped")
+
+    def add_agent(self, name: str) -> bool:
+        """
+        Start a new agent on the worker with the fewest agents
+        """
+        with self.lock:
+            if name in self.placement:
+                return False
+            candidates = [shard for shard in self.shards if not shard.failed] or self.shards
+            shard = min(candidates, key=lambda s: len(s.names))
+            shard.names.append(name)
+            self.placement[name] = shard
+            shard.pending.append(("add", name))
+        return True
+
+    def remove_agent(self, name: str) -> bool:
+        """
+        Stop an agent on whichever worker runs it
+        """
+        with self.lock:
+            shard = self.placement.pop(name, None)
+            if shard is None:
+                return False
+            shard.names.remove(name)
+            shard.pending.append(("remove", name))
+        return True
+
+    def emit_event(self, event_name: str, data: Optional[Dict[str, Any]] = None, agent_name: Optional[str] = None):
+        """
+        Deliver an event to one agent, or to every agent when `agent_name` is None
+        """
+        with self.lock:
+            if agent_name is not None:
+                shard = self.placement.get(agent_name)
+                if shard is not None:
+                    shard.pending.append(("event", agent_name, event_name, data))
+                return
+            for shard in self.shards:
+                if shard.names:
+                    shard.pending.append(("event", None, event_name, data))
+
+    def get_worker_for(self, agent_name: str) -> Optional[int]:
+        """
+        Id of the worker running an agent
+        """
+        shard = self.placement.get(agent_name)
+        return shard.worker_id if shard else None
+
+    def _on_world_change(self, change_type: str, obj: WorldObject):
+        # Only the latest state of each object is forwarded per flush
+        change = ("remove", obj.object_id, None) if change_type.startswith("remove") else \
+            ("upsert", obj.object_id, obj.to_dict())
+        with self.lock:
+            self.world_changes[obj.object_id] = change
+
+    def _spawn(self, shard: WorkerShard):
+        parent_conn, child_conn = self.context.Pipe()
+        with self.lock:
+            names = list(shard.names)
+            shard.pending.clear()
+        shard.process = self.context.Process(
+            target=_worker_main,
+            args=(shard.worker_id, child_conn, self.config, self.agent_factory, names, self.world_state.to_dict()),
+            name=f"agent-worker-{shard.worker_id}"
+        )
+        shard.process.daemon = True
+        shard.process.start()
+        child_conn.close()
+        shard.conn = parent_conn
+
+    def _supervise(self):
+        """
+        Supervisor loop: collect worker output, restart crashed workers and flush batched messages
+        """
+        next_flush = time.monotonic()
+        while self.is_running:
+            live = [shard for shard in self.shards if shard.is_alive()]
+            by_handle = {}
+            for shard in live:
+                by_handle[shard.conn] = shard
+                by_handle[shard.process.sentinel] = shard
+            ready = connection.wait(list(by_handle), timeout=max(0.0, next_flush - time.monotonic()))
+
+            for handle in ready:
+                shard = by_handle[handle]
+                if handle is shard.conn:
+                    self._drain(shard)
+
+            for shard in self.shards:
+                if not shard.failed and not shard.is_alive() and self.is_running:
+                    self._restart(shard)
+
+            if time.monotonic() >= next_flush:
+                self._flush()
+                next_flush = time.monotonic() + self.flush_interval
+
+    def _drain(self, shard: WorkerShard):
+        try:
+            while shard.conn.poll():
+                for kind, agent_name, payload in shard.conn.recv():
+                    if kind == "action":
+                        if self.on_action:
+                            self.on_action(agent_name, payload)
+                    elif kind == "say":
+                        if self.on_speech:
+                            self.on_speech(agent_name, *payload)
+                    elif kind == "stats":
+                        shard.stats = payload
+        except (EOFError, OSError):
+            pass  # Worker died; handled by the restart check
+        except Exception as e:
+            logger.error(f"Error handling output of worker {shard.worker_id}: {e}")
+
+    def _restart(self, shard: WorkerShard):
+        now = time.monotonic()
+        exitcode = shard.process.exitcode if shard.process else None
+        while shard.restart_times and now - shard.restart_times[0] > self.restart_window:
+            shard.restart_times.popleft()
+        if len(shard.restart_times) >= self.max_restarts:
+            shard.failed = True
+            logger.error(f"Worker {shard.worker_id} crashed {len(shard.restart_times) + 1} times within "
+                         f"{self.restart_window}s; giving up on its {len(shard.names)} agents")
+            return
+        logger.error(f"Worker {shard.worker_id} exited with code {exitcode}; restarting {len(shard.names)} agents")
+        shard.restart_times.append(now)
+        shard.restarts += 1
+        if shard.conn:
+            shard.conn.close()
+        self._spawn(shard)
+
+    def _flush(self):
+        """
+        Send each live worker everything queued for it as a single batch
+        """
+        with self.lock:
+            changes = list(self.world_changes.values())
+            self.world_changes.clear()
+            batches = []
+            for shard in self.shards:
+                messages = shard.pending
+                shard.pending = []
+                if changes:
+                    messages.insert(0, ("world", changes))
+                if messages and shard.is_alive():
+                    batches.append((shard, messages))
+        for shard, messages in batches:
+            try:
+                shard.conn.send(messages)
+            except (OSError, ValueError) as e:
+                logger.error(f"Failed to send to worker {shard.worker_id}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Per-worker agent counts, restarts and the latest tick stats reported by each worker
+        """
+        return {
+            "workers": [{
+                "worker_id": shard.worker_id,
+                "alive": shard.is_alive(),
+                "failed": shard.failed,
+                "agents": len(shard.names),
+                "restarts": shard.restarts,
+                "tick": shard.stats
+            } for shard in self.shards],
+            "agents": len(self.placement)
+        }
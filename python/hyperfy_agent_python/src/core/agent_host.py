@@ -0,0 +1,289 @@
+import asyncio
+import threading
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+
+from ..physics.physics_engine import PhysicsEngine
+from ..voice.voice_manager import VoiceManager
+from . import clock
+from .world_state import WorldState
+from .tick_scheduler import TickScheduler
+from .async_runtime import get_blocking_executor
+from .tick_lod import summarize_lod
+from . import metrics
+
+class AgentHost:
+    """
+    Runs many agents in one process on a single shared scheduler
+    All hosted agents share one WorldState and one physics scene, and are ticked
+    together from one update loop (a thread, or a task with run_async) instead of a
+    thread per agent. Agents can be added and removed while the host is running.
+
+    Agents are ticked in batches of `HOST_BATCH_SIZE`; in asyncio mode the host
+    yields to the event loop between batches so a large tick does not starve I/O.
+
+    With `VOICE_RECOGNITION_ENABLED` the host owns the only VoiceManager: one
+    microphone and one speech engine for the whole process. Recognized text goes
+    to the agents named in it, or to every agent if it names none, and hosted
+    agents speak through it.
+    """
+    def __init__(self, config: Dict[str, Any], world_state: Optional[WorldState] = None,
+                 physics_engine: Optional[PhysicsEngine] = None):
+        self.config = config
+        self.logger = logging.getLogger("agent_host")
+        self.world_state = world_state or WorldState()
+        if physics_engine is None and config.get("PHYSICS_ENABLED", True):
+            physics_engine = PhysicsEngine(config)
+        self.physics_engine = physics_engine
+        self.voice_manager = VoiceManager(config) if config.get("VOICE_RECOGNITION_ENABLED", True) else None
+        self.scheduler = TickScheduler(
+            config.get("AGENT_TICK_RATE", 60.0),
+            max_catch_up=config.get("AGENT_MAX_CATCH_UP", 5),
+            idle_interval=config.get("AGENT_IDLE_INTERVAL", 0.5)
+        )
+        self.batch_size = max(1, config.get("HOST_BATCH_SIZE", 64))
+        self.agents: Dict[str, Any] = {}
+        # Copy-on-write snapshot ticked by the update loop, so agents can be
+        # added or removed from any thread, or from inside a tick
+        self.agent_list: Tuple = ()
+        self.lock = threading.Lock()
+        self.is_running = False
+        self.update_thread = None
+        self.update_task: Optional[asyncio.Task] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.executor = None
+        self.metrics_server = None
+
+    def add_agent(self, agent) -> bool:
+        """
+        Register and start an agent on this host
+        Returns False if an agent with the same name is already hosted
+        """
+        with self.lock:
+            if agent.name in self.agents:
+                self.logger.warning(f"Agent {agent.name} is already hosted")
+                return False
+            self.agents[agent.name] = agent
+            self.agent_list = tuple(self.agents.values())
+
+        if not agent.start_hosted(self):
+            self._forget(agent.name)
+            return False
+        self.scheduler.wake()
+        self.logger.debug(f"Added agent {agent.name}, {len(self.agent_list)} hosted")
+        return True
+
+    def remove_agent(self, name: str) -> bool:
+        """
+        Stop an agent and remove it from this host
+        """
+        agent = self._forget(name)
+        if agent is None:
+            return False
+        agent.stop()
+        self.logger.debug(f"Removed agent {name}, {len(self.agent_list)} hosted")
+        return True
+
+    def _forget(self, name: str):
+        with self.lock:
+            agent = self.agents.pop(name, None)
+            if agent is not None:
+                self.agent_list = tuple(self.agents.values())
+        return agent
+
+    def get_agent(self, name: str):
+        """
+        Get a hosted agent by name
+        """
+        return self.agents.get(name)
+
+    def get_agent_count(self) -> int:
+        """
+        Get the number of hosted agents
+        """
+        return len(self.agent_list)
+
+    def start(self, threaded: bool = True):
+        """
+        Start the shared update loop on its own thread
+        With `threaded=False` no loop is started and the caller drives the host with step()
+        """
+        if self.is_running:
+            self.logger.warning("Agent host is already running")
+            return
+        self.is_running = True
+        self._start_subsystems()
+        if threaded:
+            self.update_thread = threading.Thread(target=self._update_loop)
+            self.update_thread.daemon = True
+            self.update_thread.start()
+        self.logger.info(f"Agent host started with {len(self.agent_list)} agents")
+
+    def stop(self):
+        """
+        Stop every hosted agent and the shared update loop
+        """
+        if not self.is_running:
+            return
+        self.is_running = False
+        self.scheduler.wake()
+        if self.update_thread and self.update_thread.is_alive():
+            self.update_thread.join(timeout=2.0)
+        self._stop_agents()
+        if self.voice_manager:
+            self.voice_manager.stop()
+        self.logger.info("Agent host stopped")
+
+    async def run_async(self):
+        """
+        Run the shared update loop as a task on the current event loop until stopped or cancelled
+        """
+        if self.is_running:
+            self.logger.warning("Agent host is already running")
+            return
+        self.is_running = True
+        self.loop = asyncio.get_running_loop()
+        self.executor = get_blocking_executor(self.config.get("ASYNC_EXECUTOR_WORKERS"))
+        self._start_subsystems()
+        self.update_task = self.loop.create_task(self._async_update_loop(), name="agent-host")
+        self.logger.info(f"Agent host started with {len(self.agent_list)} agents (asyncio)")
+        try:
+            await self.update_task
+        finally:
+            self.is_running = False
+            self._stop_agents()
+            if self.voice_manager:
+                await self.voice_manager.stop_async()
+            self.logger.info("Agent host stopped")
+
+    def _start_subsystems(self):
+        # Physics is stepped by the update loop, once per frame for all agents
+        if self.physics_engine:
+            self.physics_engine.attach_world_state(self.world_state)
+            self.physics_engine.start(threaded=False)
+        if self.voice_manager:
+            if self.loop is not None:
+                self.voice_manager.start_async(self._on_voice_input)
+            else:
+                self.voice_manager.start(self._on_voice_input)
+        if self.config.get("METRICS_ENABLED", False) and self.config.get("METRICS_PORT"):
+            try:
+                self.metrics_server = metrics.start_http_server(
+                    self.config["METRICS_PORT"], self.config.get("METRICS_HOST", "127.0.0.1"))
+            except OSError as e:
+                self.logger.error(f"Failed to start metrics server: {e}")
+
+    def _on_voice_input(self, text: str, confidence: float):
+        """
+        Route recognized speech to the hosted agents named in it, or to all of them
+        """
+        agents = [agent for agent in self.agent_list if agent.is_running]
+        lowered = text.lower()
+        addressed = [agent for agent in agents if agent.name.lower() in lowered]
+        for agent in addressed or agents:
+            try:
+                agent._on_voice_input(text, confidence)
+            except Exception as e:
+                self.logger.error(f"Error delivering voice input to agent {agent.name}: {e}")
+
+    def _stop_agents(self):
+        for name in list(self.agents):
+            self.remove_agent(name)
+        if self.physics_engine:
+            self.physics_engine.stop()
+
+    def is_idle(self) -> bool:
+        """
+        Check if every hosted agent is idle and no physics needs stepping
+        """
+        if self.physics_engine is not None and self.physics_engine.is_running:
+            return False
+        return all(not agent.is_running or agent.is_idle() for agent in self.agent_list)
+
+    def _update_loop(self):
+        """
+        Shared update loop running on its own thread
+        """
+        scheduler = self.scheduler
+        scheduler.reset(clock.monotonic())
+        while self.is_running:
+            frame_start = clock.monotonic()
+            steps = scheduler.begin_frame(frame_start)
+            if steps:
+                if self.physics_engine and self.physics_engine.is_running:
+                    self.physics_engine.advance(steps * scheduler.step)
+                for _ in range(steps):
+                    for batch in self._batches():
+                        self.tick_batch(batch, scheduler.step)
+                scheduler.end_frame(frame_start, clock.monotonic())
+
+            scheduler.wait(self.is_idle())
+
+    async def _async_update_loop(self):
+        """
+        Shared update loop running as a task on the event loop
+        """
+        scheduler = self.scheduler
+        scheduler.reset(clock.monotonic())
+        while self.is_running:
+            frame_start = clock.monotonic()
+            steps = scheduler.begin_frame(frame_start)
+            if steps:
+                if self.physics_engine and self.physics_engine.is_running:
+                    await self.loop.run_in_executor(self.executor, self.physics_engine.advance, steps * scheduler.step)
+                for _ in range(steps):
+                    for batch in self._batches():
+                        self.tick_batch(batch, scheduler.step)
+                        # Let other tasks run between batches
+                        await asyncio.sleep(0)
+                scheduler.end_frame(frame_start, clock.monotonic())
+
+            await scheduler.wait_async(self.is_idle())
+
+    def _batches(self) -> List[Tuple]:
+        agents = self.agent_list
+        size = self.batch_size
+        return [agents[i:i + size] for i in range(0, len(agents), size)]
+
+    def step(self, delta_time: Optional[float] = None):
+        """
+        Advance the shared physics scene and tick every hosted agent once
+        """
+        delta_time = self.scheduler.step if delta_time is None else delta_time
+        if self.physics_engine and self.physics_engine.is_running:
+            self.physics_engine.advance(delta_time)
+        self.tick(delta_time)
+
+    def tick(self, delta_time: Optional[float] = None):
+        """
+        Run one update step for every hosted agent
+        """
+        delta_time = self.scheduler.step if delta_time is None else delta_time
+        self.tick_batch(self.agent_list, delta_time)
+
+    def tick_batch(self, agents, delta_time: float):
+        """
+        Run one update step for a batch of agents
+        An agent whose update raises is logged and skipped for this step
+        """
+        now = clock.now()
+        for agent in agents:
+            if not agent.is_running:
+                continue
+            try:
+                agent.tick(delta_time)
+            except Exception as e:
+                self.logger.error(f"Error updating agent {agent.name}: {e}")
+            agent.last_update_time = now
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Number of hosted agents plus the shared scheduler's tick statistics and combined LOD stats
+        """
+        stats = self.scheduler.get_stats()
+        stats["agents"] = len(self.agent_list)
+        stats["batch_size"] = self.batch_size
+        lods = [agent.lod for agent in self.agent_list if agent.lod is not None]
+        if lods:
+            stats["lod"] = summarize_lod(lods)
+        return stats
@@ -0,0 +1,93 @@
+import asyncio
+from typing import Optional
+
+from .action_system import Action, ActionStatus, PreemptionPolicy
+
+class AsyncAction(Action):
+    """
+    Action written as a coroutine
+    Subclasses implement `async def run(self)`, which is scheduled as a task on the
+    agent's event loop when the action starts. The action completes when run()
+    returns and fails if it raises. Inside run() an action can await timers
+    (asyncio.sleep), connector replies (agent.wait_for_event) or child actions
+    (run_child), which are ticked by this action on the agent's update frames.
+
+    AsyncActions need the asyncio runtime (AgentBase.run_async); started without a
+    running event loop they fail immediately. A coroutine cannot be paused from the
+    outside, so preemption cancels them.
+    """
+    __slots__ = ("_task", "_child", "_child_done")
+
+    preemption_policy = PreemptionPolicy.CANCEL
+
+    def __init__(self, agent=None, priority: int = 0, ttl: Optional[float] = None, deadline: Optional[float] = None):
+        super().__init__(agent=agent, priority=priority, ttl=ttl, deadline=deadline)
+        self._task: Optional[asyncio.Task] = None
+        self._child: Optional[Action] = None
+        self._child_done: Optional[asyncio.Future] = None
+
+    async def run(self):
+        """
+        Body of the action
+        Must be implemented by subclasses
+        """
+        raise NotImplementedError("AsyncAction subclasses must implement run()")
+
+    def start(self):
+        """
+        Schedule run() on the running event loop
+        """
+        super().start()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.fail("AsyncAction requires a running event loop (start the agent with run_async)")
+            return
+        self._task = loop.create_task(self.run(), name=f"{self.__class__.__name__}-{self.id}")
+
+    def update(self, delta_time: float) -> bool:
+        """
+        Tick the awaited child action, if any, and report whether run() has finished
+        Re-raises the exception run() ended with so the ActionSystem fails the action
+        """
+        child = self._child
+        if child is not None and self.tick_child(child, delta_time):
+            if not self._child_done.done():
+                self._child_done.set_result(child.status)
+
+        task = self._task
+        if task is None or not task.done():
+            return False
+        if task.cancelled():
+            self.cancel()
+            return True
+        error = task.exception()
+        if error is not None:
+            raise error
+        return True
+
+    async def run_child(self, child: Action) -> ActionStatus:
+        """
+        Run a child action to completion and return its final status
+        The child is ticked by this action on every update and never queued
+        """
+        if child.agent is None:
+            child.agent = self.agent
+        self._child = child
+        self._child_done = asyncio.get_running_loop().create_future()
+        try:
+            return await self._child_done
+        finally:
+            self._child = None
+            self._child_done = None
+
+    def cancel(self):
+        """
+        Cancel the awaited child and the coroutine
+        """
+        child = self._child
+        if child is not None and child.is_active():
+            child.cancel()
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        super().cancel()
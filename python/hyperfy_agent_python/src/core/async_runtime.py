@@ -0,0 +1,54 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Optional
+
+# Process-wide pool that bridges blocking subsystem calls (physics steps, TTS,
+# microphone reads) into the event loop. Shared by every agent so the number of
+# threads does not grow with the number of agents.
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def get_blocking_executor(max_workers: Optional[int] = None) -> ThreadPoolExecutor:
+    """
+    Get (creating on first use) the shared executor for blocking calls
+    `max_workers` only applies when the executor is created
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hyperfy-blocking")
+        return _executor
+
+def shutdown_blocking_executor(wait: bool = True):
+    """
+    Shut down the shared executor; the next get_blocking_executor() creates a new one
+    """
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+async def run_blocking(func: Callable, *args, executor: Optional[ThreadPoolExecutor] = None) -> Any:
+    """
+    Run a blocking function on the shared executor and await its result
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor or get_blocking_executor(), functools.partial(func, *args))
+
+def resolve_future(future: asyncio.Future, result: Any):
+    """
+    Set a future's result from any thread, ignoring futures that are already done
+    """
+    def _set_result():
+        if not future.done():
+            future.set_result(result)
+    future.get_loop().call_soon_threadsafe(_set_result)
+
+async def run_agents(agents: Iterable):
+    """
+    Run several agents as tasks on the current event loop until they all stop
+    """
+    await asyncio.gather(*(agent.run_async() for agent in agents))
@@ -0,0 +1,113 @@
+import time
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+class Clock:
+    """
+    Source of time for agents, actions and world state
+    The default clock reads the system clock. Code that needs the time calls the
+    module-level now() / monotonic() / sleep(), which follow the clock installed
+    with set_clock(), so a simulation can swap in a VirtualClock without any
+    component holding a reference to it.
+    """
+    is_virtual = False
+
+    def time(self) -> float:
+        """
+        Wall-clock seconds since the epoch
+        """
+        return time.time()
+
+    def monotonic(self) -> float:
+        """
+        Seconds from a clock that never goes backwards, for measuring intervals
+        """
+        return time.monotonic()
+
+    def sleep(self, seconds: float):
+        """
+        Let `seconds` pass
+        """
+        time.sleep(seconds)
+
+class VirtualClock(Clock):
+    """
+    Clock that only moves when advanced
+    time() and monotonic() both return the virtual time, which starts at a fixed
+    epoch so timestamps look like wall-clock times and repeated runs see the same
+    values. sleep() advances the clock instead of blocking.
+    """
+    is_virtual = True
+
+    # 2023-11-14T22:13:20Z
+    DEFAULT_START = 1_700_000_000.0
+
+    def __init__(self, start: float = DEFAULT_START):
+        self.now = start
+        self.lock = threading.Lock()
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.advance(seconds)
+
+    def advance(self, seconds: float) -> float:
+        """
+        Move the clock forward and return the new time
+        """
+        if seconds < 0:
+            raise ValueError(f"Cannot move a clock backwards by {seconds}")
+        with self.lock:
+            self.now += seconds
+            return self.now
+
+    def advance_to(self, timestamp: float) -> float:
+        """
+        Move the clock forward to `timestamp`, e.g. start + steps * step without accumulated rounding
+        """
+        with self.lock:
+            if timestamp < self.now:
+                raise ValueError(f"Cannot move a clock backwards from {self.now} to {timestamp}")
+            self.now = timestamp
+            return self.now
+
+_clock: Clock = Clock()
+
+# Bound to the installed clock's methods; call through the module (clock.now())
+now = _clock.time
+monotonic = _clock.monotonic
+sleep = _clock.sleep
+
+def get_clock() -> Clock:
+    """
+    Get the installed clock
+    """
+    return _clock
+
+def set_clock(clock: Clock) -> Clock:
+    """
+    Install a clock for the whole process and return the previous one
+    """
+    global _clock, now, monotonic, sleep
+    previous = _clock
+    _clock = clock
+    now = clock.time
+    monotonic = clock.monotonic
+    sleep = clock.sleep
+    return previous
+
+@contextmanager
+def use_clock(clock: Clock) -> Iterator[Clock]:
+    """
+    Install a clock for the duration of a with block
+    """
+    previous = set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
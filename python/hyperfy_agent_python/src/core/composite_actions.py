@@ -0,0 +1,155 @@
+from typing import List, Optional
+
+from .action_system import Action
+
+class CompositeAction(Action):
+    """
+    Base class for actions that own and drive a set of child actions
+    Children are ticked directly by the parent inside its own update instead of
+    going through the agent's action queue, so a composite never waits on itself.
+    Cancelling a composite cancels every child that is still active.
+    """
+    __slots__ = ("children",)
+
+    def __init__(self, agent=None, children: Optional[List[Action]] = None, priority: int = 0):
+        super().__init__(agent=agent, priority=priority)
+        self.children: List[Action] = []
+        for child in children or []:
+            self.add_child(child)
+
+    def add_child(self, child: Action) -> 'CompositeAction':
+        """
+        Append a child action
+        Returns the composite so calls can be chained
+        """
+        if child.agent is None:
+            child.agent = self.agent
+        self.children.append(child)
+        return self
+
+    def cancel(self):
+        """
+        Cancel the composite and propagate the cancellation down the tree
+        """
+        for child in self.children:
+            if child.is_active():
+                child.cancel()
+        super().cancel()
+
+    def _update_progress(self):
+        """
+        Progress of a composite is the mean progress of its children
+        """
+        if self.children:
+            self.progress = sum(child.progress for child in self.children) / len(self.children)
+
+    def to_dict(self):
+        data = super().to_dict()
+        data["children"] = [child.to_dict() for child in self.children]
+        return data
+
+class SequenceAction(CompositeAction):
+    """
+    Runs children one after another
+    Completes when every child has completed and fails as soon as one child fails.
+    Children that finish instantly are chained within the same update.
+    """
+    __slots__ = ("current_index",)
+
+    def __init__(self, agent=None, children: Optional[List[Action]] = None, priority: int = 0):
+        super().__init__(agent=agent, children=children, priority=priority)
+        self.current_index = 0
+
+    def update(self, delta_time: float) -> bool:
+        while self.current_index < len(self.children):
+            child = self.children[self.current_index]
+            if not self.tick_child(child, delta_time):
+                self._update_progress()
+                return False
+
+            if not child.is_completed():
+                self.fail(f"Child action {child.id} ({child.__class__.__name__}) did not complete: {child.status.name}")
+                return True
+
+            self.current_index += 1
+            # Only the first child of this frame consumes the frame's time
+            delta_time = 0.0
+
+        return True
+
+class SelectorAction(CompositeAction):
+    """
+    Tries children in order until one of them completes
+    Completes with the first successful child and fails only if every child fails.
+    """
+    __slots__ = ("current_index",)
+
+    def __init__(self, agent=None, children: Optional[List[Action]] = None, priority: int = 0):
+        super().__init__(agent=agent, children=children, priority=priority)
+        self.current_index = 0
+
+    def update(self, delta_time: float) -> bool:
+        while self.current_index < len(self.children):
+            child = self.children[self.current_index]
+            if not self.tick_child(child, delta_time):
+                self._update_progress()
+                return False
+
+            if child.is_completed():
+                return True
+
+            self.logger.debug("Selector child %s ended with %s, trying next", child.id, child.status.name)
+            self.current_index += 1
+            delta_time = 0.0
+
+        self.fail("All selector children failed")
+        return True
+
+class ParallelAction(CompositeAction):
+    """
+    Ticks every child on each update
+    With REQUIRE_ALL the composite completes once all children complete and fails on the first failure.
+    With REQUIRE_ONE it completes on the first completed child and fails once all children have failed.
+    Remaining active children are cancelled as soon as the outcome is decided.
+    """
+    __slots__ = ("policy",)
+
+    REQUIRE_ALL = "all"
+    REQUIRE_ONE = "one"
+
+    def __init__(self, agent=None, children: Optional[List[Action]] = None, priority: int = 0,
+                 policy: str = REQUIRE_ALL):
+        super().__init__(agent=agent, children=children, priority=priority)
+        if policy not in (self.REQUIRE_ALL, self.REQUIRE_ONE):
+            raise ValueError(f"Invalid parallel policy: {policy}")
+        self.policy = policy
+
+    def update(self, delta_time: float) -> bool:
+        finished = 0
+        succeeded = 0
+        for child in self.children:
+            if child.is_finished() or self.tick_child(child, delta_time):
+                finished += 1
+                if child.is_completed():
+                    succeeded += 1
+                elif self.policy == self.REQUIRE_ALL:
+                    self._cancel_active_children()
+                    self.fail(f"Child action {child.id} ({child.__class__.__name__}) did not complete: {child.status.name}")
+                    return True
+
+        if self.policy == self.REQUIRE_ONE and succeeded:
+            self._cancel_active_children()
+            return True
+
+        if finished == len(self.children):
+            if self.policy == self.REQUIRE_ONE and not succeeded and self.children:
+                self.fail("No parallel child completed")
+            return True
+
+        self._update_progress()
+        return False
+
+    def _cancel_active_children(self):
+        for child in self.children:
+            if child.is_active():
+                child.cancel()
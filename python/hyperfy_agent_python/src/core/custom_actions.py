@@ -1,11 +1,10 @@
 # This file will contain the custom action classes.
 # Planned actions: WalkRandomlyAction, StopMovingAction, UseItemAction, UnuseItemAction.
 import random
-import time
-import logging
 from typing import List, Optional
 
-from .action_system import Action, ActionStatus
+from . import clock
+from .action_system import Action, ActionStatus, PreemptionPolicy
 from ..physics.movement_action import MovementAction
 
 # Placeholder for Agent class for type hinting if needed, assuming it's in ..core.agent
@@ -14,7 +13,10 @@ from ..physics.movement_action import MovementAction
 class WalkRandomlyAction(Action):
     """
     Action for making an agent walk to random waypoints within a specified area.
+    Shares the "locomotion" coalesce key with MovementAction, so queueing it drops stale pending moves.
     """
+    coalesce_key = "locomotion"
+
     def __init__(self, agent, interval: float = 5.0, max_distance: float = 10.0, duration: Optional[float] = None):
         super().__init__(agent=agent, priority=5) # Lower priority than specific movements
         self.interval = interval
@@ -23,13 +25,12 @@ class WalkRandomlyAction(Action):
         self._current_movement_action: Optional[MovementAction] = None
         self._next_waypoint_time: float = 0.0
         self._start_time: Optional[float] = None
-        self.logger = logging.getLogger(f"action.{self.__class__.__name__}")
 
     def start(self):
         super().start()
-        self._start_time = time.time()
-        self._next_waypoint_time = time.time() # Trigger immediate waypoint selection
-        self.logger.debug(f"Starting to walk randomly. Interval: {self.interval}s, Max Distance: {self.max_distance}m, Duration: {self.duration}s")
+        self._start_time = clock.now()
+        self._next_waypoint_time = clock.now() # Trigger immediate waypoint selection
+        self.logger.debug("Starting to walk randomly. Interval: %ss, Max Distance: %sm, Duration: %ss", self.interval, self.max_distance, self.duration)
 
     def update(self, delta_time: float) -> bool:
         if not self.agent:
@@ -39,7 +40,7 @@ class WalkRandomlyAction(Action):
         if self.status != ActionStatus.RUNNING:
              return True # Action is not in a state to be updated (e.g. completed, failed)
 
-        current_time = time.time()
+        current_time = clock.now()
 
         if self.duration is not None and self._start_time is not None:
             if current_time - self._start_time >= self.duration:
@@ -47,9 +48,10 @@ class WalkRandomlyAction(Action):
                 self.complete()
                 return True
         
-        # Check if current sub-movement action is done
+        # Drive the current sub-movement directly; it is owned by this action rather than queued,
+        # otherwise it would wait behind this action in the agent's queue and never run
         if self._current_movement_action:
-            if self._current_movement_action.status in [ActionStatus.COMPLETED, ActionStatus.FAILED, ActionStatus.CANCELLED]:
+            if self.tick_child(self._current_movement_action, delta_time):
                 self._current_movement_action = None # Clear it as it's no longer active
 
         if self._current_movement_action is None and current_time >= self._next_waypoint_time:
@@ -65,22 +67,14 @@ class WalkRandomlyAction(Action):
             target_z = current_pos[2] + random_dist * math.sin(random_angle)
             target_position = [target_x, target_y, target_z]
             
-            self.logger.debug(f"New random waypoint: {target_position}")
+            self.logger.debug("New random waypoint: %s", target_position)
             
-            # Create and queue MovementAction
-            # Assuming MovementAction takes agent, target_position, and speed
+            # Create the MovementAction as a child and start driving it this frame
             # Agent speed needs to be accessed, e.g., self.agent.default_speed or a fixed value
             agent_speed = getattr(self.agent, 'default_speed', 1.0) 
-            movement = MovementAction(self.agent, target_position, speed=agent_speed)
-            
-            # We need to queue this action. If queue_action is on agent:
-            if hasattr(self.agent, 'queue_action'):
-                self.agent.queue_action(movement)
-                self._current_movement_action = movement
-            else:
-                self.logger.error("Agent does not have queue_action method.")
-                self.fail("Cannot queue MovementAction.")
-                return True # Stop processing
+            self._current_movement_action = MovementAction(self.agent, target_position, speed=agent_speed)
+            if self.tick_child(self._current_movement_action, delta_time):
+                self._current_movement_action = None
 
             # Set next waypoint time
             self._next_waypoint_time = current_time + random.uniform(self.interval * 0.8, self.interval * 1.2)
@@ -88,22 +82,21 @@ class WalkRandomlyAction(Action):
         return False # Action is ongoing
 
     def cancel(self):
-        if self.status == ActionStatus.RUNNING and self._current_movement_action:
-            if hasattr(self.agent, 'action_system') and hasattr(self.agent.action_system, 'cancel_action'):
-                self.logger.debug(f"Cancelling current sub-movement action: {self._current_movement_action.id}")
-                self.agent.action_system.cancel_action(self._current_movement_action.id)
-            else:
-                # Fallback if direct cancellation via action_system isn't available
-                self._current_movement_action.cancel() 
+        if self._current_movement_action and self._current_movement_action.is_active():
+            self.logger.debug("Cancelling current sub-movement action: %s", self._current_movement_action.id)
+            self._current_movement_action.cancel()
         super().cancel()
 
 class StopMovingAction(Action):
     """
     Action to stop any current movement-related actions (MovementAction, WalkRandomlyAction).
+    Its high priority preempts the running movement, which goes back into the queue
+    suspended; start() then cancels every movement waiting there, suspended or pending.
     """
+    preemption_policy = PreemptionPolicy.NEVER # Instantaneous, nothing to preempt
+
     def __init__(self, agent):
         super().__init__(agent=agent, priority=100) # High priority to interrupt other actions
-        self.logger = logging.getLogger(f"action.{self.__class__.__name__}")
 
     def start(self):
         super().start()
@@ -112,13 +105,14 @@ class StopMovingAction(Action):
             self.fail("Agent or action system missing.")
             return
 
-        current_action = self.agent.action_system.get_current_action()
+        action_system = self.agent.action_system
 
-        if current_action and isinstance(current_action, (MovementAction, WalkRandomlyAction)):
-            self.logger.debug(f"Requesting cancellation of action: {current_action.id} ({current_action.__class__.__name__})")
-            self.agent.action_system.cancel_action(current_action.id)
-        else:
-            self.logger.debug("No current MovementAction or WalkRandomlyAction to stop.")
+        # By now this action holds the slot: a movement suspended by preemption
+        # (or still pending) waits in the queue and would otherwise resume afterwards
+        for queued_action in list(getattr(action_system, 'action_queue', [])):
+            if isinstance(queued_action, (MovementAction, WalkRandomlyAction)):
+                self.logger.debug("Dropping queued movement action: %s", queued_action.id)
+                action_system.cancel_action(queued_action.id)
         
         self.complete() # This action is instantaneous
 
@@ -135,27 +129,24 @@ class UseItemAction(Action):
         self.entity_id = entity_id
         self.move_to_item = move_to_item
         self._sub_move_action: Optional[MovementAction] = None
-        self.logger = logging.getLogger(f"action.{self.__class__.__name__}")
 
     def start(self):
         super().start()
-        self.logger.debug(f"Attempting to use item: {self.entity_id}, move_to_item: {self.move_to_item}")
+        self.logger.debug("Attempting to use item: %s, move_to_item: %s", self.entity_id, self.move_to_item)
 
         if self.move_to_item:
-            if not self.agent or not hasattr(self.agent, 'world_state') or not hasattr(self.agent, 'queue_action'):
-                self.logger.error("Agent, world_state, or queue_action method missing for move_to_item.")
+            if not self.agent or not hasattr(self.agent, 'world_state'):
+                self.logger.error("Agent or world_state missing for move_to_item.")
                 self.fail("Agent misconfigured for move_to_item.")
                 return
 
             target_entity = self.agent.world_state.get_object(self.entity_id)
             if target_entity and hasattr(target_entity, 'position'):
                 target_position = target_entity.position
-                self.logger.debug(f"Moving to item {self.entity_id} at {target_position}")
+                self.logger.debug("Moving to item %s at %s", self.entity_id, target_position)
                 agent_speed = getattr(self.agent, 'default_speed', 1.0)
+                # The movement is a child of this action and is driven from update()
                 self._sub_move_action = MovementAction(self.agent, target_position, speed=agent_speed)
-                self.agent.queue_action(self._sub_move_action)
-                # The action will now wait for movement in its update method.
-                self.status = ActionStatus.RUNNING # Explicitly set to running to wait for movement
                 return # Don't complete yet
             else:
                 self.logger.warning(f"Could not find item {self.entity_id} or its position for movement.")
@@ -173,20 +164,22 @@ class UseItemAction(Action):
             return True # Action is completed, failed, or cancelled
 
         if self._sub_move_action:
-            if self._sub_move_action.status == ActionStatus.COMPLETED:
-                self.logger.debug(f"Movement to {self.entity_id} completed.")
+            if not self.tick_child(self._sub_move_action, delta_time):
+                # Movement is still in progress
+                self.progress = self._sub_move_action.progress * 0.9
+                return False
+
+            if self._sub_move_action.is_completed():
+                self.logger.debug("Movement to %s completed.", self.entity_id)
                 self._sub_move_action = None
                 self._perform_use_action()
                 self.complete() # Complete after performing use action
                 return True
-            elif self._sub_move_action.status in [ActionStatus.FAILED, ActionStatus.CANCELLED]:
+            else:
                 self.logger.warning(f"Movement to {self.entity_id} failed or was cancelled.")
                 self._sub_move_action = None
                 self.fail("Movement for UseItemAction failed.") # Fail the UseItemAction if movement fails
                 return True
-            else:
-                # Movement is still in progress
-                return False
         
         # If there was no sub_move_action, it should have been completed in start()
         # This path should ideally not be hit if logic in start() is correct.
@@ -204,12 +197,9 @@ class UseItemAction(Action):
         # For this subtask, it's simplified to immediate completion.
 
     def cancel(self):
-        if self._sub_move_action and self._sub_move_action.status == ActionStatus.RUNNING:
-            if hasattr(self.agent, 'action_system') and hasattr(self.agent.action_system, 'cancel_action'):
-                self.logger.debug(f"Cancelling sub-movement action for UseItemAction: {self._sub_move_action.id}")
-                self.agent.action_system.cancel_action(self._sub_move_action.id)
-            else:
-                self._sub_move_action.cancel()
+        if self._sub_move_action and self._sub_move_action.is_active():
+            self.logger.debug("Cancelling sub-movement action for UseItemAction: %s", self._sub_move_action.id)
+            self._sub_move_action.cancel()
         super().cancel()
 
 
@@ -219,7 +209,6 @@ class UnuseItemAction(Action):
     """
     def __init__(self, agent):
         super().__init__(agent=agent, priority=20)
-        self.logger = logging.getLogger(f"action.{self.__class__.__name__}")
 
     def start(self):
         super().start()
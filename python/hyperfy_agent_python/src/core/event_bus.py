@@ -0,0 +1,318 @@
+import asyncio
+import logging
+import threading
+import itertools
+from enum import Enum, auto
+from typing import Dict, List, Any, Callable, Optional, Tuple
+
+from . import clock
+
+class OverflowPolicy(Enum):
+    """
+    What a queued EventBus does when its delivery queue is full
+    """
+    DROP_NEWEST = auto()  # Discard the event being published
+    DROP_OLDEST = auto()  # Discard the oldest queued event to make room
+    BLOCK = auto()        # Wait for room (threads and publish_async); raises on the loop thread
+    ERROR = auto()        # Raise EventQueueFull
+
+class EventQueueFull(Exception):
+    """
+    Raised when an event cannot be queued under the bus's overflow policy
+    """
+
+class Event:
+    """
+    Event delivered through an EventBus
+    `data` is the payload dict handed to payload-style handlers. Typed events
+    subclass Event with their own slotted fields and override payload().
+    """
+    __slots__ = ("topic", "data", "source", "timestamp")
+
+    def __init__(self, topic: str, data: Optional[Dict[str, Any]] = None, source: Optional[str] = None,
+                 timestamp: Optional[float] = None):
+        self.topic = topic
+        self.data = data
+        self.source = source
+        self.timestamp = timestamp
+
+    def payload(self) -> Dict[str, Any]:
+        """
+        Event contents as a plain dict
+        """
+        return self.data if self.data is not None else {}
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.topic!r}, source={self.source!r})"
+
+class VoiceInputEvent(Event):
+    """
+    Recognized speech, published on the "voice_input" topic
+    """
+    __slots__ = ("text", "confidence")
+    TOPIC = "voice_input"
+
+    def __init__(self, text: str, confidence: float, source: Optional[str] = None, timestamp: Optional[float] = None):
+        super().__init__(self.TOPIC, None, source, timestamp)
+        self.text = text
+        self.confidence = confidence
+
+    def payload(self) -> Dict[str, Any]:
+        return {"text": self.text, "confidence": self.confidence, "source": self.source, "timestamp": self.timestamp}
+
+class Subscription:
+    """
+    Handle returned by EventBus.subscribe(), used to unsubscribe
+    """
+    __slots__ = ("pattern", "handler", "segments", "order")
+
+    def __init__(self, pattern: str, handler: Callable[[Event], Any], order: int):
+        self.pattern = pattern
+        self.handler = handler
+        self.segments = tuple(pattern.split(".")) if is_wildcard(pattern) else None
+        self.order = order
+
+def is_wildcard(pattern: str) -> bool:
+    """
+    Check if a subscription pattern contains wildcard segments
+    """
+    return "*" in pattern or "#" in pattern
+
+def topic_matches(segments: Tuple[str, ...], topic_segments: List[str]) -> bool:
+    """
+    Match dot-separated topic segments against a pattern
+    `*` matches exactly one segment and `#` matches zero or more segments
+    """
+    if not segments:
+        return not topic_segments
+    head = segments[0]
+    if head == "#":
+        return any(topic_matches(segments[1:], topic_segments[i:]) for i in range(len(topic_segments) + 1))
+    if not topic_segments:
+        return False
+    if head != "*" and head != topic_segments[0]:
+        return False
+    return topic_matches(segments[1:], topic_segments[1:])
+
+class EventBus:
+    """
+    Publish/subscribe event bus with precomputed dispatch tables
+    Subscriptions are exact topics or wildcard patterns over dot-separated
+    segments (`player.*`, `#`). The handlers for each published topic are
+    resolved once and cached in a dispatch table until the subscriptions change,
+    so publishing is a dict lookup and a loop over a tuple.
+
+    By default events are delivered synchronously on the publishing thread.
+    After start() on an event loop, events are queued in a bounded asyncio queue
+    of `queue_size` and delivered by a task on that loop. A full queue is
+    handled according to `overflow`. Handler exceptions are logged and counted
+    and never reach the publisher.
+    """
+    # Dispatch table entries are dropped wholesale beyond this many distinct topics
+    MAX_DISPATCH_ENTRIES = 4096
+
+    def __init__(self, queue_size: int = 1024, overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+                 name: str = "event_bus"):
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.logger = logging.getLogger(name)
+        self.exact: Dict[str, List[Subscription]] = {}
+        self.wildcards: List[Subscription] = []
+        self.dispatch: Dict[str, Tuple[Callable, ...]] = {}
+        self.lock = threading.Lock()
+        # Optional TickProfiler timing handler calls as the "events" phase
+        self.profiler = None
+        self._order = itertools.count()
+
+        # Queued delivery
+        self.queue: Optional[asyncio.Queue] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.loop_thread: Optional[int] = None
+        self.delivery_task: Optional[asyncio.Task] = None
+
+        # Stats
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.handler_errors = 0
+
+    def subscribe(self, pattern: str, handler: Callable[[Event], Any]) -> Subscription:
+        """
+        Call `handler(event)` for every event whose topic matches `pattern`
+        """
+        subscription = Subscription(pattern, handler, next(self._order))
+        with self.lock:
+            if subscription.segments is None:
+                self.exact.setdefault(pattern, []).append(subscription)
+            else:
+                self.wildcards.append(subscription)
+            self.dispatch = {}
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> bool:
+        """
+        Remove a subscription
+        """
+        with self.lock:
+            if subscription.segments is None:
+                subscriptions = self.exact.get(subscription.pattern, [])
+            else:
+                subscriptions = self.wildcards
+            if subscription not in subscriptions:
+                return False
+            subscriptions.remove(subscription)
+            if not subscriptions and subscription.segments is None:
+                del self.exact[subscription.pattern]
+            self.dispatch = {}
+            return True
+
+    def handlers_for(self, topic: str) -> Tuple[Callable, ...]:
+        """
+        Handlers for a topic in subscription order, from the dispatch table
+        """
+        handlers = self.dispatch.get(topic)
+        if handlers is not None:
+            return handlers
+
+        with self.lock:
+            matched = list(self.exact.get(topic, ()))
+            if self.wildcards:
+                topic_segments = topic.split(".")
+                matched.extend(s for s in self.wildcards if topic_matches(s.segments, topic_segments))
+            matched.sort(key=lambda s: s.order)
+            handlers = tuple(s.handler for s in matched)
+            dispatch = self.dispatch
+            if len(dispatch) >= self.MAX_DISPATCH_ENTRIES:
+                dispatch = self.dispatch = {}
+            dispatch[topic] = handlers
+        return handlers
+
+    def has_subscribers(self, topic: str) -> bool:
+        """
+        Check if publishing on a topic would reach any handler
+        """
+        return bool(self.handlers_for(topic))
+
+    def publish(self, event: Event) -> bool:
+        """
+        Deliver an event now, or queue it in queued mode
+        Returns False if nobody is subscribed or the event was dropped
+        """
+        if not self.handlers_for(event.topic):
+            return False
+        self.published += 1
+        if self.queue is None:
+            self._deliver(event)
+            return True
+        if threading.get_ident() == self.loop_thread:
+            return self._enqueue(event)
+        if self.overflow == OverflowPolicy.BLOCK:
+            asyncio.run_coroutine_threadsafe(self.queue.put(event), self.loop).result()
+            return True
+        self.loop.call_soon_threadsafe(self._enqueue, event)
+        return True
+
+    async def publish_async(self, event: Event) -> bool:
+        """
+        Publish from a coroutine on the bus's loop, waiting for room under the BLOCK policy
+        """
+        if self.queue is None or self.overflow != OverflowPolicy.BLOCK:
+            return self.publish(event)
+        if not self.handlers_for(event.topic):
+            return False
+        self.published += 1
+        await self.queue.put(event)
+        return True
+
+    def _enqueue(self, event: Event) -> bool:
+        queue = self.queue
+        if queue is None:
+            self._deliver(event)
+            return True
+        try:
+            queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            if self.overflow == OverflowPolicy.DROP_OLDEST:
+                queue.get_nowait()
+                queue.task_done()
+                queue.put_nowait(event)
+                self.dropped += 1
+                return True
+            if self.overflow == OverflowPolicy.DROP_NEWEST:
+                self.dropped += 1
+                return False
+            self.dropped += 1
+            raise EventQueueFull(f"Event queue full ({self.queue_size}), dropped {event.topic}")
+
+    def _deliver(self, event: Event):
+        profiler = self.profiler
+        if profiler is not None:
+            profiler.enter("events", event.topic)
+        for handler in self.handlers_for(event.topic):
+            try:
+                handler(event)
+            except Exception as e:
+                self.handler_errors += 1
+                self.logger.error(f"Error in event handler for {event.topic}: {e}")
+        if profiler is not None:
+            profiler.exit()
+        self.delivered += 1
+
+    def start(self):
+        """
+        Switch to queued delivery on the running event loop
+        """
+        if self.queue is not None:
+            return
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread = threading.get_ident()
+        self.queue = asyncio.Queue(self.queue_size)
+        self.delivery_task = self.loop.create_task(self._delivery_loop(), name=f"{self.logger.name}-delivery")
+
+    async def stop(self, drain: bool = True):
+        """
+        Return to synchronous delivery, first delivering queued events if `drain` is set
+        """
+        queue, task = self.queue, self.delivery_task
+        if queue is None:
+            return
+        if drain:
+            await queue.join()
+        self.queue = None
+        self.delivery_task = None
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    async def _delivery_loop(self):
+        queue = self.queue
+        while True:
+            event = await queue.get()
+            try:
+                self._deliver(event)
+            finally:
+                queue.task_done()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Published, delivered and dropped event counts, handler errors and queue depth
+        """
+        return {
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "handler_errors": self.handler_errors,
+            "queued": self.queue.qsize() if self.queue is not None else 0,
+            "subscriptions": sum(len(s) for s in self.exact.values()) + len(self.wildcards)
+        }
+
+def event_from_dict(topic: str, data: Optional[Dict[str, Any]], source: str) -> Event:
+    """
+    Build an Event from a legacy payload dict without modifying the caller's dict
+    The payload carries `source` and `timestamp` keys, as emit_event always has
+    """
+    timestamp = clock.now()
+    payload = dict(data) if data else {}
+    payload["source"] = source
+    payload["timestamp"] = timestamp
+    return Event(topic, payload, source, timestamp)
@@ -0,0 +1,125 @@
+import random
+import time
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+
+from .agent_host import AgentHost
+from .clock import VirtualClock, set_clock
+
+class HeadlessRunner:
+    """
+    Runs agents on a VirtualClock as fast as the CPU allows
+    While the runner is started its clock is installed process-wide and the global
+    `random` module is seeded with `seed`, so agents created afterwards behave the
+    same on every run. Agents are hosted on an AgentHost that is stepped directly:
+    each step advances the clock by one fixed step and ticks physics and every agent,
+    with no sleeping in between. Speech goes to `transcript` as (time, agent name,
+    text) instead of text-to-speech.
+
+    Create agents with `runner.config`, which has voice recognition and background
+    navigation bakes disabled, and the host's world state and physics engine:
+
+        with HeadlessRunner(config, seed=1) as runner:
+            runner.add_agent(AliceAgent(runner.config, **runner.agent_kwargs()))
+            runner.run(3600)
+    """
+    def __init__(self, config: Dict[str, Any], seed: int = 0, clock: Optional[VirtualClock] = None,
+                 tick_rate: Optional[float] = None):
+        self.config = dict(config)
+        self.config["VOICE_RECOGNITION_ENABLED"] = False
+        # Background bakes would make paths depend on wall-clock timing
+        self.config["NAV_BACKGROUND_BAKE"] = False
+        if tick_rate is not None:
+            self.config["AGENT_TICK_RATE"] = tick_rate
+        self.seed = seed
+        self.clock = clock or VirtualClock()
+        self.start_time = self.clock.time()
+        self.logger = logging.getLogger("headless")
+        self.host: Optional[AgentHost] = None
+        self.transcript: List[Tuple[float, str, str]] = []
+        self.steps = 0
+        self._previous_clock = None
+        self._random_state = None
+
+    def start(self):
+        """
+        Install the virtual clock, seed `random` and create the agent host
+        """
+        if self.host is not None:
+            return
+        self._previous_clock = set_clock(self.clock)
+        self._random_state = random.getstate()
+        random.seed(self.seed)
+        self.host = AgentHost(self.config)
+        self.host.start(threaded=False)
+        self.logger.info(f"Headless simulation started at t={self.clock.time():.3f} with seed {self.seed}")
+
+    def stop(self):
+        """
+        Stop every agent and restore the previous clock and random state
+        """
+        if self.host is None:
+            return
+        self.host.stop()
+        self.host = None
+        set_clock(self._previous_clock)
+        random.setstate(self._random_state)
+
+    def __enter__(self) -> 'HeadlessRunner':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def agent_kwargs(self) -> Dict[str, Any]:
+        """
+        Keyword arguments that put a new agent in the runner's world and physics scene
+        """
+        self.start()
+        return {"world_state": self.host.world_state, "physics_engine": self.host.physics_engine}
+
+    def add_agent(self, agent) -> bool:
+        """
+        Host an agent in the simulation, recording what it says in the transcript
+        """
+        self.start()
+        name = agent.name
+        agent.speech_handler = lambda text, voice_id=None: self._record_speech(name, text)
+        return self.host.add_agent(agent)
+
+    def _record_speech(self, name: str, text: str) -> bool:
+        self.transcript.append((self.clock.time(), name, text))
+        return True
+
+    def step(self, count: int = 1):
+        """
+        Advance the simulation by `count` fixed steps
+        """
+        self.start()
+        host = self.host
+        step = host.scheduler.step
+        virtual = self.clock
+        start_time = self.start_time
+        for i in range(self.steps + 1, self.steps + count + 1):
+            # Computed from the step count so long runs do not accumulate rounding error
+            virtual.advance_to(start_time + i * step)
+            host.step(step)
+        self.steps += count
+
+    def run(self, duration: float) -> Dict[str, Any]:
+        """
+        Simulate `duration` seconds and return how long it took in real time
+        """
+        self.start()
+        steps = int(round(duration / self.host.scheduler.step))
+        wall_start = time.perf_counter()
+        self.step(steps)
+        wall_time = time.perf_counter() - wall_start
+        return {
+            "steps": steps,
+            "simulated_seconds": steps * self.host.scheduler.step,
+            "wall_seconds": wall_time,
+            "speedup": steps * self.host.scheduler.step / wall_time if wall_time > 0 else float("inf"),
+            "agents": self.host.get_agent_count()
+        }
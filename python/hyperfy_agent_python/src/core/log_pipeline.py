@@ -0,0 +1,350 @@
+import os
+import sys
+import json
+import time
+import queue
+import random
+import logging
+import threading
+import traceback
+from logging.handlers import QueueHandler
+from typing import Dict, List, Any, Optional
+
+from .rate_limiter import TokenBucket
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# LogRecord attributes that are not `extra=` fields
+_RECORD_FIELDS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format records as one JSON object per line
+    Fields passed with `extra=` are included as top-level keys; values that are not
+    JSON types are written with str().
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "thread": record.threadName
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_FIELDS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return json.dumps(entry, default=str)
+
+class RateLimitFilter(logging.Filter):
+    """
+    Per-logger rate limiting and sampling of records below WARNING
+    `rate` is the default messages per second each logger may pass (0 or None: no
+    limit), with `rate_limits` overriding it per logger name and `sample` keeping a
+    fraction of a logger's records before the rate limit applies. Logger names match
+    their children, so {"action": 5} limits each "action.<id>" logger. The number of
+    records dropped since a logger's last passed record is added to that record as
+    `suppressed` (and to its text as "[N suppressed]").
+    """
+    def __init__(self, rate: Optional[float] = None, rate_limits: Optional[Dict[str, float]] = None,
+                 sample: Optional[Dict[str, float]] = None, burst: Optional[float] = None):
+        super().__init__()
+        self.rate = rate or None
+        self.rate_limits = dict(rate_limits or {})
+        self.sample = dict(sample or {})
+        self.burst = burst
+        self.buckets: Dict[str, Optional[TokenBucket]] = {}
+        self.fractions: Dict[str, Optional[float]] = {}
+        self.pending: Dict[str, int] = {}
+        self.suppressed: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def _lookup(self, table: Dict[str, float], name: str, default: Optional[float]) -> Optional[float]:
+        while True:
+            if name in table:
+                return table[name]
+            if "." not in name:
+                return default
+            name = name.rsplit(".", 1)[0]
+
+    def _bucket(self, name: str) -> Optional[TokenBucket]:
+        rate = self._lookup(self.rate_limits, name, self.rate)
+        if not rate:
+            return None
+        return TokenBucket(rate, burst=max(1.0, self.burst or rate))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        # Each record is checked once, however many handlers share the filter
+        checked = getattr(record, "_rate_checked", None)
+        if checked is not None:
+            return checked
+        record._rate_checked = passed = self._check(record)
+        return passed
+
+    def _check(self, record: logging.LogRecord) -> bool:
+        name = record.name
+        with self.lock:
+            if name not in self.buckets:
+                self.buckets[name] = self._bucket(name)
+                self.fractions[name] = self._lookup(self.sample, name, None)
+            fraction = self.fractions[name]
+            bucket = self.buckets[name]
+            if ((fraction is not None and random.random() >= fraction) or
+                    (bucket is not None and not bucket.try_acquire(time.monotonic()))):
+                self.pending[name] = self.pending.get(name, 0) + 1
+                self.suppressed[name] = self.suppressed.get(name, 0) + 1
+                return False
+            dropped = self.pending.pop(name, 0)
+        if dropped:
+            record.suppressed = dropped
+            record.msg = f"{record.getMessage()} [{dropped} suppressed]"
+            record.args = None
+        return True
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Queue handler that never blocks the logging thread
+    Records are handed over with the message merged but not formatted, so timestamps
+    and JSON are rendered on the writer thread. When the queue is full the record is
+    dropped and counted instead.
+    """
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args now: they may be mutated by the time the writer gets to them
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = "".join(traceback.format_exception(*record.exc_info)).rstrip("\n")
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class LogWriter:
+    """
+    Background thread that writes queued records to handlers in batches
+    After writing a batch smaller than `batch_size` the writer waits `flush_interval`
+    seconds before taking the next one. Stream and file handlers get each batch in a
+    single write and one flush; other handlers are called per record. stop() writes
+    everything still queued.
+    """
+    def __init__(self, log_queue: queue.Queue, handlers: List[logging.Handler], batch_size: int = 256,
+                 flush_interval: float = 0.2):
+        self.queue = log_queue
+        self.handlers = handlers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.thread: Optional[threading.Thread] = None
+        self.stopping = threading.Event()
+        self.written = 0
+        self.batches = 0
+
+    def start(self):
+        """
+        Start the writer thread
+        """
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Write the remaining records and stop the writer thread
+        """
+        if self.thread is None:
+            return
+        self.stopping.set()
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self.thread.join(timeout)
+        self.thread = None
+        self.stopping.clear()
+
+    def _run(self):
+        while True:
+            record = self.queue.get()
+            batch = []
+            while record is not None:
+                batch.append(record)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    record = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self.write(batch)
+            if record is None:
+                return
+            if len(batch) < self.batch_size:
+                # Let the next batch build up rather than writing every record as it comes
+                self.stopping.wait(self.flush_interval)
+
+    def write(self, batch: List[logging.LogRecord]):
+        """
+        Write a batch of records to every handler
+        """
+        for handler in self.handlers:
+            if isinstance(handler, logging.StreamHandler) and getattr(handler, "stream", None) is not None:
+                lines = []
+                for record in batch:
+                    if record.levelno >= handler.level and handler.filter(record):
+                        try:
+                            lines.append(handler.format(record) + handler.terminator)
+                        except Exception:
+                            handler.handleError(record)
+                if not lines:
+                    continue
+                with handler.lock:
+                    try:
+                        handler.stream.write("".join(lines))
+                        handler.flush()
+                    except Exception:
+                        handler.handleError(batch[-1])
+            else:
+                for record in batch:
+                    if record.levelno >= handler.level:
+                        handler.handle(record)
+        self.written += len(batch)
+        self.batches += 1
+
+class LogPipeline:
+    """
+    Root logger setup for the agent process
+    In "sync" mode the handlers are attached to the root logger as usual. In "queued"
+    mode the root logger only gets a NonBlockingQueueHandler and a LogWriter thread
+    does the formatting and I/O, so a log call on the tick thread costs a queue put.
+    Either way the RateLimitFilter runs first, on the calling thread.
+    """
+    def __init__(self, handlers: List[logging.Handler], mode: str = "sync",
+                 rate_filter: Optional[RateLimitFilter] = None, queue_size: int = 10000,
+                 batch_size: int = 256, flush_interval: float = 0.2):
+        if mode not in ("sync", "queued"):
+            raise ValueError(f"Unknown log mode {mode!r}, expected 'sync' or 'queued'")
+        self.mode = mode
+        self.handlers = handlers
+        self.rate_filter = rate_filter
+        self.queue_handler: Optional[NonBlockingQueueHandler] = None
+        self.writer: Optional[LogWriter] = None
+        if mode == "queued":
+            log_queue = queue.Queue(maxsize=queue_size)
+            self.queue_handler = NonBlockingQueueHandler(log_queue)
+            self.writer = LogWriter(log_queue, handlers, batch_size=batch_size, flush_interval=flush_interval)
+        self.installed: List[logging.Handler] = []
+        self.logger: Optional[logging.Logger] = None
+        self.fork_hook = False
+
+    def install(self, logger: Optional[logging.Logger] = None, level: Optional[int] = None) -> 'LogPipeline':
+        """
+        Replace the handlers of `logger` (the root logger by default) with this pipeline
+        """
+        logger = logger or logging.getLogger()
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        installed = [self.queue_handler] if self.queue_handler is not None else self.handlers
+        for handler in installed:
+            if self.rate_filter is not None:
+                handler.addFilter(self.rate_filter)
+            logger.addHandler(handler)
+        if level is not None:
+            logger.setLevel(level)
+        if self.writer is not None:
+            self.writer.start()
+            if not self.fork_hook:
+                # Forked worker processes get their own queue and writer thread
+                os.register_at_fork(after_in_child=self._after_fork)
+                self.fork_hook = True
+        self.logger = logger
+        self.installed = installed
+        return self
+
+    def _after_fork(self):
+        if not self.installed:
+            return
+        writer = self.writer
+        log_queue = queue.Queue(maxsize=writer.queue.maxsize)
+        self.queue_handler.queue = log_queue
+        self.writer = LogWriter(log_queue, self.handlers, batch_size=writer.batch_size,
+                                flush_interval=writer.flush_interval)
+        self.writer.start()
+
+    def close(self):
+        """
+        Flush and detach the pipeline
+        """
+        if self.writer is not None:
+            self.writer.stop()
+        for handler in self.installed:
+            self.logger.removeHandler(handler)
+            if self.rate_filter is not None:
+                handler.removeFilter(self.rate_filter)
+        for handler in self.handlers:
+            handler.close()
+        self.installed = []
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Records written and dropped, batches, and records suppressed per logger
+        """
+        stats: Dict[str, Any] = {"mode": self.mode}
+        if self.writer is not None:
+            stats.update({
+                "queued": self.writer.queue.qsize(),
+                "written": self.writer.written,
+                "batches": self.writer.batches,
+                "mean_batch": self.writer.written / self.writer.batches if self.writer.batches else 0.0,
+                "dropped": self.queue_handler.dropped
+            })
+        if self.rate_filter is not None:
+            stats["suppressed"] = dict(self.rate_filter.suppressed)
+        return stats
+
+def setup_logging(config: Dict[str, Any], level: Any = None) -> LogPipeline:
+    """
+    Configure the root logger from LOG_* settings and return the installed pipeline
+    """
+    formatter = JsonFormatter() if config.get("LOG_FORMAT", "text") == "json" else logging.Formatter(TEXT_FORMAT)
+    handlers: List[logging.Handler] = [logging.StreamHandler(sys.stderr)]
+    log_file = config.get("LOG_FILE", "hyperfy_agent.log")
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    rate_filter = None
+    if config.get("LOG_RATE_LIMIT") or config.get("LOG_RATE_LIMITS") or config.get("LOG_SAMPLE"):
+        rate = config.get("LOG_RATE_LIMIT")
+        rate_filter = RateLimitFilter(float(rate) if rate else None, config.get("LOG_RATE_LIMITS"),
+                                      config.get("LOG_SAMPLE"))
+
+    if level is None:
+        level = config.get("LOG_LEVEL", "INFO")
+    if isinstance(level, str):
+        level = getattr(logging, level.upper())
+    pipeline = LogPipeline(
+        handlers,
+        mode=config.get("LOG_MODE", "sync"),
+        rate_filter=rate_filter,
+        queue_size=int(config.get("LOG_QUEUE_SIZE", 10000)),
+        batch_size=int(config.get("LOG_BATCH_SIZE", 256)),
+        flush_interval=float(config.get("LOG_FLUSH_INTERVAL", 0.2))
+    )
+    return pipeline.install(level=level)
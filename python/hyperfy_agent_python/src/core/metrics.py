@@ -0,0 +1,240 @@
+import os
+import bisect
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple, Optional, Sequence
+
+# Default latency buckets in seconds, from half a millisecond to ten seconds
+DEFAULT_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+logger = logging.getLogger("metrics")
+
+def _escape_label_value(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape_label_value(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class Counter:
+    """
+    Monotonic counter with optional labels
+    """
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0):
+        """
+        Increase the counter for the given label values
+        """
+        self.values[label_values] = self.values.get(label_values, 0.0) + amount
+
+    def get(self, *label_values: str) -> float:
+        return self.values.get(label_values, 0.0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for label_values, value in sorted(self.values.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, label_values)} {_format_value(value)}")
+        return lines
+
+class Histogram:
+    """
+    Fixed-bucket histogram with optional labels
+    Buckets are upper bounds; observations are counted in the first bucket they fit.
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [bucket counts..., overflow count, sum, count]
+        self.series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *label_values: str):
+        """
+        Record an observation for the given label values
+        """
+        series = self.series.get(label_values)
+        if series is None:
+            series = self.series[label_values] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def get_count(self, *label_values: str) -> int:
+        series = self.series.get(label_values)
+        return series[-1] if series else 0
+
+    def get_sum(self, *label_values: str) -> float:
+        series = self.series.get(label_values)
+        return series[-2] if series else 0.0
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for label_values, series in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                labels = _format_labels(self.label_names, label_values, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+class MetricsRegistry:
+    """
+    Collection of metrics that can be rendered in the Prometheus text exposition format
+    Metrics are get-or-create by name, so several components can share one registry.
+    """
+    def __init__(self):
+        self.metrics: Dict[str, object] = {}
+        self.lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help_text, label_names)
+
+    def histogram(self, name: str, help_text: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, label_names, buckets)
+
+    def _get_or_create(self, metric_class, name, help_text, label_names, *args):
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = metric_class(name, help_text, label_names, *args)
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"Metric {name} already registered as a {metric.kind}")
+            return metric
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format
+        """
+        with self.lock:
+            metrics = list(self.metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str):
+        """
+        Write the exposition text to a file, e.g. for the node exporter textfile collector
+        The file is replaced atomically so readers never see a partial dump
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+class MetricsServer:
+    """
+    Minimal HTTP server exposing a registry on /metrics from a daemon thread
+    """
+    def __init__(self, registry: MetricsRegistry, port: int, host: str = "127.0.0.1"):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.server: Optional[ThreadingHTTPServer] = None
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self.server:
+            return
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        logger.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    def stop(self):
+        if not self.server:
+            return
+        self.server.shutdown()
+        self.server.server_close()
+        self.server = None
+
+# Process-wide registry and servers, shared by every agent in the process
+default_registry = MetricsRegistry()
+_servers: Dict[int, MetricsServer] = {}
+_servers_lock = threading.Lock()
+
+def start_http_server(port: int, host: str = "127.0.0.1", registry: MetricsRegistry = None) -> MetricsServer:
+    """
+    Start (once per port) a metrics HTTP server for the given registry
+    """
+    with _servers_lock:
+        server = _servers.get(port)
+        if server is None:
+            server = MetricsServer(registry or default_registry, port, host)
+            server.start()
+            if port:
+                _servers[port] = server
+        return server
+
+class ActionMetrics:
+    """
+    Action lifecycle metrics for one ActionSystem
+    Covers time in queue, time blocked by start rate limits, execution time and hook time per action class
+    """
+    def __init__(self, registry: MetricsRegistry, agent_name: str = ""):
+        self.agent_name = agent_name
+        self.queued = registry.counter(
+            "hyperfy_actions_queued_total", "Actions accepted into the queue", ("agent", "action"))
+        self.rejected = registry.counter(
+            "hyperfy_actions_rejected_total", "Actions rejected because the queue was full", ("agent", "action"))
+        self.started = registry.counter(
+            "hyperfy_actions_started_total", "Actions started", ("agent", "action"))
+        self.finished = registry.counter(
+            "hyperfy_actions_finished_total", "Actions finished by final status", ("agent", "action", "status"))
+        self.rate_limited = registry.counter(
+            "hyperfy_actions_rate_limited_total", "Start attempts deferred by a rate limit", ("agent", "action"))
+        self.queue_wait = registry.histogram(
+            "hyperfy_action_queue_wait_seconds", "Time from queueing to start", ("agent", "action"))
+        self.rate_limit_wait = registry.histogram(
+            "hyperfy_action_rate_limit_wait_seconds",
+            "Time an action was ready to start but blocked by its rate limit", ("agent", "action"))
+        self.execution = registry.histogram(
+            "hyperfy_action_execution_seconds", "Time from start to finish", ("agent", "action"))
+        self.hook = registry.histogram(
+            "hyperfy_action_hook_seconds", "Time spent in lifecycle hooks", ("agent", "hook"))
+        # action id -> time it first became startable but was blocked
+        self.blocked_since: Dict[object, float] = {}
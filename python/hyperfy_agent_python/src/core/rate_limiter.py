@@ -0,0 +1,49 @@
+from typing import Optional
+
+class TokenBucket:
+    """
+    Token bucket rate limiter
+    Holds up to `burst` tokens and refills at `rate` tokens per second.
+    Time is passed in by the caller so the bucket never reads the clock itself.
+    """
+    def __init__(self, rate: float, burst: float = 1.0):
+        if rate <= 0:
+            raise ValueError(f"Token bucket rate must be positive, got {rate}")
+        if burst < 1:
+            raise ValueError(f"Token bucket burst must be at least 1, got {burst}")
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.last_refill: Optional[float] = None
+
+    def _refill(self, now: float):
+        if self.last_refill is not None and now > self.last_refill:
+            self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now if self.last_refill is None else max(self.last_refill, now)
+
+    def try_acquire(self, now: float, tokens: float = 1.0) -> bool:
+        """
+        Take tokens from the bucket if enough are available
+        Returns True if the tokens were taken
+        """
+        self._refill(now)
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+    def time_until_available(self, now: float, tokens: float = 1.0) -> float:
+        """
+        Seconds until the requested number of tokens will be available
+        """
+        self._refill(now)
+        if self.tokens >= tokens:
+            return 0.0
+        return (tokens - self.tokens) / self.rate
+
+    def reset(self):
+        """
+        Refill the bucket completely
+        """
+        self.tokens = self.burst
+        self.last_refill = None
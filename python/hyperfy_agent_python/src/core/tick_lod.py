@@ -0,0 +1,186 @@
+import zlib
+import logging
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+from .metrics import MetricsRegistry
+
+# (max distance to the nearest player, tick every N fixed steps); None means any distance
+DEFAULT_TIERS = ((15.0, 1), (40.0, 4), (100.0, 15), (None, 60))
+
+def parse_tiers(tiers: Sequence[Sequence[Any]]) -> Tuple[Tuple[float, int], ...]:
+    """
+    Validate LOD tiers given as [max_distance, interval] pairs, nearest first
+    A max_distance of None covers everything beyond the previous tier
+    """
+    parsed = []
+    for max_distance, interval in tiers:
+        max_distance = float("inf") if max_distance is None else float(max_distance)
+        interval = int(interval)
+        if interval < 1:
+            raise ValueError(f"LOD tick interval must be at least 1, got {interval}")
+        if parsed and max_distance <= parsed[-1][0]:
+            raise ValueError(f"LOD tiers must be sorted by increasing distance, got {max_distance} "
+                             f"after {parsed[-1][0]}")
+        parsed.append((max_distance, interval))
+    if not parsed:
+        raise ValueError("At least one LOD tier is required")
+    if parsed[-1][0] != float("inf"):
+        # Beyond the last tier agents keep its rate
+        parsed.append((float("inf"), parsed[-1][1]))
+    return tuple(parsed)
+
+class TickLod:
+    """
+    Tick level of detail for one agent
+    The agent's tick interval is picked from `tiers` by the distance to the nearest
+    player: an agent in a tier with interval N runs one step in N and is handed the
+    time of the skipped steps as its delta time, so movement keeps its speed. Each
+    agent's skipped steps are offset by a hash of its name, so agents in a slow tier
+    do not all tick on the same step.
+
+    The distance is re-checked only when a player has moved (WorldState.player_version)
+    or the agent itself has, so a skipped step costs two comparisons. When a player
+    comes into a nearer tier, or new work arrives (wake), the agent ticks on the
+    very next step.
+
+    Skipped steps, and an estimate of the CPU time they saved (skipped steps times the
+    measured mean cost of the steps that ran), are kept per tier and exported as
+    metrics when a registry is given. Steps that catch up a longer delta time tend to
+    cost more, so the estimate errs high; compare wall time with LOD off for an exact figure.
+    """
+    def __init__(self, tiers: Sequence[Sequence[Any]] = DEFAULT_TIERS, agent_name: str = "",
+                 registry: Optional[MetricsRegistry] = None):
+        self.tiers = parse_tiers(tiers)
+        self.agent_name = agent_name
+        self.phase = zlib.crc32(agent_name.encode())
+        self.tier = 0
+        self.interval = self.tiers[0][1]
+        self.countdown = 0
+        self.pending_time = 0.0
+        self.world_version = -1
+        self.last_position: Optional[List[float]] = None
+        self.distance = float("inf")
+
+        # Stats
+        self.ticks = [0] * len(self.tiers)
+        self.skipped = [0] * len(self.tiers)
+        self.tier_changes = 0
+        self.tick_time = 0.0
+        self.unreported_skips = 0
+
+        self.metrics = None
+        if registry is not None:
+            self.metrics = (
+                registry.counter("hyperfy_agent_ticks_total", "Agent update steps run, by LOD tier", ("agent", "tier")),
+                registry.counter("hyperfy_agent_ticks_skipped_total", "Agent update steps skipped by LOD",
+                                 ("agent", "tier")),
+                registry.counter("hyperfy_agent_lod_cpu_saved_seconds_total",
+                                 "Estimated CPU time saved by skipped steps", ("agent",))
+            )
+        self.logger = logging.getLogger(f"lod.{agent_name}")
+
+    def before_step(self, world_state, position: List[float], delta_time: float) -> float:
+        """
+        Account for one fixed step
+        Returns the delta time to tick with, or 0.0 if the agent skips this step
+        """
+        if world_state.player_version != self.world_version or position != self.last_position:
+            self._refresh(world_state, position)
+        self.pending_time += delta_time
+        if self.countdown > 0:
+            self.countdown -= 1
+            self.skipped[self.tier] += 1
+            self.unreported_skips += 1
+            return 0.0
+
+        self.countdown = self.interval - 1
+        delta_time = self.pending_time
+        self.pending_time = 0.0
+        self.ticks[self.tier] += 1
+        if self.metrics is not None:
+            self._report()
+        return delta_time
+
+    def wake(self):
+        """
+        Run the next step, e.g. because an action was queued
+        """
+        self.countdown = 0
+
+    def _refresh(self, world_state, position: List[float]):
+        self.world_version = world_state.player_version
+        self.last_position = list(position)
+        self.distance = distance = world_state.nearest_player_distance(position)
+        tier = 0
+        while distance > self.tiers[tier][0]:
+            tier += 1
+        if tier == self.tier:
+            return
+
+        interval = self.tiers[tier][1]
+        if tier < self.tier:
+            # A player came closer: catch up now
+            self.countdown = 0
+        else:
+            self.countdown = self.phase % interval
+        self.logger.debug("Tier %d -> %d (nearest player %.1f)", self.tier, tier, distance)
+        self.tier = tier
+        self.interval = interval
+        self.tier_changes += 1
+
+    def _report(self):
+        ticks, skipped, cpu_saved = self.metrics
+        tier = str(self.tier)
+        ticks.inc(self.agent_name, tier)
+        if self.unreported_skips:
+            skipped.inc(self.agent_name, tier, amount=self.unreported_skips)
+            cpu_saved.inc(self.agent_name, amount=self.unreported_skips * self.mean_tick_time())
+            self.unreported_skips = 0
+
+    def mean_tick_time(self) -> float:
+        """
+        Mean measured seconds per step that ran
+        """
+        ticks = sum(self.ticks)
+        return self.tick_time / ticks if ticks else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Current tier, steps run and skipped per tier, and the estimated CPU time saved
+        """
+        ticks = sum(self.ticks)
+        skipped = sum(self.skipped)
+        return {
+            "tier": self.tier,
+            "interval": self.interval,
+            "nearest_player": self.distance,
+            "ticks": ticks,
+            "skipped": skipped,
+            "skip_ratio": skipped / (ticks + skipped) if ticks + skipped else 0.0,
+            "tier_changes": self.tier_changes,
+            "ticks_by_tier": list(self.ticks),
+            "skipped_by_tier": list(self.skipped),
+            "cpu_saved_seconds": skipped * self.mean_tick_time()
+        }
+
+def summarize_lod(lods: Sequence[TickLod]) -> Dict[str, Any]:
+    """
+    Combined LOD stats for many agents: agents per tier, steps run and skipped, CPU saved
+    """
+    agents_by_tier: Dict[int, int] = {}
+    ticks = skipped = 0
+    cpu_saved = 0.0
+    for lod in lods:
+        agents_by_tier[lod.tier] = agents_by_tier.get(lod.tier, 0) + 1
+        lod_ticks = sum(lod.ticks)
+        lod_skipped = sum(lod.skipped)
+        ticks += lod_ticks
+        skipped += lod_skipped
+        cpu_saved += lod_skipped * lod.mean_tick_time()
+    return {
+        "agents_by_tier": dict(sorted(agents_by_tier.items())),
+        "ticks": ticks,
+        "skipped": skipped,
+        "skip_ratio": skipped / (ticks + skipped) if ticks + skipped else 0.0,
+        "cpu_saved_seconds": cpu_saved
+    }
@@ -0,0 +1,194 @@
+import json
+import time
+import logging
+import threading
+from collections import deque
+from typing import Dict, List, Any, Optional, Tuple
+
+from .action_stats import StreamingHistogram
+
+def describe_label(label: Any) -> str:
+    """
+    Name a span label, e.g. "MovementAction 12" for an action
+    A tuple is named part by part, e.g. "on_complete MovementAction 12"
+    """
+    if isinstance(label, str):
+        return label
+    if isinstance(label, tuple):
+        return " ".join(describe_label(part) for part in label)
+    label_id = getattr(label, "id", None)
+    return label.__class__.__name__ if label_id is None else f"{label.__class__.__name__} {label_id}"
+
+class TickProfiler:
+    """
+    Per-frame span timer for an agent's update loop
+    Each frame is split into named phases ("update", "action_system", "action",
+    "hooks", "events", "physics"). Spans nest: time spent in an inner span (e.g.
+    a hook fired while the action system runs) is charged to the inner phase only,
+    so the phase times of a frame add up to the frame's instrumented time. A span
+    may carry a label, such as the running action or the event topic, so a slow
+    phase can be traced to its cause. Only spans on the thread running the frame
+    are recorded; an on_queue hook fired by another thread's queue_action() is not.
+
+    The last `window` frames are kept with their phase breakdown. A frame longer
+    than its budget (`budget` seconds per fixed step) produces an overrun report
+    naming the slowest phase and label; reports are logged at most once per
+    `report_interval` seconds and, if `report_file` is set, appended to it as JSON lines.
+
+    Instrumented code holds an optional reference to the profiler and checks it
+    with `is not None`, so profiling costs nothing measurable while disabled.
+    """
+    def __init__(self, budget: float, window: int = 300, report_interval: float = 1.0,
+                 report_file: Optional[str] = None, name: str = "agent"):
+        self.budget_ns = int(budget * 1e9)
+        self.window = window
+        self.report_interval = report_interval
+        self.report_file = report_file
+        self.logger = logging.getLogger(f"profiler.{name}")
+
+        # Current frame
+        self.frame_start = 0
+        self.phases: Dict[str, int] = {}
+        self.labels: Dict[Tuple[str, Any], int] = {}
+        self.stack: List[list] = []
+        self.owner: Optional[int] = None
+
+        # Rolling window of (frame ns, steps, phases)
+        self.frames: deque = deque(maxlen=window)
+        self.reports: deque = deque(maxlen=32)
+        self.frame_count = 0
+        self.overruns = 0
+        self.last_report_time = 0.0
+        self.frame_time = StreamingHistogram()
+
+    def begin_frame(self):
+        """
+        Start timing a frame
+        """
+        self.phases = {}
+        self.labels = {}
+        self.stack.clear()
+        self.owner = threading.get_ident()
+        self.frame_start = time.perf_counter_ns()
+
+    def enter(self, phase: str, label: Any = None):
+        """
+        Open a span; every enter() must be matched by an exit()
+        `label` is a string or an object such as an action, named only if it appears in a report
+        """
+        if threading.get_ident() != self.owner:
+            return
+        self.stack.append([phase, label, time.perf_counter_ns(), 0])
+
+    def exit(self):
+        """
+        Close the innermost span
+        """
+        now = time.perf_counter_ns()
+        if threading.get_ident() != self.owner:
+            return
+        phase, label, start, child_ns = self.stack.pop()
+        elapsed = now - start
+        own = elapsed - child_ns
+        phases = self.phases
+        phases[phase] = phases.get(phase, 0) + own
+        if label is not None:
+            key = (phase, label)
+            self.labels[key] = self.labels.get(key, 0) + own
+        if self.stack:
+            self.stack[-1][3] += elapsed
+
+    def end_frame(self, steps: int = 1) -> Optional[Dict[str, Any]]:
+        """
+        Finish the frame, recording it in the window
+        Returns the overrun report if the frame exceeded its budget of `steps` fixed steps
+        """
+        total = time.perf_counter_ns() - self.frame_start
+        self.stack.clear()
+        self.frame_count += 1
+        self.frames.append((total, steps, self.phases))
+        self.frame_time.add(total / 1e9)
+        if total <= self.budget_ns * steps:
+            return None
+
+        self.overruns += 1
+        report = self._build_report(total, steps)
+        self.reports.append(report)
+        now = time.monotonic()
+        if now - self.last_report_time >= self.report_interval:
+            self.last_report_time = now
+            self.logger.warning(self.format_report(report))
+            if self.report_file:
+                self._append_report(report)
+        return report
+
+    def _build_report(self, total: int, steps: int) -> Dict[str, Any]:
+        phases = self.phases
+        slowest = max(phases, key=phases.get) if phases else None
+        label = None
+        if slowest is not None:
+            candidates = [(ns, lbl) for (phase, lbl), ns in self.labels.items() if phase == slowest]
+            if candidates:
+                label = describe_label(max(candidates, key=lambda c: c[0])[1])
+        return {
+            "frame": self.frame_count,
+            "time": time.time(),
+            "frame_ms": total / 1e6,
+            "budget_ms": self.budget_ns * steps / 1e6,
+            "steps": steps,
+            "phase": slowest,
+            "label": label,
+            "phases_ms": {phase: ns / 1e6 for phase, ns in phases.items()},
+            "labels_ms": {f"{phase}:{describe_label(lbl)}": ns / 1e6 for (phase, lbl), ns in self.labels.items()}
+        }
+
+    @staticmethod
+    def format_report(report: Dict[str, Any]) -> str:
+        """
+        One-line summary of an overrun report
+        """
+        culprit = report["phase"] or "uninstrumented code"
+        if report["label"]:
+            culprit += f" ({report['label']})"
+        breakdown = ", ".join(f"{phase} {ms:.2f}" for phase, ms in
+                              sorted(report["phases_ms"].items(), key=lambda item: -item[1]))
+        return (f"Frame {report['frame']} took {report['frame_ms']:.2f} ms "
+                f"(budget {report['budget_ms']:.2f} ms), slowest phase: {culprit}; ms by phase: {breakdown}")
+
+    def _append_report(self, report: Dict[str, Any]):
+        try:
+            with open(self.report_file, "a") as f:
+                f.write(json.dumps(report) + "\n")
+        except OSError as e:
+            self.logger.error(f"Failed to write profiler report to {self.report_file}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Frame time percentiles and the mean time per phase over the rolling window
+        """
+        frames = self.frames
+        phase_totals: Dict[str, int] = {}
+        for _, _, phases in frames:
+            for phase, ns in phases.items():
+                phase_totals[phase] = phase_totals.get(phase, 0) + ns
+        count = len(frames) or 1
+        return {
+            "frames": self.frame_count,
+            "overruns": self.overruns,
+            "budget_ms": self.budget_ns / 1e6,
+            "window": len(frames),
+            "window_mean_ms": sum(total for total, _, _ in frames) / count / 1e6,
+            "window_max_ms": max((total for total, _, _ in frames), default=0) / 1e6,
+            "phase_mean_ms": {phase: ns / count / 1e6 for phase, ns in phase_totals.items()},
+            "frame_time": self.frame_time.summary(),
+            "recent_overruns": list(self.reports)[-5:]
+        }
+
+    def dump(self, path: str):
+        """
+        Write the stats and all kept overrun reports to a JSON file
+        """
+        stats = self.get_stats()
+        stats["recent_overruns"] = list(self.reports)
+        with open(path, "w") as f:
+            json.dump(stats, f, indent=2)
@@ -0,0 +1,178 @@
+import asyncio
+import threading
+from typing import Dict, Any, Optional
+
+from .action_stats import StreamingHistogram
+from .async_runtime import resolve_future
+from . import clock
+
+class TickScheduler:
+    """
+    Fixed-timestep scheduler for agent update loops
+    Elapsed time is accumulated and consumed in whole steps of 1 / `tick_rate` seconds,
+    and sleeps are computed against the ideal tick schedule, so the rate does not drift
+    with the time spent working. When a frame falls behind by more than `max_catch_up`
+    steps, the excess steps are dropped instead of being replayed.
+
+    While the owner is idle the scheduler sleeps for up to `idle_interval` seconds, and
+    wake() (e.g. on a queued action or an emitted event) ends the sleep immediately.
+    The first frame after an idle sleep runs a single step instead of catching up.
+
+    Time is passed in by the caller as clock.monotonic() seconds; wait() and
+    wait_async() read the clock themselves.
+    """
+    def __init__(self, tick_rate: float = 60.0, max_catch_up: int = 5, idle_interval: float = 0.5):
+        if tick_rate <= 0:
+            raise ValueError(f"Tick rate must be positive, got {tick_rate}")
+        if max_catch_up < 1:
+            raise ValueError(f"max_catch_up must be at least 1, got {max_catch_up}")
+        self.tick_rate = tick_rate
+        self.step = 1.0 / tick_rate
+        self.max_catch_up = max_catch_up
+        self.idle_interval = idle_interval
+        self.accumulator = 0.0
+        self.last_time: Optional[float] = None
+        self.was_idle = False
+        self.wake_event = threading.Event()
+        self.waiter: Optional[asyncio.Future] = None
+
+        # Stats
+        self.frames = 0
+        self.steps = 0
+        self.overruns = 0
+        self.dropped_steps = 0
+        self.idle_waits = 0
+        self.wakeups = 0
+        self.jitter = StreamingHistogram()
+        self.frame_time = StreamingHistogram()
+
+    def reset(self, now: float):
+        """
+        Restart the schedule at `now`, discarding accumulated time
+        """
+        self.last_time = now
+        self.accumulator = 0.0
+        self.was_idle = False
+
+    def begin_frame(self, now: float) -> int:
+        """
+        Account for the time since the last frame
+        Returns the number of fixed steps to run now (0 to max_catch_up)
+        """
+        if self.last_time is None:
+            self.reset(now)
+        elapsed = max(0.0, now - self.last_time)
+        self.last_time = now
+
+        if self.was_idle:
+            # Time spent idle is not replayed
+            self.was_idle = False
+            self.accumulator = 0.0
+            steps = 1
+        else:
+            self.accumulator += elapsed
+            steps = int(self.accumulator / self.step)
+            self.accumulator -= steps * self.step
+            if steps > self.max_catch_up:
+                self.dropped_steps += steps - self.max_catch_up
+                steps = self.max_catch_up
+            if steps:
+                # How late this frame started relative to its scheduled tick
+                self.jitter.add(self.accumulator)
+
+        if steps:
+            self.frames += 1
+            self.steps += steps
+        return steps
+
+    def end_frame(self, frame_start: float, now: float):
+        """
+        Record how long the frame's work took, counting frames longer than one step as overruns
+        """
+        duration = now - frame_start
+        self.frame_time.add(duration)
+        if duration > self.step:
+            self.overruns += 1
+
+    def time_until_next_tick(self, now: float) -> float:
+        """
+        Seconds until the next step is due on the fixed schedule
+        """
+        if self.last_time is None:
+            return 0.0
+        return max(0.0, self.last_time + self.step - self.accumulator - now)
+
+    def wait_timeout(self, idle: bool, now: float) -> float:
+        """
+        Seconds the owner should wait before its next frame, for loops that block on
+        something other than wait(), such as a pipe. Waiting while idle means the
+        next frame runs a single step
+        """
+        if idle:
+            self.idle_waits += 1
+            self.was_idle = True
+            return self.idle_interval
+        return self.time_until_next_tick(now)
+
+    def wake(self):
+        """
+        End the current (or next) wait immediately
+        Safe to call from any thread
+        """
+        if not self.wake_event.is_set():
+            self.wake_event.set()
+        waiter = self.waiter
+        if waiter is not None:
+            resolve_future(waiter, None)
+
+    def _consume_wake(self) -> bool:
+        if self.wake_event.is_set():
+            self.wake_event.clear()
+            self.wakeups += 1
+            return True
+        return False
+
+    def wait(self, idle: bool = False):
+        """
+        Block until the next step is due, or while idle until woken or `idle_interval` passes
+        """
+        timeout = self.wait_timeout(idle, clock.monotonic())
+        if timeout > 0:
+            self.wake_event.wait(timeout)
+        self._consume_wake()
+
+    async def wait_async(self, idle: bool = False):
+        """
+        Event loop version of wait()
+        """
+        timeout = self.wait_timeout(idle, clock.monotonic())
+        loop = asyncio.get_running_loop()
+        self.waiter = waiter = loop.create_future()
+        try:
+            if timeout > 0 and not self.wake_event.is_set():
+                handle = loop.call_later(timeout, resolve_future, waiter, None)
+                try:
+                    await waiter
+                finally:
+                    handle.cancel()
+            else:
+                await asyncio.sleep(0)
+        finally:
+            self.waiter = None
+        self._consume_wake()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Tick counts, overruns, dropped steps and jitter / frame time percentiles
+        """
+        return {
+            "tick_rate": self.tick_rate,
+            "frames": self.frames,
+            "steps": self.steps,
+            "overruns": self.overruns,
+            "dropped_steps": self.dropped_steps,
+            "idle_waits": self.idle_waits,
+            "wakeups": self.wakeups,
+            "jitter": self.jitter.summary(),
+            "frame_time": self.frame_time.summary()
+        }
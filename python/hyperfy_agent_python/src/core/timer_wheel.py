@@ -0,0 +1,225 @@
+import math
+import random
+import logging
+from typing import List, Any, Callable, Optional
+
+from . import clock
+
+class Timer:
+    """
+    Handle for a callback scheduled on a TimerWheel
+    """
+    __slots__ = ("callback", "args", "when", "tick", "interval", "jitter", "wheel")
+
+    def __init__(self, wheel: 'TimerWheel', callback: Callable, args: tuple, when: float,
+                 interval: Optional[float] = None, jitter: float = 0.0):
+        self.wheel = wheel
+        self.callback = callback
+        self.args = args
+        self.when = when
+        self.tick = 0
+        self.interval = interval
+        self.jitter = jitter
+
+    @property
+    def active(self) -> bool:
+        """
+        Whether the timer will still fire
+        """
+        return self.wheel is not None
+
+    def cancel(self) -> bool:
+        """
+        Stop the timer; returns False if it had already fired (one-shot) or been cancelled
+        """
+        wheel = self.wheel
+        if wheel is None:
+            return False
+        self.wheel = None
+        wheel.count -= 1
+        return True
+
+    def __repr__(self) -> str:
+        kind = f"every {self.interval}s" if self.interval is not None else "once"
+        return f"Timer({getattr(self.callback, '__name__', self.callback)}, {kind}, when={self.when:.3f})"
+
+class TimerWheel:
+    """
+    Hierarchical timing wheel for one-shot, repeating and jittered timers
+    Time is divided into ticks of `resolution` seconds. Level 0 has one slot per tick
+    for the next `slots` ticks; each higher level has slots covering `slots` times as
+    many ticks as the level below, so 4 levels of 64 slots at 60 Hz reach 77 hours.
+    A timer is filed in the level matching how far away it is and moved down a level
+    (cascaded) when its slot comes up, so scheduling and cancelling are O(1) and an
+    advance over a tick with nothing due only looks at one empty slot.
+
+    advance() is called with the current clock.monotonic() time, usually once per
+    agent step; timers fire on the first advance at or after their due time, never
+    before it. Repeating timers are rescheduled from their due time, so they do not
+    drift, with `jitter` seconds of uniform random variation per period.
+    """
+    def __init__(self, resolution: float = 1 / 60, slots: int = 64, levels: int = 4,
+                 start: Optional[float] = None):
+        if resolution <= 0:
+            raise ValueError(f"Timer resolution must be positive, got {resolution}")
+        if slots < 2 or slots & (slots - 1):
+            raise ValueError(f"Timer wheel slots must be a power of two, got {slots}")
+        self.resolution = resolution
+        self.slots = slots
+        self.levels = levels
+        self.bits = slots.bit_length() - 1
+        self.mask = slots - 1
+        self.span = slots ** levels
+        self.wheels: List[List[List[Timer]]] = [[[] for _ in range(slots)] for _ in range(levels)]
+        self.time = clock.monotonic() if start is None else start
+        self.current_tick = int(self.time / resolution)
+        self.count = 0
+        self.fired = 0
+        self.logger = logging.getLogger("timer_wheel")
+
+    def call_later(self, delay: float, callback: Callable, *args: Any) -> Timer:
+        """
+        Call `callback(*args)` once, `delay` seconds from now
+        """
+        return self._schedule(Timer(self, callback, args, self.time + max(0.0, delay)))
+
+    def call_at(self, when: float, callback: Callable, *args: Any) -> Timer:
+        """
+        Call `callback(*args)` once at clock.monotonic() time `when`
+        """
+        return self._schedule(Timer(self, callback, args, when))
+
+    def call_every(self, interval: float, callback: Callable, *args: Any, jitter: float = 0.0,
+                   first_delay: Optional[float] = None) -> Timer:
+        """
+        Call `callback(*args)` every `interval` seconds, each period varied by up to +/- `jitter`
+        The first call comes after `first_delay` seconds, or one jittered period if not given
+        """
+        if interval <= 0:
+            raise ValueError(f"Timer interval must be positive, got {interval}")
+        if jitter < 0 or jitter >= interval:
+            raise ValueError(f"Timer jitter must be in [0, interval), got {jitter}")
+        timer = Timer(self, callback, args, 0.0, interval, jitter)
+        delay = first_delay if first_delay is not None else self._period(timer)
+        timer.when = self.time + max(0.0, delay)
+        return self._schedule(timer)
+
+    def _period(self, timer: Timer) -> float:
+        if timer.jitter:
+            return timer.interval + random.uniform(-timer.jitter, timer.jitter)
+        return timer.interval
+
+    def _schedule(self, timer: Timer) -> Timer:
+        self.count += 1
+        timer.tick = max(math.ceil(timer.when / self.resolution), self.current_tick + 1)
+        self._file(timer)
+        return timer
+
+    def _file(self, timer: Timer):
+        """
+        Put a timer in the slot of the level matching its distance from the current tick
+        """
+        delta = timer.tick - self.current_tick
+        tick = timer.tick
+        if delta >= self.span:
+            # Beyond the top level: park it in the farthest slot, it is re-filed when that slot cascades
+            delta = self.span - 1
+            tick = self.current_tick + delta
+        level = 0
+        limit = self.slots
+        while delta >= limit:
+            level += 1
+            limit <<= self.bits
+        self.wheels[level][(tick >> (self.bits * level)) & self.mask].append(timer)
+
+    def advance(self, now: Optional[float] = None) -> int:
+        """
+        Fire every timer due at or before `now` (clock.monotonic() by default)
+        Returns the number of callbacks run
+        """
+        if now is None:
+            now = clock.monotonic()
+        if now <= self.time:
+            return 0
+        self.time = now
+        target = int(now / self.resolution)
+        if target - self.current_tick > self.slots * self.slots:
+            # Long jump (e.g. a resumed agent): re-file instead of walking every tick
+            return self._jump(target)
+
+        fired = 0
+        while self.current_tick < target:
+            if not self.count:
+                self.current_tick = target
+                break
+            self.current_tick += 1
+            tick = self.current_tick
+            if not tick & self.mask:
+                self._cascade(tick)
+            slot = self.wheels[0][tick & self.mask]
+            if slot:
+                self.wheels[0][tick & self.mask] = []
+                for timer in slot:
+                    fired += self._fire(timer)
+        return fired
+
+    def _cascade(self, tick: int):
+        """
+        Move the timers of each higher level slot starting at `tick` down a level
+        """
+        for level in range(1, self.levels):
+            index = (tick >> (self.bits * level)) & self.mask
+            slot = self.wheels[level][index]
+            if slot:
+                self.wheels[level][index] = []
+                for timer in slot:
+                    if timer.wheel is not None:
+                        self._file(timer)
+            if index:
+                break
+
+    def _jump(self, target: int) -> int:
+        timers = [timer for wheel in self.wheels for slot in wheel for timer in slot if timer.wheel is not None]
+        self.wheels = [[[] for _ in range(self.slots)] for _ in range(self.levels)]
+        self.current_tick = target
+        fired = 0
+        for timer in sorted(timers, key=lambda t: t.tick):
+            if timer.tick <= target:
+                fired += self._fire(timer)
+            else:
+                self._file(timer)
+        return fired
+
+    def _fire(self, timer: Timer) -> int:
+        if timer.wheel is None:
+            return 0
+        if timer.interval is None:
+            timer.wheel = None
+            self.count -= 1
+        else:
+            # Next period from the due time; skip periods missed entirely
+            timer.when += self._period(timer)
+            if timer.when < self.time:
+                timer.when = self.time + self._period(timer)
+            timer.tick = max(math.ceil(timer.when / self.resolution), self.current_tick + 1)
+            self._file(timer)
+        self.fired += 1
+        try:
+            timer.callback(*timer.args)
+        except Exception as e:
+            self.logger.error(f"Error in timer callback {timer!r}: {e}")
+        return 1
+
+    def __len__(self) -> int:
+        return self.count
+
+    def clear(self):
+        """
+        Cancel every timer
+        """
+        for wheel in self.wheels:
+            for slot in wheel:
+                for timer in slot:
+                    timer.wheel = None
+                slot.clear()
+        self.count = 0
@@ -1,8 +1,9 @@
-import time
 import threading
 import logging
 from typing import Dict, List, Any, Optional, Set
 
+from . import clock
+
 class WorldObject:
     """
     Represents an object in the world with position, rotation, and properties
@@ -15,7 +16,7 @@ class WorldObject:
         self.rotation = rotation or [0, 0, 0]
         self.scale = scale or [1, 1, 1]
         self.properties = properties or {}
-        self.last_updated = time.time()
+        self.last_updated = clock.now()
         
     def update(self, position: List[float] = None, rotation: List[float] = None, 
                scale: List[float] = None, properties: Dict[str, Any] = None):
@@ -30,7 +31,7 @@ class WorldObject:
             self.scale = scale
         if properties is not None:
             self.properties.update(properties)
-        self.last_updated = time.time()
+        self.last_updated = clock.now()
         
     def get_property(self, key: str, default: Any = None) -> Any:
         """
@@ -43,7 +44,7 @@ class WorldObject:
         Set a property value
         """
         self.properties[key] = value
-        self.last_updated = time.time()
+        self.last_updated = clock.now()
         
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -72,7 +73,7 @@ class WorldObject:
             scale=data["scale"],
             properties=data["properties"]
         )
-        obj.last_updated = data.get("last_updated", time.time())
+        obj.last_updated = data.get("last_updated", clock.now())
         return obj
 
 
@@ -85,7 +86,7 @@ class Player(WorldObject):
         super().__init__(player_id, "player", position, rotation, [1, 1, 1], properties)
         self.username = username or player_id
         self.connected = True
-        self.last_action_time = time.time()
+        self.last_action_time = clock.now()
         
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -110,8 +111,8 @@ class Player(WorldObject):
             properties=data["properties"]
         )
         player.connected = data.get("connected", True)
-        player.last_action_time = data.get("last_action_time", time.time())
-        player.last_updated = data.get("last_updated", time.time())
+        player.last_action_time = data.get("last_action_time", clock.now())
+        player.last_updated = data.get("last_updated", clock.now())
         return player
 
 
@@ -126,6 +127,8 @@ class WorldState:
         self.lock = threading.RLock()
         self.logger = logging.getLogger("world_state")
         self.change_listeners = set()
+        # Incremented whenever a player is added, removed or moved
+        self.player_version = 0
         
     def add_object(self, obj: WorldObject) -> bool:
         """
@@ -161,6 +164,8 @@ class WorldState:
             
             obj = self.objects[object_id]
             obj.update(position, rotation, scale, properties)
+            if object_id in self.players:
+                self.player_version += 1
             self._notify_change("update_object", obj)
             return True
             
@@ -202,6 +207,7 @@ class WorldState:
             # Add to both players and objects
             self.players[player.object_id] = player
             self.objects[player.object_id] = player
+            self.player_version += 1
             self._notify_change("add_player", player)
             return True
             
@@ -216,6 +222,7 @@ class WorldState:
             # Remove from both players and objects
             player = self.players.pop(player_id)
             self.objects.pop(player_id, None)
+            self.player_version += 1
             self._notify_change("remove_player", player)
             return True
             
@@ -233,6 +240,18 @@ class WorldState:
         with self.lock:
             return list(self.players.values())
             
+    def nearest_player_distance(self, position: List[float]) -> float:
+        """
+        Distance from a position to the nearest player, or infinity if there are no players
+        """
+        with self.lock:
+            nearest_sq = float("inf")
+            for player in self.players.values():
+                distance_sq = sum((a - b) ** 2 for a, b in zip(position, player.position))
+                if distance_sq < nearest_sq:
+                    nearest_sq = distance_sq
+            return nearest_sq ** 0.5
+            
     def update_player(self, player_id: str, position: List[float] = None, 
                       rotation: List[float] = None, properties: Dict[str, Any] = None) -> bool:
         """
@@ -244,7 +263,8 @@ class WorldState:
                 return False
                 
             player.update(position, rotation, None, properties)
-            player.last_action_time = time.time()
+            player.last_action_time = clock.now()
+            self.player_version += 1
             self._notify_change("update_player", player)
             return True
             
@@ -257,7 +277,7 @@ class WorldState:
             return {
                 "objects": {obj_id: obj.to_dict() for obj_id, obj in self.objects.items()},
                 "players": {player_id: player.to_dict() for player_id, player in self.players.items()},
-                "timestamp": time.time()
+                "timestamp": clock.now()
             }
             
     def from_dict(self, data: Dict[str, Any]) -> None:
@@ -268,6 +288,7 @@ class WorldState:
             # Clear existing state
             self.objects.clear()
             self.players.clear()
+            self.player_version += 1
             
             # Load objects
             for obj_id, obj_data in data.get("objects", {}).items():
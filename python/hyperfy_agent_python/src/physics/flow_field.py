@@ -0,0 +1,117 @@
+"""
+Flow fields for crowds heading to one goal
+
+A FlowField holds, for a square window of the occupancy grid around a goal, the
+path length from every cell to the goal (the integration field, from one
+distance_field.sweep) and the neighbouring cell to step to next (the direction
+field). Any number of agents then find their way by looking up their own cell,
+instead of searching one path each.
+"""
+import math
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .distance_field import new_field, sweep, SQRT2
+
+# Neighbour offsets (dx, dz), straight ones first so they win ties
+OFFSETS = np.array([(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1)], dtype=np.int8)
+
+class FlowField:
+    """
+    Integration and direction fields towards one goal
+    The window spans `radius` cells each way from the goal cell, clamped to the
+    grid; paths that would leave it are not found. `goal_cell` is the free cell
+    the fields lead to, `end` the point agents stop at: the goal itself, or the
+    centre of the nearest free cell when the goal is inside an obstacle.
+
+    Blocked cells that border reachable ones point out of the obstacle, so an
+    agent standing within the clearance of a wall still finds its way.
+    """
+    def __init__(self, grid, goal_cell: Tuple[int, int], end: Tuple[float, float], radius: int, version: int = 0):
+        self.grid = grid
+        self.goal_cell = goal_cell
+        self.end = end
+        self.version = version
+        self.users = 0
+
+        gx, gz = goal_cell
+        self.x0, self.z0 = max(0, gx - radius), max(0, gz - radius)
+        self.x1, self.z1 = min(grid.width, gx + radius + 1), min(grid.depth, gz + radius + 1)
+        free = ~grid.blocked[self.z0:self.z1, self.x0:self.x1]
+
+        self.distances = new_field(free.shape)
+        self.distances[gz - self.z0, gx - self.x0] = 0.0
+        self.rounds = sweep(self.distances, free)
+        self.steps = _steps(self.distances, free)
+        self.steps[gz - self.z0, gx - self.x0] = 0
+        # Row-major [dx, dz] pairs: sample() runs per agent per tick, and list
+        # lookups are several times cheaper than NumPy scalar indexing
+        self._step_list = self.steps.reshape(-1, 2).tolist()
+
+    def contains(self, cx: int, cz: int) -> bool:
+        return self.x0 <= cx < self.x1 and self.z0 <= cz < self.z1
+
+    def sample(self, x: float, z: float) -> Optional[Tuple[float, float]]:
+        """
+        Point to head for from a world position: the centre of the next cell, or
+        `end` from the goal cell. None outside the window or where the goal cannot be reached.
+        """
+        grid = self.grid
+        size = grid.cell_size
+        cx = int((x - grid.origin[0]) // size)
+        cz = int((z - grid.origin[1]) // size)
+        if (cx, cz) == self.goal_cell:
+            return self.end
+        if not (self.x0 <= cx < self.x1 and self.z0 <= cz < self.z1):
+            return None
+        dx, dz = self._step_list[(cz - self.z0) * (self.x1 - self.x0) + cx - self.x0]
+        if not (dx or dz):
+            return None
+        return grid.origin[0] + (cx + dx + 0.5) * size, grid.origin[1] + (cz + dz + 0.5) * size
+
+    def distance(self, x: float, z: float) -> float:
+        """
+        Path length in metres from a world position's cell to the goal (inf if unreachable)
+        """
+        cx, cz = self.grid.cell_of(x, z)
+        if not self.contains(cx, cz):
+            return math.inf
+        cell_distance = float(self.distances[cz - self.z0, cx - self.x0])
+        if math.isinf(cell_distance) and self.steps[cz - self.z0, cx - self.x0].any():
+            # Blocked cell: one step out of the obstacle, then along the field
+            dx, dz = self.steps[cz - self.z0, cx - self.x0]
+            cell_distance = float(self.distances[cz - self.z0 + dz, cx - self.x0 + dx]) + math.hypot(dx, dz)
+        return cell_distance * self.grid.cell_size
+
+def _steps(distances: np.ndarray, free: np.ndarray) -> np.ndarray:
+    """
+    Offset of the neighbour each cell should step to: the one minimising its
+    distance plus the step cost, without cutting blocked corners from free
+    cells; (0, 0) where no neighbour is reachable
+    """
+    depth, width = distances.shape
+    padded = np.full((depth + 2, width + 2), np.inf, dtype=distances.dtype)
+    padded[1:-1, 1:-1] = distances
+    open_ = np.zeros((depth + 2, width + 2), dtype=bool)
+    open_[1:-1, 1:-1] = free
+
+    best = np.full(distances.shape, np.inf, dtype=distances.dtype)
+    choice = np.zeros(distances.shape, dtype=np.intp)
+    for k, (dx, dz) in enumerate(OFFSETS.tolist()):
+        candidate = padded[1 + dz:depth + 1 + dz, 1 + dx:width + 1 + dx]
+        if dx and dz:
+            candidate = candidate + np.float32(SQRT2)
+            corners = open_[1:-1, 1 + dx:width + 1 + dx] & open_[1 + dz:depth + 1 + dz, 1:-1]
+            candidate[free & ~corners] = np.inf
+        else:
+            candidate = candidate + np.float32(1.0)
+        better = candidate < best
+        best[better] = candidate[better]
+        choice[better] = k
+
+    steps = OFFSETS[choice]
+    steps[np.isinf(best)] = 0
+    # Free cells only step downhill; one that cannot is cut off from the goal
+    steps[free & np.isinf(distances)] = 0
+    return steps
@@ -0,0 +1,414 @@
+"""
+Hierarchical pathfinding (HPA*) over an OccupancyGrid
+
+The grid is cut into square clusters of `cluster_size` cells. Where two
+neighbouring clusters share a run of free cells along their border, the run
+gets one transition (two, at its ends, for runs of ENTRANCE_SPLIT cells or more),
+and each transition adds a node on either side joined by a one-cell edge. Nodes
+of the same cluster are joined by their shortest path length inside the
+cluster. Baking computes those lengths for all clusters at once with the
+vectorised distance sweep.
+
+A query links the start and goal to the nodes of their own clusters, searches
+the small node graph with A*, then refines each abstract edge into cells with
+a local A* confined to one cluster (or a straight line where that is clear).
+
+Baked graphs are saved as .npz files named after a hash of the grid's blocked
+cells, cell size and cluster size, so a restart with the same static geometry
+loads the graph instead of baking it again. Only the most recently used files
+are kept, since every change to the geometry is baked into a file of its own.
+"""
+import os
+import math
+import heapq
+import hashlib
+import logging
+import tempfile
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from .distance_field import new_field, sweep
+from .pathfinding import OccupancyGrid, GridPathfinder, SQRT2, TIE_BREAK
+
+FORMAT_VERSION = 1
+ENTRANCE_SPLIT = 6
+# Clusters baked per batch of the distance sweep, bounding its memory
+BAKE_BATCH = 256
+
+logger = logging.getLogger("physics_engine.navigation")
+
+def geometry_key(grid: OccupancyGrid, cluster_size: int) -> str:
+    """
+    Content hash of everything a baked graph depends on
+    """
+    digest = hashlib.sha256()
+    digest.update(repr((FORMAT_VERSION, grid.width, grid.depth, grid.cell_size, cluster_size)).encode())
+    digest.update(np.packbits(grid.blocked).tobytes())
+    return digest.hexdigest()
+
+class HierarchicalPathfinder:
+    """
+    HPA* search with the same find_path() interface as GridPathfinder
+    Build one with bake() or load_or_bake(); the grid must not change afterwards.
+    """
+    def __init__(self, grid: OccupancyGrid, cluster_size: int, node_cells: np.ndarray,
+                 indptr: np.ndarray, neighbours: np.ndarray, costs: np.ndarray, key: str = ""):
+        self.grid = grid
+        self.cluster_size = cluster_size
+        self.key = key
+        self.clusters_x = -(-grid.width // cluster_size)
+        self.clusters_z = -(-grid.depth // cluster_size)
+        self.expansions = 0
+
+        # Node positions in cells, and the graph as per-node adjacency lists
+        self.node_x = (node_cells % grid.width).tolist()
+        self.node_z = (node_cells // grid.width).tolist()
+        neighbours, costs, indptr = neighbours.tolist(), costs.tolist(), indptr.tolist()
+        self.edges = [list(zip(neighbours[a:b], costs[a:b])) for a, b in zip(indptr, indptr[1:])]
+        self.cluster_nodes = [[] for _ in range(self.clusters_x * self.clusters_z)]
+        for node, (x, z) in enumerate(zip(self.node_x, self.node_z)):
+            self.cluster_nodes[self.cluster_of(x, z)].append(node)
+
+        self._stamp = [0] * self.node_count
+        self._cost = [0.0] * self.node_count
+        self._parent = [0] * self.node_count
+        self._query = 0
+
+        # Local searches and distance fields reuse one cluster-sized grid
+        self.local_grid = OccupancyGrid(cluster_size, cluster_size, grid.cell_size, (0.0, 0.0))
+        self.local = GridPathfinder(self.local_grid)
+        self._local_cluster = -1
+
+    @property
+    def node_count(self) -> int:
+        return len(self.node_x)
+
+    @property
+    def edge_count(self) -> int:
+        return sum(len(edges) for edges in self.edges)
+
+    def cluster_of(self, x: int, z: int) -> int:
+        return (z // self.cluster_size) * self.clusters_x + x // self.cluster_size
+
+    def _cluster_origin(self, cluster: int) -> Tuple[int, int]:
+        cz, cx = divmod(cluster, self.clusters_x)
+        return cx * self.cluster_size, cz * self.cluster_size
+
+    def _use_cluster(self, cluster: int) -> Tuple[int, int]:
+        """
+        Load a cluster's cells into the local grid, cells beyond the world edge blocked
+        """
+        x0, z0 = self._cluster_origin(cluster)
+        if cluster != self._local_cluster:
+            size = self.cluster_size
+            block = self.grid.blocked[z0:z0 + size, x0:x0 + size]
+            self.local_grid.blocked[:] = True
+            self.local_grid.blocked[:block.shape[0], :block.shape[1]] = block
+            self.local_grid.refresh()
+            self._local_cluster = cluster
+        return x0, z0
+
+    def _distances_in_cluster(self, x: int, z: int, cluster: int) -> np.ndarray:
+        """
+        Path lengths from cell (x, z) to every cell of its cluster, staying inside it
+        """
+        x0, z0 = self._use_cluster(cluster)
+        field = new_field((self.cluster_size, self.cluster_size))
+        field[z - z0, x - x0] = 0.0
+        sweep(field, ~self.local_grid.blocked)
+        return field
+
+    def _local_path(self, a: Tuple[int, int], b: Tuple[int, int], cluster: int) -> Optional[List[int]]:
+        """
+        Grid indices of a path between two cells of one cluster, or None
+        """
+        grid = self.grid
+        if a == b:
+            return [grid.index(*a)]
+        if grid.line_clear(*grid.centre_of(*a), *grid.centre_of(*b)):
+            return [grid.index(*a), grid.index(*b)]
+        x0, z0 = self._use_cluster(cluster)
+        local = self.local_grid
+        cells, reached = self.local.find_path(local.index(a[0] - x0, a[1] - z0), local.index(b[0] - x0, b[1] - z0))
+        if not reached:
+            return None
+        result = []
+        for i in cells:
+            lx, lz = local.cell_at(i)
+            result.append(grid.index(lx + x0, lz + z0))
+        return result
+
+    def find_path(self, start: int, goal: int) -> Tuple[List[int], bool]:
+        """
+        Cells (grid passable indices) from start to goal, both included
+        Consecutive cells are not always neighbours: straight stretches are given
+        by their ends. Returns (cells, reached); when the goal is unreachable the
+        cells lead to the node closest to it.
+        """
+        grid = self.grid
+        start_cell, goal_cell = grid.cell_at(start), grid.cell_at(goal)
+        start_cluster, goal_cluster = self.cluster_of(*start_cell), self.cluster_of(*goal_cell)
+        if start_cluster == goal_cluster:
+            cells = self._local_path(start_cell, goal_cell, start_cluster)
+            if cells is not None:
+                self.expansions = self.local.expansions
+                return cells, True
+
+        # Link the endpoints to the nodes of their clusters
+        node_x, node_z = self.node_x, self.node_z
+        x0, z0 = self._cluster_origin(start_cluster)
+        field = self._distances_in_cluster(*start_cell, start_cluster)
+        start_links = [(n, float(field[node_z[n] - z0, node_x[n] - x0])) for n in self.cluster_nodes[start_cluster]]
+        x0, z0 = self._cluster_origin(goal_cluster)
+        field = self._distances_in_cluster(*goal_cell, goal_cluster)
+        goal_links = {}
+        for n in self.cluster_nodes[goal_cluster]:
+            distance = float(field[node_z[n] - z0, node_x[n] - x0])
+            if math.isfinite(distance):
+                goal_links[n] = distance
+
+        nodes, reached = self._search(start_links, goal_links, goal_cell)
+        points = [start_cell] + [(node_x[n], node_z[n]) for n in nodes] + ([goal_cell] if reached else [])
+
+        # Refine each abstract edge into cells
+        cells = [start]
+        for a, b in zip(points, points[1:]):
+            if max(abs(a[0] - b[0]), abs(a[1] - b[1])) <= 1:
+                cells.append(grid.index(*b))
+                continue
+            segment = self._local_path(a, b, self.cluster_of(*a))
+            if segment is None:
+                segment = [grid.index(*a), grid.index(*b)]
+            cells.extend(segment[1:])
+        return cells, reached
+
+    def _search(self, start_links, goal_links, goal_cell) -> Tuple[List[int], bool]:
+        """
+        A* over the node graph from the start links to the goal links
+        Uses stamped per-node scratch lists like GridPathfinder. Returns (nodes,
+        reached); unreached searches end at the node closest to the goal.
+        """
+        node_x, node_z, edges = self.node_x, self.node_z, self.edges
+        stamp, cost, parent = self._stamp, self._cost, self._parent
+        self._query += 1
+        query = self._query
+        goal_x, goal_z = goal_cell
+        octile = SQRT2 - 2.0
+        heappush, heappop = heapq.heappush, heapq.heappop
+        heap = []
+        for n, distance in start_links:
+            if math.isfinite(distance) and not (stamp[n] == query and cost[n] <= distance):
+                stamp[n] = query
+                cost[n] = distance
+                parent[n] = -1
+                dx, dz = abs(node_x[n] - goal_x), abs(node_z[n] - goal_z)
+                heappush(heap, (distance + (dx + dz + octile * min(dx, dz)) * TIE_BREAK, distance, n))
+
+        # The goal cell's own heap entries carry node -1 and the node they came from
+        goal_cost, goal_parent = math.inf, -1
+        best, best_h = -1, math.inf
+        expansions = 0
+        reached = False
+        while heap:
+            f, g, n = heappop(heap)
+            if n < 0:
+                reached = True
+                break
+            if g > cost[n]:
+                continue
+            expansions += 1
+            h = f - g
+            if h < best_h:
+                best, best_h = n, h
+            link = goal_links.get(n)
+            if link is not None and g + link < goal_cost:
+                goal_cost, goal_parent = g + link, n
+                heappush(heap, (goal_cost, goal_cost, -1))
+            for m, step in edges[n]:
+                new_cost = g + step
+                if stamp[m] == query and new_cost >= cost[m]:
+                    continue
+                stamp[m] = query
+                cost[m] = new_cost
+                parent[m] = n
+                dx = node_x[m] - goal_x
+                dz = node_z[m] - goal_z
+                if dx < 0:
+                    dx = -dx
+                if dz < 0:
+                    dz = -dz
+                heappush(heap, (new_cost + (dx + dz + octile * (dx if dx < dz else dz)) * TIE_BREAK, new_cost, m))
+        self.expansions = expansions
+
+        nodes = []
+        n = goal_parent if reached else best
+        while n >= 0:
+            nodes.append(n)
+            n = parent[n]
+        nodes.reverse()
+        return nodes, reached
+
+    @classmethod
+    def bake(cls, grid: OccupancyGrid, cluster_size: int) -> 'HierarchicalPathfinder':
+        """
+        Find the transitions between clusters and the path lengths between them
+        """
+        free = ~grid.blocked
+        size = cluster_size
+        clusters_x = -(-grid.width // size)
+        clusters_z = -(-grid.depth // size)
+
+        # Transitions: pairs of facing free cells on neighbouring clusters' borders
+        pairs = []
+        for boundary in range(size, grid.width, size):
+            _transitions(free[:, boundary - 1], free[:, boundary], size,
+                         lambda z, b=boundary: ((b - 1, z), (b, z)), pairs)
+        for boundary in range(size, grid.depth, size):
+            _transitions(free[boundary - 1, :], free[boundary, :], size,
+                         lambda x, b=boundary: ((x, b - 1), (x, b)), pairs)
+
+        index = {}
+        for a, b in pairs:
+            index.setdefault(a, len(index))
+            index.setdefault(b, len(index))
+        cells = np.array(list(index), dtype=np.int64).reshape(-1, 2)
+        node_x, node_z = cells[:, 0], cells[:, 1]
+        node_cluster = (node_z // size) * clusters_x + node_x // size
+        edges = [(index[a], index[b], 1.0) for a, b in pairs] + [(index[b], index[a], 1.0) for a, b in pairs]
+
+        # Intra-cluster path lengths, for batches of clusters with similar node
+        # counts at a time: one distance field per node, batched on the last axes
+        padded = np.zeros((clusters_z * size, clusters_x * size), dtype=bool)
+        padded[:grid.depth, :grid.width] = free
+        tiles = padded.reshape(clusters_z, size, clusters_x, size).transpose(1, 3, 0, 2).reshape(size, size, -1)
+        order = np.argsort(node_cluster, kind="stable")
+        bounds = np.searchsorted(node_cluster[order], np.arange(clusters_x * clusters_z + 1))
+        counts = np.diff(bounds)
+        by_count = [c for c in np.argsort(counts, kind="stable") if counts[c] > 1]
+        for first in range(0, len(by_count), BAKE_BATCH):
+            batch = by_count[first:first + BAKE_BATCH]
+            members = [order[bounds[c]:bounds[c + 1]] for c in batch]
+            fields = new_field((size, size, len(batch), max(len(m) for m in members)))
+            for b, nodes in enumerate(members):
+                fields[node_z[nodes] % size, node_x[nodes] % size, b, np.arange(len(nodes))] = 0.0
+            sweep(fields, tiles[:, :, batch, None])
+            for b, nodes in enumerate(members):
+                # lengths[i, j]: from node i to node j
+                lengths = fields[node_z[nodes] % size, node_x[nodes] % size, b, :len(nodes)].T
+                for i, j in zip(*np.nonzero(np.isfinite(lengths))):
+                    if i != j:
+                        edges.append((int(nodes[i]), int(nodes[j]), float(lengths[i, j])))
+
+        edge_array = np.array(edges, dtype=np.float64).reshape(-1, 3)
+        sources = edge_array[:, 0].astype(np.int64)
+        edge_order = np.argsort(sources, kind="stable")
+        indptr = np.searchsorted(sources[edge_order], np.arange(len(cells) + 1))
+        return cls(grid, cluster_size, node_z * grid.width + node_x, indptr,
+                   edge_array[edge_order, 1].astype(np.int64), edge_array[edge_order, 2].astype(np.float32),
+                   geometry_key(grid, cluster_size))
+
+    def save(self, path: str):
+        """
+        Write the baked graph to `path` atomically
+        """
+        indptr = np.zeros(self.node_count + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(edges) for edges in self.edges])
+        neighbours = np.array([m for edges in self.edges for m, _ in edges], dtype=np.int64)
+        costs = np.array([c for edges in self.edges for _, c in edges], dtype=np.float32)
+        node_cells = np.array(self.node_z, dtype=np.int64) * self.grid.width + np.array(self.node_x, dtype=np.int64)
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, version=FORMAT_VERSION, key=self.key, cluster_size=self.cluster_size,
+                                    node_cells=node_cells, indptr=indptr, neighbours=neighbours, costs=costs)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    @classmethod
+    def load(cls, path: str, grid: OccupancyGrid, key: str) -> Optional['HierarchicalPathfinder']:
+        """
+        Graph saved at `path`, or None if it is missing or was baked for other geometry
+        """
+        try:
+            with np.load(path) as data:
+                if int(data["version"]) != FORMAT_VERSION or str(data["key"]) != key:
+                    return None
+                return cls(grid, int(data["cluster_size"]), data["node_cells"], data["indptr"],
+                           data["neighbours"], data["costs"], key)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable navigation data {path}: {e}")
+            return None
+
+    @classmethod
+    def load_or_bake(cls, grid: OccupancyGrid, cluster_size: int, cache_dir: Optional[str] = None,
+                     max_files: Optional[int] = None) -> 'HierarchicalPathfinder':
+        """
+        Graph for the grid's current geometry, from `cache_dir` if it was baked before
+        Newly baked graphs are saved there, and beyond `max_files` graphs the least
+        recently used ones are deleted.
+        """
+        key = geometry_key(grid, cluster_size)
+        path = os.path.join(cache_dir, f"nav-{key[:32]}.npz") if cache_dir else None
+        if path:
+            loaded = cls.load(path, grid, key)
+            if loaded is not None:
+                logger.info(f"Loaded navigation data {path} ({loaded.node_count} nodes)")
+                try:
+                    os.utime(path)  # Most recently used
+                except OSError:
+                    pass
+                return loaded
+        pathfinder = cls.bake(grid, cluster_size)
+        logger.info(f"Baked navigation data: {pathfinder.node_count} nodes, {pathfinder.edge_count} edges")
+        if path:
+            try:
+                pathfinder.save(path)
+            except OSError as e:
+                logger.warning(f"Failed to save navigation data {path}: {e}")
+            if max_files:
+                prune_cache(cache_dir, max_files)
+        return pathfinder
+
+def prune_cache(cache_dir: str, max_files: int) -> int:
+    """
+    Delete all but the `max_files` most recently used graphs in `cache_dir`
+    Returns the number of files deleted
+    """
+    try:
+        names = [name for name in os.listdir(cache_dir) if name.startswith("nav-") and name.endswith(".npz")]
+        files = sorted((os.path.join(cache_dir, name) for name in names), key=os.path.getmtime, reverse=True)
+    except OSError as e:
+        logger.warning(f"Failed to list navigation data in {cache_dir}: {e}")
+        return 0
+    deleted = 0
+    for path in files[max_files:]:
+        try:
+            os.remove(path)
+            deleted += 1
+        except OSError as e:
+            logger.warning(f"Failed to delete navigation data {path}: {e}")
+    if deleted:
+        logger.info(f"Deleted {deleted} old navigation data files from {cache_dir}")
+    return deleted
+
+def _transitions(side_a: np.ndarray, side_b: np.ndarray, size: int, cells, pairs: list):
+    """
+    Append the (cell_a, cell_b) transitions of one border line, split per cluster
+    """
+    open_cells = side_a & side_b
+    for first in range(0, len(open_cells), size):
+        segment = open_cells[first:first + size]
+        edges = np.diff(np.concatenate(([0], segment.astype(np.int8), [0])))
+        for start, end in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)):
+            if end - start >= ENTRANCE_SPLIT:
+                pairs.append(cells(first + start))
+                pairs.append(cells(first + end - 1))
+            else:
+                pairs.append(cells(first + (start + end - 1) // 2))
@@ -1,23 +1,42 @@
-import time
-import logging
 import math
 from typing import List, Dict, Any
 
 from ..core.action_system import Action
 
+# Yaw is computed inline once per moving agent per tick; a call to
+# rotation.yaw_from_direction would cost more than the math itself
+DEGREES = 180.0 / math.pi
+
 class MovementAction(Action):
     """
     Action for moving an agent to a target position
     Handles path finding and collision avoidance
+    Movements share the "locomotion" coalesce key, so a newer move retargets
+    the running or pending one in place instead of queueing behind it
+
+    In "flow" mode the agent follows the physics engine's shared flow field
+    towards the target instead of a path of its own, looking up its next step
+    every tick; meant for targets many agents head to at once. Without a field
+    (no navigator, or the agent outside the field's reach) it plans a path as usual.
     """
-    def __init__(self, agent, target_position: List[float], speed: float = 1.0, precision: float = 0.1):
+    __slots__ = ("target_position", "speed", "precision", "path", "current_waypoint_index",
+                 "_cached_initial_distance", "mode", "flow_field")
+    
+    coalesce_key = "locomotion"
+    # Flow field steps followed per update, so long catch-up updates keep their speed
+    MAX_FLOW_STEPS = 16
+    
+    def __init__(self, agent, target_position: List[float], speed: float = 1.0, precision: float = 0.1,
+                 mode: str = "path"):
         super().__init__(agent=agent, priority=10)  # Movement is usually high priority
         self.target_position = target_position
         self.speed = speed
         self.precision = precision  # How close we need to get to consider it "arrived"
         self.path = [target_position]  # Simple direct path by default
         self.current_waypoint_index = 0
-        self.logger = logging.getLogger(f"action.MovementAction")
+        self._cached_initial_distance = None
+        self.mode = mode
+        self.flow_field = None
         
     def start(self):
         """
@@ -26,9 +45,39 @@ class MovementAction(Action):
         super().start()
         
         # Log start of movement
-        self.logger.debug(f"Starting movement to {self.target_position} at speed {self.speed}")
+        self.logger.debug("Starting movement to %s at speed %s", self.target_position, self.speed)
+        self._plan()
+        
+    def _plan(self):
+        if self.mode == "flow" and self._hold_flow_field() is not None:
+            return
+        self._plan_path()
         
-        # Calculate path if we have pathfinding available
+    def _hold_flow_field(self):
+        """
+        Take (or keep) the current shared flow field towards the target, None if there is none
+        """
+        physics_engine = getattr(self.agent, 'physics_engine', None)
+        field = None
+        if physics_engine and hasattr(physics_engine, 'flow_field'):
+            try:
+                field = physics_engine.flow_field(self.target_position, self.flow_field)
+            except Exception as e:
+                self.logger.warning(f"Failed to get flow field: {e}, planning a path")
+        self.flow_field = field
+        return field
+        
+    def _release_flow_field(self):
+        if self.flow_field is not None:
+            physics_engine = getattr(self.agent, 'physics_engine', None)
+            if physics_engine and hasattr(physics_engine, 'release_flow_field'):
+                physics_engine.release_flow_field(self.flow_field)
+            self.flow_field = None
+        
+    def _plan_path(self):
+        """
+        Calculate path if we have pathfinding available
+        """
         physics_engine = getattr(self.agent, 'physics_engine', None)
         if physics_engine and hasattr(physics_engine, 'calculate_path'):
             try:
@@ -36,7 +85,7 @@ class MovementAction(Action):
                     self.agent.position,
                     self.target_position
                 )
-                self.logger.debug(f"Calculated path with {len(self.path)} waypoints")
+                self.logger.debug("Calculated path with %s waypoints", len(self.path))
             except Exception as e:
                 self.logger.warning(f"Failed to calculate path: {e}, using direct path")
         
@@ -48,9 +97,12 @@ class MovementAction(Action):
         if not self.agent:
             self.fail("Agent reference is missing")
             return True
+        if self.flow_field is not None:
+            return self._follow_flow_field(delta_time)
             
         # Get current waypoint
         if self.current_waypoint_index >= len(self.path):
+            self.complete()
             return True  # Path completed
             
         current_waypoint = self.path[self.current_waypoint_index]
@@ -66,12 +118,13 @@ class MovementAction(Action):
             
         # Check if we've arrived at waypoint
         if distance <= self.precision:
-            self.logger.debug(f"Reached waypoint {self.current_waypoint_index}")
+            self.logger.debug("Reached waypoint %s", self.current_waypoint_index)
             self.current_waypoint_index += 1
             
             # Check if we've arrived at final destination
             if self.current_waypoint_index >= len(self.path):
-                self.logger.debug(f"Reached final destination {self.target_position}")
+                self.logger.debug("Reached final destination %s", self.target_position)
+                self.complete()
                 return True
                 
             # Move to next waypoint
@@ -88,18 +141,71 @@ class MovementAction(Action):
         # Calculate new position
         new_position = [a + (b * move_distance) for a, b in zip(current_pos, direction)]
 
-        # Calculate yaw for agent orientation
-        if direction[0] != 0 or direction[2] != 0: # Avoid atan2(0,0)
-            yaw_radians = math.atan2(direction[0], direction[2])
-            yaw_degrees = math.degrees(yaw_radians)
-            # Assuming ground movement, so pitch and roll are 0
-            self.agent.rotation = [0, yaw_degrees, 0]
+        # Face the direction of travel (nonzero, as the waypoint is not reached);
+        # assuming ground movement, so pitch and roll are 0
+        self.agent.rotation = [0, math.atan2(direction[0], direction[2]) * DEGREES, 0]
         
         # Update agent position and rotation
         self._move_agent(new_position)
         
         return False
         
+    def _follow_flow_field(self, delta_time: float) -> bool:
+        """
+        Step along the flow field, from cell to cell, for this update's distance
+        """
+        field = self._hold_flow_field()
+        position = self.agent.position
+        if field is None:
+            # Geometry changed and the goal has no field any more
+            self.path = [self.target_position]
+            self.current_waypoint_index = 0
+            self._plan_path()
+            return False
+
+        budget = self.speed * delta_time
+        end_x, end_z = field.end
+        direction = None
+        lost = False
+        for _ in range(self.MAX_FLOW_STEPS):
+            remaining = math.hypot(end_x - position[0], end_z - position[2])
+            if remaining <= self.precision or budget <= 0:
+                break
+            target = field.sample(position[0], position[2])
+            if target is None:
+                lost = True
+                break
+            dx, dz = target[0] - position[0], target[1] - position[2]
+            step = math.hypot(dx, dz)
+            if step == 0:
+                break
+            move = min(step, budget)
+            direction = (dx / step, dz / step)
+            position = [position[0] + direction[0] * move, position[1], position[2] + direction[1] * move]
+            budget -= move
+
+        if direction is not None:
+            self.agent.rotation = [0, math.atan2(direction[0], direction[1]) * DEGREES, 0]
+            self._move_agent(position)
+
+        if lost:
+            # Outside the field's window or cut off inside it: plan a path instead
+            self.logger.debug("No flow field step at %s, planning a path", position)
+            self._release_flow_field()
+            self._plan_path()
+            return False
+
+        remaining = math.hypot(end_x - position[0], end_z - position[2])
+        if remaining <= self.precision:
+            self.logger.debug("Reached final destination %s", self.target_position)
+            self.complete()
+            return True
+        left = max(remaining, field.distance(position[0], position[2]))
+        if self._cached_initial_distance is None:
+            self._cached_initial_distance = max(0.1, left)
+        self.progress = min(1.0, max(0.0, 1.0 - left / self._cached_initial_distance))
+        return False
+        
     def _move_agent(self, new_position: List[float]):
         """
         Move the agent to the new position
@@ -124,7 +230,7 @@ class MovementAction(Action):
         """
         Calculate initial distance to target (for progress calculation)
         """
-        if hasattr(self, '_cached_initial_distance'):
+        if self._cached_initial_distance is not None:
             return self._cached_initial_distance
             
         # Calculate distance along path
@@ -155,9 +261,53 @@ class MovementAction(Action):
             return [0] * len(vector)
         return [x / length for x in vector]
         
+    def resume(self):
+        """
+        Replan from wherever the agent is now when resuming after preemption
+        """
+        super().resume()
+        self.retarget(self.target_position)
+        
+    def complete(self):
+        self._release_flow_field()
+        super().complete()
+        
+    def fail(self, error: str):
+        self._release_flow_field()
+        super().fail(error)
+        
+    def retarget(self, target_position: List[float], speed: float = None, precision: float = None):
+        """
+        Point this movement at a new target in place, replanning if it is already running
+        """
+        self.target_position = target_position
+        if speed is not None:
+            self.speed = speed
+        if precision is not None:
+            self.precision = precision
+        self.path = [target_position]
+        self.current_waypoint_index = 0
+        self._cached_initial_distance = None
+        self._release_flow_field()
+        if self.is_running():
+            self.logger.debug("Retargeting movement to %s", target_position)
+            self._plan()
+            
+    def absorb(self, newer) -> bool:
+        """
+        Take over the target of a newer MovementAction
+        """
+        if not isinstance(newer, MovementAction):
+            return False
+        self.mode = newer.mode
+        self.retarget(newer.target_position, newer.speed, newer.precision)
+        self.deadline = newer.deadline
+        return True
+        
     def cancel(self):
         """
         Called when the action is cancelled
         """
-        self.logger.debug(f"Movement to {self.target_position} cancelled")
+        self.logger.debug("Movement to %s cancelled", self.target_position)
+        self._release_flow_field()
         super().cancel()
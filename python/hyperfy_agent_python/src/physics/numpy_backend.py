@@ -0,0 +1,498 @@
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+from .physics_backend import PhysicsBackend, Shape, BOX
+from .rotation import euler_to_matrix
+
+class NumpyBackend(PhysicsBackend):
+    """
+    Built-in rigid body simulation with NumPy, used when PyPhysX is not installed
+    Bodies are rows of structure-of-arrays state, so every stage runs vectorised over
+    all bodies: semi-implicit Euler integration with gravity, a ground plane, a
+    sweep-and-prune broadphase along the axis with the widest spread, and a
+    narrowphase for upright capsules, spheres and axis-aligned boxes that pushes
+    overlapping bodies apart by inverse mass and removes their approaching velocity.
+
+    Bodies translate only: rotations are stored and returned but do not turn the
+    shapes or take part in the dynamics, which suits upright agents and static
+    level geometry. Resting contacts with the ground are not reported as collisions.
+    """
+    name = "numpy"
+
+    def __init__(self, config: Dict[str, Any], capacity: int = 64):
+        self.logger = logging.getLogger("physics_engine.numpy")
+        self.gravity = np.array(config.get("GRAVITY", [0, -9.81, 0]), dtype=np.float64)
+        self.ground_enabled = config.get("WORLD_GROUND_ENABLED", True)
+        self.ground_height = float(config.get("PHYSICS_GROUND_HEIGHT", 0.0))
+        self.restitution = float(config.get("PHYSICS_RESTITUTION", 0.2))
+        self.friction = float(config.get("PHYSICS_FRICTION", 0.5))
+        self.linear_damping = float(config.get("PHYSICS_LINEAR_DAMPING", 0.05))
+        self.iterations = int(config.get("PHYSICS_SOLVER_ITERATIONS", 2))
+
+        self.count = 0
+        self.names: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.user_data: List[Dict[str, Any]] = []
+        self._allocate(capacity)
+        self._pairs = (np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp))
+        self._contacts = None
+        # Rows change when a removal moves the last body; read_states() caches its row lookup per layout
+        self.layout = 0
+        self._read_names = None
+        self._read_layout = -1
+        self._read_rows = None
+
+    def _allocate(self, capacity: int):
+        old = self.count
+        arrays = {
+            "position": np.zeros((capacity, 3)),
+            "velocity": np.zeros((capacity, 3)),
+            "force": np.zeros((capacity, 3)),
+            "impulse": np.zeros((capacity, 3)),
+            "rotation": np.zeros((capacity, 3)),
+            "offset": np.zeros((capacity, 3)),
+            "extents": np.zeros((capacity, 3)),
+            "radius": np.zeros(capacity),
+            "half_height": np.zeros(capacity),
+            "inv_mass": np.zeros(capacity),
+            "kind": np.zeros(capacity, dtype=np.int8)
+        }
+        for name, array in arrays.items():
+            if old:
+                array[:old] = getattr(self, name)[:old]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def add_body(self, name: str, position: List[float], rotation: List[float], shape: Shape,
+                 mass: float, user_data: Dict[str, Any]):
+        if name in self.index:
+            raise ValueError(f"Body {name} already exists")
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        i = self.count
+        self.position[i] = position
+        self.velocity[i] = self.force[i] = self.impulse[i] = 0.0
+        self.rotation[i] = rotation
+        self.offset[i] = shape.offset
+        self.extents[i] = shape.half_extents
+        self.radius[i] = shape.radius
+        self.half_height[i] = shape.half_height
+        self.inv_mass[i] = 1.0 / mass if mass > 0 else 0.0
+        self.kind[i] = shape.kind
+        self.names.append(name)
+        self.user_data.append(user_data)
+        self.index[name] = i
+        self.count += 1
+
+    def remove_body(self, name: str):
+        i = self.index.pop(name, None)
+        if i is None:
+            return
+        last = self.count - 1
+        if i != last:
+            # Move the last body into the hole
+            for array in (self.position, self.velocity, self.force, self.impulse, self.rotation, self.offset,
+                          self.extents, self.radius, self.half_height, self.inv_mass, self.kind):
+                array[i] = array[last]
+            self.names[i] = self.names[last]
+            self.user_data[i] = self.user_data[last]
+            self.index[self.names[i]] = i
+        self.names.pop()
+        self.user_data.pop()
+        self.count = last
+        self.layout += 1
+        self._contacts = None
+
+    def has_body(self, name: str) -> bool:
+        return name in self.index
+
+    def set_pose(self, name: str, position: List[float], rotation: Optional[List[float]] = None):
+        i = self.index[name]
+        self.position[i] = position
+        if rotation is not None:
+            self.rotation[i] = rotation
+
+    def get_pose(self, name: str) -> Tuple[List[float], List[float]]:
+        i = self.index[name]
+        return self.position[i].tolist(), self.rotation[i].tolist()
+
+    def get_linear_velocity(self, name: str) -> List[float]:
+        return self.velocity[self.index[name]].tolist()
+
+    def read_states(self, names, positions, rotations, velocities):
+        if names is not self._read_names or self.layout != self._read_layout:
+            self._read_rows = np.fromiter((self.index[name] for name in names), dtype=np.intp, count=len(names))
+            self._read_names = names
+            self._read_layout = self.layout
+        rows = self._read_rows
+        np.take(self.position, rows, axis=0, out=positions)
+        np.take(self.rotation, rows, axis=0, out=rotations)
+        np.take(self.velocity, rows, axis=0, out=velocities)
+
+    def add_force(self, name: str, force: List[float], impulse: bool = False, local: bool = False):
+        i = self.index[name]
+        force = np.asarray(force, dtype=np.float64)
+        if local:
+            force = euler_to_matrix(self.rotation[i]) @ force
+        if impulse:
+            self.impulse[i] += force
+        else:
+            self.force[i] += force
+
+    def simulate(self, dt: float):
+        n = self.count
+        self._contacts = None
+        if not n:
+            return
+        position = self.position[:n]
+        velocity = self.velocity[:n]
+        inv_mass = self.inv_mass[:n]
+        dynamic = inv_mass > 0.0
+
+        # Integrate: impulses, forces, gravity, damping (static bodies have zero inverse mass)
+        velocity += (self.impulse[:n] + self.force[:n] * dt) * inv_mass[:, None]
+        velocity[dynamic] += self.gravity * dt
+        velocity *= max(0.0, 1.0 - self.linear_damping * dt)
+        position += velocity * dt
+        self.force[:n] = 0.0
+        self.impulse[:n] = 0.0
+
+        if self.ground_enabled:
+            self._resolve_ground(dynamic, dt)
+
+        a, b = self._broadphase(dynamic)
+        if not len(a):
+            return
+        for _ in range(self.iterations):
+            contact = self._narrowphase(a, b)
+            if contact is None:
+                break
+            self._resolve(*contact)
+            if self._contacts is None:
+                self._contacts = contact
+
+    def _resolve_ground(self, dynamic: np.ndarray, dt: float):
+        n = self.count
+        position = self.position[:n]
+        bottom = position[:, 1] + self.offset[:n, 1] - self.extents[:n, 1]
+        depth = self.ground_height - bottom
+        below = np.flatnonzero((depth > 0.0) & dynamic)
+        if not len(below):
+            return
+        position[below, 1] += depth[below]
+        velocity = self.velocity[below]
+        falling = velocity[:, 1] < 0.0
+        # Bounce fast impacts, settle slow ones
+        velocity[:, 1] = np.where(falling, np.where(velocity[:, 1] < -1.0, -velocity[:, 1] * self.restitution, 0.0),
+                                  velocity[:, 1])
+        # Coulomb friction against the normal force of gravity
+        speed = np.hypot(velocity[:, 0], velocity[:, 2])
+        slow = self.friction * abs(self.gravity[1]) * dt
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scale = np.where(speed > slow, 1.0 - slow / speed, 0.0)
+        velocity[:, 0] *= scale
+        velocity[:, 2] *= scale
+        self.velocity[below] = velocity
+
+    def bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        World-space axis-aligned bounds (min, max) of every body's shape
+        """
+        n = self.count
+        centre = self.position[:n] + self.offset[:n]
+        return centre - self.extents[:n], centre + self.extents[:n]
+
+    def _broadphase(self, dynamic: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Sweep and prune: pairs whose bounds overlap, with at least one dynamic body
+        """
+        n = self.count
+        lo, hi = self.bounds()
+        axis = int(np.argmax(lo.max(axis=0) - lo.min(axis=0))) if n > 1 else 0
+        order = np.argsort(lo[:, axis], kind="stable")
+        sorted_lo = lo[order, axis]
+        # Bodies after i in sweep order that start before i ends
+        end = np.searchsorted(sorted_lo, hi[order, axis], side="right")
+        counts = end - np.arange(1, n + 1)
+        total = int(counts.sum())
+        if not total:
+            return self._pairs
+        first = np.repeat(np.arange(n), counts)
+        starts = np.cumsum(counts) - counts
+        second = first + 1 + (np.arange(total) - np.repeat(starts, counts))
+        a = order[first]
+        b = order[second]
+        keep = dynamic[a] | dynamic[b]
+        # The sort already guarantees overlap on the sweep axis; test the other two one column at a time
+        for other in (axis + 1) % 3, (axis + 2) % 3:
+            a = a[keep]
+            b = b[keep]
+            other_lo = lo[:, other]
+            other_hi = hi[:, other]
+            keep = (other_lo[a] <= other_hi[b]) & (other_lo[b] <= other_hi[a])
+        return a[keep], b[keep]
+
+    def _narrowphase(self, a: np.ndarray, b: np.ndarray):
+        """
+        Penetration depth, normal (pointing from b to a) and contact point of each pair
+        """
+        n = self.count
+        centre = self.position[:n] + self.offset[:n]
+        extents = self.extents[:n]
+        is_box = self.kind[:n] == BOX
+        m = len(a)
+        depth = np.empty(m)
+        normal = np.zeros((m, 3))
+        point = np.empty((m, 3))
+
+        box_a = is_box[a]
+        box_b = is_box[b]
+        round_pairs = np.flatnonzero(~box_a & ~box_b)
+        if len(round_pairs):
+            self._round_round(round_pairs, a[round_pairs], b[round_pairs], centre, depth, normal, point)
+        box_pairs = np.flatnonzero(box_a & box_b)
+        if len(box_pairs):
+            self._box_box(box_pairs, a[box_pairs], b[box_pairs], centre, extents, depth, normal, point)
+        mixed = np.flatnonzero(box_a != box_b)
+        if len(mixed):
+            # Put the round body first, then flip the normal back for pairs where a was the box
+            flip = box_a[mixed]
+            round_body = np.where(flip, b[mixed], a[mixed])
+            box_body = np.where(flip, a[mixed], b[mixed])
+            self._round_box(mixed, round_body, box_body, centre, extents, depth, normal, point)
+            normal[mixed[flip]] *= -1.0
+
+        touching = depth > 0.0
+        if not touching.any():
+            return None
+        return a[touching], b[touching], depth[touching], normal[touching], point[touching]
+
+    def _segments(self, bodies: np.ndarray, centre: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # Capsule core segments run along Y; a sphere's is a point
+        y = centre[bodies, 1]
+        half = self.half_height[bodies]
+        return y - half, y + half
+
+    def _round_round(self, pairs, a, b, centre, depth, normal, point):
+        lo_a, hi_a = self._segments(a, centre)
+        lo_b, hi_b = self._segments(b, centre)
+        # Closest points of two vertical segments
+        mid = (np.maximum(lo_a, lo_b) + np.minimum(hi_a, hi_b)) * 0.5
+        point_a = centre[a].copy()
+        point_b = centre[b].copy()
+        point_a[:, 1] = np.clip(mid, lo_a, hi_a)
+        point_b[:, 1] = np.clip(mid, lo_b, hi_b)
+        delta = point_a - point_b
+        distance = np.linalg.norm(delta, axis=1)
+        radius_a = self.radius[a]
+        radius_b = self.radius[b]
+        depth[pairs] = radius_a + radius_b - distance
+        normal[pairs] = _directions(delta, distance)
+        point[pairs] = point_b + normal[pairs] * (radius_b - depth[pairs] * 0.5)[:, None]
+
+    def _box_box(self, pairs, a, b, centre, extents, depth, normal, point):
+        delta = centre[a] - centre[b]
+        overlap = extents[a] + extents[b] - np.abs(delta)
+        axis = np.argmin(overlap, axis=1)
+        rows = np.arange(len(pairs))
+        depth[pairs] = overlap[rows, axis]
+        sign = np.where(delta[rows, axis] < 0.0, -1.0, 1.0)
+        box_normal = np.zeros((len(pairs), 3))
+        box_normal[rows, axis] = sign
+        normal[pairs] = box_normal
+        lo = np.maximum(centre[a] - extents[a], centre[b] - extents[b])
+        hi = np.minimum(centre[a] + extents[a], centre[b] + extents[b])
+        point[pairs] = (lo + hi) * 0.5
+
+    def _round_box(self, pairs, round_body, box_body, centre, extents, depth, normal, point):
+        lo_s, hi_s = self._segments(round_body, centre)
+        box_lo = centre[box_body] - extents[box_body]
+        box_hi = centre[box_body] + extents[box_body]
+        # Point of the segment nearest the box's vertical span, then the nearest point on the box
+        mid = (np.maximum(lo_s, box_lo[:, 1]) + np.minimum(hi_s, box_hi[:, 1])) * 0.5
+        p = centre[round_body].copy()
+        p[:, 1] = np.clip(mid, lo_s, hi_s)
+        q = np.clip(p, box_lo, box_hi)
+        delta = p - q
+        distance = np.linalg.norm(delta, axis=1)
+        radius = self.radius[round_body]
+        result_depth = radius - distance
+        result_normal = _directions(delta, distance)
+
+        inside = np.flatnonzero(distance < 1e-9)
+        if len(inside):
+            # Segment point inside the box: push out through the nearest face
+            to_lo = p[inside] - box_lo[inside]
+            to_hi = box_hi[inside] - p[inside]
+            faces = np.concatenate([to_lo, to_hi], axis=1)
+            face = np.argmin(faces, axis=1)
+            rows = np.arange(len(inside))
+            axis = face % 3
+            inside_normal = np.zeros((len(inside), 3))
+            inside_normal[rows, axis] = np.where(face < 3, -1.0, 1.0)
+            result_normal[inside] = inside_normal
+            result_depth[inside] = radius[inside] + faces[rows, face]
+
+        depth[pairs] = result_depth
+        normal[pairs] = result_normal
+        point[pairs] = q
+
+    def _resolve(self, a, b, depth, normal, point):
+        position = self.position
+        velocity = self.velocity
+        w_a = self.inv_mass[a]
+        w_b = self.inv_mass[b]
+        w_sum = w_a + w_b
+
+        # Split the separation by inverse mass
+        correction = normal * (depth / w_sum)[:, None]
+        np.add.at(position, a, correction * w_a[:, None])
+        np.add.at(position, b, -correction * w_b[:, None])
+
+        # Remove the approaching part of the relative velocity, with restitution
+        closing = np.einsum("ij,ij->i", velocity[a] - velocity[b], normal)
+        j = np.where(closing < 0.0, -(1.0 + self.restitution) * closing / w_sum, 0.0)
+        impulse = normal * j[:, None]
+        np.add.at(velocity, a, impulse * w_a[:, None])
+        np.add.at(velocity, b, -impulse * w_b[:, None])
+
+    def contacts(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        if self._contacts is None:
+            return []
+        a, b, depth, normal, point = self._contacts
+        names = self.names
+        user_data = self.user_data
+        contacts = []
+        for i, j, n, p, d in zip(a.tolist(), b.tolist(), normal.tolist(), point.tolist(), depth.tolist()):
+            contacts.append((names[i], names[j], {
+                "contact_point": p,
+                "normal": n,
+                "depth": d,
+                "type1": user_data[i].get("type", "unknown"),
+                "type2": user_data[j].get("type", "unknown")
+            }))
+        return contacts
+
+    def raycast(self, origin: List[float], direction: List[float], max_distance: float) -> Optional[Dict[str, Any]]:
+        n = self.count
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+        best_t = max_distance
+        best_normal = None
+        best = None
+
+        if n:
+            # Slab test against every body's bounds; exact for boxes, a cull for round shapes
+            centre = self.position[:n] + self.offset[:n]
+            extents = self.extents[:n]
+            entry, exit_, near = _slabs(origin, direction, centre - extents, centre + extents)
+            candidates = (entry <= exit_) & (exit_ >= 0.0) & (entry <= best_t)
+            is_box = self.kind[:n] == BOX
+            t = np.full(n, np.inf)
+            normals = np.zeros((n, 3))
+            boxes = np.flatnonzero(candidates & is_box & (entry >= 0.0))
+            if len(boxes):
+                t[boxes] = entry[boxes]
+                axis = np.argmax(near[boxes], axis=1)
+                normals[boxes, axis] = -np.sign(direction[axis])
+            round_bodies = np.flatnonzero(candidates & ~is_box)
+            if len(round_bodies):
+                self._ray_round(origin, direction, round_bodies, centre, t, normals)
+            i = int(np.argmin(t))
+            if t[i] <= best_t:
+                best_t = float(t[i])
+                best_normal = normals[i]
+                best = i
+
+        if self.ground_enabled and direction[1] < 0.0 and origin[1] >= self.ground_height:
+            ground_t = (self.ground_height - origin[1]) / direction[1]
+            if ground_t <= best_t:
+                return _hit(origin + direction * ground_t, [0.0, 1.0, 0.0], ground_t, "ground", "ground")
+
+        if best is None:
+            return None
+        user_data = self.user_data[best]
+        return _hit(origin + direction * best_t, best_normal.tolist(), best_t,
+                    user_data.get("type", "unknown"), user_data.get("name", self.names[best]))
+
+    def _ray_round(self, origin, direction, bodies, centre, t, normals):
+        c = centre[bodies]
+        radius = self.radius[bodies]
+        half = self.half_height[bodies]
+        lo = c[:, 1] - half
+        hi = c[:, 1] + half
+        best = np.full(len(bodies), np.inf)
+        best_normal = np.zeros((len(bodies), 3))
+
+        # Cylinder wall between the caps
+        flat = direction[0] ** 2 + direction[2] ** 2
+        if flat > 1e-12:
+            ox = origin[0] - c[:, 0]
+            oz = origin[2] - c[:, 2]
+            half_b = ox * direction[0] + oz * direction[2]
+            cc = ox * ox + oz * oz - radius * radius
+            disc = half_b * half_b - flat * cc
+            with np.errstate(invalid="ignore"):
+                wall_t = (-half_b - np.sqrt(disc)) / flat
+            y = origin[1] + direction[1] * wall_t
+            ok = (disc >= 0.0) & (wall_t >= 0.0) & (y >= lo) & (y <= hi)
+            best = np.where(ok, wall_t, best)
+            hit = origin + direction * np.where(ok, wall_t, 0.0)[:, None]
+            wall_normal = np.stack([hit[:, 0] - c[:, 0], np.zeros(len(bodies)), hit[:, 2] - c[:, 2]], axis=1)
+            best_normal = np.where(ok[:, None], wall_normal / radius[:, None], best_normal)
+
+        # End spheres
+        for end_y in (lo, hi):
+            sphere = c.copy()
+            sphere[:, 1] = end_y
+            oc = origin - sphere
+            half_b = oc @ direction
+            cc = np.einsum("ij,ij->i", oc, oc) - radius * radius
+            disc = half_b * half_b - cc
+            with np.errstate(invalid="ignore"):
+                cap_t = -half_b - np.sqrt(disc)
+            ok = (disc >= 0.0) & (cap_t >= 0.0) & (cap_t < best)
+            best = np.where(ok, cap_t, best)
+            hit = origin + direction * np.where(ok, cap_t, 0.0)[:, None]
+            best_normal = np.where(ok[:, None], (hit - sphere) / radius[:, None], best_normal)
+
+        # Bodies containing the origin (e.g. the agent casting the ray) are not hit
+        nearest = c.copy()
+        nearest[:, 1] = np.clip(origin[1], lo, hi)
+        inside = np.einsum("ij,ij->i", origin - nearest, origin - nearest) <= radius * radius
+        t[bodies] = np.where(inside, np.inf, best)
+        normals[bodies] = best_normal
+
+def _slabs(origin: np.ndarray, direction: np.ndarray, lo: np.ndarray, hi: np.ndarray):
+    """
+    Ray entry and exit distances through axis-aligned boxes, and the per-axis entry distances
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inv = 1.0 / direction
+        t1 = (lo - origin) * inv
+        t2 = (hi - origin) * inv
+    # A zero direction component gives nan for a ray exactly on a slab face; the fmin/fmax keep the other bound
+    near = np.nan_to_num(np.fmin(t1, t2), nan=-np.inf)
+    far = np.nan_to_num(np.fmax(t1, t2), nan=np.inf)
+    return near.max(axis=1), far.min(axis=1), near
+
+def _directions(delta: np.ndarray, distance: np.ndarray) -> np.ndarray:
+    """
+    Unit vectors of `delta`, with +X for coincident points
+    """
+    result = np.zeros_like(delta)
+    apart = distance > 1e-9
+    result[apart] = delta[apart] / distance[apart, None]
+    result[~apart, 0] = 1.0
+    return result
+
+def _hit(position, normal, distance, kind, name) -> Dict[str, Any]:
+    return {
+        "position": [float(v) for v in position],
+        "normal": [float(v) for v in normal],
+        "distance": float(distance),
+        "type": kind,
+        "name": name
+    }
@@ -0,0 +1,702 @@
+import math
+import heapq
+import threading
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+import numpy as np
+
+from .rotation import euler_to_matrix
+
+SQRT2 = math.sqrt(2.0)
+# Scales the heuristic so that among equal-cost paths the search prefers the
+# one heading for the goal, instead of widening across every tie
+TIE_BREAK = 1.0 + 1e-3
+
+# Footprint on the ground: (min_x, min_z, max_x, max_z)
+Footprint = Tuple[float, float, float, float]
+
+def footprint(position: List[float], half_extents: List[float], rotation: Optional[List[float]] = None,
+              offset: Optional[List[float]] = None, step_height: float = 0.0) -> Optional[Footprint]:
+    """
+    Ground rectangle covered by a box, or None if the box is low enough to step over
+    The box is centred on position + offset and turned by the Euler `rotation`
+    (degrees); rotated boxes cover their axis-aligned bounds.
+    """
+    extents = np.asarray(half_extents, dtype=np.float64)
+    if rotation is not None and any(rotation):
+        extents = np.abs(euler_to_matrix(rotation)) @ extents
+    centre = np.asarray(position, dtype=np.float64)
+    if offset is not None:
+        centre = centre + offset
+    if centre[1] + extents[1] <= step_height:
+        return None
+    return (float(centre[0] - extents[0]), float(centre[2] - extents[2]),
+            float(centre[0] + extents[0]), float(centre[2] + extents[2]))
+
+class OccupancyGrid:
+    """
+    Walkable cells of the ground plane
+    Cell (x, z) covers [origin + x * cell_size, origin + (x + 1) * cell_size) on
+    each axis. `blocked` is a (depth, width) array indexed [z, x]; `passable` is a
+    flat copy for the search, padded with a ring of blocked cells so neighbours
+    never need a bounds check. Call refresh() after changing `blocked`.
+    """
+    def __init__(self, width: int, depth: int, cell_size: float, origin: Tuple[float, float]):
+        self.width = width
+        self.depth = depth
+        self.cell_size = cell_size
+        self.origin = origin
+        self.blocked = np.zeros((depth, width), dtype=bool)
+        self.stride = width + 2
+        self.passable = bytearray()
+        self.refresh()
+
+    @classmethod
+    def for_world(cls, size: List[float], cell_size: float) -> 'OccupancyGrid':
+        """
+        Grid over a world of `size` (x, y, z) metres centred on the origin
+        """
+        width = max(1, int(math.ceil(size[0] / cell_size)))
+        depth = max(1, int(math.ceil(size[2] / cell_size)))
+        return cls(width, depth, cell_size, (-width * cell_size / 2, -depth * cell_size / 2))
+
+    def refresh(self):
+        padded = np.zeros((self.depth + 2, self.stride), dtype=np.uint8)
+        padded[1:-1, 1:-1] = ~self.blocked
+        self.passable = bytearray(padded.tobytes())
+
+    def copy(self) -> 'OccupancyGrid':
+        """
+        Independent grid with the same blocked cells
+        """
+        grid = OccupancyGrid(self.width, self.depth, self.cell_size, self.origin)
+        grid.blocked[:] = self.blocked
+        grid.passable = bytearray(self.passable)
+        return grid
+
+    def block(self, area: Footprint, inflate: float = 0.0):
+        """
+        Mark every cell whose centre lies within `area`, grown by `inflate`
+        """
+        x0, z0, x1, z1 = self.cell_range(area, inflate)
+        if x0 < x1 and z0 < z1:
+            self.blocked[z0:z1, x0:x1] = True
+
+    def cell_range(self, area: Footprint, inflate: float = 0.0) -> Tuple[int, int, int, int]:
+        """
+        Clamped cell bounds (x0, z0, x1, z1), end exclusive, of the cells centred within `area`
+        """
+        size = self.cell_size
+        ox, oz = self.origin
+        x0 = max(0, math.ceil((area[0] - inflate - ox) / size - 0.5))
+        z0 = max(0, math.ceil((area[1] - inflate - oz) / size - 0.5))
+        x1 = min(self.width, math.floor((area[2] + inflate - ox) / size - 0.5) + 1)
+        z1 = min(self.depth, math.floor((area[3] + inflate - oz) / size - 0.5) + 1)
+        return x0, z0, x1, z1
+
+    def cell_of(self, x: float, z: float) -> Tuple[int, int]:
+        """
+        Cell containing a world position, clamped to the grid
+        """
+        cx = int((x - self.origin[0]) // self.cell_size)
+        cz = int((z - self.origin[1]) // self.cell_size)
+        return min(max(cx, 0), self.width - 1), min(max(cz, 0), self.depth - 1)
+
+    def centre_of(self, cx: int, cz: int) -> Tuple[float, float]:
+        return (self.origin[0] + (cx + 0.5) * self.cell_size,
+                self.origin[1] + (cz + 0.5) * self.cell_size)
+
+    def index(self, cx: int, cz: int) -> int:
+        """
+        Position of a cell in `passable`
+        """
+        return (cz + 1) * self.stride + cx + 1
+
+    def cell_at(self, index: int) -> Tuple[int, int]:
+        cz, cx = divmod(index, self.stride)
+        return cx - 1, cz - 1
+
+    def is_free(self, cx: int, cz: int) -> bool:
+        return bool(self.passable[self.index(cx, cz)])
+
+    def nearest_free(self, cx: int, cz: int, max_radius: int) -> Optional[Tuple[int, int]]:
+        """
+        Closest free cell within `max_radius` rings of a cell, or None
+        """
+        if self.is_free(cx, cz):
+            return cx, cz
+        for radius in range(1, max_radius + 1):
+            x0, x1 = max(0, cx - radius), min(self.width, cx + radius + 1)
+            z0, z1 = max(0, cz - radius), min(self.depth, cz + radius + 1)
+            zs, xs = np.nonzero(~self.blocked[z0:z1, x0:x1])
+            if len(xs):
+                xs = xs + x0
+                zs = zs + z0
+                nearest = np.argmin((xs - cx) ** 2 + (zs - cz) ** 2)
+                return int(xs[nearest]), int(zs[nearest])
+        return None
+
+    def line_clear(self, ax: float, az: float, bx: float, bz: float) -> bool:
+        """
+        Whether the straight segment between two world positions crosses only free cells
+        Samples the segment every half cell.
+        """
+        size = self.cell_size
+        ox, oz = self.origin
+        passable = self.passable
+        stride = self.stride
+        steps = int(math.hypot(bx - ax, bz - az) / (size * 0.5)) + 1
+        dx = (bx - ax) / steps
+        dz = (bz - az) / steps
+        for i in range(steps + 1):
+            cx = int((ax + dx * i - ox) // size)
+            cz = int((az + dz * i - oz) // size)
+            if not (0 <= cx < self.width and 0 <= cz < self.depth) or not passable[(cz + 1) * stride + cx + 1]:
+                return False
+        return True
+
+    def line_cells(self, ax: float, az: float, bx: float, bz: float) -> Set[int]:
+        """
+        Indices of the cells line_clear() samples along a segment, clamped to the grid
+        """
+        size = self.cell_size
+        ox, oz = self.origin
+        steps = int(math.hypot(bx - ax, bz - az) / (size * 0.5)) + 1
+        dx = (bx - ax) / steps
+        dz = (bz - az) / steps
+        cells = set()
+        for i in range(steps + 1):
+            cx = min(max(int((ax + dx * i - ox) // size), 0), self.width - 1)
+            cz = min(max(int((az + dz * i - oz) // size), 0), self.depth - 1)
+            cells.add((cz + 1) * self.stride + cx + 1)
+        return cells
+
+class GridPathfinder:
+    """
+    A* over an OccupancyGrid
+    Moves to the 8 neighbouring cells without cutting blocked corners, with an
+    octile distance heuristic and an early exit when the goal is reached. Cost,
+    parent and visit-stamp arrays are allocated once per grid size and reused:
+    a cell's entries are only valid when its stamp matches the current query, so
+    nothing is cleared between queries.
+    """
+    def __init__(self, grid: OccupancyGrid, max_expansions: int = 50000):
+        self.grid = grid
+        self.max_expansions = max_expansions
+        self.expansions = 0
+        self._size = 0
+        self._query = 0
+
+    def _resize(self):
+        # Sized on first use, so grids searched some other way cost nothing here
+        size = len(self.grid.passable)
+        if size == self._size:
+            return
+        self._size = size
+        self._stamp = [0] * size
+        self._cost = [0.0] * size
+        self._parent = [0] * size
+        stride = self.grid.stride
+        # (offset, step cost, orthogonal offsets that must be free for a diagonal)
+        self._moves = (
+            (1, 1.0, 0, 0), (-1, 1.0, 0, 0), (stride, 1.0, 0, 0), (-stride, 1.0, 0, 0),
+            (stride + 1, SQRT2, 1, stride), (stride - 1, SQRT2, -1, stride),
+            (-stride + 1, SQRT2, 1, -stride), (-stride - 1, SQRT2, -1, -stride)
+        )
+
+    def find_path(self, start: int, goal: int) -> Tuple[List[int], bool]:
+        """
+        Cells (passable indices) from start to goal, both included
+        Returns (cells, reached). If the goal cannot be reached within
+        max_expansions, the cells lead to the expanded cell closest to it instead.
+        """
+        self._resize()
+        self._query += 1
+        query = self._query
+        stamp, cost, parent = self._stamp, self._cost, self._parent
+        passable = self.grid.passable
+        moves = self._moves
+        stride = self.grid.stride
+        goal_z, goal_x = divmod(goal, stride)
+        octile = SQRT2 - 2.0
+        heappush, heappop = heapq.heappush, heapq.heappop
+
+        stamp[start] = query
+        cost[start] = 0.0
+        parent[start] = -1
+        dx, dz = abs(start % stride - goal_x), abs(start // stride - goal_z)
+        best, best_h = start, dx + dz + octile * min(dx, dz)
+        heap = [(best_h * TIE_BREAK, 0.0, start)]
+        expansions = 0
+        reached = False
+        while heap:
+            f, g, i = heappop(heap)
+            if i == goal:
+                reached = True
+                break
+            if g > cost[i]:
+                continue  # superseded by a cheaper entry
+            expansions += 1
+            if expansions > self.max_expansions:
+                break
+            h = f - g
+            if h < best_h:
+                best, best_h = i, h
+            for offset, step, side_a, side_b in moves:
+                j = i + offset
+                if not passable[j]:
+                    continue
+                if side_a and not (passable[i + side_a] and passable[i + side_b]):
+                    continue
+                new_cost = g + step
+                if stamp[j] == query and new_cost >= cost[j]:
+                    continue
+                stamp[j] = query
+                cost[j] = new_cost
+                parent[j] = i
+                jz, jx = divmod(j, stride)
+                dx = jx - goal_x if jx > goal_x else goal_x - jx
+                dz = jz - goal_z if jz > goal_z else goal_z - jz
+                h = dx + dz + octile * (dx if dx < dz else dz)
+                heappush(heap, (new_cost + h * TIE_BREAK, new_cost, j))
+        self.expansions = expansions
+
+        cells = []
+        i = goal if reached else best
+        while i != -1:
+            cells.append(i)
+            i = parent[i]
+        cells.reverse()
+        return cells, reached
+
+class PathCache:
+    """
+    LRU cache of navigation paths keyed by quantised start and goal cells
+    Starts and goals are bucketed into squares of `quantum` cells, so agents
+    setting off from about the same place towards the same landmark share an
+    entry. Each entry is indexed under the cells its segments cross: when the
+    grid changes, only the paths through changed cells are dropped. Paths that
+    stopped short of their goal are also dropped whenever any cell is freed,
+    since the goal may have become reachable.
+    """
+    def __init__(self, capacity: int = 512, quantum: int = 2, registry=None):
+        self.capacity = capacity
+        self.quantum = max(1, quantum)
+        # key -> (points, reached, cells)
+        self.entries: "OrderedDict[Tuple[int, int, int, int], Tuple[list, bool, Set[int]]]" = OrderedDict()
+        self.by_cell: Dict[int, Set[Tuple[int, int, int, int]]] = {}
+        self.unreached: Set[Tuple[int, int, int, int]] = set()
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+        self.evicted = 0
+
+        self.metrics = None
+        if registry is not None:
+            self.metrics = (
+                registry.counter("hyperfy_nav_path_cache_lookups_total", "Path cache lookups, by result", ("result",)),
+                registry.counter("hyperfy_nav_path_cache_invalidations_total",
+                                 "Cached paths dropped because cells along them changed"),
+                registry.counter("hyperfy_nav_path_cache_evictions_total", "Cached paths evicted as least recently used")
+            )
+
+    def key(self, start_cell: Tuple[int, int], goal_cell: Tuple[int, int]) -> Tuple[int, int, int, int]:
+        q = self.quantum
+        return start_cell[0] // q, start_cell[1] // q, goal_cell[0] // q, goal_cell[1] // q
+
+    def get(self, key) -> Optional[Tuple[list, bool]]:
+        """
+        Points and reached flag of a cached path, marking it recently used
+        The caller checks the ends still fit its query and reports the outcome with record().
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.entries.move_to_end(key)
+        return entry[0], entry[1]
+
+    def record(self, hit: bool):
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        if self.metrics is not None:
+            self.metrics[0].inc("hit" if hit else "miss")
+
+    def put(self, key, points: list, reached: bool, cells: Set[int]):
+        self.discard(key)
+        self.entries[key] = (points, reached, cells)
+        for cell in cells:
+            self.by_cell.setdefault(cell, set()).add(key)
+        if not reached:
+            self.unreached.add(key)
+        while len(self.entries) > self.capacity:
+            self.discard(next(iter(self.entries)))
+            self.evicted += 1
+            if self.metrics is not None:
+                self.metrics[2].inc()
+
+    def discard(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        for cell in entry[2]:
+            keys = self.by_cell[cell]
+            keys.discard(key)
+            if not keys:
+                del self.by_cell[cell]
+        self.unreached.discard(key)
+
+    def invalidate(self, changed: List[int], freed: bool = False) -> int:
+        """
+        Drop the paths crossing any of the `changed` cells, and with `freed` the
+        ones that never reached their goal. Returns how many were dropped.
+        """
+        stale = set(self.unreached) if freed else set()
+        by_cell = self.by_cell
+        for cell in changed:
+            keys = by_cell.get(cell)
+            if keys:
+                stale.update(keys)
+        for key in stale:
+            self.discard(key)
+        self.invalidated += len(stale)
+        if stale and self.metrics is not None:
+            self.metrics[1].inc(amount=len(stale))
+        return len(stale)
+
+    def clear(self):
+        self.entries.clear()
+        self.by_cell.clear()
+        self.unreached.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self.entries), "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hit_rate, "invalidated": self.invalidated, "evicted": self.evicted}
+
+class Navigator:
+    """
+    Ground navigation for PhysicsEngine.calculate_path()
+    Keeps the footprints of static geometry from two sources: physics obstacles
+    added through the engine, and WorldState objects of the `NAV_OBSTACLE_TYPES`
+    or with an "obstacle" property. Their size comes from a "half_extents"
+    property or half their scale. The occupancy grid over `WORLD_SIZE` (centred
+    on the origin) is rebuilt lazily after footprints change, with every
+    footprint grown by `NAV_CLEARANCE` so paths keep agents clear of walls.
+
+    Grids of more than `NAV_HIERARCHICAL_MIN_CELLS` cells (with NAV_HIERARCHICAL
+    "auto") are searched hierarchically instead, over clusters of
+    `NAV_CLUSTER_SIZE` cells. That graph is baked after each change, or loaded
+    from `NAV_CACHE_DIR` (which keeps the `NAV_CACHE_MAX_FILES` most recently
+    used graphs) if the same geometry was baked before. With `NAV_BACKGROUND_BAKE`
+    the bake runs on its own thread from a copy of the grid, and queries use the
+    flat search until it is done; a bake overtaken by newer geometry is discarded.
+
+    Searched paths are kept in a PathCache of `NAV_PATH_CACHE_SIZE` entries,
+    reused when a later query starts and ends in the same `NAV_PATH_CACHE_QUANTUM`
+    buckets and its first and last legs are clear. Each rebuild compares the old
+    and new grids and drops only the paths through cells that changed.
+
+    Agents converging on one goal can share a FlowField instead: flow_field()
+    hands out the one for a goal, computed over `NAV_FLOW_FIELD_RADIUS` metres
+    around it, and keeps it while any agent holds it. Once released, the last
+    `NAV_FLOW_FIELD_IDLE` fields are kept in case the same goal comes up again.
+    """
+    def __init__(self, config: Dict[str, Any], registry=None):
+        self.logger = logging.getLogger("physics_engine.navigation")
+        self.grid = OccupancyGrid.for_world(config.get("WORLD_SIZE", [100, 50, 100]),
+                                            config.get("NAV_CELL_SIZE", 0.5))
+        self.pathfinder = GridPathfinder(self.grid, config.get("NAV_MAX_EXPANSIONS", 50000))
+        self.clearance = config.get("NAV_CLEARANCE", config.get("PHYSICS_AGENT_RADIUS", 0.5))
+        self.step_height = config.get("NAV_STEP_HEIGHT", 0.3)
+        self.obstacle_types = set(config.get("NAV_OBSTACLE_TYPES", ["obstacle", "wall"]))
+        self.footprints: Dict[str, Footprint] = {}
+        self.lock = threading.RLock()
+        self.dirty = False
+        self.version = 0
+        self.world_state = None
+
+        mode = config.get("NAV_HIERARCHICAL", "auto")
+        if mode == "auto":
+            mode = self.grid.width * self.grid.depth > config.get("NAV_HIERARCHICAL_MIN_CELLS", 250000)
+        self.hierarchical = bool(mode)
+        self.cluster_size = config.get("NAV_CLUSTER_SIZE", 32)
+        self.cache_dir = config.get("NAV_CACHE_DIR", "nav_cache")
+        self.cache_max_files = config.get("NAV_CACHE_MAX_FILES", 8)
+        self.background_bake = config.get("NAV_BACKGROUND_BAKE", True)
+        self.hierarchy = None
+        self.bake_thread: Optional[threading.Thread] = None
+        self.bake_pending = False
+        self.baked = threading.Event()
+        self.baked.set()
+
+        capacity = config.get("NAV_PATH_CACHE_SIZE", 512)
+        self.path_cache = PathCache(capacity, config.get("NAV_PATH_CACHE_QUANTUM", 2), registry) if capacity else None
+
+        self.flow_radius = config.get("NAV_FLOW_FIELD_RADIUS", 64.0)
+        self.flow_idle = config.get("NAV_FLOW_FIELD_IDLE", 4)
+        self.flow_fields: "OrderedDict[Tuple[float, float], Any]" = OrderedDict()
+
+    def set_footprint(self, name: str, area: Optional[Footprint]):
+        """
+        Add, move or (with area None) remove the footprint of a static body
+        """
+        with self.lock:
+            if area is None:
+                if self.footprints.pop(name, None) is not None:
+                    self.dirty = True
+            elif self.footprints.get(name) != area:
+                self.footprints[name] = area
+                self.dirty = True
+
+    def attach_world_state(self, world_state):
+        """
+        Track the obstacle objects of a WorldState, replacing any previously attached one
+        """
+        with self.lock:
+            if world_state is self.world_state:
+                return
+            if self.world_state is not None:
+                self.world_state.remove_change_listener(self._on_world_change)
+                for name in [name for name in self.footprints if name.startswith("world:")]:
+                    self.set_footprint(name, None)
+            self.world_state = world_state
+            with world_state.lock:
+                for obj in world_state.objects.values():
+                    self._on_world_change("add_object", obj)
+                world_state.add_change_listener(self._on_world_change)
+
+    def _on_world_change(self, change_type: str, obj):
+        if obj.object_type == "player":
+            return
+        name = f"world:{obj.object_id}"
+        if change_type == "remove_object" or not (obj.object_type in self.obstacle_types or
+                                                  obj.properties.get("obstacle")):
+            self.set_footprint(name, None)
+            return
+        half_extents = obj.properties.get("half_extents") or [s / 2 for s in obj.scale]
+        self.set_footprint(name, footprint(obj.position, half_extents, obj.rotation, step_height=self.step_height))
+
+    def _rebuild(self):
+        grid = self.grid
+        cache = self.path_cache
+        previous = grid.blocked.copy() if cache is not None and cache.entries else None
+        grid.blocked[:] = False
+        for area in self.footprints.values():
+            grid.block(area, self.clearance)
+        grid.refresh()
+        if previous is not None:
+            zs, xs = np.nonzero(previous != grid.blocked)
+            if len(zs):
+                freed = bool(np.any(previous & ~grid.blocked))
+                dropped = cache.invalidate(((zs + 1) * grid.stride + xs + 1).tolist(), freed)
+                self.logger.debug("%d grid cells changed, dropped %d cached paths", len(zs), dropped)
+        self.dirty = False
+        self.version += 1
+        self.logger.debug("Rebuilt navigation grid from %s footprints", len(self.footprints))
+        self.hierarchy = None
+        if self.hierarchical and self.footprints:
+            if self.background_bake:
+                self._request_bake()
+            else:
+                from .hierarchical import HierarchicalPathfinder
+                self.hierarchy = HierarchicalPathfinder.load_or_bake(grid, self.cluster_size, self.cache_dir,
+                                                                     self.cache_max_files)
+
+    def _request_bake(self):
+        """
+        Bake the hierarchy for the current grid on the bake thread, starting it if needed
+        Called with the lock held
+        """
+        self.baked.clear()
+        if self.bake_thread is not None:
+            # The running bake picks up the newest geometry when it finishes
+            self.bake_pending = True
+            return
+        self.bake_thread = threading.Thread(target=self._bake_worker, name="nav-bake")
+        self.bake_thread.daemon = True
+        self.bake_thread.start()
+
+    def _bake_worker(self):
+        """
+        Bake thread: bake the latest grid until no newer geometry is waiting
+        """
+        from .hierarchical import HierarchicalPathfinder
+        while True:
+            with self.lock:
+                self.bake_pending = False
+                version = self.version
+                grid = self.grid.copy()
+            try:
+                hierarchy = HierarchicalPathfinder.load_or_bake(grid, self.cluster_size, self.cache_dir,
+                                                                self.cache_max_files)
+            except Exception as e:
+                self.logger.error(f"Failed to bake navigation data: {e}")
+                hierarchy = None
+            with self.lock:
+                if hierarchy is not None and version == self.version:
+                    self.hierarchy = hierarchy
+                    if self.path_cache is not None:
+                        # Flat searches may have given up on long paths meanwhile
+                        self.path_cache.clear()
+                if not self.bake_pending:
+                    self.bake_thread = None
+                    self.baked.set()
+                    return
+
+    def wait_for_bake(self, timeout: Optional[float] = None) -> bool:
+        """
+        Apply pending geometry changes and wait for any background bake to finish
+        Returns False if it is still running after `timeout` seconds
+        """
+        with self.lock:
+            if self.dirty:
+                self._rebuild()
+        return self.baked.wait(timeout)
+
+    def calculate_path(self, start: List[float], goal: List[float]) -> List[List[float]]:
+        """
+        Waypoints from start to goal, ending at the goal
+        A clear straight line is returned as the goal alone. Otherwise the grid
+        path is cut down to the turns that cannot be skipped in a straight line. If the goal is
+        inside an obstacle the path ends at the nearest free cell, and if it cannot
+        be reached, at the reachable cell closest to it.
+        """
+        with self.lock:
+            if self.dirty:
+                self._rebuild()
+            grid = self.grid
+            if not self.footprints or grid.line_clear(start[0], start[2], goal[0], goal[2]):
+                return [list(goal)]
+
+            radius = max(1, int(math.ceil(4 * self.clearance / grid.cell_size)))
+            start_cell = grid.nearest_free(*grid.cell_of(start[0], start[2]), radius)
+            goal_cell = grid.nearest_free(*grid.cell_of(goal[0], goal[2]), radius)
+            if start_cell is None or goal_cell is None:
+                return [list(goal)]
+            exact = goal_cell == grid.cell_of(goal[0], goal[2])
+
+            points = None
+            cache = self.path_cache
+            if cache is not None:
+                key = cache.key(start_cell, goal_cell)
+                cached = cache.get(key)
+                if cached is not None:
+                    points = self._reuse(cached, start, goal, goal_cell, exact)
+                cache.record(points is not None)
+
+            if points is None:
+                search = self.hierarchy or self.pathfinder
+                cells, reached = search.find_path(grid.index(*start_cell), grid.index(*goal_cell))
+
+                # Keep the cells where the path turns, then shortcut across those
+                turns = [cells[0]] + [cells[k] for k in range(1, len(cells) - 1)
+                                      if cells[k + 1] - cells[k] != cells[k] - cells[k - 1]] + cells[-1:]
+                points = [grid.centre_of(*grid.cell_at(i)) for i in turns]
+                if reached and exact:
+                    points[-1] = (goal[0], goal[2])
+                points[0] = (start[0], start[2])
+                points = self._shorten(points)
+                if cache is not None:
+                    crossed = set()
+                    for a, b in zip(points, points[1:]):
+                        crossed |= grid.line_cells(*a, *b)
+                    cache.put(key, points, reached, crossed)
+
+        y = start[1]
+        waypoints = [[x, y, z] for x, z in points[1:]]
+        if waypoints and points[-1] == (goal[0], goal[2]):
+            waypoints[-1] = list(goal)
+        return waypoints or [list(goal)]
+
+    def flow_field(self, goal: List[float], held=None):
+        """
+        Hold the FlowField leading to `goal`, computing it if there is no current one
+        A `held` field that still matches the geometry is returned as is, otherwise
+        released in exchange for a current one, so movers can call this every tick.
+        Returns None if there is no free cell near the goal. Pair with release_flow_field().
+        """
+        if held is not None:
+            if not self.dirty and held.version == self.version:
+                return held
+            self.release_flow_field(held)
+        with self.lock:
+            if self.dirty:
+                self._rebuild()
+            key = (goal[0], goal[2])
+            field = self.flow_fields.get(key)
+            if field is None or field.version != self.version:
+                from .flow_field import FlowField
+                grid = self.grid
+                radius = max(1, int(math.ceil(4 * self.clearance / grid.cell_size)))
+                goal_cell = grid.nearest_free(*grid.cell_of(goal[0], goal[2]), radius)
+                if goal_cell is None:
+                    return None
+                end = key if goal_cell == grid.cell_of(goal[0], goal[2]) else grid.centre_of(*goal_cell)
+                # Agents holding a stale field move over to this one as they notice
+                field = FlowField(grid, goal_cell, end, int(math.ceil(self.flow_radius / grid.cell_size)), self.version)
+                self.flow_fields[key] = field
+                self.logger.debug("Computed flow field to %s in %d rounds", key, field.rounds)
+            field.users += 1
+            self.flow_fields.move_to_end(key)
+            return field
+
+    def release_flow_field(self, field):
+        """
+        Let go of a FlowField; idle ones beyond `NAV_FLOW_FIELD_IDLE` are dropped, oldest first
+        """
+        with self.lock:
+            field.users = max(0, field.users - 1)
+            if field.users == 0:
+                key = next((key for key, held in self.flow_fields.items() if held is field), None)
+                if key is not None:
+                    self.flow_fields.move_to_end(key)
+            idle = [key for key, held in self.flow_fields.items() if held.users == 0]
+            for key in idle[:max(0, len(idle) - self.flow_idle)]:
+                del self.flow_fields[key]
+
+    def _reuse(self, cached: Tuple[list, bool], start: List[float], goal: List[float],
+               goal_cell: Tuple[int, int], exact: bool) -> Optional[List[Tuple[float, float]]]:
+        """
+        A cached path with its ends moved to this query's start and goal, or None
+        if either end leg is not clear from its new end
+        """
+        points, reached = cached
+        if not reached:
+            end = points[-1]
+        elif exact:
+            end = (goal[0], goal[2])
+        else:
+            end = self.grid.centre_of(*goal_cell)
+        points = [(start[0], start[2])] + points[1:-1] + [end]
+        line_clear = self.grid.line_clear
+        if not (line_clear(*points[0], *points[1]) and line_clear(*points[-2], *points[-1])):
+            return None
+        return points
+
+    def _shorten(self, points: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+        """
+        Drop the points that a straight line from the last kept point can skip
+        """
+        if len(points) <= 2:
+            return points
+        line_clear = self.grid.line_clear
+        kept = [points[0]]
+        anchor = 0
+        while anchor < len(points) - 1:
+            # Furthest point visible from the anchor, checking far points first
+            for i in range(len(points) - 1, anchor, -1):
+                if i == anchor + 1 or line_clear(*points[anchor], *points[i]):
+                    break
+            kept.append(points[i])
+            anchor = i
+        return kept
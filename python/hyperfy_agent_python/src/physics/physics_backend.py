@@ -0,0 +1,105 @@
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+SPHERE = 0
+CAPSULE = 1
+BOX = 2
+
+class Shape:
+    """
+    Collision shape of a physics body
+    Capsules stand upright along the Y axis and boxes are axis aligned. `offset` is
+    the shape's centre relative to the body position, e.g. an agent's capsule sits
+    on the agent's feet.
+    """
+    __slots__ = ("kind", "radius", "half_height", "half_extents", "offset")
+
+    def __init__(self, kind: int, radius: float = 0.0, half_height: float = 0.0,
+                 half_extents: Optional[List[float]] = None, offset: Optional[List[float]] = None):
+        self.kind = kind
+        self.radius = float(radius)
+        self.half_height = float(half_height)
+        self.half_extents = [float(v) for v in half_extents] if half_extents is not None else [radius] * 3
+        self.offset = [float(v) for v in offset] if offset is not None else [0.0, 0.0, 0.0]
+
+    @classmethod
+    def sphere(cls, radius: float, offset: Optional[List[float]] = None) -> 'Shape':
+        return cls(SPHERE, radius=radius, offset=offset)
+
+    @classmethod
+    def capsule(cls, radius: float, half_height: float, offset: Optional[List[float]] = None) -> 'Shape':
+        return cls(CAPSULE, radius=radius, half_height=half_height,
+                   half_extents=[radius, radius + half_height, radius], offset=offset)
+
+    @classmethod
+    def box(cls, half_extents: List[float], offset: Optional[List[float]] = None) -> 'Shape':
+        return cls(BOX, half_extents=half_extents, offset=offset)
+
+    def __repr__(self) -> str:
+        kind = ("sphere", "capsule", "box")[self.kind]
+        return f"Shape({kind}, half_extents={self.half_extents}, offset={self.offset})"
+
+class PhysicsBackend:
+    """
+    Interface between PhysicsEngine and a physics library
+    Bodies are identified by name. Rotations are Euler angles in degrees, as on
+    agents; a mass of 0 adds a static body. The engine keeps the fixed timestep,
+    the agent registry and the collision callbacks, and only calls into the
+    backend from the thread that simulates.
+    """
+    name = "none"
+
+    def add_body(self, name: str, position: List[float], rotation: List[float], shape: Shape,
+                 mass: float, user_data: Dict[str, Any]):
+        raise NotImplementedError
+
+    def remove_body(self, name: str):
+        raise NotImplementedError
+
+    def has_body(self, name: str) -> bool:
+        raise NotImplementedError
+
+    def set_pose(self, name: str, position: List[float], rotation: Optional[List[float]] = None):
+        """
+        Teleport a body; rotation None keeps the current one
+        """
+        raise NotImplementedError
+
+    def get_pose(self, name: str) -> Tuple[List[float], List[float]]:
+        """
+        Position and Euler rotation of a body
+        """
+        raise NotImplementedError
+
+    def get_linear_velocity(self, name: str) -> List[float]:
+        raise NotImplementedError
+
+    def read_states(self, names: Sequence[str], positions, rotations, velocities):
+        """
+        Write the position, Euler rotation and linear velocity of each named body into
+        row i of the given (len(names), 3) arrays
+        """
+        for i, name in enumerate(names):
+            positions[i], rotations[i] = self.get_pose(name)
+            velocities[i] = self.get_linear_velocity(name)
+
+    def add_force(self, name: str, force: List[float], impulse: bool = False, local: bool = False):
+        """
+        Apply a force for the next step, or an instant change of momentum if `impulse`
+        """
+        raise NotImplementedError
+
+    def simulate(self, dt: float):
+        raise NotImplementedError
+
+    def raycast(self, origin: List[float], direction: List[float], max_distance: float) -> Optional[Dict[str, Any]]:
+        """
+        Nearest hit as a dict with position, normal, distance, type and name, or None
+        `direction` is already normalized
+        """
+        raise NotImplementedError
+
+    def contacts(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """
+        (name1, name2, collision_data) for each touching pair found by the last step
+        """
+        return []
@@ -3,20 +3,77 @@ import logging
 import time
 from typing import Dict, List, Any, Optional, Callable
 
+from ..core import clock, metrics
+from .physics_backend import PhysicsBackend, Shape
+
 # Import PyPhysX conditionally to handle environments where it may not be installed
 try:
     import pyphysx
+    PYPHYSX_AVAILABLE = True
+except ImportError:
+    PYPHYSX_AVAILABLE = False
+
+try:
     import numpy as np
-    PHYSICS_ENABLED = True
+    NUMPY_AVAILABLE = True
 except ImportError:
-    PHYSICS_ENABLED = False
+    NUMPY_AVAILABLE = False
+
+PHYSICS_ENABLED = PYPHYSX_AVAILABLE or NUMPY_AVAILABLE
+
+if NUMPY_AVAILABLE:
+    from .pathfinding import Navigator, footprint
+
+def create_backend(config: Dict[str, Any]) -> Optional[PhysicsBackend]:
+    """
+    Create the physics backend named by PHYSICS_BACKEND
+    "auto" uses PyPhysX when it is installed and the NumPy backend otherwise.
+    Returns None if the requested backend is not available
+    """
+    name = config.get("PHYSICS_BACKEND", "auto")
+    if name not in ("auto", "pyphysx", "numpy"):
+        raise ValueError(f"Unknown physics backend {name!r}, expected 'auto', 'pyphysx' or 'numpy'")
+    if name in ("auto", "pyphysx") and PYPHYSX_AVAILABLE:
+        from .pyphysx_backend import PyPhysXBackend
+        return PyPhysXBackend(config)
+    if name in ("auto", "numpy") and NUMPY_AVAILABLE:
+        from .numpy_backend import NumpyBackend
+        return NumpyBackend(config)
+    return None
+
+class PoseBuffer:
+    """
+    Positions, Euler rotations (degrees) and linear velocities of every agent body
+    Row i belongs to names[i]. The engine fills a spare buffer after each outer
+    step and swaps it in as PhysicsEngine.poses, so a reader always sees the
+    poses of one complete step.
+    """
+    __slots__ = ("names", "index", "positions", "rotations", "velocities", "step")
+
+    def __init__(self, names: tuple):
+        self.names = names
+        self.index = {name: i for i, name in enumerate(names)}
+        self.positions = np.zeros((len(names), 3))
+        self.rotations = np.zeros((len(names), 3))
+        self.velocities = np.zeros((len(names), 3))
+        self.step = 0
+
+    def get(self, name: str) -> Optional[tuple]:
+        """
+        (position, rotation, velocity) lists of one body, or None if it is not in this buffer
+        """
+        i = self.index.get(name)
+        if i is None:
+            return None
+        return self.positions[i].tolist(), self.rotations[i].tolist(), self.velocities[i].tolist()
 
 class PhysicsEngine:
     """
-    Physics engine for Hyperfy agents using PyPhysX
-    Provides collision detection, rigid body dynamics, and raycasting
+    Physics engine for Hyperfy agents
+    Provides collision detection, rigid body dynamics, and raycasting through a
+    PhysicsBackend: PyPhysX when available, otherwise the built-in NumPy backend
     """
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], backend: Optional[PhysicsBackend] = None):
         self.config = config
         self.logger = logging.getLogger("physics_engine")
         self.is_running = False
@@ -24,49 +81,51 @@ class PhysicsEngine:
         self.timestep = config.get("PHYSICS_TIMESTEP", 1/60)
         self.gravity = config.get("GRAVITY", [0, -9.81, 0])
         self.agents = {}
-        self.rigid_bodies = {}
+        self.accumulator = 0.0
+        self.steps = 0
+        
+        # Double-buffered agent states, read back once per outer step
+        self.batch_states = config.get("PHYSICS_BATCH_STATES", True) and NUMPY_AVAILABLE
+        self.poses: Optional[PoseBuffer] = None
+        self._spare_poses: Optional[PoseBuffer] = None
+        self._agent_list: Optional[list] = None
+        # Agents register from the tick thread while the physics thread reads them back
+        self.agents_lock = threading.Lock()
         self.collision_callbacks = []
+        self.backend = backend
+        
+        # Agent bodies: an upright capsule standing on the agent's position
+        radius = config.get("PHYSICS_AGENT_RADIUS", 0.5)
+        half_height = config.get("PHYSICS_AGENT_HALF_HEIGHT", 0.5)
+        self.agent_shape = Shape.capsule(radius, half_height, offset=[0.0, radius + half_height, 0.0])
+        self.agent_mass = config.get("PHYSICS_AGENT_MASS", 70.0)  # 70kg for standard agent
+        
+        # Pathfinding around static geometry, independent of the backend
+        registry = metrics.default_registry if config.get("METRICS_ENABLED", False) else None
+        self.navigator = Navigator(config, registry) if NUMPY_AVAILABLE else None
         
-        # Check if physics library is available
-        if not PHYSICS_ENABLED:
-            self.logger.warning("PyPhysX not available. Physics capabilities will be disabled.")
+        if self.backend is not None:
             return
             
         # Initialize physics scene
         try:
-            self._init_physics()
-            self.logger.info("Physics engine initialized")
+            self.backend = create_backend(config)
         except Exception as e:
             self.logger.error(f"Failed to initialize physics engine: {e}")
             return
             
-    def _init_physics(self):
-        """
-        Initialize physics scene and components
-        """
-        if not PHYSICS_ENABLED:
-            return
-            
-        # Create physics scene
-        scene_flags = pyphysx.SceneFlag.ENABLE_STABILIZATION | pyphysx.SceneFlag.ENABLE_CCD
-        self.scene = pyphysx.Scene(scene_flags=scene_flags)
-        self.scene.set_gravity(self.gravity)
-        
-        # Setup physics material
-        self.default_material = pyphysx.Material(static_friction=0.5, dynamic_friction=0.5, restitution=0.2)
-        
-        # Create ground plane if enabled
-        if self.config.get("WORLD_GROUND_ENABLED", True):
-            ground_plane = pyphysx.RigidStatic()
-            ground_plane.attach_shape(pyphysx.Shape.create_plane(material=self.default_material, nx=0, ny=1, nz=0))
-            self.scene.add_actor(ground_plane)
-            self.logger.debug("Added ground plane to physics scene")
+        if self.backend is None:
+            self.logger.warning("No physics backend available. Physics capabilities will be disabled.")
+        else:
+            self.logger.info(f"Physics engine initialized with the {self.backend.name} backend")
             
-    def start(self):
+    def start(self, threaded: bool = True):
         """
         Start the physics simulation
+        With `threaded` False no worker thread is started and the owner drives the
+        simulation by calling advance(), e.g. from an executor in the asyncio runtime
         """
-        if not PHYSICS_ENABLED:
+        if self.backend is None:
             self.logger.warning("Physics capabilities are disabled")
             return False
             
@@ -75,6 +134,11 @@ class PhysicsEngine:
             return False
             
         self.is_running = True
+        self.accumulator = 0.0
+        
+        if not threaded:
+            self.logger.info("Physics engine started (externally stepped)")
+            return True
         
         # Start physics thread
         self.physics_thread = threading.Thread(target=self._physics_worker)
@@ -103,88 +167,115 @@ class PhysicsEngine:
         """
         Register an agent with the physics engine
         """
-        if not PHYSICS_ENABLED or agent.name in self.agents:
+        if self.backend is None:
             return False
             
-        try:
-            # Create rigid body for agent
-            rigid_body = pyphysx.RigidDynamic()
-            
-            # Create collision shape based on agent type
-            # Default to capsule shape for humanoid agents
-            shape = pyphysx.Shape.create_capsule(
-                radius=0.5,                 # 0.5m radius
-                half_height=0.5,            # 1m total height
-                material=self.default_material,
-                transform=pyphysx.Transform(
-                    position=agent.position,
-                    rotation=self._euler_to_quat(agent.rotation)
-                )
-            )
-            
-            rigid_body.attach_shape(shape)
-            rigid_body.set_global_pose(
-                position=agent.position,
-                rotation=self._euler_to_quat(agent.rotation)
-            )
-            
-            # Set mass properties
-            rigid_body.set_mass(70.0)  # 70kg for standard agent
-            
-            # Add to scene
-            self.scene.add_actor(rigid_body)
-            self.rigid_bodies[agent.name] = rigid_body
-            self.agents[agent.name] = agent
-            
-            # Set user data for collision callbacks
-            rigid_body.set_user_data({"type": "agent", "name": agent.name})
-            
-            self.logger.debug(f"Registered agent {agent.name} with physics engine")
-            return True
-        except Exception as e:
-            self.logger.error(f"Failed to register agent {agent.name} with physics engine: {e}")
-            return False
+        with self.agents_lock:
+            if agent.name in self.agents:
+                return False
+            try:
+                self.backend.add_body(agent.name, list(agent.position), list(agent.rotation), self.agent_shape,
+                                      self.agent_mass, {"type": "agent", "name": agent.name})
+                self.agents[agent.name] = agent
+                self._agent_list = None
+            except Exception as e:
+                self.logger.error(f"Failed to register agent {agent.name} with physics engine: {e}")
+                return False
+                
+        self.logger.debug("Registered agent %s with physics engine", agent.name)
+        return True
             
     def unregister_agent(self, agent_name: str):
         """
         Unregister an agent from the physics engine
         """
-        if not PHYSICS_ENABLED or agent_name not in self.agents:
+        if self.backend is None:
             return False
             
-        try:
-            # Remove rigid body from scene
-            rigid_body = self.rigid_bodies.pop(agent_name, None)
-            if rigid_body:
-                self.scene.remove_actor(rigid_body)
+        with self.agents_lock:
+            if self.agents.pop(agent_name, None) is None:
+                return False
+            # Forget the agent before its body, so no read-back asks for a removed body
+            self._agent_list = None
+            try:
+                self.backend.remove_body(agent_name)
+            except Exception as e:
+                self.logger.error(f"Failed to unregister agent {agent_name} from physics engine: {e}")
+                return False
                 
-            # Remove agent from registry
-            self.agents.pop(agent_name, None)
+        self.logger.debug("Unregistered agent %s from physics engine", agent_name)
+        return True
+            
+    def add_obstacle(self, name: str, position: List[float], shape: Shape, rotation: Optional[List[float]] = None,
+                     object_type: str = "obstacle"):
+        """
+        Add a static body, e.g. level geometry for raycasts and collisions
+        """
+        if self.backend is None:
+            return False
             
-            self.logger.debug(f"Unregistered agent {agent_name} from physics engine")
+        try:
+            self.backend.add_body(name, list(position), list(rotation or [0, 0, 0]), shape, 0.0,
+                                  {"type": object_type, "name": name})
+            if self.navigator is not None:
+                self.navigator.set_footprint(name, footprint(position, shape.half_extents, rotation, shape.offset,
+                                                             self.navigator.step_height))
             return True
         except Exception as e:
-            self.logger.error(f"Failed to unregister agent {agent_name} from physics engine: {e}")
+            self.logger.error(f"Failed to add obstacle {name}: {e}")
+            return False
+            
+    def remove_obstacle(self, name: str):
+        """
+        Remove a static body added with add_obstacle()
+        """
+        if self.backend is None or name in self.agents or not self.backend.has_body(name):
             return False
             
+        self.backend.remove_body(name)
+        if self.navigator is not None:
+            self.navigator.set_footprint(name, None)
+        return True
+        
+    def attach_world_state(self, world_state):
+        """
+        Treat the obstacle objects of a WorldState as static geometry for pathfinding
+        """
+        if self.navigator is not None:
+            self.navigator.attach_world_state(world_state)
+            
+    def calculate_path(self, start: List[float], goal: List[float]) -> List[List[float]]:
+        """
+        Waypoints from start to goal around static geometry, ending at the goal
+        Used by MovementAction; without a navigator the path is the goal alone
+        """
+        if self.navigator is None:
+            return [list(goal)]
+        return self.navigator.calculate_path(start, goal)
+
+    def flow_field(self, goal: List[float], held=None):
+        """
+        Shared flow field towards goal, for MovementAction's "flow" mode
+        See Navigator.flow_field(); None without a navigator or a free cell near the goal.
+        """
+        if self.navigator is None:
+            return None
+        return self.navigator.flow_field(goal, held)
+
+    def release_flow_field(self, field):
+        if self.navigator is not None:
+            self.navigator.release_flow_field(field)
+            
     def update_agent_position(self, agent_name: str, position: List[float], rotation: List[float] = None):
         """
         Update the position of an agent in the physics simulation
         """
-        if not PHYSICS_ENABLED or agent_name not in self.rigid_bodies:
+        if self.backend is None or agent_name not in self.agents:
             return False
             
         try:
-            rigid_body = self.rigid_bodies[agent_name]
-            
             # If rotation is not provided, maintain current rotation
-            if rotation is None:
-                _, current_quat = rigid_body.get_global_pose()
-                rigid_body.set_global_pose(position=position, rotation=current_quat)
-            else:
-                # Convert Euler angles to quaternion
-                quat = self._euler_to_quat(rotation)
-                rigid_body.set_global_pose(position=position, rotation=quat)
+            self.backend.set_pose(agent_name, position, rotation)
                 
             # Update agent reference
             agent = self.agents[agent_name]
@@ -201,17 +292,11 @@ class PhysicsEngine:
         """
         Apply a force to an agent
         """
-        if not PHYSICS_ENABLED or agent_name not in self.rigid_bodies:
+        if self.backend is None or agent_name not in self.agents:
             return False
             
         try:
-            rigid_body = self.rigid_bodies[agent_name]
-            
-            if local:
-                rigid_body.add_force(force=force, mode=pyphysx.ForceMode.FORCE, local=True)
-            else:
-                rigid_body.add_force(force=force, mode=pyphysx.ForceMode.FORCE)
-                
+            self.backend.add_force(agent_name, force, impulse=False, local=local)
             return True
         except Exception as e:
             self.logger.error(f"Failed to apply force: {e}")
@@ -221,17 +306,11 @@ class PhysicsEngine:
         """
         Apply an impulse to an agent
         """
-        if not PHYSICS_ENABLED or agent_name not in self.rigid_bodies:
+        if self.backend is None or agent_name not in self.agents:
             return False
             
         try:
-            rigid_body = self.rigid_bodies[agent_name]
-            
-            if local:
-                rigid_body.add_force(force=impulse, mode=pyphysx.ForceMode.IMPULSE, local=True)
-            else:
-                rigid_body.add_force(force=impulse, mode=pyphysx.ForceMode.IMPULSE)
-                
+            self.backend.add_force(agent_name, impulse, impulse=True, local=local)
             return True
         except Exception as e:
             self.logger.error(f"Failed to apply impulse: {e}")
@@ -242,43 +321,21 @@ class PhysicsEngine:
         Perform a raycast in the physics scene
         Returns a dict with hit information or None if no hit
         """
-        if not PHYSICS_ENABLED:
+        if self.backend is None:
             return None
             
         try:
             # Normalize direction
-            dir_np = np.array(direction, dtype=np.float32)
-            dir_norm = dir_np / np.linalg.norm(dir_np)
-            
-            # Create the ray
-            ray_origin = np.array(origin, dtype=np.float32)
-            
-            # Perform raycast
-            hit = self.scene.raycast(
-                ray_origin,
-                dir_norm,
-                max_distance,
-                pyphysx.QueryFlag.STATIC | pyphysx.QueryFlag.DYNAMIC
-            )
-            
-            if hit.has_block:
-                # Get the actor and shape that was hit
-                actor = hit.block.actor
-                shape = hit.block.shape
-                
-                # Get user data if available
-                user_data = actor.get_user_data() or {}
-                
-                return {
-                    "hit": True,
-                    "position": hit.block.position.tolist(),
-                    "normal": hit.block.normal.tolist(),
-                    "distance": hit.block.distance,
-                    "type": user_data.get("type", "unknown"),
-                    "name": user_data.get("name", "unknown")
-                }
-            else:
+            length = sum(v * v for v in direction) ** 0.5
+            if length == 0:
+                raise ValueError("Raycast direction must not be zero")
+            dir_norm = [v / length for v in direction]
+            
+            hit = self.backend.raycast(list(origin), dir_norm, max_distance)
+            if hit is None:
                 return {"hit": False}
+            hit["hit"] = True
+            return hit
         except Exception as e:
             self.logger.error(f"Raycast error: {e}")
             return {"hit": False, "error": str(e)}
@@ -288,7 +345,7 @@ class PhysicsEngine:
         Add a callback for collision events
         Callback will receive (object1_name, object2_name, collision_data)
         """
-        if not PHYSICS_ENABLED:
+        if self.backend is None:
             return False
             
         self.collision_callbacks.append(callback)
@@ -298,7 +355,7 @@ class PhysicsEngine:
         """
         Remove a collision callback
         """
-        if not PHYSICS_ENABLED:
+        if self.backend is None:
             return False
             
         try:
@@ -307,31 +364,46 @@ class PhysicsEngine:
         except ValueError:
             return False
             
+    def advance(self, elapsed: float) -> int:
+        """
+        Advance the simulation by `elapsed` seconds in fixed timesteps
+        Time that does not fill a whole step is carried over to the next call.
+        Returns the number of steps simulated
+        """
+        if self.backend is None:
+            return 0
+            
+        self.accumulator += elapsed
+        steps = int(self.accumulator / self.timestep)
+        for _ in range(steps):
+            self.backend.simulate(self.timestep)
+            self._process_collisions()
+        self.accumulator -= steps * self.timestep
+        if steps:
+            # Agents only need the state after the last substep
+            self.steps += steps
+            self._update_agent_states()
+        return steps
+            
     def _physics_worker(self):
         """
         Worker thread for physics simulation
         """
-        if not PHYSICS_ENABLED:
+        if self.backend is None:
             return
             
-        last_time = time.time()
+        last_time = clock.monotonic()
         
         while self.is_running:
             try:
-                current_time = time.time()
+                current_time = clock.monotonic()
                 elapsed = current_time - last_time
+                last_time = current_time
                 
                 # Advance simulation with fixed timestep
-                if elapsed >= self.timestep:
-                    steps = int(elapsed / self.timestep)
-                    for _ in range(steps):
-                        self.scene.simulate(self.timestep)
-                        self._process_collisions()
-                        self._update_agent_states()
-                    last_time = current_time - (elapsed % self.timestep)
-                else:
+                if not self.advance(elapsed):
                     # Sleep to avoid consuming too much CPU
-                    time.sleep(max(0, self.timestep - elapsed))
+                    clock.sleep(max(0, self.timestep - self.accumulator))
             except Exception as e:
                 self.logger.error(f"Error in physics worker: {e}")
                 time.sleep(0.1)  # Avoid tight loop on error
@@ -340,34 +412,10 @@ class PhysicsEngine:
         """
         Process collision events from the physics scene
         """
-        if not PHYSICS_ENABLED or not self.collision_callbacks:
+        if self.backend is None or not self.collision_callbacks:
             return
             
-        # Get collision data from simulation
-        # This depends on how PyPhysX provides collision information
-        # The following is a placeholder for the actual implementation
-        
-        for contact_pair in self.scene.get_active_contact_pairs():
-            actor1 = contact_pair.actor1
-            actor2 = contact_pair.actor2
-            
-            # Get user data
-            user_data1 = actor1.get_user_data() or {}
-            user_data2 = actor2.get_user_data() or {}
-            
-            # Extract names
-            name1 = user_data1.get("name", "unknown")
-            name2 = user_data2.get("name", "unknown")
-            
-            # Create collision data
-            collision_data = {
-                "contact_point": contact_pair.contact_points[0].tolist() if contact_pair.contact_points else [0, 0, 0],
-                "normal": contact_pair.contact_normals[0].tolist() if contact_pair.contact_normals else [0, 1, 0],
-                "impulse": contact_pair.impulses[0] if contact_pair.impulses else 0.0,
-                "type1": user_data1.get("type", "unknown"),
-                "type2": user_data2.get("type", "unknown")
-            }
-            
+        for name1, name2, collision_data in self.backend.contacts():
             # Notify callbacks
             for callback in self.collision_callbacks:
                 try:
@@ -379,78 +427,58 @@ class PhysicsEngine:
         """
         Update agent states based on physics simulation
         """
-        if not PHYSICS_ENABLED:
+        if self.backend is None:
+            return
+            
+        if self.batch_states:
+            with self.agents_lock:
+                self._update_agent_states_batched()
             return
             
-        for agent_name, rigid_body in self.rigid_bodies.items():
+        with self.agents_lock:
+            agents = list(self.agents.items())
+        for agent_name, agent in agents:
             try:
                 # Get position and rotation from physics
-                position, quat = rigid_body.get_global_pose()
-                
-                # Convert quaternion to Euler angles
-                rotation = self._quat_to_euler(quat)
+                position, rotation = self.backend.get_pose(agent_name)
                 
                 # Update agent properties
-                agent = self.agents.get(agent_name)
-                if agent:
-                    agent.position = position.tolist()
-                    agent.rotation = rotation
-                    
-                    # Update velocity
-                    linear_vel = rigid_body.get_linear_velocity()
-                    agent.velocity = linear_vel.tolist()
+                agent.position = position
+                agent.rotation = rotation
+                
+                # Update velocity
+                agent.velocity = self.backend.get_linear_velocity(agent_name)
             except Exception as e:
                 self.logger.error(f"Error updating agent state: {e}")
                 
-    def _euler_to_quat(self, euler_angles: List[float]):
-        """
-        Convert Euler angles (in degrees) to quaternion
-        """
-        if not PHYSICS_ENABLED:
-            return [0, 0, 0, 1]  # Identity quaternion
-            
-        # Convert degrees to radians
-        radians = [angle * np.pi / 180.0 for angle in euler_angles]
-        
-        # Create rotation matrix from Euler angles (assuming XYZ order)
-        qx = pyphysx.Quat.from_axis_angle([1, 0, 0], radians[0])
-        qy = pyphysx.Quat.from_axis_angle([0, 1, 0], radians[1])
-        qz = pyphysx.Quat.from_axis_angle([0, 0, 1], radians[2])
-        
-        # Combine rotations
-        quat = qx * qy * qz
-        return quat
-        
-    def _quat_to_euler(self, quat):
-        """
-        Convert quaternion to Euler angles (in degrees)
-        """
-        if not PHYSICS_ENABLED:
-            return [0, 0, 0]  # Identity rotation
-            
-        # This is a simplified conversion that may have gimbal lock issues
-        # A more robust implementation would be needed for production code
-        
-        # Extract Euler angles from quaternion
-        # Assuming XYZ order for Euler angles
-        x, y, z, w = quat.x, quat.y, quat.z, quat.w
-        
-        # Roll (x-axis rotation)
-        sinr_cosp = 2 * (w * x + y * z)
-        cosr_cosp = 1 - 2 * (x * x + y * y)
-        roll = np.arctan2(sinr_cosp, cosr_cosp)
-        
-        # Pitch (y-axis rotation)
-        sinp = 2 * (w * y - z * x)
-        if abs(sinp) >= 1:
-            pitch = np.copysign(np.pi / 2, sinp)  # Use 90 degrees if out of range
-        else:
-            pitch = np.arcsin(sinp)
+    def _update_agent_states_batched(self):
+        """
+        Read every agent body's state into the spare PoseBuffer in one backend call,
+        swap it in as `poses` and hand each agent its rows
+        Called with `agents_lock` held, so the agents cannot change mid read-back
+        """
+        agents = self._agent_list
+        if agents is None:
+            # Agents changed: new buffers in the new order, names and agents from one snapshot
+            names = tuple(self.agents)
+            agents = self._agent_list = [self.agents[name] for name in names]
+            self.poses = PoseBuffer(names)
+            self._spare_poses = PoseBuffer(names)
+        if not agents:
+            return
             
-        # Yaw (z-axis rotation)
-        siny_cosp = 2 * (w * z + x * y)
-        cosy_cosp = 1 - 2 * (y * y + z * z)
-        yaw = np.arctan2(siny_cosp, cosy_cosp)
+        buffer = self._spare_poses
+        try:
+            self.backend.read_states(buffer.names, buffer.positions, buffer.rotations, buffer.velocities)
+        except Exception as e:
+            self.logger.error(f"Error updating agent states: {e}")
+            return
+        buffer.step = self.steps
+        self._spare_poses = self.poses
+        self.poses = buffer
         
-        # Convert radians to degrees
-        return [roll * 180.0 / np.pi, pitch * 180.0 / np.pi, yaw * 180.0 / np.pi]
+        for agent, position, rotation, velocity in zip(agents, buffer.positions.tolist(),
+                                                       buffer.rotations.tolist(), buffer.velocities.tolist()):
+            agent.position = position
+            agent.rotation = rotation
+            agent.velocity = velocity
@@ -0,0 +1,149 @@
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+import pyphysx
+
+from . import rotation
+from .physics_backend import PhysicsBackend, Shape, SPHERE, CAPSULE
+
+class PyPhysXBackend(PhysicsBackend):
+    """
+    PhysX scene through PyPhysX
+    """
+    name = "pyphysx"
+
+    def __init__(self, config: Dict[str, Any]):
+        self.logger = logging.getLogger("physics_engine.pyphysx")
+        self.rigid_bodies = {}
+
+        # Create physics scene
+        scene_flags = pyphysx.SceneFlag.ENABLE_STABILIZATION | pyphysx.SceneFlag.ENABLE_CCD
+        self.scene = pyphysx.Scene(scene_flags=scene_flags)
+        self.scene.set_gravity(config.get("GRAVITY", [0, -9.81, 0]))
+
+        # Setup physics material
+        self.default_material = pyphysx.Material(static_friction=0.5, dynamic_friction=0.5, restitution=0.2)
+
+        # Create ground plane if enabled
+        if config.get("WORLD_GROUND_ENABLED", True):
+            ground_plane = pyphysx.RigidStatic()
+            ground_plane.attach_shape(pyphysx.Shape.create_plane(material=self.default_material, nx=0, ny=1, nz=0))
+            ground_plane.set_user_data({"type": "ground", "name": "ground"})
+            self.scene.add_actor(ground_plane)
+            self.logger.debug("Added ground plane to physics scene")
+
+    def _create_shape(self, shape: Shape):
+        transform = pyphysx.Transform(position=shape.offset)
+        if shape.kind == SPHERE:
+            return pyphysx.Shape.create_sphere(radius=shape.radius, material=self.default_material,
+                                               transform=transform)
+        if shape.kind == CAPSULE:
+            return pyphysx.Shape.create_capsule(radius=shape.radius, half_height=shape.half_height,
+                                                material=self.default_material, transform=transform)
+        return pyphysx.Shape.create_box(size=[2 * v for v in shape.half_extents], material=self.default_material,
+                                        transform=transform)
+
+    def add_body(self, name: str, position: List[float], rotation: List[float], shape: Shape,
+                 mass: float, user_data: Dict[str, Any]):
+        rigid_body = pyphysx.RigidDynamic() if mass > 0 else pyphysx.RigidStatic()
+        rigid_body.attach_shape(self._create_shape(shape))
+        rigid_body.set_global_pose(position=position, rotation=self._euler_to_quat(rotation))
+        if mass > 0:
+            rigid_body.set_mass(mass)
+
+        # Set user data for collision callbacks
+        rigid_body.set_user_data(user_data)
+        self.scene.add_actor(rigid_body)
+        self.rigid_bodies[name] = rigid_body
+
+    def remove_body(self, name: str):
+        rigid_body = self.rigid_bodies.pop(name, None)
+        if rigid_body:
+            self.scene.remove_actor(rigid_body)
+
+    def has_body(self, name: str) -> bool:
+        return name in self.rigid_bodies
+
+    def set_pose(self, name: str, position: List[float], rotation: Optional[List[float]] = None):
+        rigid_body = self.rigid_bodies[name]
+
+        # If rotation is not provided, maintain current rotation
+        if rotation is None:
+            _, current_quat = rigid_body.get_global_pose()
+            rigid_body.set_global_pose(position=position, rotation=current_quat)
+        else:
+            rigid_body.set_global_pose(position=position, rotation=self._euler_to_quat(rotation))
+
+    def get_pose(self, name: str) -> Tuple[List[float], List[float]]:
+        position, quat = self.rigid_bodies[name].get_global_pose()
+        return position.tolist(), self._quat_to_euler(quat)
+
+    def get_linear_velocity(self, name: str) -> List[float]:
+        return self.rigid_bodies[name].get_linear_velocity().tolist()
+
+    def read_states(self, names, positions, rotations, velocities):
+        quats = np.empty((len(names), 4))
+        for i, name in enumerate(names):
+            rigid_body = self.rigid_bodies[name]
+            position, quat = rigid_body.get_global_pose()
+            positions[i] = position
+            quats[i] = (quat.x, quat.y, quat.z, quat.w)
+            velocities[i] = rigid_body.get_linear_velocity()
+        rotation.quat_to_euler_batch(quats, out=rotations)
+
+    def add_force(self, name: str, force: List[float], impulse: bool = False, local: bool = False):
+        mode = pyphysx.ForceMode.IMPULSE if impulse else pyphysx.ForceMode.FORCE
+        if local:
+            self.rigid_bodies[name].add_force(force=force, mode=mode, local=True)
+        else:
+            self.rigid_bodies[name].add_force(force=force, mode=mode)
+
+    def simulate(self, dt: float):
+        self.scene.simulate(dt)
+
+    def raycast(self, origin: List[float], direction: List[float], max_distance: float) -> Optional[Dict[str, Any]]:
+        hit = self.scene.raycast(
+            np.array(origin, dtype=np.float32),
+            np.array(direction, dtype=np.float32),
+            max_distance,
+            pyphysx.QueryFlag.STATIC | pyphysx.QueryFlag.DYNAMIC
+        )
+        if not hit.has_block:
+            return None
+
+        # Get user data if available
+        user_data = hit.block.actor.get_user_data() or {}
+        return {
+            "position": hit.block.position.tolist(),
+            "normal": hit.block.normal.tolist(),
+            "distance": hit.block.distance,
+            "type": user_data.get("type", "unknown"),
+            "name": user_data.get("name", "unknown")
+        }
+
+    def contacts(self) -> List[Tuple[str, str, Dict[str, Any]]]:
+        contacts = []
+        for contact_pair in self.scene.get_active_contact_pairs():
+            user_data1 = contact_pair.actor1.get_user_data() or {}
+            user_data2 = contact_pair.actor2.get_user_data() or {}
+            contacts.append((user_data1.get("name", "unknown"), user_data2.get("name", "unknown"), {
+                "contact_point": contact_pair.contact_points[0].tolist() if contact_pair.contact_points else [0, 0, 0],
+                "normal": contact_pair.contact_normals[0].tolist() if contact_pair.contact_normals else [0, 1, 0],
+                "impulse": contact_pair.impulses[0] if contact_pair.impulses else 0.0,
+                "type1": user_data1.get("type", "unknown"),
+                "type2": user_data2.get("type", "unknown")
+            }))
+        return contacts
+
+    def _euler_to_quat(self, euler_angles: List[float]):
+        """
+        Convert Euler angles (in degrees) to quaternion
+        """
+        return pyphysx.Quat(*rotation.euler_to_quat(euler_angles))
+
+    def _quat_to_euler(self, quat) -> List[float]:
+        """
+        Convert quaternion to Euler angles (in degrees)
+        """
+        return list(rotation.quat_to_euler((quat.x, quat.y, quat.z, quat.w)))
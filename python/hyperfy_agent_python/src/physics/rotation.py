@@ -0,0 +1,156 @@
+"""
+Rotation conversions shared by the physics backends and movement
+
+Euler angles are in degrees, as on agents, and apply in XYZ order: the rotation
+is Rx * Ry * Rz, i.e. the quaternion qx * qy * qz. Quaternions are (x, y, z, w).
+Each conversion has a scalar path built on `math`, for single bodies, and a
+batched NumPy path for (n, 3) / (n, 4) arrays that writes into `out` when given.
+"""
+import math
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+# Pitch sine beyond which roll and yaw are no longer separable
+GIMBAL_LOCK = 1.0 - 1e-9
+
+_HALF_RADIANS = math.pi / 360.0
+_DEGREES = 180.0 / math.pi
+
+def euler_to_quat(euler: Sequence[float]) -> Tuple[float, float, float, float]:
+    """
+    Quaternion for XYZ Euler angles in degrees
+    Repeated identical angles, e.g. an agent that has not turned, hit a cache.
+    """
+    x, y, z = euler
+    return _euler_to_quat(float(x), float(y), float(z))
+
+@lru_cache(maxsize=1024)
+def _euler_to_quat(x: float, y: float, z: float) -> Tuple[float, float, float, float]:
+    x *= _HALF_RADIANS
+    y *= _HALF_RADIANS
+    z *= _HALF_RADIANS
+    cx, sx = math.cos(x), math.sin(x)
+    cy, sy = math.cos(y), math.sin(y)
+    cz, sz = math.cos(z), math.sin(z)
+    return (sx * cy * cz + cx * sy * sz,
+            cx * sy * cz - sx * cy * sz,
+            cx * cy * sz + sx * sy * cz,
+            cx * cy * cz - sx * sy * sz)
+
+def quat_to_euler(quat: Sequence[float]) -> Tuple[float, float, float]:
+    """
+    XYZ Euler angles in degrees for a unit quaternion
+    Pitch is in [-90, 90]; at gimbal lock the yaw is folded into the roll.
+    """
+    x, y, z, w = quat
+    return _quat_to_euler(float(x), float(y), float(z), float(w))
+
+@lru_cache(maxsize=1024)
+def _quat_to_euler(x: float, y: float, z: float, w: float) -> Tuple[float, float, float]:
+    sinp = 2.0 * (x * z + w * y)
+    if abs(sinp) >= GIMBAL_LOCK:
+        return (math.atan2(2.0 * (y * z + w * x), 1.0 - 2.0 * (x * x + z * z)) * _DEGREES,
+                math.copysign(90.0, sinp), 0.0)
+    return (math.atan2(2.0 * (w * x - y * z), 1.0 - 2.0 * (x * x + y * y)) * _DEGREES,
+            math.asin(sinp) * _DEGREES,
+            math.atan2(2.0 * (w * z - x * y), 1.0 - 2.0 * (y * y + z * z)) * _DEGREES)
+
+def yaw_from_direction(dx: float, dz: float) -> Optional[float]:
+    """
+    Yaw in degrees that faces +Z towards (dx, dz), or None for a zero direction
+    """
+    if dx == 0 and dz == 0:
+        return None
+    return math.atan2(dx, dz) * _DEGREES
+
+def yaw_to_quat(yaw: float) -> Tuple[float, float, float, float]:
+    """
+    Quaternion for a rotation of `yaw` degrees about Y, i.e. Euler [0, yaw, 0]
+    """
+    half = yaw * _HALF_RADIANS
+    return (0.0, math.sin(half), 0.0, math.cos(half))
+
+def quat_multiply(a: Sequence[float], b: Sequence[float]) -> Tuple[float, float, float, float]:
+    """
+    Hamilton product a * b, the rotation b followed by a
+    """
+    ax, ay, az, aw = a
+    bx, by, bz, bw = b
+    return (aw * bx + ax * bw + ay * bz - az * by,
+            aw * by - ax * bz + ay * bw + az * bx,
+            aw * bz + ax * by - ay * bx + az * bw,
+            aw * bw - ax * bx - ay * by - az * bz)
+
+def euler_to_matrix(euler: Sequence[float]) -> np.ndarray:
+    """
+    3x3 rotation matrix Rx * Ry * Rz for XYZ Euler angles in degrees
+    """
+    x, y, z = (math.radians(a) for a in euler)
+    cx, sx = math.cos(x), math.sin(x)
+    cy, sy = math.cos(y), math.sin(y)
+    cz, sz = math.cos(z), math.sin(z)
+    return np.array([
+        [cy * cz, -cy * sz, sy],
+        [cx * sz + sx * sy * cz, cx * cz - sx * sy * sz, -sx * cy],
+        [sx * sz - cx * sy * cz, sx * cz + cx * sy * sz, cx * cy]
+    ])
+
+def euler_to_quat_batch(eulers: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    euler_to_quat for an (n, 3) array of angles, into an (n, 4) array
+    """
+    half = np.multiply(eulers, _HALF_RADIANS)
+    c = np.cos(half)
+    s = np.sin(half, out=half)
+    cx, cy, cz = c[:, 0], c[:, 1], c[:, 2]
+    sx, sy, sz = s[:, 0], s[:, 1], s[:, 2]
+    if out is None:
+        out = np.empty((len(eulers), 4))
+    cxcy = cx * cy
+    sxsy = sx * sy
+    sxcy = sx * cy
+    cxsy = cx * sy
+    np.multiply(sxcy, cz, out=out[:, 0])
+    out[:, 0] += cxsy * sz
+    np.multiply(cxsy, cz, out=out[:, 1])
+    out[:, 1] -= sxcy * sz
+    np.multiply(cxcy, sz, out=out[:, 2])
+    out[:, 2] += sxsy * cz
+    np.multiply(cxcy, cz, out=out[:, 3])
+    out[:, 3] -= sxsy * sz
+    return out
+
+def quat_to_euler_batch(quats: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    quat_to_euler for an (n, 4) array of quaternions, into an (n, 3) array
+    """
+    x, y, z, w = quats[:, 0], quats[:, 1], quats[:, 2], quats[:, 3]
+    if out is None:
+        out = np.empty((len(quats), 3))
+    xx = x * x
+    yy = y * y
+    sinp = x * z
+    sinp += w * y
+    sinp *= 2.0
+    np.arctan2(2.0 * (w * x - y * z), 1.0 - 2.0 * (xx + yy), out=out[:, 0])
+    np.arcsin(np.clip(sinp, -1.0, 1.0), out=out[:, 1])
+    np.arctan2(2.0 * (w * z - x * y), 1.0 - 2.0 * (yy + z * z), out=out[:, 2])
+    locked = np.abs(sinp) >= GIMBAL_LOCK
+    if locked.any():
+        lx, ly, lz, lw = x[locked], y[locked], z[locked], w[locked]
+        out[locked, 0] = np.arctan2(2.0 * (ly * lz + lw * lx), 1.0 - 2.0 * (lx * lx + lz * lz))
+        out[locked, 1] = np.copysign(math.pi / 2, sinp[locked])
+        out[locked, 2] = 0.0
+    out *= _DEGREES
+    return out
+
+def yaw_from_directions(directions: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    yaw_from_direction for an (n, 3) array of directions, into an (n,) array
+    Zero directions get a yaw of 0.
+    """
+    out = np.arctan2(directions[:, 0], directions[:, 2], out=out)
+    out *= _DEGREES
+    return out
@@ -1,6 +1,8 @@
+import asyncio
 import threading
 import logging
 import queue
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Callable, Optional
 import time
 
@@ -16,6 +18,10 @@ class VoiceManager:
     """
     Manages voice input and output capabilities for agents
     Provides text-to-speech and speech-to-text functionality
+
+    Microphone reads block for seconds at a time, so recognition always runs on
+    a dedicated thread and speech on a dedicated single worker, never on an
+    executor shared with short calls such as physics steps.
     """
     def __init__(self, config: Dict[str, Any]):
         self.config = config
@@ -24,6 +30,10 @@ class VoiceManager:
         self.speech_thread = None
         self.recognition_thread = None
         self.speech_queue = queue.Queue()
+        self.async_speech_queue = None
+        self.async_tasks = []
+        self.speech_executor = None
+        self.loop = None
         self.callback = None
         self.confidence_threshold = config.get("VOICE_CONFIDENCE_THRESHOLD", 0.7)
         self.language = config.get("VOICE_RECOGNITION_LANGUAGE", "en-US")
@@ -76,6 +86,7 @@ class VoiceManager:
             return False
             
         self.callback = callback
+        self.loop = None
         self.is_running = True
         
         # Start speech output thread
@@ -91,6 +102,51 @@ class VoiceManager:
         self.logger.info("Voice manager started")
         return True
         
+    def start_async(self, callback: Callable[[str, float], None]) -> bool:
+        """
+        Start voice processing for the running event loop
+        Speech is queued from the loop and spoken on the voice manager's own worker,
+        recognition runs on its own thread, and the callback is invoked on the
+        event loop thread
+        """
+        if not VOICE_ENABLED:
+            self.logger.warning("Voice capabilities are disabled")
+            return False
+            
+        if self.is_running:
+            self.logger.warning("Voice manager is already running")
+            return False
+            
+        loop = asyncio.get_running_loop()
+        self.callback = callback
+        self.loop = loop
+        self.is_running = True
+        self.async_speech_queue = asyncio.Queue()
+        self.speech_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="voice-speech")
+        self.async_tasks = [loop.create_task(self._speech_task())]
+        
+        self.recognition_thread = threading.Thread(target=self._recognition_worker)
+        self.recognition_thread.daemon = True
+        self.recognition_thread.start()
+        
+        self.logger.info("Voice manager started (asyncio)")
+        return True
+        
+    async def stop_async(self):
+        """
+        Stop the voice processing started by start_async() and wait for it to finish
+        Threads are joined off the event loop so it keeps running meanwhile
+        """
+        if not self.is_running:
+            return
+            
+        tasks = self.async_tasks
+        self._shutdown()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.to_thread(self._join_threads)
+        self.logger.info("Voice manager stopped")
+        
     def stop(self):
         """
         Stop voice recognition and text-to-speech processing
@@ -98,16 +154,34 @@ class VoiceManager:
         if not self.is_running:
             return
             
+        self._shutdown()
+        self._join_threads()
+        self.logger.info("Voice manager stopped")
+        
+    def _shutdown(self):
+        """
+        Signal workers to stop and cancel asyncio tasks without waiting for them
+        """
         self.is_running = False
         
-        # Wait for threads to finish
+        for task in self.async_tasks:
+            task.cancel()
+        self.async_tasks = []
+        self.async_speech_queue = None
+        
+        if self.speech_executor is not None:
+            self.speech_executor.shutdown(wait=False, cancel_futures=True)
+            self.speech_executor = None
+            
+    def _join_threads(self):
+        """
+        Wait for the worker threads to notice they should stop
+        """
         if self.speech_thread and self.speech_thread.is_alive():
             self.speech_thread.join(timeout=2.0)
             
         if self.recognition_thread and self.recognition_thread.is_alive():
             self.recognition_thread.join(timeout=2.0)
-            
-        self.logger.info("Voice manager stopped")
         
     def speak(self, text: str, voice_id: str = None) -> bool:
         """
@@ -119,7 +193,10 @@ class VoiceManager:
             return False
             
         # Add to speech queue
-        self.speech_queue.put((text, voice_id))
+        if self.async_speech_queue is not None:
+            self.async_speech_queue.put_nowait((text, voice_id))
+        else:
+            self.speech_queue.put((text, voice_id))
         return True
         
     def get_available_voices(self) -> Dict[str, str]:
@@ -131,6 +208,19 @@ class VoiceManager:
             
         return {voice_id: voice.name for voice_id, voice in self.available_voices.items()}
         
+    def _say(self, text: str, voice_id: str = None):
+        """
+        Speak one utterance, blocking until it has been spoken
+        """
+        # Change voice if necessary
+        if voice_id and voice_id in self.available_voices:
+            self.engine.setProperty('voice', self.available_voices[voice_id].id)
+            
+        # Speak the text
+        self.logger.debug("Speaking: %s", text)
+        self.engine.say(text)
+        self.engine.runAndWait()
+        
     def _speech_worker(self):
         """
         Worker thread for text-to-speech processing
@@ -143,19 +233,68 @@ class VoiceManager:
                 except queue.Empty:
                     continue
                     
-                # Change voice if necessary
-                if voice_id and voice_id in self.available_voices:
-                    self.engine.setProperty('voice', self.available_voices[voice_id].id)
-                    
-                # Speak the text
-                self.logger.debug(f"Speaking: {text}")
-                self.engine.say(text)
-                self.engine.runAndWait()
+                self._say(text, voice_id)
                 self.speech_queue.task_done()
             except Exception as e:
                 self.logger.error(f"Error in speech worker: {e}")
                 time.sleep(0.5)  # Avoid tight loop on error
                 
+    async def _speech_task(self):
+        """
+        Event loop task for text-to-speech processing
+        """
+        loop = asyncio.get_running_loop()
+        speech_queue = self.async_speech_queue
+        speech_executor = self.speech_executor
+        while self.is_running:
+            text, voice_id = await speech_queue.get()
+            try:
+                await loop.run_in_executor(speech_executor, self._say, text, voice_id)
+            except Exception as e:
+                self.logger.error(f"Error in speech task: {e}")
+                
+    def _recognize_once(self, source):
+        """
+        Listen for one phrase and recognize it, blocking until done
+        Returns (text, confidence) or None if nothing was understood
+        """
+        self.logger.debug("Listening for speech...")
+        audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=5)
+        
+        try:
+            # Use Google's speech recognition
+            text = self.recognizer.recognize_google(audio, language=self.language)
+            confidence = 0.9  # Google doesn't provide confidence, use default
+            
+            self.logger.info(f"Recognized: {text} (confidence: {confidence})")
+            return text, confidence
+        except sr.UnknownValueError:
+            self.logger.debug("Speech not understood")
+        except sr.RequestError as e:
+            self.logger.error(f"Could not request results from Google Speech API: {e}")
+        return None
+        
+    def _on_recognized(self, result):
+        """
+        Pass a recognition result to the callback if it is confident enough
+        Under start_async() the callback is handed to the event loop thread
+        """
+        if result is None:
+            return
+        text, confidence = result
+        
+        # Check confidence threshold
+        if confidence < self.confidence_threshold or not self.callback:
+            return
+        loop = self.loop
+        if loop is None:
+            self.callback(text, confidence)
+            return
+        try:
+            loop.call_soon_threadsafe(self.callback, text, confidence)
+        except RuntimeError:
+            self.logger.debug("Event loop closed, dropping recognized speech")
+                
     def _recognition_worker(self):
         """
         Worker thread for speech recognition
@@ -175,23 +314,7 @@ class VoiceManager:
             
             while self.is_running:
                 try:
-                    self.logger.debug("Listening for speech...")
-                    audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=5)
-                    
-                    try:
-                        # Use Google's speech recognition
-                        text = self.recognizer.recognize_google(audio, language=self.language)
-                        confidence = 0.9  # Google doesn't provide confidence, use default
-                        
-                        self.logger.info(f"Recognized: {text} (confidence: {confidence})")
-                        
-                        # Check confidence threshold
-                        if confidence >= self.confidence_threshold and self.callback:
-                            self.callback(text, confidence)
-                    except sr.UnknownValueError:
-                        self.logger.debug("Speech not understood")
-                    except sr.RequestError as e:
-                        self.logger.error(f"Could not request results from Google Speech API: {e}")
+                    self._on_recognized(self._recognize_once(source))
                 except Exception as e:
                     self.logger.error(f"Error in recognition worker: {e}")
                     time.sleep(0.5)  # Avoid tight loop on error
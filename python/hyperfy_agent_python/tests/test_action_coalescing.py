@@ -0,0 +1,120 @@
+import unittest
+
+from hyperfy_agent_python.src.core.action_system import ActionSystem, ActionStatus, Action
+from hyperfy_agent_python.src.core.custom_actions import WalkRandomlyAction
+from hyperfy_agent_python.src.physics.movement_action import MovementAction
+
+
+class SimpleAgent:
+    def __init__(self):
+        self.name = "Walker"
+        self.position = [0.0, 0.0, 0.0]
+        self.rotation = [0.0, 0.0, 0.0]
+        self.physics_engine = None
+
+
+class BusyAction(Action):
+    """High priority action that keeps the slot busy until released."""
+    def __init__(self):
+        super().__init__(priority=50)
+        self.done = False
+
+    def update(self, delta_time):
+        return self.done
+
+
+class TestActionCoalescing(unittest.TestCase):
+    def setUp(self):
+        self.agent = SimpleAgent()
+        self.system = ActionSystem(action_cooldown=0.0)
+
+    def test_running_movement_is_retargeted_in_place(self):
+        first = MovementAction(self.agent, [10.0, 0.0, 0.0])
+        self.system.queue_action(first)
+        self.system.update(0.1)
+        self.assertIs(self.system.current_action, first)
+
+        newer = MovementAction(self.agent, [0.0, 0.0, 10.0], speed=2.0)
+        self.assertTrue(self.system.queue_action(newer))
+        self.assertIs(self.system.current_action, first)
+        self.assertEqual(first.target_position, [0.0, 0.0, 10.0])
+        self.assertEqual(first.speed, 2.0)
+        self.assertEqual(self.system.get_queue_count(), 0)
+        self.assertEqual(newer.status, ActionStatus.COALESCED) # Absorbed, never started
+        self.assertTrue(newer.is_finished())
+        self.assertEqual(self.system.coalesced_count, 1)
+        self.assertEqual(self.system.action_stats["MovementAction"].status_counts, {"COALESCED": 1})
+
+        self.system.update(0.1)
+        self.assertAlmostEqual(self.agent.rotation[1], 0.0, delta=1.0) # Now heading along +z
+
+    def test_burst_of_pending_moves_collapses_to_one(self):
+        busy = BusyAction()
+        self.system.queue_action(busy)
+        self.system.update(0.016)
+
+        moves = [MovementAction(self.agent, [float(i), 0.0, 0.0]) for i in range(1, 20)]
+        for move in moves:
+            self.assertTrue(self.system.queue_action(move))
+
+        self.assertEqual(self.system.get_queue_count(), 1)
+        pending = self.system.action_queue[0]
+        self.assertIs(pending, moves[0])
+        self.assertEqual(pending.target_position, [19.0, 0.0, 0.0])
+        self.assertTrue(all(move.is_coalesced() for move in moves[1:]))
+        self.assertEqual(len(self.system.action_history), 18)
+
+    def test_absorbed_actions_fire_on_coalesce(self):
+        settled = []
+        self.system.add_hook("on_coalesce", settled.append)
+        first = MovementAction(self.agent, [1.0, 0.0, 0.0])
+        self.system.queue_action(first)
+        newer = MovementAction(self.agent, [2.0, 0.0, 0.0])
+        self.system.queue_action(newer)
+        self.assertEqual(settled, [newer])
+
+    def test_running_absorber_takes_higher_priority(self):
+        first = MovementAction(self.agent, [10.0, 0.0, 0.0])
+        self.system.queue_action(first)
+        self.system.update(0.1)
+        urgent = MovementAction(self.agent, [0.0, 0.0, 10.0])
+        urgent.priority = first.priority + 20
+        self.system.queue_action(urgent)
+        self.assertIs(self.system.current_action, first)
+        self.assertEqual(first.priority, urgent.priority)
+
+    def test_newer_key_holder_replaces_pending_it_cannot_absorb(self):
+        busy = BusyAction()
+        self.system.queue_action(busy)
+        self.system.update(0.016)
+
+        move = MovementAction(self.agent, [5.0, 0.0, 0.0])
+        self.system.queue_action(move)
+        wander = WalkRandomlyAction(self.agent)
+        self.system.queue_action(wander)
+
+        self.assertEqual(move.status, ActionStatus.CANCELLED)
+        self.assertEqual(self.system.action_queue, [wander])
+
+    def test_coalescing_can_be_disabled(self):
+        system = ActionSystem(action_cooldown=0.0, coalesce=False)
+        for i in range(3):
+            system.queue_action(MovementAction(self.agent, [float(i), 0.0, 0.0]))
+        self.assertEqual(system.get_queue_count(), 3)
+
+    def test_absorbed_pending_takes_newer_deadline(self):
+        busy = BusyAction()
+        self.system.queue_action(busy)
+        self.system.update(0.016)
+
+        first = MovementAction(self.agent, [1.0, 0.0, 0.0])
+        first.deadline = 0.0 # Would already be expired
+        self.system.queue_action(first)
+        self.system.queue_action(MovementAction(self.agent, [2.0, 0.0, 0.0]))
+        self.assertIsNone(first.deadline)
+        self.system.update(0.016)
+        self.assertTrue(first.is_pending())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import time
+
+from hyperfy_agent_python.src.core.action_system import ActionSystem, ActionStatus, Action
+
+
+class BlockingAction(Action):
+    """Keeps the action slot busy until released."""
+    def __init__(self, priority=50):
+        super().__init__(priority=priority)
+        self.done = False
+
+    def update(self, delta_time):
+        return self.done
+
+
+class LowAction(Action):
+    pass
+
+
+@patch('time.time', MagicMock(return_value=1000.0))
+class TestActionDeadlines(unittest.TestCase):
+    def setUp(self):
+        self.system = ActionSystem(action_cooldown=0.0)
+        self.blocker = BlockingAction()
+        self.system.queue_action(self.blocker)
+        self.system.update(0.016)
+        self.assertTrue(self.blocker.is_running())
+
+    def advance(self, seconds):
+        time.time.return_value += seconds
+        self.system.update(0.016)
+
+    def test_ttl_expires_proactively_while_slot_is_busy(self):
+        expired = []
+        self.system.add_hook("on_expire", expired.append)
+        stale = Action(ttl=2.0)
+        fresh = Action()
+        self.system.queue_action(stale)
+        self.system.queue_action(fresh)
+
+        self.advance(1.0)
+        self.assertTrue(stale.is_pending())
+        self.advance(1.5)
+        self.assertEqual(stale.status, ActionStatus.EXPIRED)
+        self.assertEqual(expired, [stale])
+        self.assertEqual(self.system.get_queue_count(), 1)
+        self.assertEqual(self.system.expired_count, 1)
+        self.assertEqual(self.system.get_stats("Action")["status_counts"], {"EXPIRED": 1})
+
+    def test_expired_on_dequeue(self):
+        stale = Action()
+        self.system.queue_action(stale)
+        stale.deadline = 1001.0 # Set after queueing, so only the dequeue check sees it
+        self.blocker.done = True
+        self.advance(2.0)
+        self.assertTrue(stale.is_expired())
+        self.assertTrue(self.system.is_idle())
+
+    def test_started_actions_are_not_expired(self):
+        self.blocker.done = True
+        action = BlockingAction(priority=0)
+        action.set_ttl(1.0)
+        self.system.queue_action(action)
+        self.advance(0.1)
+        self.assertTrue(action.is_running())
+        self.advance(5.0)
+        self.assertTrue(action.is_running())
+
+    def test_absolute_deadline(self):
+        action = Action(deadline=1000.5)
+        self.system.queue_action(action)
+        self.advance(0.6)
+        self.assertTrue(action.is_expired())
+
+
+@patch('time.time', MagicMock(return_value=1000.0))
+class TestPriorityAging(unittest.TestCase):
+    def test_low_priority_action_eventually_wins(self):
+        system = ActionSystem(action_cooldown=0.0, priority_aging=1.0)
+        low = LowAction(priority=0)
+        system.queue_action(low)
+
+        # A stream of fresh priority 5 actions would starve `low` without aging
+        started = []
+        system.add_hook("pre_execute", started.append)
+        for _ in range(10):
+            time.time.return_value += 1.0
+            system.queue_action(Action(priority=5))
+            system.update(0.016)
+            if low in started:
+                break
+        self.assertIn(low, started)
+
+    def test_no_aging_keeps_strict_priority(self):
+        system = ActionSystem(action_cooldown=0.0)
+        low = LowAction(priority=0)
+        system.queue_action(low)
+        for _ in range(10):
+            time.time.return_value += 1.0
+            system.queue_action(Action(priority=5))
+            system.update(0.016)
+        self.assertTrue(low.is_pending())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import time
+
+from hyperfy_agent_python.src.core.action_system import ActionSystem, Action
+from hyperfy_agent_python.src.core.rate_limiter import TokenBucket
+
+FRAME = 1 / 60
+
+
+class ProbeAction(Action):
+    """Records when it was first updated and runs for a fixed number of frames."""
+    def __init__(self, frames=3, priority=0):
+        super().__init__(priority=priority)
+        self.frames = frames
+        self.updates = 0
+        self.first_update_time = None
+
+    def update(self, delta_time):
+        if self.first_update_time is None:
+            self.first_update_time = time.time()
+        self.updates += 1
+        return self.updates >= self.frames
+
+
+class OtherProbeAction(ProbeAction):
+    pass
+
+
+@patch('time.time', MagicMock(return_value=1000.0))
+class TestActionLatency(unittest.TestCase):
+    """Queue-to-start and start-to-first-update latency with the default one second cooldown."""
+
+    def setUp(self):
+        self.system = ActionSystem(action_cooldown=1.0)
+
+    def run_frames(self, count):
+        for _ in range(count):
+            time.time.return_value += FRAME
+            self.system.update(FRAME)
+
+    def test_queue_to_start_and_first_update_within_one_frame(self):
+        action = ProbeAction()
+        self.system.queue_action(action)
+        self.run_frames(1)
+
+        self.assertLessEqual(action.start_time - action.queued_time, FRAME + 1e-9)
+        self.assertEqual(action.first_update_time - action.start_time, 0.0)
+
+    def test_running_action_ticks_every_frame(self):
+        action = ProbeAction(frames=30)
+        self.system.queue_action(action)
+        self.run_frames(10)
+        self.assertEqual(action.updates, 10)
+
+    def test_follow_up_action_starts_on_completion_frame(self):
+        first, second = ProbeAction(frames=3), OtherProbeAction(frames=3)
+        self.system.queue_action(first)
+        self.system.queue_action(second)
+        self.run_frames(3)
+        self.assertTrue(first.is_completed())
+        self.assertTrue(second.is_running())
+        self.assertEqual(second.start_time, first.completion_time)
+
+    def test_rate_limit_only_delays_starts_of_the_same_type(self):
+        first, same_type, other_type = ProbeAction(frames=1), ProbeAction(frames=1), OtherProbeAction(frames=1)
+        self.system.queue_action(first)
+        self.system.queue_action(same_type)
+        self.system.queue_action(other_type)
+        self.run_frames(2)
+        self.assertTrue(first.is_completed())
+        self.assertTrue(other_type.is_completed())
+        self.assertTrue(same_type.is_pending())
+
+        self.run_frames(60)
+        self.assertTrue(same_type.is_completed())
+        self.assertAlmostEqual(same_type.start_time - first.start_time, 1.0, delta=FRAME + 1e-9)
+
+    def test_per_class_rate_limit_override(self):
+        self.system.set_rate_limit("ProbeAction", rate=100.0, burst=2)
+        actions = [ProbeAction(frames=1) for _ in range(3)]
+        for action in actions:
+            self.system.queue_action(action)
+        self.run_frames(3)
+        self.assertTrue(all(action.is_completed() for action in actions))
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_refill_and_burst(self):
+        bucket = TokenBucket(rate=2.0, burst=2)
+        self.assertTrue(bucket.try_acquire(0.0))
+        self.assertTrue(bucket.try_acquire(0.0))
+        self.assertFalse(bucket.try_acquire(0.0))
+        self.assertAlmostEqual(bucket.time_until_available(0.0), 0.5)
+        self.assertTrue(bucket.try_acquire(0.5))
+        self.assertFalse(bucket.try_acquire(0.5))
+        self.assertTrue(bucket.try_acquire(10.0))
+        self.assertAlmostEqual(bucket.tokens, 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import time
+
+from hyperfy_agent_python.src.core.action_system import ActionSystem, ActionStatus, Action, PreemptionPolicy
+from hyperfy_agent_python.src.core.custom_actions import StopMovingAction
+from hyperfy_agent_python.src.physics.movement_action import MovementAction
+
+FRAME = 1 / 60
+
+
+class SimpleAgent:
+    def __init__(self, action_system):
+        self.name = "Runner"
+        self.position = [0.0, 0.0, 0.0]
+        self.rotation = [0.0, 0.0, 0.0]
+        self.physics_engine = None
+        self.action_system = action_system
+
+
+class LongAction(Action):
+    def __init__(self, priority=10, frames=100):
+        super().__init__(priority=priority)
+        self.frames = frames
+        self.updates = 0
+
+    def update(self, delta_time):
+        self.updates += 1
+        return self.updates >= self.frames
+
+
+class CancelOnPreemptAction(LongAction):
+    preemption_policy = PreemptionPolicy.CANCEL
+
+
+class UnpreemptableAction(LongAction):
+    preemption_policy = PreemptionPolicy.NEVER
+
+
+@patch('time.time', MagicMock(return_value=1000.0))
+class TestActionPreemption(unittest.TestCase):
+    def setUp(self):
+        self.system = ActionSystem(action_cooldown=0.0)
+
+    def run_frames(self, count):
+        for _ in range(count):
+            time.time.return_value += FRAME
+            self.system.update(FRAME)
+
+    def test_urgent_action_starts_on_next_update(self):
+        running = LongAction()
+        self.system.queue_action(running)
+        self.run_frames(5)
+
+        urgent = LongAction(priority=100, frames=3)
+        self.system.queue_action(urgent)
+        self.run_frames(1)
+
+        self.assertIs(self.system.current_action, urgent)
+        self.assertLessEqual(urgent.start_time - urgent.queued_time, FRAME + 1e-9)
+        self.assertEqual(urgent.updates, 1)
+        self.assertEqual(running.status, ActionStatus.SUSPENDED)
+        self.assertEqual(self.system.preempted_count, 1)
+
+    def test_suspended_action_resumes_where_it_left_off(self):
+        resumed = []
+        self.system.add_hook("on_resume", resumed.append)
+        running = LongAction(frames=10)
+        self.system.queue_action(running)
+        self.run_frames(4)
+        self.system.queue_action(LongAction(priority=100, frames=2))
+        self.run_frames(1)
+        self.assertEqual(running.updates, 4)
+        self.assertTrue(running.is_suspended())
+
+        # The urgent action finishes and the suspended one resumes in the same frame
+        self.run_frames(1)
+        self.assertEqual(resumed, [running])
+        self.assertTrue(running.is_running())
+        self.assertEqual(running.updates, 5)
+
+    def test_cancel_policy(self):
+        running = CancelOnPreemptAction()
+        self.system.queue_action(running)
+        self.run_frames(1)
+        self.system.queue_action(LongAction(priority=100))
+        self.run_frames(1)
+        self.assertTrue(running.is_cancelled())
+        self.assertEqual(self.system.get_queue_count(), 0)
+
+    def test_never_policy_and_equal_priority_do_not_preempt(self):
+        running = UnpreemptableAction()
+        self.system.queue_action(running)
+        self.run_frames(1)
+        self.system.queue_action(LongAction(priority=100))
+        self.run_frames(1)
+        self.assertIs(self.system.current_action, running)
+
+        system = ActionSystem(action_cooldown=0.0)
+        first = LongAction(priority=10)
+        system.queue_action(first)
+        system.update(FRAME)
+        system.queue_action(LongAction(priority=10))
+        system.update(FRAME)
+        self.assertIs(system.current_action, first)
+
+    def test_stop_moving_preempts_and_drops_the_movement(self):
+        agent = SimpleAgent(self.system)
+        movement = MovementAction(agent, [100.0, 0.0, 0.0])
+        self.system.queue_action(movement)
+        self.run_frames(3)
+
+        stop = StopMovingAction(agent)
+        self.system.queue_action(stop)
+        self.run_frames(1)
+        self.assertTrue(stop.is_completed())
+        self.assertTrue(movement.is_cancelled())
+        self.assertTrue(self.system.is_idle())
+        self.assertLessEqual(stop.start_time - stop.queued_time, FRAME + 1e-9)
+
+
+if __name__ == '__main__':
+    unittest.main()
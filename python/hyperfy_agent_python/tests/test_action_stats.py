@@ -0,0 +1,80 @@
+import unittest
+import random
+
+from hyperfy_agent_python.src.core.action_system import ActionSystem, Action
+from hyperfy_agent_python.src.core.action_stats import StreamingHistogram, ActionRecord
+
+
+class FailingAction(Action):
+    def update(self, delta_time):
+        raise RuntimeError("boom")
+
+
+class TestStreamingHistogram(unittest.TestCase):
+    def test_quantiles_within_relative_accuracy(self):
+        rng = random.Random(42)
+        samples = [rng.expovariate(20.0) for _ in range(20000)]
+        histogram = StreamingHistogram(relative_accuracy=0.01)
+        for value in samples:
+            histogram.add(value)
+
+        samples.sort()
+        for q in (0.5, 0.95, 0.99):
+            exact = samples[int(q * (len(samples) - 1))]
+            self.assertAlmostEqual(histogram.quantile(q), exact, delta=exact * 0.011)
+        self.assertEqual(histogram.count, len(samples))
+
+    def test_empty_and_zero_values(self):
+        histogram = StreamingHistogram()
+        self.assertIsNone(histogram.quantile(0.5))
+        histogram.add(0.0)
+        histogram.add(0.0)
+        self.assertEqual(histogram.quantile(0.5), 0.0)
+
+    def test_merge(self):
+        a, b = StreamingHistogram(), StreamingHistogram()
+        for value in range(1, 51):
+            a.add(value / 1000)
+            b.add((value + 50) / 1000)
+        a.merge(b)
+        self.assertEqual(a.count, 100)
+        self.assertAlmostEqual(a.quantile(0.5), 0.050, delta=0.001)
+
+
+class TestActionHistory(unittest.TestCase):
+    def test_history_is_bounded_and_holds_records(self):
+        system = ActionSystem(action_cooldown=0.0, history_size=5)
+        for _ in range(20):
+            system.queue_action(Action(agent=object()))
+            system.update(0.016)
+
+        self.assertEqual(len(system.action_history), 5)
+        self.assertTrue(all(isinstance(record, ActionRecord) for record in system.action_history))
+        self.assertFalse(hasattr(system.action_history[0], "agent"))
+        self.assertEqual(len(system.get_history(limit=2)), 2)
+        self.assertEqual(system.get_stats("Action")["count"], 20)
+
+    def test_stats_track_failures_and_cancellations(self):
+        system = ActionSystem(action_cooldown=0.0)
+        for _ in range(3):
+            system.queue_action(Action())
+            system.update(0.016)
+        system.queue_action(FailingAction())
+        system.update(0.016)
+        cancelled = Action()
+        system.queue_action(cancelled)
+        system.cancel_action(cancelled.id)
+
+        stats = system.get_stats()
+        self.assertEqual(stats["Action"]["status_counts"], {"COMPLETED": 3, "CANCELLED": 1})
+        self.assertEqual(stats["FailingAction"]["failure_rate"], 1.0)
+        self.assertEqual(stats["Action"]["execution_time"]["count"], 3)
+        self.assertEqual(stats["Action"]["queue_wait"]["count"], 4)
+        self.assertIsNotNone(stats["Action"]["queue_wait"]["p99"])
+
+        system.reset_stats()
+        self.assertEqual(system.get_stats(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
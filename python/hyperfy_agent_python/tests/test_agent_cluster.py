@@ -0,0 +1,128 @@
+import unittest
+import threading
+import time
+
+from hyperfy_agent_python.src.core.agent_base import AgentBase
+from hyperfy_agent_python.src.core.agent_cluster import AgentCluster, apply_world_change
+from hyperfy_agent_python.src.core.world_state import WorldState, Player
+
+CONFIG = {"VOICE_RECOGNITION_ENABLED": False, "PHYSICS_ENABLED": False, "ACTION_COOLDOWN": 0.0,
+          "CLUSTER_FLUSH_INTERVAL": 0.01, "CLUSTER_STATS_INTERVAL": 0.05}
+
+
+class EchoAgent(AgentBase):
+    def on_start(self):
+        self.register_event_handler("ping", lambda data: self.say(f"pong from {self.name}"))
+        self.register_event_handler("count_players",
+                                    lambda data: self.say(str(len(self.world_state.get_all_players()))))
+        self.register_event_handler("walk", lambda data: self.move_to(data["position"], speed=50.0))
+        self.register_event_handler("has_voice", lambda data: self.say(
+            str(self.voice_manager is not None or self.host.voice_manager is not None)))
+
+
+def create_echo_agent(config, name, **kwargs):
+    return EchoAgent(name, config, **kwargs)
+
+
+class TestAgentCluster(unittest.TestCase):
+    def setUp(self):
+        self.speech = []
+        self.actions = []
+        self.lock = threading.Lock()
+        self.cluster = AgentCluster(
+            CONFIG, [f"npc-{i}" for i in range(4)], agent_factory=create_echo_agent, workers=2,
+            on_action=lambda name, action: self._record(self.actions, (name, action)),
+            on_speech=lambda name, text, voice_id: self._record(self.speech, (name, text))
+        )
+        self.cluster.start()
+
+    def tearDown(self):
+        self.cluster.stop()
+
+    def _record(self, target, item):
+        with self.lock:
+            target.append(item)
+
+    def wait_for(self, predicate, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self.lock:
+                if predicate():
+                    return True
+            time.sleep(0.01)
+        return False
+
+    def test_agents_are_partitioned_across_workers(self):
+        workers = {self.cluster.get_worker_for(f"npc-{i}") for i in range(4)}
+        self.assertEqual(workers, {0, 1})
+        self.assertEqual([len(shard.names) for shard in self.cluster.shards], [2, 2])
+
+    def test_events_fan_out_and_speech_comes_back(self):
+        self.cluster.emit_event("ping")
+        self.assertTrue(self.wait_for(lambda: len(self.speech) == 4))
+        self.assertEqual(sorted(text for _, text in self.speech), [f"pong from npc-{i}" for i in range(4)])
+
+        self.cluster.emit_event("ping", agent_name="npc-2")
+        self.assertTrue(self.wait_for(lambda: len(self.speech) == 5))
+        self.assertEqual(self.speech[-1], ("npc-2", "pong from npc-2"))
+
+    def test_world_changes_reach_workers(self):
+        self.cluster.world_state.add_player(Player("p1", position=[1.0, 0.0, 0.0]))
+        self.cluster.world_state.add_player(Player("p2"))
+        time.sleep(0.1)
+        self.cluster.emit_event("count_players", agent_name="npc-0")
+        self.assertTrue(self.wait_for(lambda: ("npc-0", "2") in self.speech))
+
+    def test_started_actions_are_collected(self):
+        self.cluster.emit_event("walk", {"position": [1.0, 0.0, 0.0]}, agent_name="npc-1")
+        self.assertTrue(self.wait_for(lambda: any(name == "npc-1" for name, _ in self.actions)))
+        name, action = self.actions[0]
+        self.assertEqual(action["type"], "MovementAction")
+
+    def test_crashed_worker_is_restarted(self):
+        shard = self.cluster.shards[0]
+        shard.process.kill()
+        self.assertTrue(self.wait_for(lambda: shard.restarts == 1 and shard.is_alive()))
+        self.cluster.emit_event("ping", agent_name=shard.names[0])
+        self.assertTrue(self.wait_for(lambda: (shard.names[0], f"pong from {shard.names[0]}") in self.speech))
+
+    def test_add_and_remove_agents_at_runtime(self):
+        self.assertTrue(self.cluster.add_agent("late"))
+        self.cluster.emit_event("ping", agent_name="late")
+        self.assertTrue(self.wait_for(lambda: ("late", "pong from late") in self.speech))
+        self.assertTrue(self.cluster.remove_agent("late"))
+        self.assertIsNone(self.cluster.get_worker_for("late"))
+
+
+class TestClusterVoice(unittest.TestCase):
+    def test_workers_run_without_voice_recognition(self):
+        speech = []
+        cluster = AgentCluster({**CONFIG, "VOICE_RECOGNITION_ENABLED": True}, ["npc-0"],
+                               agent_factory=create_echo_agent, workers=1,
+                               on_speech=lambda name, text, voice_id: speech.append(text))
+        cluster.start()
+        try:
+            cluster.emit_event("has_voice")
+            deadline = time.monotonic() + 10.0
+            while not speech and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            cluster.stop()
+        self.assertEqual(speech, ["False"])
+
+
+class TestApplyWorldChange(unittest.TestCase):
+    def test_upsert_and_remove(self):
+        world = WorldState()
+        data = Player("p1", position=[1.0, 2.0, 3.0]).to_dict()
+        apply_world_change(world, ("upsert", "p1", data))
+        self.assertIsNotNone(world.get_player("p1"))
+        data["position"] = [4.0, 5.0, 6.0]
+        apply_world_change(world, ("upsert", "p1", data))
+        self.assertEqual(world.get_player("p1").position, [4.0, 5.0, 6.0])
+        apply_world_change(world, ("remove", "p1", None))
+        self.assertIsNone(world.get_object("p1"))
+
+
+if __name__ == '__main__':
+    unittest.main()
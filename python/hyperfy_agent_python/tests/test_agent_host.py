@@ -0,0 +1,160 @@
+import unittest
+import asyncio
+import time
+
+from hyperfy_agent_python.src.core.agent_base import AgentBase
+from hyperfy_agent_python.src.core.agent_host import AgentHost
+
+CONFIG = {"VOICE_RECOGNITION_ENABLED": False, "PHYSICS_ENABLED": False, "ACTION_COOLDOWN": 0.0}
+
+
+class BrokenAgent(AgentBase):
+    def update(self, delta_time):
+        raise RuntimeError("bad npc")
+
+
+class FakeVoiceManager:
+    def __init__(self):
+        self.callback = None
+        self.spoken = []
+
+    def start(self, callback):
+        self.callback = callback
+        return True
+
+    def stop(self):
+        self.callback = None
+
+    def speak(self, text, voice_id=None):
+        self.spoken.append(text)
+        return True
+
+
+class ListeningAgent(AgentBase):
+    def __init__(self, name, config):
+        super().__init__(name, config)
+        self.heard = []
+
+    def on_voice_input(self, text, confidence):
+        self.heard.append(text)
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+class TestAgentHost(unittest.TestCase):
+    def setUp(self):
+        self.host = AgentHost(CONFIG)
+
+    def tearDown(self):
+        self.host.stop()
+
+    def test_agents_share_world_state_and_scheduler(self):
+        agents = [AgentBase(f"npc-{i}", CONFIG) for i in range(3)]
+        for agent in agents:
+            self.assertTrue(self.host.add_agent(agent))
+        self.assertFalse(self.host.add_agent(AgentBase("npc-0", CONFIG)))
+
+        for agent in agents:
+            self.assertIs(agent.world_state, self.host.world_state)
+            self.assertIs(agent.scheduler, self.host.scheduler)
+            self.assertTrue(agent.is_running)
+            self.assertIsNone(agent.update_thread)
+        self.assertEqual(self.host.get_agent_count(), 3)
+
+    def test_add_and_remove_agents_while_running(self):
+        self.host.start()
+        first = AgentBase("first", CONFIG)
+        self.host.add_agent(first)
+        first.move_to([1.0, 0.0, 0.0], speed=50.0)
+        self.assertTrue(wait_until(lambda: first.position[0] == 1.0))
+
+        second = AgentBase("second", CONFIG)
+        self.host.add_agent(second)
+        second.move_to([0.0, 0.0, 1.0], speed=50.0)
+        self.assertTrue(wait_until(lambda: second.position[2] == 1.0))
+
+        self.assertTrue(self.host.remove_agent("first"))
+        self.assertFalse(first.is_running)
+        self.assertIsNone(first.host)
+        self.assertEqual(self.host.get_agent_count(), 1)
+
+        self.host.stop()
+        self.assertFalse(second.is_running)
+        self.assertEqual(self.host.get_agent_count(), 0)
+
+    def test_failing_agent_does_not_stop_others(self):
+        self.host.add_agent(BrokenAgent("broken", CONFIG))
+        healthy = AgentBase("healthy", CONFIG)
+        self.host.add_agent(healthy)
+        healthy.move_to([0.5, 0.0, 0.0], speed=60.0)
+        for _ in range(5):
+            self.host.tick()
+        self.assertEqual(healthy.position[0], 0.5)
+
+    def test_batches_cover_every_agent(self):
+        self.host.batch_size = 4
+        for i in range(10):
+            self.host.add_agent(AgentBase(f"npc-{i}", CONFIG))
+        batches = self.host._batches()
+        self.assertEqual([len(batch) for batch in batches], [4, 4, 2])
+
+    def test_run_async(self):
+        agents = [AgentBase(f"npc-{i}", CONFIG) for i in range(50)]
+
+        async def scenario():
+            runner = asyncio.ensure_future(self.host.run_async())
+            await asyncio.sleep(0)
+            for agent in agents:
+                self.host.add_agent(agent)
+                agent.move_to([1.0, 0.0, 0.0], speed=100.0)
+            await asyncio.sleep(0.2)
+            self.host.stop()
+            await runner
+
+        asyncio.run(scenario())
+        self.assertTrue(all(agent.position[0] == 1.0 for agent in agents))
+        self.assertTrue(all(not agent.is_running for agent in agents))
+        self.assertGreater(self.host.get_stats()["steps"], 0)
+
+
+class TestAgentHostVoice(unittest.TestCase):
+    def setUp(self):
+        self.host = AgentHost(CONFIG)
+        self.host.voice_manager = FakeVoiceManager()
+        self.agents = [ListeningAgent(name, CONFIG) for name in ("Alice", "Bob")]
+        for agent in self.agents:
+            agent.voice_manager = FakeVoiceManager()
+            self.host.add_agent(agent)
+        self.host.start(threaded=False)
+
+    def tearDown(self):
+        self.host.stop()
+
+    def test_hosted_agents_share_the_host_voice(self):
+        self.assertIsNotNone(self.host.voice_manager.callback)
+        for agent in self.agents:
+            self.assertIsNone(agent.voice_manager.callback)
+        self.agents[0].say("Hello")
+        self.assertEqual(self.host.voice_manager.spoken, ["Hello"])
+        self.assertEqual(self.agents[0].voice_manager.spoken, [])
+
+    def test_recognized_text_goes_to_the_named_agent(self):
+        alice, bob = self.agents
+        self.host.voice_manager.callback("bob, come here", 0.9)
+        self.assertEqual((alice.heard, bob.heard), ([], ["bob, come here"]))
+        self.host.voice_manager.callback("hello everyone", 0.9)
+        self.assertEqual((alice.heard, bob.heard), (["hello everyone"], ["bob, come here", "hello everyone"]))
+
+    def test_voice_stops_with_the_host(self):
+        voice_manager = self.host.voice_manager
+        self.host.stop()
+        self.assertIsNone(voice_manager.callback)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+import unittest
+import asyncio
+import threading
+
+from hyperfy_agent_python.src.core.action_system import ActionSystem, ActionStatus
+from hyperfy_agent_python.src.core.async_actions import AsyncAction
+from hyperfy_agent_python.src.core.agent_base import AgentBase
+from hyperfy_agent_python.src.core.async_runtime import run_agents, run_blocking
+from hyperfy_agent_python.src.physics.movement_action import MovementAction
+
+FRAME = 1 / 60
+CONFIG = {"VOICE_RECOGNITION_ENABLED": False, "PHYSICS_ENABLED": False, "ACTION_COOLDOWN": 0.0}
+
+
+class SimpleAgent:
+    def __init__(self):
+        self.name = "Walker"
+        self.position = [0.0, 0.0, 0.0]
+        self.rotation = [0.0, 0.0, 0.0]
+        self.physics_engine = None
+
+
+class PatrolAction(AsyncAction):
+    """Walks to two points and pauses in between."""
+    def __init__(self, agent):
+        super().__init__(agent=agent)
+        self.steps = []
+
+    async def run(self):
+        self.steps.append(await self.run_child(MovementAction(None, [0.5, 0.0, 0.0], speed=30.0)))
+        await asyncio.sleep(0)
+        self.steps.append(await self.run_child(MovementAction(None, [0.5, 0.0, 0.5], speed=30.0)))
+
+
+class FailingAsyncAction(AsyncAction):
+    async def run(self):
+        await asyncio.sleep(0)
+        raise RuntimeError("connector unreachable")
+
+
+class WaitForeverAction(AsyncAction):
+    def __init__(self):
+        super().__init__()
+        self.was_cancelled = False
+
+    async def run(self):
+        try:
+            await asyncio.sleep(3600)
+        except asyncio.CancelledError:
+            self.was_cancelled = True
+            raise
+
+
+async def drive(system, frames):
+    for _ in range(frames):
+        system.update(FRAME)
+        await asyncio.sleep(0)
+
+
+class TestAsyncAction(unittest.TestCase):
+    def test_awaits_child_movements_in_order(self):
+        agent = SimpleAgent()
+        system = ActionSystem(action_cooldown=0.0)
+        action = PatrolAction(agent)
+
+        async def scenario():
+            system.queue_action(action)
+            await drive(system, 20)
+
+        asyncio.run(scenario())
+        self.assertTrue(action.is_completed())
+        self.assertEqual(action.steps, [ActionStatus.COMPLETED, ActionStatus.COMPLETED])
+        self.assertAlmostEqual(agent.position[0], 0.5)
+        self.assertAlmostEqual(agent.position[2], 0.5)
+        self.assertTrue(system.is_idle())
+
+    def test_exception_in_run_fails_action(self):
+        system = ActionSystem(action_cooldown=0.0)
+        action = FailingAsyncAction()
+
+        async def scenario():
+            system.queue_action(action)
+            await drive(system, 3)
+
+        asyncio.run(scenario())
+        self.assertTrue(action.is_failed())
+        self.assertIn("connector unreachable", action.error)
+
+    def test_cancel_cancels_coroutine(self):
+        system = ActionSystem(action_cooldown=0.0)
+        action = WaitForeverAction()
+
+        async def scenario():
+            system.queue_action(action)
+            await drive(system, 2)
+            system.cancel_action(action.id)
+            await asyncio.sleep(0)
+
+        asyncio.run(scenario())
+        self.assertTrue(action.is_cancelled())
+        self.assertTrue(action.was_cancelled)
+
+    def test_fails_without_event_loop(self):
+        system = ActionSystem(action_cooldown=0.0)
+        action = WaitForeverAction()
+        system.queue_action(action)
+        system.update(FRAME)
+        self.assertTrue(action.is_failed())
+        self.assertTrue(system.is_idle())
+
+
+class TestAsyncAgent(unittest.TestCase):
+    def test_wait_for_event_receives_emitted_data(self):
+        agent = AgentBase("Listener", CONFIG)
+
+        async def scenario():
+            await agent.start_async()
+            waiter = asyncio.ensure_future(agent.wait_for_event("connector_reply", timeout=1.0))
+            await asyncio.sleep(0)
+            agent.emit_event("connector_reply", {"ok": True})
+            reply = await waiter
+            await agent.stop_async()
+            return reply
+
+        reply = asyncio.run(scenario())
+        self.assertTrue(reply["ok"])
+        self.assertEqual(reply["source"], "Listener")
+        self.assertEqual(agent.event_waiters, {})
+
+    def test_wait_for_event_times_out(self):
+        agent = AgentBase("Listener", CONFIG)
+
+        async def scenario():
+            with self.assertRaises(asyncio.TimeoutError):
+                await agent.wait_for_event("never", timeout=0.01)
+
+        asyncio.run(scenario())
+        self.assertEqual(agent.event_waiters, {"never": []})
+
+    def test_many_agents_share_one_loop_without_threads(self):
+        agents = [AgentBase(f"Agent{i}", CONFIG) for i in range(20)]
+        threads_before = threading.active_count()
+        observed = {}
+
+        async def scenario():
+            runner = asyncio.ensure_future(run_agents(agents))
+            await asyncio.sleep(0.1)
+            observed["threads"] = threading.active_count()
+            observed["running"] = all(agent.is_running for agent in agents)
+            for agent in agents:
+                agent.move_to([1.0, 0.0, 0.0], speed=100.0)
+            await asyncio.sleep(0.1)
+            for agent in agents:
+                await agent.stop_async()
+            await runner
+
+        asyncio.run(scenario())
+        self.assertTrue(observed["running"])
+        self.assertEqual(observed["threads"], threads_before)
+        for agent in agents:
+            self.assertFalse(agent.is_running)
+            self.assertAlmostEqual(agent.position[0], 1.0)
+
+    def test_run_blocking_uses_executor_thread(self):
+        async def scenario():
+            return await run_blocking(threading.get_ident)
+
+        self.assertNotEqual(asyncio.run(scenario()), threading.get_ident())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+
+from hyperfy_agent_python.src.core.action_system import ActionSystem, ActionStatus, Action
+from hyperfy_agent_python.src.core.composite_actions import SequenceAction, SelectorAction, ParallelAction
+
+
+class CountdownAction(Action):
+    """Leaf action that completes (or fails) after a fixed number of updates."""
+    def __init__(self, ticks=1, succeed=True):
+        super().__init__()
+        self.ticks = ticks
+        self.succeed = succeed
+        self.updates = 0
+
+    def update(self, delta_time):
+        self.updates += 1
+        if self.updates < self.ticks:
+            return False
+        if not self.succeed:
+            self.fail("countdown failed")
+        return True
+
+
+class TestSequenceAction(unittest.TestCase):
+    def test_runs_children_in_order(self):
+        first, second = CountdownAction(2), CountdownAction(1)
+        sequence = SequenceAction(children=[first, second])
+        sequence.start()
+
+        self.assertFalse(sequence.update(0.016))
+        self.assertTrue(first.is_running())
+        self.assertTrue(second.is_pending())
+
+        # First finishes and second starts and finishes within the same update
+        self.assertTrue(sequence.update(0.016))
+        self.assertTrue(first.is_completed())
+        self.assertTrue(second.is_completed())
+
+    def test_fails_on_child_failure(self):
+        remaining = CountdownAction(1)
+        sequence = SequenceAction(children=[CountdownAction(1, succeed=False), remaining])
+        sequence.start()
+        self.assertTrue(sequence.update(0.016))
+        self.assertTrue(sequence.is_failed())
+        self.assertTrue(remaining.is_pending())
+
+
+class TestSelectorAction(unittest.TestCase):
+    def test_falls_through_to_first_success(self):
+        fallback = CountdownAction(1)
+        selector = SelectorAction(children=[CountdownAction(1, succeed=False), fallback, CountdownAction(1)])
+        selector.start()
+        self.assertTrue(selector.update(0.016))
+        self.assertTrue(fallback.is_completed())
+        self.assertTrue(selector.is_running()) # Settled by the owner
+
+    def test_fails_when_all_children_fail(self):
+        selector = SelectorAction(children=[CountdownAction(1, succeed=False), CountdownAction(1, succeed=False)])
+        selector.start()
+        self.assertTrue(selector.update(0.016))
+        self.assertTrue(selector.is_failed())
+
+
+class TestParallelAction(unittest.TestCase):
+    def test_require_all_ticks_every_child(self):
+        short, long = CountdownAction(1), CountdownAction(3)
+        parallel = ParallelAction(children=[short, long])
+        parallel.start()
+        self.assertFalse(parallel.update(0.016))
+        self.assertTrue(short.is_completed())
+        self.assertEqual(long.updates, 1)
+        self.assertFalse(parallel.update(0.016))
+        self.assertTrue(parallel.update(0.016))
+        self.assertEqual(short.updates, 1)
+
+    def test_require_one_cancels_losers(self):
+        winner, loser = CountdownAction(1), CountdownAction(5)
+        parallel = ParallelAction(children=[winner, loser], policy=ParallelAction.REQUIRE_ONE)
+        parallel.start()
+        self.assertTrue(parallel.update(0.016))
+        self.assertTrue(loser.is_cancelled())
+
+    def test_require_all_fails_fast(self):
+        sibling = CountdownAction(5)
+        parallel = ParallelAction(children=[CountdownAction(1, succeed=False), sibling])
+        parallel.start()
+        self.assertTrue(parallel.update(0.016))
+        self.assertTrue(parallel.is_failed())
+        self.assertTrue(sibling.is_cancelled())
+
+
+class TestCompositeInActionSystem(unittest.TestCase):
+    def test_cancel_propagates_down_the_tree(self):
+        leaf = CountdownAction(10)
+        tree = SequenceAction(children=[ParallelAction(children=[SequenceAction(children=[leaf])])])
+        system = ActionSystem(action_cooldown=0.0)
+        system.queue_action(tree)
+        system.update(0.016)
+        system.update(0.016)
+        self.assertTrue(leaf.is_running())
+
+        self.assertTrue(system.cancel_action(tree.id))
+        self.assertEqual(leaf.status, ActionStatus.CANCELLED)
+        self.assertTrue(system.is_idle())
+
+    def test_composite_completes_through_action_system(self):
+        completed = []
+        system = ActionSystem(action_cooldown=0.0)
+        system.add_hook("on_complete", completed.append)
+        tree = SequenceAction(children=[CountdownAction(1), CountdownAction(1)])
+        system.queue_action(tree)
+        for _ in range(5):
+            system.update(0.016)
+        self.assertEqual(completed, [tree])
+        self.assertTrue(tree.is_completed())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -47,8 +47,14 @@ class MockActionSystem:
             if hasattr(self.current_action, 'cancel'):
                 self.current_action.cancel() # This will set its status to CANCELLED
             self.current_action = None
+        for queued in self.action_queue:
+            if queued.id == action_id:
+                queued.cancel()
         self.action_queue = [a for a in self.action_queue if a.id != action_id]
 
+    def get_current_action(self):
+        return self.current_action
+
 
 class MockWorldState:
     def __init__(self):
@@ -135,12 +141,15 @@ class TestWalkRandomlyAction(unittest.TestCase):
     @patch('random.choice') # Mock random.choice if used by any sub-actions for other things
     @patch('math.cos', MagicMock(return_value=0.5)) # Mock math.cos
     @patch('math.sin', MagicMock(return_value=0.5)) # Mock math.sin
-    def test_walk_randomly_queues_movement(self, mock_random_uniform, mock_random_choice):
+    def test_walk_randomly_drives_movement_child(self, mock_random_choice, mock_random_uniform):
         # Configure random.uniform to return predictable values
         mock_random_uniform.side_effect = [
-            1.0, # For random_angle or random_dist calculation in WalkRandomlyAction
+            1.0, # For random_angle
             5.0, # For random_dist
-            10.0 # For next_waypoint_time randomization factor
+            0.1, # For next_waypoint_time randomization factor
+            1.0, # Second waypoint angle
+            5.0, # Second waypoint distance
+            0.1  # Second waypoint interval
         ]
 
         action = WalkRandomlyAction(self.agent, interval=0.1, max_distance=5, duration=1.0)
@@ -150,20 +159,21 @@ class TestWalkRandomlyAction(unittest.TestCase):
         self.assertEqual(time.time(), 100.0)
         self.assertEqual(action._next_waypoint_time, 100.0) # Should set to current time initially
 
-        # First update, should queue a movement
+        # First update creates a movement child and drives it in the same frame
         action.update(0.01) 
-        self.agent.queue_action.assert_called_once()
-        queued_action = self.agent.queue_action.call_args[0][0]
-        self.assertIsInstance(queued_action, MovementAction)
-        
-        # Simulate movement completion for next step
-        action._current_movement_action = queued_action # Manually assign as queue_action is mocked
-        action._current_movement_action.status = ActionStatus.COMPLETED 
+        self.agent.queue_action.assert_not_called() # The child is owned, never queued
+        movement = action._current_movement_action
+        self.assertIsInstance(movement, MovementAction)
+        self.assertEqual(movement.status, ActionStatus.RUNNING)
+        self.assertNotEqual(self.agent.position, [0.0, 0.0, 0.0]) # The agent already moved
         
-        # Second update, after interval, should queue another
-        time.time.return_value = 100.2 # Advance time past interval (0.1 * ~1.0 from random.uniform)
+        # Finish the child, then after the interval a new waypoint is picked
+        movement.complete()
+        time.time.return_value = 100.2
         action.update(0.01)
-        self.assertEqual(self.agent.queue_action.call_count, 2)
+        self.assertIsNot(action._current_movement_action, movement)
+        self.assertIsInstance(action._current_movement_action, MovementAction)
+        self.agent.queue_action.assert_not_called()
 
     @patch('time.time', MagicMock(return_value=100.0))
     def test_walk_randomly_duration(self):
@@ -181,40 +191,39 @@ class TestWalkRandomlyAction(unittest.TestCase):
         self.assertEqual(action.status, ActionStatus.COMPLETED)
 
     @patch('time.time', MagicMock(return_value=100.0))
+    @patch('random.uniform', MagicMock(return_value=3.0)) # Waypoint far enough away to keep moving
     def test_walk_randomly_cancel(self):
         action = WalkRandomlyAction(self.agent, interval=0.1, max_distance=5, duration=1.0)
         action.start()
-        action.update(0.01) # Queues a movement action
+        action.update(0.01) # Creates and starts a movement child
         
-        # Assume the movement action was "queued" and is now the _current_movement_action
-        mock_sub_movement = MagicMock(spec=MovementAction)
-        mock_sub_movement.id = "sub_move_id_123"
-        mock_sub_movement.status = ActionStatus.RUNNING
-        action._current_movement_action = mock_sub_movement
+        sub_movement = action._current_movement_action
+        self.assertTrue(sub_movement.is_running())
         
         action.cancel()
         self.assertEqual(action.status, ActionStatus.CANCELLED)
-        # Check if the sub-movement action's cancel was called
-        # In the custom_actions.py, cancel calls self.agent.action_system.cancel_action
-        # So we check the mock on agent.action_system
-        self.agent.action_system._cancel_action_mock.assert_called_with(mock_sub_movement.id)
+        # Cancellation propagates straight to the owned child
+        self.assertEqual(sub_movement.status, ActionStatus.CANCELLED)
+        self.agent.action_system._cancel_action_mock.assert_not_called()
 
 
 class TestStopMovingAction(unittest.TestCase):
     def setUp(self):
         self.agent = MockAgent()
 
-    def test_stop_moving_cancels_current_movement(self):
-        # Setup a mock current action that is a MovementAction
+    def test_stop_moving_cancels_suspended_movement(self):
+        # Preemption has put the movement back in the queue and handed the slot to the stop
         mock_movement_action = MovementAction(self.agent, [1,1,1])
         mock_movement_action.id = "current_move_action_id"
-        mock_movement_action.status = ActionStatus.RUNNING 
-        self.agent.action_system.current_action = mock_movement_action
+        mock_movement_action.status = ActionStatus.SUSPENDED
+        self.agent.action_system.action_queue.append(mock_movement_action)
         
         action = StopMovingAction(self.agent)
-        action.start() # This should call cancel_action on the mock_movement_action
+        self.agent.action_system.current_action = action
+        action.start() # This should call cancel_action on the suspended movement
         
-        self.agent.action_system._cancel_action_mock.assert_called_with("current_move_action_id")
+        self.agent.action_system._cancel_action_mock.assert_called_once_with("current_move_action_id")
+        self.assertEqual(self.agent.action_system.action_queue, [])
         self.assertEqual(action.status, ActionStatus.COMPLETED)
         # Verify the mock_movement_action itself was cancelled
         self.assertEqual(mock_movement_action.status, ActionStatus.CANCELLED)
@@ -229,7 +238,7 @@ class TestStopMovingAction(unittest.TestCase):
     def test_stop_moving_non_movement_action(self):
         mock_other_action = Action(self.agent) # A generic action
         mock_other_action.id = "other_action_id"
-        self.agent.action_system.current_action = mock_other_action
+        self.agent.action_system.action_queue.append(mock_other_action)
 
         action = StopMovingAction(self.agent)
         action.start()
@@ -259,18 +268,22 @@ class TestUseItemAction(unittest.TestCase):
         action = UseItemAction(self.agent, self.item_id, move_to_item=True)
         action.start()
 
-        self.agent.queue_action.assert_called_once()
-        queued_move_action = self.agent.queue_action.call_args[0][0]
-        self.assertIsInstance(queued_move_action, MovementAction)
-        self.assertEqual(queued_move_action.target_position, self.item_pos)
+        self.agent.queue_action.assert_not_called() # Movement is a child, not a queued action
+        move_action = action._sub_move_action
+        self.assertIsInstance(move_action, MovementAction)
+        self.assertEqual(move_action.target_position, self.item_pos)
         
         # Action should be RUNNING, waiting for movement
         self.assertEqual(action.status, ActionStatus.RUNNING) 
         mock_perform_use.assert_not_called() # Not called yet
 
+        # The first update starts and drives the movement child
+        action.update(0.1)
+        self.assertEqual(move_action.status, ActionStatus.RUNNING)
+        self.assertEqual(action.status, ActionStatus.RUNNING)
+
         # Simulate movement completion
-        action._sub_move_action = queued_move_action # Manually assign
-        action._sub_move_action.status = ActionStatus.COMPLETED
+        move_action.status = ActionStatus.COMPLETED
         
         action.update(0.1) # Update to process movement completion
         
@@ -282,9 +295,7 @@ class TestUseItemAction(unittest.TestCase):
         action = UseItemAction(self.agent, self.item_id, move_to_item=True)
         action.start()
 
-        self.agent.queue_action.assert_called_once()
-        queued_move_action = self.agent.queue_action.call_args[0][0]
-        action._sub_move_action = queued_move_action
+        self.agent.queue_action.assert_not_called()
 
         # Simulate movement failure
         action._sub_move_action.status = ActionStatus.FAILED
@@ -294,6 +305,16 @@ class TestUseItemAction(unittest.TestCase):
         mock_perform_use.assert_not_called()
         self.assertEqual(action.status, ActionStatus.FAILED)
 
+    def test_use_item_cancel_propagates_to_movement(self):
+        action = UseItemAction(self.agent, self.item_id, move_to_item=True)
+        action.start()
+        action.update(0.1)
+        move_action = action._sub_move_action
+
+        action.cancel()
+        self.assertEqual(action.status, ActionStatus.CANCELLED)
+        self.assertEqual(move_action.status, ActionStatus.CANCELLED)
+
     def test_use_item_item_not_found_for_move(self):
         action = UseItemAction(self.agent, "non_existent_item", move_to_item=True)
         # action.logger = MagicMock() # Suppress logger warning for cleaner test output if needed
@@ -0,0 +1,65 @@
+import unittest
+import random
+
+import numpy as np
+
+from hyperfy_agent_python.src.physics.distance_field import new_field, sweep
+from hyperfy_agent_python.tests.test_pathfinding import random_grid, dijkstra_cost
+
+
+class TestSweep(unittest.TestCase):
+    def test_matches_dijkstra(self):
+        rng = random.Random(48)
+        for _ in range(10):
+            grid = random_grid(rng, size=20)
+            free = ~grid.blocked
+            cells = [(x, z) for x in range(20) for z in range(20) if free[z, x]]
+            source = rng.choice(cells)
+            field = new_field((20, 20))
+            field[source[1], source[0]] = 0.0
+            sweep(field, free)
+            for x, z in rng.sample(cells, 40):
+                expected = dijkstra_cost(grid, grid.index(*source), grid.index(x, z))
+                if expected is None:
+                    self.assertEqual(field[z, x], np.inf)
+                else:
+                    self.assertAlmostEqual(float(field[z, x]), expected, places=4)
+            self.assertTrue(np.all(np.isinf(field[~free])))
+
+    def test_diagonals_do_not_cut_corners(self):
+        free = np.ones((3, 3), dtype=bool)
+        free[1, 0] = False
+        field = new_field((3, 3))
+        field[0, 0] = 0.0
+        sweep(field, free)
+        self.assertAlmostEqual(float(field[1, 1]), 2.0, places=5)
+        self.assertAlmostEqual(float(field[2, 0]), 4.0, places=5)
+
+    def test_batched_fields_match_single_ones(self):
+        rng = random.Random(480)
+        grids = [~random_grid(rng, size=12).blocked for _ in range(3)]
+        sources = [[(0, 0), (11, 11)], [(5, 5), (0, 11)], [(11, 0), (6, 2)]]
+        batched = new_field((12, 12, 3, 2))
+        for b, pair in enumerate(sources):
+            for k, (x, z) in enumerate(pair):
+                batched[z, x, b, k] = 0.0
+        sweep(batched, np.stack(grids, axis=-1)[..., None])
+        for b, pair in enumerate(sources):
+            for k, (x, z) in enumerate(pair):
+                single = new_field((12, 12))
+                single[z, x] = 0.0
+                sweep(single, grids[b])
+                np.testing.assert_array_equal(batched[:, :, b, k], single)
+
+    def test_max_rounds(self):
+        free = np.ones((20, 20), dtype=bool)
+        free[2:, 5] = False
+        free[:-2, 10] = False
+        field = new_field((20, 20))
+        field[19, 0] = 0.0
+        self.assertEqual(sweep(field.copy(), free, max_rounds=1), 1)
+        self.assertGreater(sweep(field, free), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import unittest
+import asyncio
+
+from hyperfy_agent_python.src.core.agent_base import AgentBase
+from hyperfy_agent_python.src.core.event_bus import (
+    EventBus, Event, VoiceInputEvent, OverflowPolicy, EventQueueFull, topic_matches
+)
+
+CONFIG = {"VOICE_RECOGNITION_ENABLED": False, "PHYSICS_ENABLED": False}
+
+
+class TestTopicMatching(unittest.TestCase):
+    def match(self, pattern, topic):
+        return topic_matches(tuple(pattern.split(".")), topic.split("."))
+
+    def test_single_segment_wildcard(self):
+        self.assertTrue(self.match("player.*", "player.joined"))
+        self.assertFalse(self.match("player.*", "player"))
+        self.assertFalse(self.match("player.*", "player.joined.late"))
+
+    def test_multi_segment_wildcard(self):
+        self.assertTrue(self.match("#", "collision"))
+        self.assertTrue(self.match("player.#", "player"))
+        self.assertTrue(self.match("player.#", "player.joined.late"))
+        self.assertTrue(self.match("#.late", "player.joined.late"))
+        self.assertFalse(self.match("world.#", "player.joined"))
+
+
+class TestEventBus(unittest.TestCase):
+    def setUp(self):
+        self.bus = EventBus()
+        self.received = []
+
+    def record(self, tag):
+        return lambda event: self.received.append((tag, event.topic))
+
+    def test_delivers_in_subscription_order_with_wildcards(self):
+        self.bus.subscribe("#", self.record("all"))
+        self.bus.subscribe("player.joined", self.record("exact"))
+        self.bus.subscribe("player.*", self.record("player"))
+        self.bus.subscribe("world.*", self.record("world"))
+
+        self.assertTrue(self.bus.publish(Event("player.joined")))
+        self.assertEqual(self.received, [("all", "player.joined"), ("exact", "player.joined"),
+                                         ("player", "player.joined")])
+
+    def test_unsubscribe_invalidates_dispatch_table(self):
+        subscription = self.bus.subscribe("ping", self.record("a"))
+        self.bus.publish(Event("ping"))
+        self.assertTrue(self.bus.unsubscribe(subscription))
+        self.assertFalse(self.bus.unsubscribe(subscription))
+        self.assertFalse(self.bus.publish(Event("ping")))
+        self.assertEqual(len(self.received), 1)
+        self.assertEqual(self.bus.get_stats()["subscriptions"], 0)
+
+    def test_handler_errors_are_contained(self):
+        self.bus.subscribe("ping", lambda event: 1 / 0)
+        self.bus.subscribe("ping", self.record("ok"))
+        with self.assertLogs("event_bus", level="ERROR"):
+            self.bus.publish(Event("ping"))
+        self.assertEqual(self.received, [("ok", "ping")])
+        self.assertEqual(self.bus.get_stats()["handler_errors"], 1)
+
+    def test_typed_event_payload(self):
+        event = VoiceInputEvent("hello", 0.9, source="alice", timestamp=1.0)
+        self.assertEqual(event.topic, "voice_input")
+        self.assertEqual(event.payload(), {"text": "hello", "confidence": 0.9, "source": "alice", "timestamp": 1.0})
+        with self.assertRaises(AttributeError):
+            event.extra = True
+
+
+class TestQueuedDelivery(unittest.TestCase):
+    def run_async(self, coro):
+        return asyncio.run(coro)
+
+    def test_events_are_delivered_from_the_queue(self):
+        async def scenario():
+            bus = EventBus(queue_size=8)
+            received = []
+            bus.subscribe("tick", lambda event: received.append(event.data))
+            bus.start()
+            for i in range(5):
+                bus.publish(Event("tick", i))
+            self.assertEqual(received, [])
+            await bus.stop()
+            return received
+        self.assertEqual(self.run_async(scenario()), [0, 1, 2, 3, 4])
+
+    def test_overflow_policies(self):
+        async def scenario(policy):
+            bus = EventBus(queue_size=2, overflow=policy)
+            received = []
+            bus.subscribe("tick", lambda event: received.append(event.data))
+            bus.start()
+            raised = False
+            for i in range(4):
+                try:
+                    bus.publish(Event("tick", i))
+                except EventQueueFull:
+                    raised = True
+            await bus.stop()
+            return received, bus.dropped, raised
+
+        self.assertEqual(self.run_async(scenario(OverflowPolicy.DROP_OLDEST)), ([2, 3], 2, False))
+        self.assertEqual(self.run_async(scenario(OverflowPolicy.DROP_NEWEST)), ([0, 1], 2, False))
+        self.assertEqual(self.run_async(scenario(OverflowPolicy.ERROR)), ([0, 1], 2, True))
+
+    def test_block_policy_waits_for_room(self):
+        async def scenario():
+            bus = EventBus(queue_size=1, overflow=OverflowPolicy.BLOCK)
+            received = []
+            bus.subscribe("tick", lambda event: received.append(event.data))
+            bus.start()
+            for i in range(4):
+                await bus.publish_async(Event("tick", i))
+            await bus.stop()
+            return received, bus.dropped
+        self.assertEqual(self.run_async(scenario()), ([0, 1, 2, 3], 0))
+
+    def test_publish_from_another_thread(self):
+        async def scenario():
+            bus = EventBus(queue_size=4, overflow=OverflowPolicy.BLOCK)
+            received = []
+            bus.subscribe("tick", lambda event: received.append(event.data))
+            bus.start()
+            await asyncio.to_thread(lambda: [bus.publish(Event("tick", i)) for i in range(10)])
+            await bus.stop()
+            return received
+        self.assertEqual(self.run_async(scenario()), list(range(10)))
+
+
+class TestAgentEvents(unittest.TestCase):
+    def setUp(self):
+        self.agent = AgentBase("tester", CONFIG)
+
+    def test_emit_does_not_modify_callers_data(self):
+        received = []
+        self.agent.register_event_handler("ping", received.append)
+        data = {"value": 1}
+        self.agent.emit_event("ping", data)
+        self.assertEqual(data, {"value": 1})
+        self.assertEqual(received[0]["value"], 1)
+        self.assertEqual(received[0]["source"], "tester")
+        self.assertIn("timestamp", received[0])
+
+    def test_wildcard_handlers_and_unregister(self):
+        received = []
+        subscription = self.agent.register_event_handler("player.*", lambda data: received.append(data["name"]))
+        self.agent.emit_event("player.joined", {"name": "bob"})
+        self.agent.emit_event("world.changed", {"name": "ignored"})
+        self.assertTrue(self.agent.unregister_event_handler(subscription))
+        self.agent.emit_event("player.left", {"name": "bob"})
+        self.assertEqual(received, ["bob"])
+
+    def test_typed_events_reach_payload_handlers(self):
+        received = []
+        self.agent.register_event_handler("voice_input", received.append)
+        self.agent._on_voice_input("hello", 0.75)
+        self.assertEqual(received[0]["text"], "hello")
+        self.assertEqual(received[0]["source"], "tester")
+
+
+if __name__ == '__main__':
+    unittest.main()
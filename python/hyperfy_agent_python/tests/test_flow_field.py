@@ -0,0 +1,179 @@
+import unittest
+import math
+import random
+
+from hyperfy_agent_python.src.core.agent_base import AgentBase
+from hyperfy_agent_python.src.core.headless import HeadlessRunner
+from hyperfy_agent_python.src.core.world_state import WorldObject
+from hyperfy_agent_python.src.physics.flow_field import FlowField
+from hyperfy_agent_python.src.physics.movement_action import MovementAction
+from hyperfy_agent_python.src.physics.pathfinding import Navigator
+from hyperfy_agent_python.tests.test_pathfinding import random_grid, dijkstra_cost
+
+
+class TestFlowField(unittest.TestCase):
+    def test_steps_lead_to_the_goal_along_shortest_paths(self):
+        rng = random.Random(50)
+        for _ in range(5):
+            grid = random_grid(rng, size=24)
+            free = [(x, z) for x in range(24) for z in range(24) if grid.is_free(x, z)]
+            goal = rng.choice(free)
+            field = FlowField(grid, goal, grid.centre_of(*goal), radius=24)
+            for x, z in rng.sample(free, 30):
+                expected = dijkstra_cost(grid, grid.index(x, z), grid.index(*goal))
+                if expected is None:
+                    self.assertIsNone(field.sample(*grid.centre_of(x, z)))
+                    continue
+                length = 0.0
+                while (x, z) != goal:
+                    dx, dz = (int(d) for d in field.steps[z, x])
+                    self.assertTrue(grid.is_free(x + dx, z + dz))
+                    if dx and dz:
+                        self.assertTrue(grid.is_free(x + dx, z) and grid.is_free(x, z + dz))
+                    x, z = x + dx, z + dz
+                    length += math.hypot(dx, dz)
+                self.assertAlmostEqual(length, expected, places=3)
+
+    def test_sampling(self):
+        navigator = Navigator({"WORLD_SIZE": [40, 10, 40], "NAV_CELL_SIZE": 0.5, "NAV_CLEARANCE": 0.5,
+                               "NAV_FLOW_FIELD_RADIUS": 10.0})
+        navigator.set_footprint("wall", (-5.0, -0.5, 5.0, 0.5))
+        field = navigator.flow_field([0.0, 0.0, 5.0])
+        self.assertEqual(field.end, (0.0, 5.0))
+        # Heading for the centre of a neighbouring cell, the goal itself from its own cell
+        x, z = field.sample(0.1, -4.9)
+        self.assertLessEqual(max(abs(x - 0.1), abs(z + 4.9)), 0.75)
+        self.assertEqual(field.sample(0.1, 5.1), (0.0, 5.0))
+        self.assertAlmostEqual(field.distance(0.0, 5.0), 0.0)
+        self.assertGreater(field.distance(0.0, -4.5), 2 * math.hypot(5.5, 4.75))
+        # Within the clearance of the wall: step out of it
+        cx, cz = navigator.grid.cell_of(0.1, -0.8)
+        self.assertFalse(navigator.grid.is_free(cx, cz))
+        self.assertTrue(navigator.grid.is_free(*navigator.grid.cell_of(*field.sample(0.1, -0.8))))
+        # Outside the window
+        self.assertIsNone(field.sample(0.0, -15.0))
+        self.assertEqual(field.distance(0.0, -15.0), math.inf)
+
+    def test_goal_inside_an_obstacle(self):
+        navigator = Navigator({"WORLD_SIZE": [40, 10, 40], "NAV_CELL_SIZE": 0.5, "NAV_CLEARANCE": 0.5})
+        navigator.set_footprint("table", (-1.0, -1.0, 1.0, 1.0))
+        field = navigator.flow_field([0.0, 0.0, 0.0])
+        grid = navigator.grid
+        self.assertTrue(grid.is_free(*grid.cell_of(*field.end)))
+        self.assertLess(math.dist(field.end, (0.0, 0.0)), 2.5)
+
+
+class TestNavigatorFlowFields(unittest.TestCase):
+    def setUp(self):
+        self.navigator = Navigator({"WORLD_SIZE": [40, 10, 40], "NAV_CELL_SIZE": 0.5, "NAV_FLOW_FIELD_IDLE": 1})
+        self.navigator.set_footprint("wall", (-5.0, -0.5, 5.0, 0.5))
+
+    def test_agents_share_a_field_while_they_hold_it(self):
+        navigator = self.navigator
+        first = navigator.flow_field([0.0, 0.0, 5.0])
+        self.assertIs(navigator.flow_field([0.0, 0.0, 5.0]), first)
+        self.assertIs(navigator.flow_field([0.0, 0.0, 5.0], held=first), first)
+        self.assertEqual(first.users, 2)
+
+        # Idle fields beyond NAV_FLOW_FIELD_IDLE are dropped, held ones never
+        other = navigator.flow_field([3.0, 0.0, -5.0])
+        navigator.release_flow_field(other)
+        navigator.release_flow_field(navigator.flow_field([-3.0, 0.0, -5.0]))
+        self.assertEqual(set(navigator.flow_fields), {(0.0, 5.0), (-3.0, -5.0)})
+        navigator.release_flow_field(first)
+        navigator.release_flow_field(first)
+        self.assertEqual(set(navigator.flow_fields), {(0.0, 5.0)})
+
+    def test_geometry_changes_replace_held_fields(self):
+        navigator = self.navigator
+        field = navigator.flow_field([0.0, 0.0, 5.0])
+        navigator.set_footprint("wall", (-15.0, -0.5, 15.0, 0.5))
+        current = navigator.flow_field([0.0, 0.0, 5.0], held=field)
+        self.assertIsNot(current, field)
+        self.assertEqual((field.users, current.users), (0, 1))
+        self.assertGreater(current.distance(0.0, -5.0), field.distance(0.0, -5.0))
+
+
+class TestFlowMovement(unittest.TestCase):
+    def test_crowd_converges_around_a_wall(self):
+        config = {"ACTION_COOLDOWN": 0.0, "PHYSICS_BACKEND": "numpy"}
+        with HeadlessRunner(config) as runner:
+            runner.host.world_state.add_object(WorldObject("wall", "wall", [0, 1, 0], scale=[12, 2, 1]))
+            navigator = runner.agent_kwargs()["physics_engine"].navigator
+            goal = [0.0, 0.0, 5.0]
+            walkers = []
+            for i in range(4):
+                walker = AgentBase(f"walker-{i}", runner.config, **runner.agent_kwargs())
+                walker.position = [-3.0 + 2 * i, 0.0, -5.0]
+                runner.add_agent(walker)
+                walker.move_to(goal, speed=4.0, mode="flow")
+                walkers.append(walker)
+            runner.run(0.25)
+            self.assertEqual(list(navigator.flow_fields), [(0.0, 5.0)])
+            self.assertEqual(navigator.flow_fields[(0.0, 5.0)].users, 4)
+
+            closest = math.inf
+            for _ in range(40):
+                runner.run(0.25)
+                for walker in walkers:
+                    x, _, z = walker.position
+                    if abs(x) < 6.0:
+                        closest = min(closest, abs(z))
+        # Their bodies keep them from all standing on the goal itself
+        for walker in walkers:
+            self.assertLess(math.dist(walker.position, goal), 1.5)
+        self.assertGreaterEqual(closest, 0.5)
+
+    def test_arriving_releases_the_field(self):
+        config = {"ACTION_COOLDOWN": 0.0, "PHYSICS_BACKEND": "numpy"}
+        with HeadlessRunner(config) as runner:
+            runner.host.world_state.add_object(WorldObject("wall", "wall", [0, 1, 0], scale=[12, 2, 1]))
+            navigator = runner.agent_kwargs()["physics_engine"].navigator
+            walker = AgentBase("walker", runner.config, **runner.agent_kwargs())
+            walker.position = [0.0, 0.0, -5.0]
+            runner.add_agent(walker)
+            walker.move_to([0.0, 0.0, 5.0], speed=4.0, mode="flow")
+            runner.run(10.0)
+            self.assertAlmostEqual(walker.position[2], 5.0, delta=0.2)
+            self.assertEqual(navigator.flow_fields[(0.0, 5.0)].users, 0)
+
+    def test_falls_back_to_a_path_without_a_field(self):
+        class Walker:
+            position = [0.0, 0.0, 0.0]
+            rotation = [0, 0, 0]
+            name = "walker"
+            physics_engine = None
+
+        walker = Walker()
+        action = MovementAction(walker, [3.0, 0.0, 4.0], speed=5.0, mode="flow")
+        action.start()
+        self.assertIsNone(action.flow_field)
+        action.update(0.5)
+        self.assertAlmostEqual(math.dist(walker.position, [0.0, 0.0, 0.0]), 2.5)
+
+    def test_leaving_the_field_plans_a_path(self):
+        navigator = Navigator({"WORLD_SIZE": [60, 10, 60], "NAV_CELL_SIZE": 0.5, "NAV_FLOW_FIELD_RADIUS": 5.0})
+        navigator.set_footprint("wall", (-5.0, -0.5, 5.0, 0.5))
+
+        class Engine:
+            flow_field = staticmethod(navigator.flow_field)
+            release_flow_field = staticmethod(navigator.release_flow_field)
+            calculate_path = staticmethod(navigator.calculate_path)
+
+        class Walker:
+            position = [0.0, 0.0, -20.0]
+            rotation = [0, 0, 0]
+            name = "walker"
+            physics_engine = Engine()
+
+        action = MovementAction(Walker(), [0.0, 0.0, 5.0], speed=2.0, mode="flow")
+        action.start()
+        self.assertIsNotNone(action.flow_field)
+        action.update(0.1)
+        self.assertIsNone(action.flow_field)
+        self.assertGreater(len(action.path), 1)
+        self.assertEqual(navigator.flow_fields[(0.0, 5.0)].users, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import time
+
+from hyperfy_agent_python.src.core import clock
+from hyperfy_agent_python.src.core.agent_base import AgentBase
+from hyperfy_agent_python.src.core.action_system import ActionSystem, Action
+from hyperfy_agent_python.src.core.clock import VirtualClock, use_clock, get_clock
+from hyperfy_agent_python.src.core.custom_actions import WalkRandomlyAction
+from hyperfy_agent_python.src.core.headless import HeadlessRunner
+
+CONFIG = {"PHYSICS_ENABLED": False, "ACTION_COOLDOWN": 0.0}
+
+
+class BusyAction(Action):
+    def update(self, delta_time):
+        return False
+
+
+class WanderingAgent(AgentBase):
+    def on_start(self):
+        self.queue_action(WalkRandomlyAction(self, interval=2, max_distance=5, duration=600))
+
+    def on_stop(self):
+        self.final_position = list(self.position)
+
+
+class TestVirtualClock(unittest.TestCase):
+    def test_use_clock_installs_and_restores(self):
+        wall = get_clock()
+        virtual = VirtualClock(start=100.0)
+        with use_clock(virtual):
+            self.assertEqual(clock.now(), 100.0)
+            clock.sleep(2.5)
+            self.assertEqual(clock.monotonic(), 102.5)
+        self.assertIs(get_clock(), wall)
+        self.assertAlmostEqual(clock.now(), time.time(), delta=1.0)
+
+    def test_cannot_go_backwards(self):
+        with self.assertRaises(ValueError):
+            VirtualClock().advance(-1.0)
+
+    def test_actions_expire_on_virtual_time(self):
+        with use_clock(VirtualClock()) as virtual:
+            system = ActionSystem(action_cooldown=0.0, preemption=False)
+            system.queue_action(BusyAction())
+            system.update(0.1)
+            queued = Action(ttl=5.0)
+            system.queue_action(queued)
+            virtual.advance(4.0)
+            system.update(0.1)
+            self.assertTrue(queued.is_pending())
+            virtual.advance(2.0)
+            system.update(0.1)
+            self.assertTrue(queued.is_expired())
+
+
+class TestHeadlessRunner(unittest.TestCase):
+    def simulate(self, seed, duration=120.0):
+        with HeadlessRunner(CONFIG, seed=seed) as runner:
+            agents = [WanderingAgent(f"npc-{i}", runner.config, **runner.agent_kwargs()) for i in range(3)]
+            for agent in agents:
+                runner.add_agent(agent)
+            stats = runner.run(duration)
+        return stats, [agent.final_position for agent in agents]
+
+    def test_runs_faster_than_real_time(self):
+        stats, _ = self.simulate(seed=1)
+        self.assertEqual(stats["steps"], 7200)
+        self.assertAlmostEqual(stats["simulated_seconds"], 120.0)
+        self.assertGreater(stats["speedup"], 1.0)
+
+    def test_same_seed_gives_same_run(self):
+        _, first = self.simulate(seed=7)
+        _, second = self.simulate(seed=7)
+        _, other = self.simulate(seed=8)
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+
+    def test_speech_goes_to_transcript_on_virtual_time(self):
+        with HeadlessRunner(CONFIG) as runner:
+            agent = AgentBase("speaker", runner.config, **runner.agent_kwargs())
+            runner.add_agent(agent)
+            runner.run(10.0)
+            agent.say("hello")
+        self.assertEqual(runner.transcript, [(runner.start_time + 10.0, "speaker", "hello")])
+
+    def test_stop_restores_clock(self):
+        wall = get_clock()
+        runner = HeadlessRunner(CONFIG)
+        runner.step(3)
+        self.assertIs(get_clock(), runner.clock)
+        runner.stop()
+        self.assertIs(get_clock(), wall)
+
+
+if __name__ == '__main__':
+    unittest.main()
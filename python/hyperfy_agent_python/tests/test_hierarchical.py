@@ -0,0 +1,188 @@
+import unittest
+import math
+import os
+import random
+import tempfile
+import threading
+from unittest.mock import patch
+
+from hyperfy_agent_python.src.physics import hierarchical
+from hyperfy_agent_python.src.physics.hierarchical import HierarchicalPathfinder, geometry_key, prune_cache
+from hyperfy_agent_python.src.physics.pathfinding import OccupancyGrid, GridPathfinder, Navigator
+from hyperfy_agent_python.tests.test_pathfinding import random_grid
+
+
+def path_length(grid, cells):
+    points = [grid.centre_of(*grid.cell_at(i)) for i in cells]
+    return sum(math.dist(a, b) for a, b in zip(points, points[1:]))
+
+
+class TestHierarchicalPathfinder(unittest.TestCase):
+    def setUp(self):
+        self.grid = random_grid(random.Random(48), size=64, density=0.25)
+        self.hpa = HierarchicalPathfinder.bake(self.grid, 16)
+        self.free = [(x, z) for x in range(64) for z in range(64) if self.grid.is_free(x, z)]
+
+    def assert_walkable(self, cells):
+        grid = self.grid
+        for a, b in zip(cells, cells[1:]):
+            (ax, az), (bx, bz) = grid.cell_at(a), grid.cell_at(b)
+            if max(abs(ax - bx), abs(az - bz)) > 1:
+                self.assertTrue(grid.line_clear(*grid.centre_of(ax, az), *grid.centre_of(bx, bz)))
+            else:
+                self.assertTrue(grid.passable[b])
+
+    def test_paths_match_the_flat_search(self):
+        rng = random.Random(1)
+        flat = GridPathfinder(self.grid)
+        for _ in range(60):
+            start, goal = self.grid.index(*rng.choice(self.free)), self.grid.index(*rng.choice(self.free))
+            expected, reachable = flat.find_path(start, goal)
+            cells, reached = self.hpa.find_path(start, goal)
+            self.assertEqual(reached, reachable)
+            self.assertEqual(cells[0], start)
+            self.assert_walkable(cells)
+            if reached:
+                self.assertEqual(cells[-1], goal)
+                self.assertLess(path_length(self.grid, cells), path_length(self.grid, expected) * 1.3 + 1.0)
+
+    def test_transitions_pair_up_across_borders(self):
+        hpa = self.hpa
+        for node, edges in enumerate(hpa.edges):
+            cluster = hpa.cluster_of(hpa.node_x[node], hpa.node_z[node])
+            for other, cost in edges:
+                other_cluster = hpa.cluster_of(hpa.node_x[other], hpa.node_z[other])
+                if other_cluster != cluster:
+                    self.assertEqual(cost, 1.0)
+                    self.assertEqual(abs(hpa.node_x[node] - hpa.node_x[other]) +
+                                     abs(hpa.node_z[node] - hpa.node_z[other]), 1)
+
+    def test_walled_off_goal_is_not_reached(self):
+        grid = OccupancyGrid(48, 48, 1.0, (0.0, 0.0))
+        grid.blocked[30:40, 30] = grid.blocked[30:40, 40] = True
+        grid.blocked[30, 30:41] = grid.blocked[40, 30:41] = True
+        grid.refresh()
+        hpa = HierarchicalPathfinder.bake(grid, 16)
+        cells, reached = hpa.find_path(grid.index(2, 2), grid.index(35, 35))
+        self.assertFalse(reached)
+        self.assertEqual(cells[0], grid.index(2, 2))
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            path = os.path.join(cache_dir, "nav.npz")
+            self.hpa.save(path)
+            loaded = HierarchicalPathfinder.load(path, self.grid, self.hpa.key)
+            self.assertEqual(loaded.edges, self.hpa.edges)
+            self.assertEqual((loaded.node_x, loaded.node_z), (self.hpa.node_x, self.hpa.node_z))
+            self.assertIsNone(HierarchicalPathfinder.load(path, self.grid, "other geometry"))
+            self.assertIsNone(HierarchicalPathfinder.load(os.path.join(cache_dir, "missing.npz"), self.grid, ""))
+            with open(path, "wb") as f:
+                f.write(b"not a graph")
+            with self.assertLogs("physics_engine.navigation", "WARNING"):
+                self.assertIsNone(HierarchicalPathfinder.load(path, self.grid, self.hpa.key))
+
+    def test_load_or_bake_reuses_baked_geometry(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            HierarchicalPathfinder.load_or_bake(self.grid, 16, cache_dir)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+            with self.assertLogs("physics_engine.navigation", "INFO") as logs:
+                HierarchicalPathfinder.load_or_bake(self.grid, 16, cache_dir)
+            self.assertIn("Loaded navigation data", logs.output[0])
+
+            # Any change to the blocked cells is different geometry
+            key = geometry_key(self.grid, 16)
+            self.grid.blocked[0, 0] = not self.grid.blocked[0, 0]
+            self.assertNotEqual(geometry_key(self.grid, 16), key)
+            HierarchicalPathfinder.load_or_bake(self.grid, 16, cache_dir)
+            self.assertEqual(len(os.listdir(cache_dir)), 2)
+
+    def test_cache_keeps_the_most_recently_used_graphs(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            paths = [os.path.join(cache_dir, f"nav-{i}.npz") for i in range(4)]
+            for age, path in enumerate(reversed(paths)):
+                open(path, "wb").close()
+                os.utime(path, (1000 - age, 1000 - age))
+            open(os.path.join(cache_dir, "other.txt"), "wb").close()
+            self.assertEqual(prune_cache(cache_dir, 2), 2)
+            self.assertEqual(sorted(os.listdir(cache_dir)), ["nav-2.npz", "nav-3.npz", "other.txt"])
+
+            # Loading a graph makes it the most recently used
+            HierarchicalPathfinder.load_or_bake(self.grid, 16, cache_dir, max_files=2)
+            baked = next(name for name in os.listdir(cache_dir) if name not in ("nav-2.npz", "nav-3.npz", "other.txt"))
+            os.utime(os.path.join(cache_dir, baked), (0, 0))
+            HierarchicalPathfinder.load_or_bake(self.grid, 16, cache_dir, max_files=2)
+            prune_cache(cache_dir, 1)
+            self.assertEqual(sorted(os.listdir(cache_dir)), sorted([baked, "other.txt"]))
+
+
+class TestHierarchicalNavigator(unittest.TestCase):
+    def test_large_worlds_search_hierarchically(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            config = {"WORLD_SIZE": [300, 50, 300], "NAV_CELL_SIZE": 0.5, "NAV_CACHE_DIR": cache_dir}
+            navigator = Navigator(config)
+            self.assertTrue(navigator.hierarchical)
+            self.assertFalse(Navigator({"WORLD_SIZE": [100, 50, 100]}).hierarchical)
+
+            navigator.set_footprint("wall", (-100.0, -0.5, 100.0, 0.5))
+            self.assertTrue(navigator.wait_for_bake(30.0))
+            start, goal = [0.0, 0.0, -20.0], [0.0, 0.0, 20.0]
+            waypoints = navigator.calculate_path(start, goal)
+            self.assertIsNotNone(navigator.hierarchy)
+            self.assertEqual(waypoints[-1], goal)
+            self.assertTrue(any(abs(x) > 100.0 for x, _, _ in waypoints))
+            points = [start] + waypoints
+            for a, b in zip(points, points[1:]):
+                self.assertTrue(navigator.grid.line_clear(a[0], a[2], b[0], b[2]))
+
+            # A restart with the same geometry loads the baked graph
+            restarted = Navigator(config)
+            restarted.set_footprint("wall", (-100.0, -0.5, 100.0, 0.5))
+            with self.assertLogs("physics_engine.navigation", "INFO") as logs:
+                self.assertTrue(restarted.wait_for_bake(30.0))
+                self.assertEqual(restarted.calculate_path(start, goal), waypoints)
+            self.assertTrue(any("Loaded navigation data" in line for line in logs.output))
+
+    def test_queries_use_the_flat_search_while_baking(self):
+        release = threading.Event()
+        started = threading.Event()
+        bakes = []
+        original = HierarchicalPathfinder.load_or_bake
+
+        def slow_bake(grid, *args):
+            bakes.append(geometry_key(grid, 16))
+            started.set()
+            release.wait(10.0)
+            return original(grid, *args)
+
+        config = {"WORLD_SIZE": [100, 50, 100], "NAV_CELL_SIZE": 0.5, "NAV_HIERARCHICAL": True,
+                  "NAV_CLUSTER_SIZE": 16, "NAV_CACHE_DIR": None}
+        navigator = Navigator(config)
+        with patch.object(hierarchical.HierarchicalPathfinder, "load_or_bake", side_effect=slow_bake):
+            navigator.set_footprint("wall", (-10.0, -0.5, 10.0, 0.5))
+            waypoints = navigator.calculate_path([0.0, 0.0, -5.0], [0.0, 0.0, 5.0])
+            self.assertIsNone(navigator.hierarchy)
+            self.assertEqual(waypoints[-1], [0.0, 0.0, 5.0])
+
+            # Geometry that changes mid-bake is baked again; the stale graph is never used
+            self.assertTrue(started.wait(10.0))
+            navigator.set_footprint("wall", (-20.0, -0.5, 20.0, 0.5))
+            navigator.calculate_path([0.0, 0.0, -5.0], [0.0, 0.0, 5.0])
+            self.assertFalse(navigator.wait_for_bake(0.05))
+            release.set()
+            self.assertTrue(navigator.wait_for_bake(30.0))
+        self.assertEqual(len(bakes), 2)
+        self.assertEqual(navigator.hierarchy.key, geometry_key(navigator.grid, 16))
+        self.assertIsNone(navigator.bake_thread)
+
+    def test_baking_inline(self):
+        config = {"WORLD_SIZE": [100, 50, 100], "NAV_CELL_SIZE": 0.5, "NAV_HIERARCHICAL": True,
+                  "NAV_CLUSTER_SIZE": 16, "NAV_CACHE_DIR": None, "NAV_BACKGROUND_BAKE": False}
+        navigator = Navigator(config)
+        navigator.set_footprint("wall", (-10.0, -0.5, 10.0, 0.5))
+        navigator.calculate_path([0.0, 0.0, -5.0], [0.0, 0.0, 5.0])
+        self.assertIsNotNone(navigator.hierarchy)
+        self.assertIsNone(navigator.bake_thread)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+import io
+import json
+import queue
+import logging
+from unittest.mock import patch
+
+from hyperfy_agent_python.src.core.log_pipeline import (
+    JsonFormatter, RateLimitFilter, NonBlockingQueueHandler, LogPipeline
+)
+
+
+def make_record(name="test", level=logging.INFO, msg="hello %s", args=("world",), **extra):
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestJsonFormatter(unittest.TestCase):
+    def test_one_object_per_record_with_extra_fields(self):
+        line = JsonFormatter().format(make_record(agent="Alice", position=(1, 2)))
+        entry = json.loads(line)
+        self.assertEqual(entry["msg"], "hello world")
+        self.assertEqual(entry["level"], "INFO")
+        self.assertEqual(entry["logger"], "test")
+        self.assertEqual(entry["agent"], "Alice")
+        self.assertEqual(entry["position"], [1, 2])
+        self.assertNotIn("args", entry)
+
+
+class TestRateLimitFilter(unittest.TestCase):
+    def test_limits_each_logger_and_reports_suppressed(self):
+        rate_filter = RateLimitFilter(rate_limits={"action": 2})
+        with patch("time.monotonic", return_value=100.0):
+            passed = [rate_filter.filter(make_record(name="action.a1")) for _ in range(5)]
+            other = rate_filter.filter(make_record(name="action.a2"))
+        self.assertEqual(passed, [True, True, False, False, False])
+        self.assertTrue(other)
+
+        record = make_record(name="action.a1")
+        with patch("time.monotonic", return_value=101.0):
+            self.assertTrue(rate_filter.filter(record))
+        self.assertEqual(record.suppressed, 3)
+        self.assertEqual(record.getMessage(), "hello world [3 suppressed]")
+        self.assertEqual(rate_filter.suppressed, {"action.a1": 3})
+
+    def test_warnings_are_never_limited(self):
+        rate_filter = RateLimitFilter(rate=1)
+        with patch("time.monotonic", return_value=0.0):
+            results = [rate_filter.filter(make_record(level=logging.WARNING)) for _ in range(10)]
+        self.assertTrue(all(results))
+
+    def test_sampling(self):
+        rate_filter = RateLimitFilter(sample={"physics": 0.25})
+        with patch("random.random", side_effect=[0.1, 0.5, 0.9, 0.2]):
+            results = [rate_filter.filter(make_record(name="physics")) for _ in range(4)]
+        self.assertEqual(results, [True, False, False, True])
+        self.assertTrue(rate_filter.filter(make_record(name="voice")))
+
+    def test_record_checked_once_per_handler_set(self):
+        rate_filter = RateLimitFilter(rate=1)
+        record = make_record()
+        with patch("time.monotonic", return_value=0.0):
+            self.assertTrue(rate_filter.filter(record))
+            self.assertTrue(rate_filter.filter(record))
+            self.assertFalse(rate_filter.filter(make_record()))
+
+
+class TestQueuedPipeline(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("test_log_pipeline")
+        self.logger.propagate = False
+        self.addCleanup(setattr, self.logger, "propagate", True)
+        self.stream = io.StringIO()
+
+    def test_records_are_written_in_batches_by_the_writer(self):
+        handler = logging.StreamHandler(self.stream)
+        handler.setFormatter(JsonFormatter())
+        pipeline = LogPipeline([handler], mode="queued", batch_size=50, flush_interval=0.01)
+        pipeline.install(self.logger, level=logging.DEBUG)
+        items = [1]
+        for i in range(200):
+            self.logger.debug("step %d %s", i, items)
+        items.append(2)  # formatted before the writer sees it
+        pipeline.close()
+
+        lines = self.stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 200)
+        self.assertEqual(json.loads(lines[0])["msg"], "step 0 [1]")
+        stats = pipeline.get_stats()
+        self.assertEqual(stats["written"], 200)
+        self.assertLess(stats["batches"], 200)
+        self.assertEqual(self.logger.handlers, [])
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=3))
+        self.logger.addHandler(handler)
+        self.addCleanup(self.logger.removeHandler, handler)
+        self.logger.setLevel(logging.INFO)
+        for i in range(10):
+            self.logger.info("message %d", i)
+        self.assertEqual(handler.dropped, 7)
+
+    def test_exceptions_survive_the_queue(self):
+        handler = logging.StreamHandler(self.stream)
+        pipeline = LogPipeline([handler], mode="queued").install(self.logger, level=logging.INFO)
+        try:
+            raise ValueError("bad value")
+        except ValueError:
+            self.logger.exception("failed")
+        pipeline.close()
+        output = self.stream.getvalue()
+        self.assertIn("failed", output)
+        self.assertIn("ValueError: bad value", output)
+
+    def test_sync_mode_applies_rate_limit(self):
+        handler = logging.StreamHandler(self.stream)
+        pipeline = LogPipeline([handler], mode="sync", rate_filter=RateLimitFilter(rate=5))
+        pipeline.install(self.logger, level=logging.INFO)
+        with patch("time.monotonic", return_value=0.0):
+            for i in range(20):
+                self.logger.info("tick %d", i)
+        pipeline.close()
+        self.assertEqual(len(self.stream.getvalue().splitlines()), 5)
+        self.assertEqual(pipeline.get_stats()["suppressed"], {"test_log_pipeline": 15})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import urllib.request
+
+from hyperfy_agent_python.src.core.action_system import ActionSystem, Action
+from hyperfy_agent_python.src.core.metrics import MetricsRegistry, MetricsServer
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def test_render_exposition_format(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("test_events_total", "Events seen", ("kind",))
+        counter.inc("a")
+        counter.inc("a", amount=2)
+        histogram = registry.histogram("test_latency_seconds", "Latency", buckets=(0.1, 1.0))
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+        histogram.observe(5.0)
+
+        text = registry.render()
+        self.assertIn('# TYPE test_events_total counter', text)
+        self.assertIn('test_events_total{kind="a"} 3', text)
+        self.assertIn('test_latency_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('test_latency_seconds_bucket{le="1"} 2', text)
+        self.assertIn('test_latency_seconds_bucket{le="+Inf"} 3', text)
+        self.assertIn('test_latency_seconds_count 3', text)
+
+    def test_same_name_returns_same_metric(self):
+        registry = MetricsRegistry()
+        self.assertIs(registry.counter("x_total", "x"), registry.counter("x_total", "x"))
+        with self.assertRaises(ValueError):
+            registry.histogram("x_total", "x")
+
+
+class TestActionSystemMetrics(unittest.TestCase):
+    def test_lifecycle_is_instrumented(self):
+        registry = MetricsRegistry()
+        system = ActionSystem(action_cooldown=10.0)
+        system.enable_metrics(registry, agent_name="Alice")
+        system.add_hook("pre_execute", lambda action: None)
+
+        for _ in range(2):
+            system.queue_action(Action())
+        system.update(0.016)
+        system.update(0.016)  # Second Action is blocked by the cooldown bucket
+
+        metrics = system.metrics
+        self.assertEqual(metrics.queued.get("Alice", "Action"), 2)
+        self.assertEqual(metrics.started.get("Alice", "Action"), 1)
+        self.assertEqual(metrics.finished.get("Alice", "Action", "COMPLETED"), 1)
+        self.assertEqual(metrics.rate_limited.get("Alice", "Action"), 1)
+        self.assertEqual(metrics.queue_wait.get_count("Alice", "Action"), 1)
+        self.assertEqual(metrics.execution.get_count("Alice", "Action"), 1)
+        self.assertEqual(metrics.hook.get_count("Alice", "pre_execute"), 1)
+        self.assertIn('hyperfy_actions_started_total{agent="Alice",action="Action"} 1', registry.render())
+
+    def test_disabled_by_default(self):
+        system = ActionSystem(action_cooldown=0.0)
+        system.queue_action(Action())
+        system.update(0.016)
+        self.assertIsNone(system.metrics)
+
+
+class TestMetricsServer(unittest.TestCase):
+    def test_serves_metrics(self):
+        registry = MetricsRegistry()
+        registry.counter("served_total", "Served").inc()
+        server = MetricsServer(registry, port=0)
+        server.start()
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5) as response:
+                body = response.read().decode("utf-8")
+            self.assertIn("served_total 1", body)
+        finally:
+            server.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
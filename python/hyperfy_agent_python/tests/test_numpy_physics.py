@@ -0,0 +1,285 @@
+import unittest
+import random
+import threading
+
+import numpy as np
+
+from hyperfy_agent_python.src.core.agent_base import AgentBase
+from hyperfy_agent_python.src.core.headless import HeadlessRunner
+from hyperfy_agent_python.src.physics.numpy_backend import NumpyBackend
+from hyperfy_agent_python.src.physics.physics_backend import Shape
+from hyperfy_agent_python.src.physics.physics_engine import PhysicsEngine
+
+STEP = 1 / 60
+AGENT = Shape.capsule(0.5, 0.5, offset=[0.0, 1.0, 0.0])
+
+
+class TestNumpyBackend(unittest.TestCase):
+    def setUp(self):
+        self.backend = NumpyBackend({})
+
+    def add(self, name, position, shape, mass=1.0):
+        self.backend.add_body(name, position, [0, 0, 0], shape, mass, {"type": "test", "name": name})
+
+    def simulate(self, seconds):
+        for _ in range(int(round(seconds / STEP))):
+            self.backend.simulate(STEP)
+
+    def test_bodies_fall_and_rest_on_the_ground(self):
+        self.add("ball", [0, 5, 0], Shape.sphere(0.5))
+        self.add("agent", [3, 0, 0], AGENT, mass=70.0)
+        self.add("crate", [6, 2, 0], Shape.box([0.5, 0.5, 0.5]))
+        self.simulate(3.0)
+        self.assertAlmostEqual(self.backend.get_pose("ball")[0][1], 0.5, places=6)
+        self.assertAlmostEqual(self.backend.get_pose("agent")[0][1], 0.0, places=6)
+        self.assertAlmostEqual(self.backend.get_pose("crate")[0][1], 0.5, places=6)
+        self.assertAlmostEqual(self.backend.get_linear_velocity("ball")[1], 0.0)
+
+    def test_overlapping_agents_are_pushed_apart_and_reported(self):
+        self.add("a", [0, 0, 0], AGENT, mass=70.0)
+        self.add("b", [0.4, 0, 0], AGENT, mass=70.0)
+        self.backend.simulate(STEP)
+        contacts = self.backend.contacts()
+        self.assertEqual(len(contacts), 1)
+        name1, name2, data = contacts[0]
+        self.assertEqual({name1, name2}, {"a", "b"})
+        self.assertAlmostEqual(data["depth"], 0.6)
+        self.simulate(0.5)
+        a = self.backend.get_pose("a")[0]
+        b = self.backend.get_pose("b")[0]
+        self.assertGreaterEqual(b[0] - a[0], 1.0 - 1e-6)
+        self.assertAlmostEqual(a[0] + b[0], 0.4)
+
+    def test_static_boxes_stop_dynamic_bodies(self):
+        self.add("wall", [0, 1, 5], Shape.box([5, 1, 0.5]), mass=0.0)
+        self.add("agent", [0, 0, 0], AGENT, mass=70.0)
+        for _ in range(120):
+            position = self.backend.get_pose("agent")[0]
+            self.backend.set_pose("agent", [position[0], position[1], position[2] + 0.1])
+            self.backend.simulate(STEP)
+        self.assertAlmostEqual(self.backend.get_pose("agent")[0][2], 4.0, places=6)
+        self.assertEqual(self.backend.get_pose("wall")[0], [0.0, 1.0, 5.0])
+
+    def test_impulses_and_local_forces(self):
+        self.backend.add_body("a", [0, 10, 0], [0, 90, 0], AGENT, 2.0, {})
+        self.backend.add_force("a", [0, 0, 4], impulse=True, local=True)
+        self.backend.simulate(STEP)
+        velocity = self.backend.get_linear_velocity("a")
+        self.assertAlmostEqual(velocity[0], 2.0, delta=0.05)
+        self.assertAlmostEqual(velocity[2], 0.0, places=6)
+
+    def test_raycasts_hit_the_nearest_shape(self):
+        self.add("ball", [0, 0.5, 0], Shape.sphere(0.5))
+        self.add("agent", [3, 0, 0], AGENT)
+        self.add("wall", [0, 1, 5], Shape.box([5, 1, 0.5]), mass=0.0)
+
+        hit = self.backend.raycast([3, 1.5, -5], [0, 0, 1], 100)
+        self.assertEqual(hit["name"], "agent")
+        self.assertAlmostEqual(hit["distance"], 4.5)
+        self.assertEqual(hit["normal"], [0.0, 0.0, -1.0])
+
+        hit = self.backend.raycast([3, 10, 0], [0, -1, 0], 100)
+        self.assertEqual(hit["name"], "agent")
+        self.assertAlmostEqual(hit["position"][1], 2.0)
+
+        hit = self.backend.raycast([0, 0.5, -5], [0, 0, 1], 100)
+        self.assertEqual(hit["name"], "ball")
+        self.assertAlmostEqual(hit["distance"], 4.5)
+
+        hit = self.backend.raycast([1, 1, -5], [0, 0, 1], 100)
+        self.assertEqual(hit["name"], "wall")
+        self.assertAlmostEqual(hit["distance"], 9.5)
+        self.assertEqual(hit["normal"], [0.0, 0.0, -1.0])
+
+        hit = self.backend.raycast([20, 3, 0], [0, -1, 0], 100)
+        self.assertEqual(hit["type"], "ground")
+        self.assertAlmostEqual(hit["distance"], 3.0)
+
+        self.assertIsNone(self.backend.raycast([0, 10, -20], [0, 0, 1], 100))
+        self.assertIsNone(self.backend.raycast([3, 1.5, -5], [0, 0, 1], 4.0))
+
+    def test_rays_starting_inside_a_body_ignore_it(self):
+        self.add("agent", [0, 0, 0], AGENT)
+        self.add("other", [0, 0, 5], AGENT)
+        hit = self.backend.raycast([0, 1, 0], [0, 0, 1], 100)
+        self.assertEqual(hit["name"], "other")
+
+    def test_broadphase_matches_brute_force(self):
+        backend = NumpyBackend({"WORLD_GROUND_ENABLED": False})
+        rng = random.Random(4)
+        shapes = [Shape.sphere(0.5), Shape.capsule(0.4, 0.5), Shape.box([0.5, 0.3, 0.7])]
+        for i in range(200):
+            backend.add_body(f"b{i}", [rng.uniform(0, 10) for _ in range(3)], [0, 0, 0], shapes[i % 3],
+                             0.0 if i % 5 == 0 else 1.0, {})
+        dynamic = backend.inv_mass[:backend.count] > 0
+        a, b = backend._broadphase(dynamic)
+        lo, hi = backend.bounds()
+        expected = {(i, j) for i in range(200) for j in range(i + 1, 200)
+                    if np.all((lo[i] <= hi[j]) & (lo[j] <= hi[i])) and (dynamic[i] or dynamic[j])}
+        self.assertEqual({tuple(sorted(pair)) for pair in zip(a.tolist(), b.tolist())}, expected)
+
+    def test_remove_body_keeps_the_others(self):
+        for i in range(100):
+            self.add(f"b{i}", [i * 2.0, 0, 0], Shape.sphere(0.5))
+        for i in range(0, 100, 3):
+            self.backend.remove_body(f"b{i}")
+        for i in range(100):
+            if i % 3:
+                self.assertEqual(self.backend.get_pose(f"b{i}")[0], [i * 2.0, 0.0, 0.0])
+            else:
+                self.assertFalse(self.backend.has_body(f"b{i}"))
+        self.assertEqual(self.backend.count, 66)
+
+
+class TestPhysicsEngineFallback(unittest.TestCase):
+    def test_engine_api_runs_on_the_numpy_backend(self):
+        engine = PhysicsEngine({"PHYSICS_BACKEND": "numpy"})
+        agent = AgentBase("a", {"VOICE_RECOGNITION_ENABLED": False}, physics_engine=engine)
+        agent.position = [0, 2, 0]
+        self.assertEqual(engine.backend.name, "numpy")
+        self.assertTrue(engine.register_agent(agent))
+        self.assertTrue(engine.add_obstacle("crate", [0, 0.5, 3], Shape.box([0.5, 0.5, 0.5])))
+        collisions = []
+        engine.add_collision_callback(lambda name1, name2, data: collisions.append({name1, name2}))
+
+        self.assertTrue(engine.start(threaded=False))
+        engine.advance(1.0)
+        self.assertAlmostEqual(agent.position[1], 0.0, places=6)
+
+        self.assertTrue(engine.update_agent_position("a", [0, 0, 2.6], [0, 90, 0]))
+        self.assertEqual(agent.rotation, [0, 90, 0])
+        engine.advance(STEP)
+        self.assertIn({"a", "crate"}, collisions)
+        self.assertAlmostEqual(agent.position[2], 2.0, places=6)
+
+        self.assertTrue(engine.apply_impulse("a", [0, 0, -70]))
+        engine.advance(STEP)
+        self.assertLess(agent.velocity[2], -0.5)
+
+        hit = engine.raycast([0, 0.5, 10], [0, 0, -2])
+        self.assertTrue(hit["hit"])
+        self.assertEqual(hit["type"], "obstacle")
+        self.assertAlmostEqual(hit["distance"], 6.5)
+        engine.stop()
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            from hyperfy_agent_python.src.physics.physics_engine import create_backend
+            create_backend({"PHYSICS_BACKEND": "bullet"})
+
+    def test_walking_agents_stay_on_the_ground(self):
+        with HeadlessRunner({"ACTION_COOLDOWN": 0.0, "PHYSICS_BACKEND": "numpy"}) as runner:
+            walker = AgentBase("walker", runner.config, **runner.agent_kwargs())
+            bystander = AgentBase("bystander", runner.config, **runner.agent_kwargs())
+            bystander.position = [5.0, 0.0, 0.0]
+            runner.add_agent(walker)
+            runner.add_agent(bystander)
+            walker.move_to([10.0, 0.0, 0.0], speed=2.0)
+            runner.run(8.0)
+        self.assertAlmostEqual(walker.position[0], 10.0, delta=0.2)
+        self.assertAlmostEqual(walker.position[1], 0.0, places=6)
+        # The bystander was shoved along ahead of the walker
+        self.assertGreater(bystander.position[0], 10.5)
+
+
+
+class RecordingAgent:
+    def __init__(self, name, position):
+        self.name = name
+        self.rotation = [0.0, 0.0, 0.0]
+        self.velocity = [0.0, 0.0, 0.0]
+        self.writes = 0
+        self._position = position
+
+    @property
+    def position(self):
+        return self._position
+
+    @position.setter
+    def position(self, value):
+        self.writes += 1
+        self._position = value
+
+
+class TestBatchedStates(unittest.TestCase):
+    def make_engine(self, batch, count=5):
+        engine = PhysicsEngine({"PHYSICS_BACKEND": "numpy", "PHYSICS_BATCH_STATES": batch})
+        agents = [RecordingAgent(f"a{i}", [i * 3.0, 2.0 + i, 0.0]) for i in range(count)]
+        for agent in agents:
+            engine.register_agent(agent)
+            agent.writes = 0
+        engine.start(threaded=False)
+        return engine, agents
+
+    def test_states_are_published_once_per_outer_step(self):
+        engine, agents = self.make_engine(batch=True)
+        self.assertEqual(engine.advance(4 * STEP + 1e-9), 4)
+        self.assertTrue(all(agent.writes == 1 for agent in agents))
+        self.assertEqual(engine.poses.step, 4)
+        self.assertEqual(engine.advance(0.5 * STEP), 0)
+        self.assertTrue(all(agent.writes == 1 for agent in agents))
+
+    def test_batched_and_per_agent_paths_agree(self):
+        batched, batched_agents = self.make_engine(batch=True)
+        single, single_agents = self.make_engine(batch=False)
+        for engine in (batched, single):
+            engine.apply_impulse("a2", [70.0, 0.0, 0.0])
+            engine.advance(1.0)
+        for a, b in zip(batched_agents, single_agents):
+            self.assertEqual(a.position, b.position)
+            self.assertEqual(a.velocity, b.velocity)
+            self.assertEqual(a.rotation, b.rotation)
+        position, rotation, velocity = batched.poses.get("a2")
+        self.assertEqual(position, batched_agents[2].position)
+
+    def test_buffers_are_swapped_not_overwritten(self):
+        engine, agents = self.make_engine(batch=True)
+        engine.advance(STEP)
+        first = engine.poses
+        snapshot = first.positions.copy()
+        engine.advance(STEP)
+        self.assertIsNot(engine.poses, first)
+        np.testing.assert_array_equal(first.positions, snapshot)
+
+    def test_unregistering_rebuilds_the_buffers(self):
+        engine, agents = self.make_engine(batch=True)
+        engine.advance(STEP)
+        engine.unregister_agent("a1")
+        engine.advance(STEP)
+        self.assertEqual(engine.poses.names, ("a0", "a2", "a3", "a4"))
+        self.assertIsNone(engine.poses.get("a1"))
+        self.assertEqual(engine.poses.get("a4")[0], agents[4].position)
+
+    def test_unregistering_waits_for_the_read_back(self):
+        engine, agents = self.make_engine(batch=True)
+        engine.advance(STEP)
+        reading, release = threading.Event(), threading.Event()
+        read_states = engine.backend.read_states
+
+        def slow_read_states(*args):
+            reading.set()
+            release.wait(5.0)
+            return read_states(*args)
+
+        engine.backend.read_states = slow_read_states
+        stepper = threading.Thread(target=engine.advance, args=(STEP,))
+        stepper.start()
+        self.assertTrue(reading.wait(5.0))
+        remover = threading.Thread(target=engine.unregister_agent, args=("a1",))
+        remover.start()
+        remover.join(0.05)
+        self.assertTrue(remover.is_alive())
+        self.assertTrue(engine.backend.has_body("a1"))
+        release.set()
+        stepper.join(5.0)
+        remover.join(5.0)
+
+        self.assertNotIn("a1", engine.agents)
+        engine.advance(STEP)
+        self.assertEqual(engine.poses.names, ("a0", "a2", "a3", "a4"))
+        for agent in agents[:1] + agents[2:]:
+            self.assertEqual(engine.poses.get(agent.name)[0], agent.position)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,330 @@
+import unittest
+import heapq
+import math
+import random
+
+from hyperfy_agent_python.src.core.agent_base import AgentBase
+from hyperfy_agent_python.src.core.metrics import MetricsRegistry
+from hyperfy_agent_python.src.core.headless import HeadlessRunner
+from hyperfy_agent_python.src.core.world_state import WorldState, WorldObject
+from hyperfy_agent_python.src.physics.pathfinding import (OccupancyGrid, GridPathfinder, Navigator, PathCache,
+                                                        footprint)
+from hyperfy_agent_python.src.physics.physics_backend import Shape
+from hyperfy_agent_python.src.physics.physics_engine import PhysicsEngine
+
+
+def random_grid(rng, size=30, density=0.3):
+    grid = OccupancyGrid(size, size, 1.0, (0.0, 0.0))
+    for _ in range(int(size * size * density / 4)):
+        x, z = rng.randrange(size), rng.randrange(size)
+        grid.blocked[z:z + rng.randint(1, 3), x:x + rng.randint(1, 3)] = True
+    grid.refresh()
+    return grid
+
+
+def dijkstra_cost(grid, start, goal):
+    """
+    Shortest octile path cost by plain Dijkstra, for reference
+    """
+    stride = grid.stride
+    passable = grid.passable
+    costs = {start: 0.0}
+    heap = [(0.0, start)]
+    while heap:
+        cost, i = heapq.heappop(heap)
+        if i == goal:
+            return cost
+        if cost > costs[i]:
+            continue
+        for dx in (-1, 0, 1):
+            for dz in (-1, 0, 1):
+                j = i + dx + dz * stride
+                if j == i or not passable[j]:
+                    continue
+                if dx and dz and not (passable[i + dx] and passable[i + dz * stride]):
+                    continue
+                new_cost = cost + (math.sqrt(2) if dx and dz else 1.0)
+                if new_cost < costs.get(j, math.inf):
+                    costs[j] = new_cost
+                    heapq.heappush(heap, (new_cost, j))
+    return None
+
+
+def path_cost(grid, cells):
+    cost = 0.0
+    for a, b in zip(cells, cells[1:]):
+        (ax, az), (bx, bz) = grid.cell_at(a), grid.cell_at(b)
+        assert max(abs(ax - bx), abs(az - bz)) == 1, "cells are not neighbours"
+        cost += math.sqrt(2) if ax != bx and az != bz else 1.0
+    return cost
+
+
+class TestOccupancyGrid(unittest.TestCase):
+    def test_block_marks_cells_centred_in_the_inflated_area(self):
+        grid = OccupancyGrid(10, 10, 1.0, (0.0, 0.0))
+        grid.block((3.0, 3.0, 5.0, 4.0))
+        self.assertEqual(grid.blocked.sum(), 2)
+        self.assertTrue(grid.blocked[3, 3] and grid.blocked[3, 4])
+        grid.block((3.0, 3.0, 5.0, 4.0), inflate=1.0)
+        self.assertEqual(grid.blocked.sum(), 12)
+        grid.refresh()
+        self.assertFalse(grid.is_free(3, 3))
+        self.assertTrue(grid.is_free(0, 0))
+
+    def test_world_grid_is_centred_on_the_origin(self):
+        grid = OccupancyGrid.for_world([100, 50, 100], 0.5)
+        self.assertEqual((grid.width, grid.depth), (200, 200))
+        self.assertEqual(grid.cell_of(0.1, -0.1), (100, 99))
+        self.assertEqual(grid.cell_of(-500, 500), (0, 199))
+        self.assertEqual(grid.centre_of(100, 99), (0.25, -0.25))
+
+    def test_footprints(self):
+        self.assertEqual(footprint([1, 1, 2], [1, 1, 0.5]), (0.0, 1.5, 2.0, 2.5))
+        # A box turned a quarter turn about Y swaps its X and Z extents
+        area = footprint([0, 1, 0], [2, 1, 0.5], [0, 90, 0])
+        for actual, expected in zip(area, (-0.5, -2.0, 0.5, 2.0)):
+            self.assertAlmostEqual(actual, expected)
+        self.assertIsNone(footprint([0, 0.1, 0], [1, 0.1, 1], step_height=0.3))
+
+    def test_line_clear(self):
+        grid = OccupancyGrid(10, 10, 1.0, (0.0, 0.0))
+        grid.blocked[5, 2:8] = True
+        grid.refresh()
+        self.assertTrue(grid.line_clear(0.5, 0.5, 9.5, 4.5))
+        self.assertFalse(grid.line_clear(5.0, 0.5, 5.0, 9.5))
+        self.assertFalse(grid.line_clear(5.0, 0.5, 50.0, 0.5))
+
+
+class TestGridPathfinder(unittest.TestCase):
+    def test_paths_are_shortest(self):
+        rng = random.Random(47)
+        for _ in range(20):
+            grid = random_grid(rng)
+            pathfinder = GridPathfinder(grid)
+            free = [(x, z) for x in range(grid.width) for z in range(grid.depth) if grid.is_free(x, z)]
+            for _ in range(10):
+                start, goal = grid.index(*rng.choice(free)), grid.index(*rng.choice(free))
+                expected = dijkstra_cost(grid, start, goal)
+                cells, reached = pathfinder.find_path(start, goal)
+                self.assertEqual(reached, expected is not None)
+                if reached:
+                    self.assertEqual((cells[0], cells[-1]), (start, goal))
+                    self.assertTrue(all(grid.passable[i] for i in cells))
+                    self.assertAlmostEqual(path_cost(grid, cells), expected, delta=expected * 2e-3)
+
+    def test_diagonals_do_not_cut_corners(self):
+        grid = OccupancyGrid(3, 3, 1.0, (0.0, 0.0))
+        grid.blocked[1, 0] = True
+        grid.refresh()
+        cells, reached = GridPathfinder(grid).find_path(grid.index(0, 0), grid.index(0, 2))
+        self.assertTrue(reached)
+        # Around the blocked cell in four straight steps, not two diagonals past its corners
+        self.assertEqual(path_cost(grid, cells), 4.0)
+        self.assertEqual([grid.cell_at(i) for i in cells], [(0, 0), (1, 0), (1, 1), (1, 2), (0, 2)])
+
+    def test_unreachable_goal_leads_to_the_closest_cell(self):
+        grid = OccupancyGrid(10, 10, 1.0, (0.0, 0.0))
+        grid.blocked[:, 5] = True
+        grid.refresh()
+        cells, reached = GridPathfinder(grid).find_path(grid.index(0, 5), grid.index(9, 5))
+        self.assertFalse(reached)
+        self.assertEqual(grid.cell_at(cells[-1]), (4, 5))
+
+    def test_scratch_arrays_are_reused_between_queries(self):
+        grid = random_grid(random.Random(1))
+        pathfinder = GridPathfinder(grid)
+        start, goal = grid.index(0, 0), grid.index(29, 29)
+        grid.passable[start] = grid.passable[goal] = 1
+        first, _ = pathfinder.find_path(start, goal)
+        arrays = (pathfinder._stamp, pathfinder._cost, pathfinder._parent)
+        pathfinder.find_path(goal, grid.index(15, 0))
+        second, _ = pathfinder.find_path(start, goal)
+        self.assertEqual(first, second)
+        self.assertEqual(arrays, (pathfinder._stamp, pathfinder._cost, pathfinder._parent))
+
+
+class TestNavigator(unittest.TestCase):
+    def setUp(self):
+        self.navigator = Navigator({"WORLD_SIZE": [40, 10, 40], "NAV_CELL_SIZE": 0.5, "NAV_CLEARANCE": 0.5})
+
+    def assert_avoids(self, waypoints, start):
+        grid = self.navigator.grid
+        points = [start] + waypoints
+        for a, b in zip(points, points[1:]):
+            self.assertTrue(grid.line_clear(a[0], a[2], b[0], b[2]), (a, b))
+
+    def test_clear_line_is_the_goal_alone(self):
+        self.assertEqual(self.navigator.calculate_path([0, 0, 0], [5, 0, 5]), [[5, 0, 5]])
+        self.navigator.set_footprint("crate", (10.0, 10.0, 11.0, 11.0))
+        self.assertEqual(self.navigator.calculate_path([0, 0, 0], [5, 0, 5]), [[5, 0, 5]])
+
+    def test_paths_go_around_walls(self):
+        self.navigator.set_footprint("wall", (-10.0, -0.5, 10.0, 0.5))
+        start, goal = [0.0, 0.0, -8.0], [2.0, 0.0, 8.0]
+        waypoints = self.navigator.calculate_path(start, goal)
+        self.assertEqual(waypoints[-1], goal)
+        self.assertGreater(len(waypoints), 1)
+        self.assert_avoids(waypoints, start)
+        self.assertTrue(all(abs(x) >= 10.5 for x, _, _ in waypoints[:-1]))
+
+    def test_goal_inside_an_obstacle_ends_next_to_it(self):
+        self.navigator.set_footprint("wall", (-10.0, -0.5, 10.0, 0.5))
+        self.navigator.set_footprint("table", (-1.0, 5.0, 1.0, 7.0))
+        waypoints = self.navigator.calculate_path([0.0, 0.0, -8.0], [0.0, 0.0, 6.0])
+        end = waypoints[-1]
+        self.assertTrue(self.navigator.grid.is_free(*self.navigator.grid.cell_of(end[0], end[2])))
+        self.assertLess(math.dist(end, [0.0, 0.0, 6.0]), 2.5)
+
+    def test_world_state_obstacles(self):
+        world_state = WorldState()
+        world_state.add_object(WorldObject("wall", "wall", [0, 1, 0], scale=[20, 2, 1]))
+        self.navigator.attach_world_state(world_state)
+        start, goal = [0.0, 0.0, -8.0], [0.0, 0.0, 8.0]
+        self.assertGreater(len(self.navigator.calculate_path(start, goal)), 1)
+
+        # Flat decorations and other objects do not block
+        world_state.add_object(WorldObject("rug", "obstacle", [0, 0, -4], scale=[4, 0.1, 4]))
+        world_state.add_object(WorldObject("teapot", "item", [0, 0, 4], scale=[4, 4, 4]))
+        self.assertEqual(set(self.navigator.footprints), {"world:wall"})
+        world_state.add_object(WorldObject("hedge", "plant", [5, 1, 5], scale=[1, 2, 1],
+                                           properties={"obstacle": True}))
+        self.assertIn("world:hedge", self.navigator.footprints)
+
+        world_state.update_object("wall", position=[30, 1, 0])
+        self.assertEqual(self.navigator.calculate_path(start, goal), [goal])
+        world_state.update_object("wall", position=[0, 1, 0])
+        self.assertGreater(len(self.navigator.calculate_path(start, goal)), 1)
+        world_state.remove_object("wall")
+        self.assertEqual(self.navigator.calculate_path(start, goal), [goal])
+
+
+class TestPathCache(unittest.TestCase):
+    def setUp(self):
+        self.navigator = Navigator({"WORLD_SIZE": [40, 10, 40], "NAV_CELL_SIZE": 0.5, "NAV_CLEARANCE": 0.5})
+        self.navigator.set_footprint("wall", (-10.0, -0.5, 10.0, 0.5))
+        self.cache = self.navigator.path_cache
+
+    def test_nearby_queries_reuse_a_path(self):
+        start, goal = [0.0, 0.0, -8.0], [2.0, 0.0, 8.0]
+        waypoints = self.navigator.calculate_path(start, goal)
+        self.assertEqual(self.navigator.calculate_path(start, goal), waypoints)
+        # Same buckets, ends moved to the new start and goal
+        nearby = self.navigator.calculate_path([0.2, 0.0, -7.9], [2.2, 0.0, 8.1])
+        self.assertEqual(nearby[:-1], waypoints[:-1])
+        self.assertEqual(nearby[-1], [2.2, 0.0, 8.1])
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 1))
+        self.navigator.calculate_path([0.0, 0.0, -12.0], goal)
+        self.assertEqual(self.cache.misses, 2)
+        self.assertAlmostEqual(self.cache.hit_rate, 0.5)
+
+    def test_blocked_end_legs_are_searched_again(self):
+        navigator = Navigator({"WORLD_SIZE": [40, 10, 40], "NAV_CELL_SIZE": 0.5, "NAV_CLEARANCE": 0.0,
+                               "NAV_PATH_CACHE_QUANTUM": 8})
+        navigator.set_footprint("wall", (-10.0, -0.5, 10.0, 0.5))
+        navigator.set_footprint("post", (3.0, -4.0, 4.0, -3.0))
+        navigator.calculate_path([0.0, 0.0, -8.0], [2.0, 0.0, 8.0])
+        # In the same bucket, but the post hides the cached path's first turn
+        start = [0.0, 0.0, -6.0]
+        waypoints = navigator.calculate_path(start, [2.0, 0.0, 8.0])
+        self.assertEqual(navigator.path_cache.misses, 2)
+        points = [start] + waypoints
+        for a, b in zip(points, points[1:]):
+            self.assertTrue(navigator.grid.line_clear(a[0], a[2], b[0], b[2]))
+
+    def test_only_paths_through_changed_cells_are_dropped(self):
+        start, goal = [0.0, 0.0, -8.0], [2.0, 0.0, 8.0]
+        side = math.copysign(1.0, self.navigator.calculate_path(start, goal)[0][0])
+        self.navigator.calculate_path([-15.0, 0.0, 15.0], [-15.0, 0.0, 12.0])  # clear line, not cached
+        self.navigator.set_footprint("crate", (-16.0, -16.0, -15.0, -15.0))
+        self.navigator.calculate_path(start, goal)
+        self.assertEqual((self.cache.hits, self.cache.invalidated), (1, 0))
+
+        # Closing the gap the path went through
+        gap = (10.0, -0.5, 20.0, 0.5) if side > 0 else (-20.0, -0.5, -10.0, 0.5)
+        self.navigator.set_footprint("hedge", gap)
+        waypoints = self.navigator.calculate_path(start, goal)
+        self.assertEqual((self.cache.hits, self.cache.invalidated), (1, 1))
+        self.assertTrue(all(x * side < 0 for x, _, _ in waypoints[:-1]))
+
+    def test_world_state_changes_invalidate(self):
+        navigator = Navigator({"WORLD_SIZE": [40, 10, 40], "NAV_CELL_SIZE": 0.5, "NAV_CLEARANCE": 0.5})
+        world_state = WorldState()
+        world_state.add_object(WorldObject("wall", "wall", [0, 1, 0], scale=[20, 2, 1]))
+        navigator.attach_world_state(world_state)
+        start, goal = [0.0, 0.0, -8.0], [2.0, 0.0, 8.0]
+        navigator.calculate_path(start, goal)
+        world_state.add_object(WorldObject("tree", "tree", [-15, 1, -15], scale=[1, 4, 1]))
+        navigator.calculate_path(start, goal)
+        self.assertEqual(navigator.path_cache.hits, 1)
+        world_state.update_object("wall", scale=[40, 2, 1])
+        navigator.calculate_path(start, goal)
+        self.assertEqual(navigator.path_cache.invalidated, 1)
+
+    def test_unreached_paths_are_dropped_when_cells_free_up(self):
+        self.navigator.set_footprint("wall", (-20.0, -0.5, 20.0, 0.5))
+        start, goal = [0.0, 0.0, -8.0], [0.0, 0.0, 8.0]
+        self.assertNotEqual(self.navigator.calculate_path(start, goal)[-1], goal)
+        self.assertEqual(self.cache.unreached, set(self.cache.entries))
+        self.navigator.set_footprint("wall", (-20.0, -0.5, 15.0, 0.5))
+        self.assertEqual(self.navigator.calculate_path(start, goal)[-1], goal)
+        self.assertEqual(self.cache.invalidated, 1)
+        self.assertFalse(self.cache.unreached)
+
+    def test_least_recently_used_paths_are_evicted(self):
+        cache = PathCache(capacity=2)
+        for i in range(3):
+            cache.put((i, 0, 0, 0), [(0.0, 0.0), (1.0, 1.0)], True, {i, 100})
+            cache.get((0, 0, 0, 0))
+        self.assertEqual(list(cache.entries), [(2, 0, 0, 0), (0, 0, 0, 0)])
+        self.assertEqual(cache.evicted, 1)
+        self.assertEqual(cache.by_cell, {0: {(0, 0, 0, 0)}, 2: {(2, 0, 0, 0)}, 100: {(0, 0, 0, 0), (2, 0, 0, 0)}})
+        self.assertEqual(cache.invalidate([100, 7]), 2)
+        self.assertEqual(cache.by_cell, {})
+
+    def test_metrics(self):
+        registry = MetricsRegistry()
+        navigator = Navigator({"WORLD_SIZE": [40, 10, 40], "NAV_CELL_SIZE": 0.5}, registry)
+        navigator.set_footprint("wall", (-10.0, -0.5, 10.0, 0.5))
+        for _ in range(3):
+            navigator.calculate_path([0.0, 0.0, -8.0], [2.0, 0.0, 8.0])
+        lookups = registry.counter("hyperfy_nav_path_cache_lookups_total", "", ("result",))
+        self.assertEqual((lookups.get("hit"), lookups.get("miss")), (2, 1))
+        self.assertIn("hyperfy_nav_path_cache_invalidations_total", registry.render())
+
+    def test_disabled(self):
+        navigator = Navigator({"WORLD_SIZE": [40, 10, 40], "NAV_PATH_CACHE_SIZE": 0})
+        navigator.set_footprint("wall", (-10.0, -0.5, 10.0, 0.5))
+        self.assertIsNone(navigator.path_cache)
+        self.assertGreater(len(navigator.calculate_path([0.0, 0.0, -8.0], [2.0, 0.0, 8.0])), 1)
+
+
+class TestEnginePaths(unittest.TestCase):
+    def test_obstacles_feed_the_navigator(self):
+        engine = PhysicsEngine({"PHYSICS_BACKEND": "numpy"})
+        start, goal = [0.0, 0.0, -10.0], [0.0, 0.0, 10.0]
+        self.assertEqual(engine.calculate_path(start, goal), [goal])
+        engine.add_obstacle("wall", [0, 1, 0], Shape.box([10, 1, 0.5]))
+        self.assertGreater(len(engine.calculate_path(start, goal)), 1)
+        engine.remove_obstacle("wall")
+        self.assertEqual(engine.calculate_path(start, goal), [goal])
+
+    def test_agents_walk_around_obstacles(self):
+        config = {"ACTION_COOLDOWN": 0.0, "PHYSICS_BACKEND": "numpy"}
+        with HeadlessRunner(config) as runner:
+            runner.host.world_state.add_object(WorldObject("wall", "wall", [0, 1, 0], scale=[12, 2, 1]))
+            walker = AgentBase("walker", runner.config, **runner.agent_kwargs())
+            walker.position = [0.0, 0.0, -5.0]
+            runner.add_agent(walker)
+            walker.move_to([0.0, 0.0, 5.0], speed=4.0)
+            closest = math.inf
+            for _ in range(40):
+                runner.run(0.25)
+                x, _, z = walker.position
+                if abs(x) < 6.0:
+                    closest = min(closest, abs(z))
+        self.assertAlmostEqual(walker.position[2], 5.0, delta=0.2)
+        self.assertGreaterEqual(closest, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
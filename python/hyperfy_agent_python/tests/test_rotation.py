@@ -0,0 +1,138 @@
+import unittest
+import math
+import random
+
+import numpy as np
+
+from hyperfy_agent_python.src.physics import rotation
+
+TRIALS = 500
+
+
+def random_euler(rng):
+    # Pitch stays clear of +-90 where roll and yaw are not unique
+    return [rng.uniform(-180, 180), rng.uniform(-89, 89), rng.uniform(-180, 180)]
+
+
+def random_quat(rng):
+    quat = [rng.gauss(0, 1) for _ in range(4)]
+    length = math.sqrt(sum(v * v for v in quat))
+    return [v / length for v in quat]
+
+
+def rotate(quat, vector):
+    """
+    Rotate a vector by a unit quaternion as q * v * q^-1
+    """
+    x, y, z, w = quat
+    conjugate = (-x, -y, -z, w)
+    return rotation.quat_multiply(rotation.quat_multiply(quat, (*vector, 0.0)), conjugate)[:3]
+
+
+def same_rotation(a, b):
+    # q and -q are the same rotation
+    return abs(abs(sum(p * q for p, q in zip(a, b))) - 1.0) < 1e-9
+
+
+class TestScalarRotation(unittest.TestCase):
+    def setUp(self):
+        self.rng = random.Random(46)
+
+    def test_euler_round_trips_through_quaternion(self):
+        for _ in range(TRIALS):
+            euler = random_euler(self.rng)
+            result = rotation.quat_to_euler(rotation.euler_to_quat(euler))
+            for expected, actual in zip(euler, result):
+                self.assertAlmostEqual(expected, actual, places=7)
+
+    def test_quaternion_round_trips_through_euler(self):
+        for _ in range(TRIALS):
+            quat = random_quat(self.rng)
+            result = rotation.euler_to_quat(rotation.quat_to_euler(quat))
+            self.assertTrue(same_rotation(quat, result), (quat, result))
+
+    def test_gimbal_lock_keeps_the_rotation(self):
+        for pitch in (90.0, -90.0, 89.9999999999, -89.9999999999):
+            for _ in range(50):
+                euler = [self.rng.uniform(-180, 180), pitch, self.rng.uniform(-180, 180)]
+                quat = rotation.euler_to_quat(euler)
+                result = rotation.quat_to_euler(quat)
+                self.assertAlmostEqual(abs(result[1]), 90.0, places=4)
+                self.assertTrue(same_rotation(quat, rotation.euler_to_quat(result)), (euler, result))
+
+    def test_quaternion_composes_x_then_y_then_z_axes(self):
+        for _ in range(TRIALS // 5):
+            x, y, z = random_euler(self.rng)
+            expected = rotation.quat_multiply(rotation.quat_multiply(rotation.euler_to_quat([x, 0, 0]),
+                                                                     rotation.yaw_to_quat(y)),
+                                              rotation.euler_to_quat([0, 0, z]))
+            self.assertTrue(same_rotation(expected, rotation.euler_to_quat([x, y, z])))
+
+    def test_matrix_matches_quaternion(self):
+        for _ in range(TRIALS // 5):
+            euler = random_euler(self.rng)
+            vector = [self.rng.uniform(-1, 1) for _ in range(3)]
+            by_matrix = rotation.euler_to_matrix(euler) @ vector
+            by_quat = rotate(rotation.euler_to_quat(euler), vector)
+            np.testing.assert_allclose(by_matrix, by_quat, atol=1e-12)
+
+    def test_yaw_from_direction(self):
+        self.assertAlmostEqual(rotation.yaw_from_direction(0, 1), 0.0)
+        self.assertAlmostEqual(rotation.yaw_from_direction(1, 0), 90.0)
+        self.assertAlmostEqual(rotation.yaw_from_direction(-1, -1), -135.0)
+        self.assertIsNone(rotation.yaw_from_direction(0, 0))
+        # The yaw turns +Z onto the direction
+        for _ in range(50):
+            dx, dz = self.rng.uniform(-1, 1), self.rng.uniform(-1, 1)
+            forward = rotate(rotation.yaw_to_quat(rotation.yaw_from_direction(dx, dz)), (0, 0, 1))
+            length = math.hypot(dx, dz)
+            np.testing.assert_allclose(forward, [dx / length, 0, dz / length], atol=1e-12)
+
+    def test_repeated_inputs_are_cached(self):
+        euler = [12.5, -33.0, 71.25]
+        first = rotation.euler_to_quat(euler)
+        hits = rotation._euler_to_quat.cache_info().hits
+        self.assertIs(rotation.euler_to_quat(list(euler)), first)
+        self.assertIs(rotation.euler_to_quat(np.array(euler)), first)
+        self.assertEqual(rotation._euler_to_quat.cache_info().hits, hits + 2)
+
+
+class TestBatchedRotation(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(460)
+        self.eulers = np.array([random_euler(rng) for _ in range(TRIALS)] +
+                               [[rng.uniform(-180, 180), pitch, rng.uniform(-180, 180)] for pitch in (90, -90)])
+        self.quats = np.array([random_quat(rng) for _ in range(TRIALS)])
+
+    def test_batch_matches_scalar(self):
+        quats = rotation.euler_to_quat_batch(self.eulers)
+        for euler, quat in zip(self.eulers, quats):
+            np.testing.assert_allclose(quat, rotation.euler_to_quat(euler), atol=1e-12)
+        eulers = rotation.quat_to_euler_batch(self.quats)
+        for quat, euler in zip(self.quats, eulers):
+            np.testing.assert_allclose(euler, rotation.quat_to_euler(quat), atol=1e-9)
+
+    def test_batch_round_trip(self):
+        quats = rotation.euler_to_quat_batch(self.eulers)
+        eulers = rotation.quat_to_euler_batch(quats)
+        np.testing.assert_allclose(eulers[:TRIALS], self.eulers[:TRIALS], atol=1e-7)
+        back = rotation.euler_to_quat_batch(eulers)
+        np.testing.assert_allclose(np.abs(np.sum(back * quats, axis=1)), 1.0, atol=1e-9)
+
+    def test_batch_writes_into_out(self):
+        quats = np.empty((len(self.eulers), 4))
+        self.assertIs(rotation.euler_to_quat_batch(self.eulers, out=quats), quats)
+        eulers = np.empty_like(self.eulers)
+        self.assertIs(rotation.quat_to_euler_batch(quats, out=eulers), eulers)
+        yaws = np.empty(len(self.eulers))
+        self.assertIs(rotation.yaw_from_directions(self.eulers, out=yaws), yaws)
+
+    def test_yaw_from_directions_matches_scalar(self):
+        directions = self.eulers / 180.0
+        yaws = rotation.yaw_from_directions(directions)
+        for direction, yaw in zip(directions, yaws):
+            self.assertAlmostEqual(yaw, rotation.yaw_from_direction(direction[0], direction[2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
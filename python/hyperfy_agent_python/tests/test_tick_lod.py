@@ -0,0 +1,114 @@
+import unittest
+
+from hyperfy_agent_python.src.core.agent_base import AgentBase
+from hyperfy_agent_python.src.core.metrics import MetricsRegistry
+from hyperfy_agent_python.src.core.tick_lod import TickLod, parse_tiers
+from hyperfy_agent_python.src.core.world_state import WorldState, Player
+
+CONFIG = {"VOICE_RECOGNITION_ENABLED": False, "PHYSICS_ENABLED": False, "ACTION_COOLDOWN": 0.0}
+TIERS = [[10.0, 1], [50.0, 4], [None, 10]]
+STEP = 1 / 60
+
+
+class CountingAgent(AgentBase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.updates = []
+
+    def update(self, delta_time):
+        self.updates.append(delta_time)
+
+
+class TestParseTiers(unittest.TestCase):
+    def test_open_ended_tier_is_added(self):
+        self.assertEqual(parse_tiers([[10, 1], [20, 5]]), ((10.0, 1), (20.0, 5), (float("inf"), 5)))
+
+    def test_invalid_tiers(self):
+        with self.assertRaises(ValueError):
+            parse_tiers([[20, 1], [10, 2]])
+        with self.assertRaises(ValueError):
+            parse_tiers([[10, 0]])
+
+
+class TestTickLod(unittest.TestCase):
+    def setUp(self):
+        self.world = WorldState()
+        self.position = [0.0, 0.0, 0.0]
+
+    def run_steps(self, lod, steps):
+        return [lod.before_step(self.world, self.position, STEP) for _ in range(steps)]
+
+    def test_far_agents_skip_steps_but_keep_time(self):
+        lod = TickLod(TIERS, agent_name="npc")
+        deltas = self.run_steps(lod, 100)
+        ran = [dt for dt in deltas if dt]
+        self.assertEqual(lod.tier, 2)
+        self.assertIn(len(ran), (10, 11))
+        self.assertAlmostEqual(sum(ran) + lod.pending_time, 100 * STEP)
+
+    def test_near_player_restores_full_rate_instantly(self):
+        self.world.add_player(Player("p1", position=[30.0, 0.0, 0.0]))
+        lod = TickLod(TIERS, agent_name="npc")
+        self.run_steps(lod, 3)
+        self.assertEqual(lod.tier, 1)
+
+        self.world.update_player("p1", position=[5.0, 0.0, 0.0])
+        deltas = self.run_steps(lod, 5)
+        self.assertEqual(lod.tier, 0)
+        self.assertTrue(all(deltas))
+        self.assertGreaterEqual(deltas[0], STEP)
+
+    def test_agents_in_a_slow_tier_are_staggered(self):
+        lods = [TickLod(TIERS, agent_name=f"npc-{i}") for i in range(20)]
+        first_ticks = set()
+        for lod in lods:
+            lod.before_step(self.world, self.position, STEP)  # the first step always runs
+            deltas = self.run_steps(lod, 10)
+            first_ticks.add(next(i for i, dt in enumerate(deltas) if dt))
+        self.assertGreater(len(first_ticks), 3)
+
+    def test_metrics_and_cpu_saved(self):
+        registry = MetricsRegistry()
+        lod = TickLod(TIERS, agent_name="npc", registry=registry)
+        lod.tick_time = 0.5
+        self.run_steps(lod, 41)
+        stats = lod.get_stats()
+        self.assertEqual(stats["ticks"] + stats["skipped"], 41)
+        self.assertGreater(stats["cpu_saved_seconds"], 0.0)
+        self.assertEqual(registry.counter("hyperfy_agent_ticks_total", "", ("agent", "tier")).get("npc", "2"),
+                         stats["ticks_by_tier"][2])
+
+
+class TestAgentLod(unittest.TestCase):
+    def test_agent_ticks_follow_player_distance(self):
+        world = WorldState()
+        agent = CountingAgent("npc", dict(CONFIG, LOD_ENABLED=True, LOD_TIERS=TIERS), world_state=world)
+        agent._run_steps(60)
+        self.assertLessEqual(len(agent.updates), 7)
+        self.assertAlmostEqual(sum(agent.updates) + agent.lod.pending_time, 1.0)
+
+        world.add_player(Player("p1", position=[1.0, 0.0, 0.0]))
+        agent.updates.clear()
+        agent._run_steps(60)
+        self.assertEqual(len(agent.updates), 60)
+        self.assertEqual(agent.get_lod_stats()["tier"], 0)
+
+    def test_queued_action_runs_on_the_next_step(self):
+        agent = CountingAgent("npc", dict(CONFIG, LOD_ENABLED=True, LOD_TIERS=TIERS))
+        agent._run_steps(3)
+        self.assertGreater(agent.lod.countdown, 0)
+        agent.updates.clear()
+        agent.move_to([1.0, 0.0, 0.0], speed=1.0)
+        agent._run_steps(1)
+        self.assertEqual(len(agent.updates), 1)
+        self.assertTrue(agent.action_system.current_action.is_running())
+
+    def test_disabled_by_default(self):
+        agent = CountingAgent("npc", CONFIG)
+        agent._run_steps(10)
+        self.assertEqual(len(agent.updates), 10)
+        self.assertIsNone(agent.get_lod_stats())
+
+
+if __name__ == '__main__':
+    unittest.main()
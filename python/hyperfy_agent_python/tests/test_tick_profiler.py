@@ -0,0 +1,110 @@
+import unittest
+import json
+import os
+import tempfile
+import threading
+import time
+
+from hyperfy_agent_python.src.core.agent_base import AgentBase
+from hyperfy_agent_python.src.core.action_system import Action
+from hyperfy_agent_python.src.core.tick_profiler import TickProfiler
+
+CONFIG = {"VOICE_RECOGNITION_ENABLED": False, "PHYSICS_ENABLED": False, "ACTION_COOLDOWN": 0.0}
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class SlowAction(Action):
+    def update(self, delta_time):
+        busy(0.01)
+        return False
+
+
+class TestTickProfiler(unittest.TestCase):
+    def test_nested_spans_are_charged_to_the_inner_phase(self):
+        profiler = TickProfiler(budget=1.0)
+        profiler.begin_frame()
+        profiler.enter("outer")
+        busy(0.002)
+        profiler.enter("inner", "label")
+        busy(0.005)
+        profiler.exit()
+        profiler.exit()
+        self.assertIsNone(profiler.end_frame())
+
+        phases = profiler.frames[-1][2]
+        self.assertGreaterEqual(phases["inner"], 5_000_000)
+        self.assertLess(phases["outer"], 5_000_000)
+
+    def test_overrun_report_names_slowest_phase_and_label(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "overruns.jsonl")
+            profiler = TickProfiler(budget=0.001, report_file=path)
+            profiler.begin_frame()
+            profiler.enter("update")
+            profiler.exit()
+            profiler.enter("action", "SlowAction 7")
+            busy(0.003)
+            profiler.exit()
+            with self.assertLogs("profiler.agent", level="WARNING") as logs:
+                report = profiler.end_frame()
+
+            self.assertEqual(report["phase"], "action")
+            self.assertEqual(report["label"], "SlowAction 7")
+            self.assertIn("SlowAction 7", logs.output[0])
+            with open(path) as f:
+                self.assertEqual(json.loads(f.readline())["label"], "SlowAction 7")
+
+    def test_budget_scales_with_steps_and_window_is_bounded(self):
+        profiler = TickProfiler(budget=0.005, window=3)
+        for _ in range(5):
+            profiler.begin_frame()
+            busy(0.006)
+            self.assertIsNone(profiler.end_frame(steps=2))
+        stats = profiler.get_stats()
+        self.assertEqual(stats["frames"], 5)
+        self.assertEqual(stats["window"], 3)
+        self.assertEqual(stats["overruns"], 0)
+
+    def test_spans_from_other_threads_are_ignored(self):
+        profiler = TickProfiler(budget=1.0)
+        profiler.begin_frame()
+        profiler.enter("update")
+        thread = threading.Thread(target=lambda: (profiler.enter("hooks"), profiler.exit()))
+        thread.start()
+        thread.join()
+        profiler.exit()
+        profiler.end_frame()
+        self.assertEqual(set(profiler.frames[-1][2]), {"update"})
+
+
+class TestAgentProfiling(unittest.TestCase):
+    def test_agent_frames_are_broken_down_by_phase(self):
+        agent = AgentBase("profiled", CONFIG)
+        profiler = agent.enable_profiler(budget=0.005)
+        agent.register_event_handler("started", lambda data: None)
+        agent.action_system.add_hook("pre_execute", lambda action: agent.emit_event("started"))
+        agent.queue_action(SlowAction())
+
+        profiler.begin_frame()
+        with self.assertLogs("profiler.profiled", level="WARNING"):
+            agent._run_steps(1)
+            report = profiler.end_frame(1)
+
+        self.assertEqual(report["phase"], "action")
+        self.assertTrue(report["label"].startswith("SlowAction"))
+        self.assertEqual(set(report["phases_ms"]), {"timers", "update", "action_system", "action", "hooks", "events"})
+        self.assertIn("action", agent.get_profile_stats()["phase_mean_ms"])
+        self.assertTrue(any(name.startswith("hooks:pre_execute SlowAction") for name in report["labels_ms"]))
+
+        agent.disable_profiler()
+        self.assertIsNone(agent.action_system.profiler)
+        self.assertIsNone(agent.get_profile_stats())
+
+
+if __name__ == '__main__':
+    unittest.main()
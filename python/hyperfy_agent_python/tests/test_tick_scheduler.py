@@ -0,0 +1,95 @@
+import unittest
+import asyncio
+import random
+import threading
+import time
+
+from hyperfy_agent_python.src.core.tick_scheduler import TickScheduler
+from hyperfy_agent_python.src.core.agent_base import AgentBase
+from hyperfy_agent_python.src.core.action_system import Action
+
+CONFIG = {"VOICE_RECOGNITION_ENABLED": False, "PHYSICS_ENABLED": False, "ACTION_COOLDOWN": 0.0,
+          "AGENT_IDLE_INTERVAL": 5.0}
+
+
+class TestTickScheduler(unittest.TestCase):
+    def test_fixed_steps_do_not_drift(self):
+        scheduler = TickScheduler(tick_rate=60.0)
+        rng = random.Random(7)
+        now = 100.0
+        scheduler.reset(now)
+        total = 0
+        for _ in range(600):
+            now += rng.uniform(0.010, 0.024)
+            total += scheduler.begin_frame(now)
+        self.assertAlmostEqual(total, int((now - 100.0) * 60), delta=1)
+        self.assertEqual(scheduler.dropped_steps, 0)
+        self.assertLess(scheduler.jitter.max, scheduler.step)
+
+    def test_catch_up_is_bounded(self):
+        scheduler = TickScheduler(tick_rate=60.0, max_catch_up=3)
+        scheduler.reset(0.0)
+        self.assertEqual(scheduler.begin_frame(0.5), 3)
+        self.assertEqual(scheduler.dropped_steps, 27)
+        self.assertEqual(scheduler.begin_frame(0.5 + scheduler.step), 1)
+
+    def test_next_tick_follows_schedule(self):
+        scheduler = TickScheduler(tick_rate=50.0)
+        scheduler.reset(0.0)
+        scheduler.begin_frame(0.025)  # one step due, 5 ms late
+        self.assertAlmostEqual(scheduler.time_until_next_tick(0.025), 0.015)
+        self.assertEqual(scheduler.time_until_next_tick(1.0), 0.0)
+
+    def test_overruns_counted(self):
+        scheduler = TickScheduler(tick_rate=100.0)
+        scheduler.end_frame(0.0, 0.005)
+        scheduler.end_frame(0.0, 0.05)
+        self.assertEqual(scheduler.overruns, 1)
+        self.assertEqual(scheduler.get_stats()["frame_time"]["count"], 2)
+
+    def test_idle_wait_ends_on_wake_and_skips_catch_up(self):
+        scheduler = TickScheduler(tick_rate=60.0, idle_interval=5.0)
+        scheduler.reset(time.monotonic())
+        threading.Timer(0.05, scheduler.wake).start()
+        started = time.monotonic()
+        scheduler.wait(idle=True)
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(scheduler.wakeups, 1)
+        self.assertEqual(scheduler.begin_frame(time.monotonic()), 1)
+
+    def test_async_idle_wait_ends_on_wake(self):
+        scheduler = TickScheduler(tick_rate=60.0, idle_interval=5.0)
+
+        async def scenario():
+            asyncio.get_running_loop().call_later(0.05, scheduler.wake)
+            started = time.monotonic()
+            await scheduler.wait_async(idle=True)
+            return time.monotonic() - started
+
+        self.assertLess(asyncio.run(scenario()), 1.0)
+        self.assertIsNone(scheduler.waiter)
+
+
+class TestAgentScheduling(unittest.TestCase):
+    def test_idle_agent_sleeps_and_wakes_on_queued_action(self):
+        agent = AgentBase("Sleeper", CONFIG)
+        agent.start()
+        try:
+            time.sleep(0.2)
+            idle_frames = agent.scheduler.frames
+            self.assertLessEqual(idle_frames, 2)
+
+            action = Action()
+            agent.queue_action(action)
+            deadline = time.monotonic() + 1.0
+            while not action.is_completed() and time.monotonic() < deadline:
+                time.sleep(0.005)
+            self.assertTrue(action.is_completed())
+            self.assertLess(action.start_time - action.queued_time, 0.5)
+        finally:
+            agent.stop()
+        self.assertFalse(agent.update_thread.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
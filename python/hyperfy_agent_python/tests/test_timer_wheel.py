@@ -0,0 +1,137 @@
+import unittest
+import random
+
+from hyperfy_agent_python.src.agents.alice_agent import AliceAgent
+from hyperfy_agent_python.src.core.headless import HeadlessRunner
+from hyperfy_agent_python.src.core.timer_wheel import TimerWheel
+
+STEP = 1 / 60
+CONFIG = {"PHYSICS_ENABLED": False, "ACTION_COOLDOWN": 0.0}
+
+
+class WheelTestCase(unittest.TestCase):
+    def setUp(self):
+        self.wheel = TimerWheel(resolution=STEP, slots=8, levels=3, start=0.0)
+        self.now = 0.0
+        self.fired = []
+
+    def record(self, label):
+        self.fired.append((label, self.now))
+
+    def run_until(self, end):
+        while self.now < end - 1e-9:
+            self.now += STEP
+            self.wheel.advance(self.now)
+
+
+class TestTimerWheel(WheelTestCase):
+    def test_one_shot_fires_once_never_early(self):
+        self.wheel.call_later(0.5, self.record, "a")
+        self.run_until(2.0)
+        self.assertEqual(len(self.fired), 1)
+        self.assertGreaterEqual(self.fired[0][1], 0.5 - 1e-9)
+        self.assertLess(self.fired[0][1], 0.5 + 2 * STEP)
+        self.assertEqual(len(self.wheel), 0)
+
+    def test_cascades_across_levels(self):
+        # 8 slots of 1/60 s: level 0 covers 0.13 s, level 1 1.07 s, level 2 8.5 s
+        delays = [0.05, 0.3, 1.0, 3.0, 7.9]
+        for delay in delays:
+            self.wheel.call_later(delay, self.record, delay)
+        self.run_until(10.0)
+        self.assertEqual([label for label, _ in self.fired], delays)
+        for delay, at in self.fired:
+            self.assertGreaterEqual(at, delay - 1e-9)
+            self.assertLess(at, delay + 2 * STEP)
+
+    def test_beyond_the_top_level(self):
+        self.wheel.call_later(20.0, self.record, "far")
+        self.run_until(19.9)
+        self.assertEqual(self.fired, [])
+        self.run_until(20.1)
+        self.assertEqual([label for label, _ in self.fired], ["far"])
+
+    def test_repeating_timer_does_not_drift(self):
+        self.wheel.call_every(0.25, self.record, "tick")
+        self.run_until(10.0)
+        self.assertEqual(len(self.fired), 40)
+        self.assertAlmostEqual(self.fired[-1][1], 10.0, delta=STEP)
+
+    def test_jitter_stays_in_bounds(self):
+        random.seed(3)
+        self.wheel.call_every(1.0, self.record, "tick", jitter=0.3)
+        self.run_until(60.0)
+        times = [0.0] + [at for _, at in self.fired]
+        gaps = [b - a for a, b in zip(times, times[1:])]
+        self.assertGreater(len(gaps), 40)
+        self.assertTrue(all(0.7 - STEP < gap < 1.3 + 2 * STEP for gap in gaps))
+        self.assertGreater(max(gaps) - min(gaps), 0.2)
+
+    def test_cancel(self):
+        once = self.wheel.call_later(1.0, self.record, "once")
+        repeat = self.wheel.call_every(0.5, self.record, "repeat")
+        self.run_until(1.2)
+        self.assertFalse(once.cancel())
+        self.assertTrue(repeat.cancel())
+        self.assertFalse(repeat.active)
+        self.run_until(5.0)
+        self.assertEqual([label for label, _ in self.fired], ["repeat", "once", "repeat"])
+        self.assertEqual(len(self.wheel), 0)
+
+    def test_timer_can_cancel_itself(self):
+        def stop_after_three(label):
+            self.record(label)
+            if len(self.fired) == 3:
+                timer.cancel()
+        timer = self.wheel.call_every(0.1, stop_after_three, "tick")
+        self.run_until(2.0)
+        self.assertEqual(len(self.fired), 3)
+
+    def test_long_jump_fires_due_timers_in_order(self):
+        self.wheel.call_later(30.0, self.record, "b")
+        self.wheel.call_later(10.0, self.record, "a")
+        self.wheel.call_later(500.0, self.record, "c")
+        self.now = 100.0
+        self.assertEqual(self.wheel.advance(self.now), 2)
+        self.assertEqual([label for label, _ in self.fired], ["a", "b"])
+        self.run_until(500.1)
+        self.assertEqual([label for label, _ in self.fired], ["a", "b", "c"])
+
+    def test_callback_errors_are_contained(self):
+        def broken():
+            raise RuntimeError("boom")
+        self.wheel.call_every(0.1, broken)
+        self.wheel.call_later(0.2, self.record, "after")
+        with self.assertLogs("timer_wheel", level="ERROR"):
+            self.run_until(0.5)
+        self.assertEqual([label for label, _ in self.fired], ["after"])
+        self.assertEqual(len(self.wheel), 1)
+
+    def test_empty_wheel_skips_ahead(self):
+        self.assertEqual(self.wheel.advance(1000.0), 0)
+        self.assertEqual(self.wheel.current_tick, int(1000.0 / STEP))
+        self.now = 1000.0
+        self.wheel.call_later(0.5, self.record, "a")
+        self.run_until(1001.0)
+        self.assertEqual(len(self.fired), 1)
+
+
+class TestAliceTimers(unittest.TestCase):
+    def test_idle_phrases_follow_timers_on_virtual_time(self):
+        with HeadlessRunner(CONFIG, seed=5) as runner:
+            alice = AliceAgent(runner.config, **runner.agent_kwargs())
+            runner.add_agent(alice)
+            self.assertEqual(len(alice.timers), 2)
+            runner.run(600.0)
+            idle_timer = alice.idle_timer
+        said = [(at - runner.start_time, text) for at, name, text in runner.transcript]
+        idle = [at for at, text in said if text in alice.idle_phrases]
+        # 600 s at one chance in 30-60 s, 30% of the time
+        self.assertTrue(1 <= len(idle) <= 8, idle)
+        self.assertTrue(all(at >= 30.0 for at in idle))
+        self.assertFalse(idle_timer.active)
+        self.assertEqual(len(alice.timers), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import asyncio
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock
+
+from hyperfy_agent_python.src.voice import voice_manager
+from hyperfy_agent_python.src.voice.voice_manager import VoiceManager
+
+
+class FakeRecognizer:
+    """Hears "hello" once, then nothing; records the threads it was called on."""
+    def __init__(self):
+        self.threads = set()
+        self.heard = False
+
+    def adjust_for_ambient_noise(self, source):
+        self.threads.add(threading.current_thread().name)
+
+    def listen(self, source, timeout=None, phrase_time_limit=None):
+        self.threads.add(threading.current_thread().name)
+        if self.heard:
+            threading.Event().wait(0.05)
+            raise voice_manager.sr.UnknownValueError()
+        self.heard = True
+        return "audio"
+
+    def recognize_google(self, audio, language=None):
+        return "hello"
+
+
+class FakeMicrophone:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def fake_speech_modules():
+    sr = SimpleNamespace(Recognizer=FakeRecognizer, Microphone=FakeMicrophone,
+                         UnknownValueError=type("UnknownValueError", (Exception,), {}),
+                         RequestError=type("RequestError", (Exception,), {}))
+    engine = MagicMock()
+    engine.getProperty.return_value = []
+    return sr, SimpleNamespace(init=lambda: engine)
+
+
+class TestVoiceManagerAsync(unittest.TestCase):
+    def setUp(self):
+        sr, pyttsx3 = fake_speech_modules()
+        for name, value in (("VOICE_ENABLED", True), ("sr", sr), ("pyttsx3", pyttsx3)):
+            patcher = patch.object(voice_manager, name, value, create=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_blocking_calls_run_on_dedicated_threads(self):
+        async def scenario():
+            heard = asyncio.Event()
+            received = []
+
+            def callback(text, confidence):
+                received.append((text, threading.current_thread() is threading.main_thread()))
+                heard.set()
+
+            manager = VoiceManager({})
+            spoken = []
+            manager._say = lambda text, voice_id=None: spoken.append(threading.current_thread().name)
+            self.assertTrue(manager.start_async(callback))
+            manager.speak("hi")
+            await asyncio.wait_for(heard.wait(), 2.0)
+            await asyncio.sleep(0.05)
+            await manager.stop_async()
+            return manager, received, spoken
+
+        manager, received, spoken = asyncio.run(scenario())
+        self.assertEqual(received, [("hello", True)])
+        self.assertEqual(len(spoken), 1)
+        self.assertTrue(spoken[0].startswith("voice-speech"))
+        self.assertEqual(manager.recognizer.threads, {manager.recognition_thread.name})
+        self.assertFalse(manager.recognition_thread.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()